@@ -3,6 +3,9 @@ Phase 1: Zomato Data Ingestion
 Load and validate Zomato restaurant dataset from Hugging Face or local CSV.
 """
 
+from .bitmap_index import BitmapIndex
 from .data_loader import ZomatoDataLoader
+from .lazy_columns import HeavyColumnStore
+from .snapshot import SnapshotCache
 
-__all__ = ["ZomatoDataLoader"]
+__all__ = ["ZomatoDataLoader", "BitmapIndex", "HeavyColumnStore", "SnapshotCache"]
@@ -0,0 +1,236 @@
+"""
+Phase 1 - Bitmap Index
+Packed bitmaps over the low-cardinality Zomato attributes (online_order,
+book_table, rest_type, listed_in(type) and the derived veg flag), built at
+load time so multi-predicate filters are bitwise ANDs over n/8 bytes instead
+of chained DataFrame masks.
+"""
+
+import os
+from pathlib import Path
+from typing import Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .normalize import IS_VEG_COL, non_veg_mask
+
+BITMAP_COLUMNS = ["online_order", "book_table", "rest_type", "listed_in(type)"]
+# Columns holding comma-separated lists ("Casual Dining, Bar"); one bitmap per item.
+MULTI_VALUE_COLUMNS = {"rest_type"}
+# Derived attribute: "yes" for rows without non-veg keywords, else "no".
+VEG_ATTRIBUTE = "veg"
+
+Predicate = Union[str, bool, Sequence[str]]
+
+# Bit i of a bitmap is row i; little bit order keeps that a shift and a mask.
+_BITORDER = "little"
+
+
+def value_key(value: object) -> str:
+    """Canonical form of an attribute value: stripped, lowercase; missing -> ''."""
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    return str(value).strip().lower()
+
+
+def _value_keys(values: Predicate) -> list[str]:
+    if isinstance(values, (str, bool)):
+        return [value_key(values)]
+    return [value_key(v) for v in values]
+
+
+def attribute_values(df: pd.DataFrame, column: str) -> pd.Series:
+    """
+    Canonical attribute keys per row of df: a str Series, or for
+    MULTI_VALUE_COLUMNS a Series of lists of str.
+    """
+    if column == VEG_ATTRIBUTE:
+        veg = df[IS_VEG_COL].to_numpy(dtype=bool) if IS_VEG_COL in df.columns else ~non_veg_mask(df).to_numpy(dtype=bool)
+        return pd.Series(np.where(veg, "yes", "no"), index=df.index)
+    keys = df[column].map(value_key)
+    if column in MULTI_VALUE_COLUMNS:
+        return keys.str.split(",").map(lambda items: [i.strip() for i in items if i.strip()])
+    return keys
+
+
+def match_mask(df: pd.DataFrame, predicates: Mapping[str, Predicate]) -> np.ndarray:
+    """
+    Evaluate predicates on df with plain boolean masks.
+
+    Same semantics as BitmapIndex.select (values OR-ed within a column,
+    columns AND-ed); used when no index matches the frame.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in predicates.items():
+        wanted = set(_value_keys(values))
+        keys = attribute_values(df, column)
+        if column in MULTI_VALUE_COLUMNS:
+            mask &= keys.map(lambda items: not wanted.isdisjoint(items)).to_numpy(dtype=bool)
+        else:
+            mask &= keys.isin(wanted).to_numpy(dtype=bool)
+    return mask
+
+
+class BitmapIndex:
+    """
+    Column -> value -> packed bitmap (uint8, one bit per row).
+
+    Positions refer to the frame the index was built from, so it is only
+    valid for that frame (same rows, same order). Missing values get no
+    bitmap and so never match.
+    """
+
+    def __init__(self, length: int, bitmaps: dict[str, dict[str, np.ndarray]]):
+        """
+        Args:
+            length: Number of rows in the indexed frame.
+            bitmaps: Column -> canonical value -> packed bitmap.
+        """
+        self.length = length
+        self.bitmaps = bitmaps
+        self._nbytes = (length + 7) // 8
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, columns: Sequence[str] = BITMAP_COLUMNS) -> "BitmapIndex":
+        """
+        Index the given columns of df (those present) plus VEG_ATTRIBUTE.
+        """
+        bitmaps = {}
+        for column in cls.indexed_columns(df, columns):
+            keys = attribute_values(df, column)
+            if column in MULTI_VALUE_COLUMNS:
+                lengths = keys.map(len).to_numpy()
+                rows = np.repeat(np.arange(len(df)), lengths)
+                keys = pd.Series([k for items in keys for k in items], dtype=object)
+            else:
+                rows = np.arange(len(df))
+            codes, uniques = pd.factorize(keys)
+            bitmaps[column] = {}
+            for code, value in enumerate(uniques):
+                if not value:
+                    continue
+                bits = np.zeros(len(df), dtype=bool)
+                bits[rows[codes == code]] = True
+                bitmaps[column][str(value)] = np.packbits(bits, bitorder=_BITORDER)
+        return cls(len(df), bitmaps)
+
+    @staticmethod
+    def indexed_columns(df: pd.DataFrame, columns: Sequence[str] = BITMAP_COLUMNS) -> list[str]:
+        """Columns build() indexes for df: those of columns present, plus VEG_ATTRIBUTE."""
+        return [c for c in columns if c in df.columns] + [VEG_ATTRIBUTE]
+
+    def columns(self) -> list[str]:
+        """Indexed column names."""
+        return list(self.bitmaps)
+
+    def values(self, column: str) -> list[str]:
+        """Canonical values seen in column, sorted."""
+        return sorted(self._column(column))
+
+    def bitmap(self, column: str, value: object) -> np.ndarray:
+        """Packed bitmap of rows where column == value (all zeros if unseen)."""
+        return self._column(column).get(value_key(value), self._zeros())
+
+    def select(self, predicates: Mapping[str, Predicate]) -> np.ndarray:
+        """
+        Packed bitmap of rows matching all predicates.
+
+        Args:
+            predicates: Column -> value or list of values. Values within a
+                        column are OR-ed, columns are AND-ed.
+                        e.g. {"online_order": "Yes", "rest_type": ["Cafe", "Bar"]}
+        """
+        result = np.full(self._nbytes, 0xFF, dtype=np.uint8)
+        for column, values in predicates.items():
+            column_bits = self._zeros()
+            for key in _value_keys(values):
+                column_bits = column_bits | self.bitmap(column, key)
+            result &= column_bits
+        return self._clear_padding(result)
+
+    def positions(self, bits: np.ndarray) -> np.ndarray:
+        """Ascending int64 row positions set in a packed bitmap."""
+        unpacked = np.unpackbits(bits, count=self.length, bitorder=_BITORDER)
+        return np.flatnonzero(unpacked).astype(np.int64)
+
+    def contains(self, bits: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        """Boolean array: whether each of positions is set in bits."""
+        positions = np.asarray(positions, dtype=np.int64)
+        return ((bits[positions >> 3] >> (positions & 7).astype(np.uint8)) & 1).astype(bool)
+
+    def count(self, bits: np.ndarray) -> int:
+        """Number of rows set in a packed bitmap."""
+        if hasattr(np, "bitwise_count"):
+            return int(np.bitwise_count(bits).sum())
+        return int(np.unpackbits(bits).sum())
+
+    def save(self, path: Path) -> Optional[Path]:
+        """
+        Write the index to path (.npz, written atomically). Returns the path,
+        or None on failure.
+        """
+        path = Path(path)
+        keys = [(column, value) for column, values in self.bitmaps.items() for value in values]
+        matrix = np.stack([self.bitmaps[c][v] for c, v in keys]) if keys else np.zeros((0, self._nbytes), np.uint8)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp.npz")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            np.savez(
+                tmp,
+                length=np.int64(self.length),
+                indexed=np.array(list(self.bitmaps), dtype=str),
+                columns=np.array([c for c, _ in keys], dtype=str),
+                values=np.array([v for _, v in keys], dtype=str),
+                bits=matrix,
+            )
+            os.replace(tmp, path)
+        except Exception as e:
+            print(f"Could not write bitmap index {path}: {e}")
+            tmp.unlink(missing_ok=True)
+            return None
+        return path
+
+    @classmethod
+    def load(cls, path: Path, columns: Optional[Sequence[str]] = None) -> Optional["BitmapIndex"]:
+        """
+        Read an index written by save(). Returns None if the file is missing,
+        unreadable, or (when columns is given) indexes different columns
+        than columns.
+        """
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                bitmaps: dict[str, dict[str, np.ndarray]] = {str(c): {} for c in data["indexed"]}
+                for column, value, bits in zip(data["columns"], data["values"], data["bits"]):
+                    bitmaps[str(column)][str(value)] = bits
+                index = cls(int(data["length"]), bitmaps)
+        except Exception as e:
+            print(f"Ignoring unreadable bitmap index {path}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+        if columns is not None and set(index.columns()) != set(columns):
+            return None
+        return index
+
+    def _column(self, column: str) -> dict[str, np.ndarray]:
+        if column not in self.bitmaps:
+            raise KeyError(f"Column '{column}' is not in the bitmap index")
+        return self.bitmaps[column]
+
+    def _zeros(self) -> np.ndarray:
+        return np.zeros(self._nbytes, dtype=np.uint8)
+
+    def _clear_padding(self, bits: np.ndarray) -> np.ndarray:
+        """Zero the unused high bits of the last byte."""
+        spare = self._nbytes * 8 - self.length
+        if spare:
+            bits[-1] &= np.uint8(0xFF >> spare)
+        return bits
+
+    def __len__(self) -> int:
+        return self.length
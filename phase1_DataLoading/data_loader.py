@@ -4,10 +4,31 @@ Loads Zomato restaurant data from Hugging Face dataset or local CSV file.
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
+from . import snapshot
+from .bitmap_index import BITMAP_COLUMNS, BitmapIndex
+from .lazy_columns import (
+    ArrowHeavyColumnStore,
+    CsvHeavyColumnStore,
+    FrameHeavyColumnStore,
+    HeavyColumnStore,
+)
+from .normalize import NORMALIZED_COLUMNS, normalize_dataset
+from .snapshot import (
+    SnapshotCache,
+    fingerprint_file,
+    fingerprint_source,
+    remote_validator,
+    schema_tag,
+    snapshot_name,
+)
+
+HUGGINGFACE_CSV_URL = "https://huggingface.co/datasets/ManikaSaini/zomato-restaurant-recommendation/resolve/main/zomato.csv"
+HUGGINGFACE_SNAPSHOT_NAME = "huggingface-zomato"
 
 # Expected columns from Zomato dataset schema
 EXPECTED_COLUMNS = [
@@ -30,33 +51,91 @@ EXPECTED_COLUMNS = [
     "listed_in(city)",
 ]
 
+# Large free-text columns that filtering and prompt building never read.
+HEAVY_COLUMNS = ["reviews_list", "menu_item"]
+HOT_COLUMNS = [c for c in EXPECTED_COLUMNS if c not in HEAVY_COLUMNS]
+# Source row position; added to the frame in lazy mode to join heavy columns back.
+ROW_ID_COL = "row_id"
+
 
 class ZomatoDataLoader:
     """
     Loads Zomato restaurant recommendation dataset from:
     - Hugging Face: ManikaSaini/zomato-restaurant-recommendation
     - Local CSV file
+
+    When cache_dir is set, the validated dataset is also written to a
+    columnar snapshot there and memory-mapped on later loads of the same
+    source (see phase1_DataLoading.snapshot).
+
+    With lazy_heavy_columns=True only HOT_COLUMNS (plus ROW_ID_COL) are kept
+    in memory; HEAVY_COLUMNS are served on demand by fetch_heavy_columns().
+
+    With normalize=True (default) the typed columns from
+    phase1_DataLoading.normalize are added at load time and persisted in
+    snapshots.
+
+    With build_bitmaps=True (default) a BitmapIndex over BITMAP_COLUMNS is
+    built for the loaded frame and stored next to its snapshot.
+
+    data_version changes on every load, so caches keyed by it (e.g.
+    phase3_Integration.result_cache) never serve positions of an older frame.
     """
 
-    def __init__(self, data_path: Optional[Path] = None):
+    def __init__(
+        self,
+        data_path: Optional[Path] = None,
+        cache_dir: Optional[Path] = None,
+        lazy_heavy_columns: bool = False,
+        normalize: bool = True,
+        build_bitmaps: bool = True,
+    ):
         """
         Args:
             data_path: Optional path to local CSV. If None, uses Hugging Face.
+            cache_dir: Optional snapshot directory. If None, snapshots are disabled.
+            lazy_heavy_columns: If True, keep HEAVY_COLUMNS out of the loaded frame.
+            normalize: If True, add NORMALIZED_COLUMNS (parsed cost, rating, ...).
+            build_bitmaps: If True, build bitmap_index for the loaded frame.
         """
         self.data_path = Path(data_path) if data_path else None
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.lazy_heavy_columns = lazy_heavy_columns
+        self.normalize = normalize
+        self.build_bitmaps = build_bitmaps
+        self.fingerprint: Optional[str] = None
+        self.loaded_from_snapshot = False
+        self.load_count = 0
+        self.heavy_store: Optional[HeavyColumnStore] = None
+        self.bitmap_index: Optional[BitmapIndex] = None
         self._df: Optional[pd.DataFrame] = None
 
     def load_from_huggingface(self) -> pd.DataFrame:
         """
         Load dataset directly from Hugging Face CSV file.
+
+        With a cache_dir, the snapshot is keyed by the file's ETag /
+        revision (one HEAD request), so an updated upstream dataset is
+        downloaded again. When the HEAD request fails (e.g. offline), the
+        newest snapshot with the same schema is used.
         """
+        name = f"{HUGGINGFACE_SNAPSHOT_NAME}-{schema_tag(self._schema_key())}"
+        validator = remote_validator(HUGGINGFACE_CSV_URL) if self.cache_dir else None
+        fingerprint = fingerprint_source(HUGGINGFACE_CSV_URL, self._schema_key(), validator)
+        if self.cache_dir and validator is None:
+            fingerprint = SnapshotCache(self.cache_dir).latest(name) or fingerprint
+        cached = self._load_snapshot(name, fingerprint)
+        if cached is not None:
+            return self._attach_bitmaps(cached, name)
         try:
             # Direct CSV read from Hugging Face datasets
-            url = "https://huggingface.co/datasets/ManikaSaini/zomato-restaurant-recommendation/resolve/main/zomato.csv"
+            url = HUGGINGFACE_CSV_URL
             print(f"Loading from: {url}")
             self._df = pd.read_csv(url)
             print(f"Loaded {len(self._df)} restaurants successfully!")
-            return self._validate_schema(self._df)
+            validated = self._prepare(self._df)
+            path = self._save_snapshot(validated, name, fingerprint)
+            return self._attach_bitmaps(self._finish_load(validated, path), name)
         except Exception as e:
             print(f"Error loading dataset from Hugging Face: {e}")
             # Create sample data for testing
@@ -81,8 +160,9 @@ class ZomatoDataLoader:
                 "listed_in(city)": ["Bangalore", "Bangalore", "Bangalore"]
             }
             self._df = pd.DataFrame(sample_data)
+            self.fingerprint = None
             print(f"Created {len(self._df)} sample restaurants for testing!")
-            return self._validate_schema(self._df)
+            return self._attach_bitmaps(self._finish_load(self._prepare(self._df)))
 
     def load_from_csv(self, csv_path: Optional[Path] = None) -> pd.DataFrame:
         """
@@ -99,8 +179,27 @@ class ZomatoDataLoader:
         if not path.exists():
             raise FileNotFoundError(f"CSV file not found: {path}")
 
+        fingerprint = fingerprint_file(path, self._schema_key())
+        name = snapshot_name(path)
+        cached = self._load_snapshot(name, fingerprint)
+        if cached is not None:
+            return self._attach_bitmaps(cached, name)
+
+        if self.lazy_heavy_columns and not self.cache_dir:
+            # No snapshot to map: parse only the hot columns and scan the CSV
+            # for heavy ones on demand.
+            self._validate_schema(pd.read_csv(path, nrows=0))
+            hot = pd.read_csv(path, usecols=HOT_COLUMNS, low_memory=False)[HOT_COLUMNS]
+            self._df = normalize_dataset(hot) if self.normalize else hot
+            self.fingerprint = fingerprint
+            self._df[ROW_ID_COL] = np.arange(len(self._df))
+            self.heavy_store = CsvHeavyColumnStore(path, HEAVY_COLUMNS)
+            return self._attach_bitmaps(self._df)
+
         self._df = pd.read_csv(path, low_memory=False)
-        return self._validate_schema(self._df)
+        validated = self._prepare(self._df)
+        snapshot_path = self._save_snapshot(validated, name, fingerprint)
+        return self._attach_bitmaps(self._finish_load(validated, snapshot_path), name)
 
     def load(self, prefer_local: bool = True) -> pd.DataFrame:
         """
@@ -114,9 +213,132 @@ class ZomatoDataLoader:
             return self.load_from_csv()
         return self.load_from_huggingface()
 
-    def _validate_schema(self, df: pd.DataFrame) -> pd.DataFrame:
+    def fetch_heavy_columns(
+        self, row_ids: Sequence[int], columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Return HEAVY_COLUMNS for the given source row ids, indexed by row id.
+
+        In lazy mode this reads from the side store; otherwise it slices the
+        loaded frame.
+        """
+        if self.heavy_store is not None:
+            return self.heavy_store.fetch(row_ids, columns)
+        cols = list(columns) if columns is not None else HEAVY_COLUMNS
+        ids = [int(i) for i in row_ids]
+        result = self.data[cols].iloc[ids].reset_index(drop=True)
+        result.index = pd.Index(ids, name=ROW_ID_COL)
+        return result
+
+    def with_heavy_columns(
+        self, df: pd.DataFrame, columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Return a copy of df (a subset of the loaded frame, e.g. the filtered
+        restaurants that go into a prompt) with heavy columns attached.
+        """
+        if self.heavy_store is None or df.empty:
+            return df.copy()
+        heavy = self.fetch_heavy_columns(df[ROW_ID_COL].tolist(), columns)
+        result = df.copy()
+        for col in heavy.columns:
+            result[col] = heavy[col].to_numpy()
+        return result
+
+    def _finish_load(self, df: pd.DataFrame, snapshot_path: Optional[Path] = None) -> pd.DataFrame:
+        """Split off heavy columns in lazy mode. Returns the resident frame."""
+        self.heavy_store = None
+        if not self.lazy_heavy_columns:
+            self._df = df
+            return df
+        if snapshot_path is not None and snapshot.HAS_PYARROW:
+            self.heavy_store = ArrowHeavyColumnStore(snapshot_path, HEAVY_COLUMNS)
+        else:
+            self.heavy_store = FrameHeavyColumnStore(df[HEAVY_COLUMNS])
+        hot = df[[c for c in df.columns if c not in HEAVY_COLUMNS]].copy()
+        hot[ROW_ID_COL] = np.arange(len(hot))
+        self._df = hot
+        return hot
+
+    def _load_snapshot(self, name: str, fingerprint: Optional[str]) -> Optional[pd.DataFrame]:
+        """Return the snapshot for (name, fingerprint) if caching is enabled and it exists."""
+        self.loaded_from_snapshot = False
+        if not self.cache_dir or not fingerprint:
+            return None
+        cache = SnapshotCache(self.cache_dir)
+        lazy_arrow = self.lazy_heavy_columns and snapshot.HAS_PYARROW
+        df = cache.load(name, fingerprint, columns=self._resident_columns() if lazy_arrow else None)
+        if df is None:
+            return None
+        self.fingerprint = fingerprint
+        self.loaded_from_snapshot = True
+        if lazy_arrow:
+            self._validate_schema(df, HOT_COLUMNS)
+            self.heavy_store = ArrowHeavyColumnStore(cache.path_for(name, fingerprint), HEAVY_COLUMNS)
+            df[ROW_ID_COL] = np.arange(len(df))
+            self._df = df
+            return df
+        return self._finish_load(self._validate_schema(df))
+
+    @property
+    def data_version(self) -> Optional[str]:
+        """Identifies the currently loaded frame: source fingerprint plus load count. None before the first load."""
+        if not self.load_count:
+            return None
+        return f"{self.fingerprint or 'unversioned'}#{self.load_count}"
+
+    def _attach_bitmaps(self, df: pd.DataFrame, name: Optional[str] = None) -> pd.DataFrame:
+        """
+        Final step of every load: bump load_count and set bitmap_index for
+        df, read from next to the snapshot when df came from one, otherwise
+        built (and stored if caching is on). Returns df.
+        """
+        self.load_count += 1
+        self.bitmap_index = None
+        if not self.build_bitmaps:
+            return df
+        path = None
+        if self.cache_dir and self.fingerprint and name:
+            path = SnapshotCache(self.cache_dir).sidecar_path(name, self.fingerprint, "bitmaps")
+        columns = BitmapIndex.indexed_columns(df, BITMAP_COLUMNS)
+        if path is not None and self.loaded_from_snapshot:
+            index = BitmapIndex.load(path, columns)
+            if index is not None and len(index) == len(df):
+                self.bitmap_index = index
+                return df
+        self.bitmap_index = BitmapIndex.build(df, BITMAP_COLUMNS)
+        if path is not None:
+            self.bitmap_index.save(path)
+        return df
+
+    def _save_snapshot(
+        self, df: pd.DataFrame, name: str, fingerprint: Optional[str]
+    ) -> Optional[Path]:
+        """Record the fingerprint and write a snapshot if caching is enabled."""
+        self.fingerprint = fingerprint
+        if self.cache_dir and fingerprint:
+            return SnapshotCache(self.cache_dir).save(df, name, fingerprint)
+        return None
+
+    def _schema_key(self) -> list[str]:
+        """Columns that determine snapshot content; part of the fingerprint."""
+        return EXPECTED_COLUMNS + (NORMALIZED_COLUMNS if self.normalize else [])
+
+    def _resident_columns(self) -> list[str]:
+        """Columns kept in memory in lazy mode, in frame order."""
+        derived = [c for c in NORMALIZED_COLUMNS if c not in HOT_COLUMNS] if self.normalize else []
+        return HOT_COLUMNS + derived
+
+    def _prepare(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Validate the raw frame and add normalized columns if enabled."""
+        validated = self._validate_schema(df)
+        return normalize_dataset(validated) if self.normalize else validated
+
+    def _validate_schema(
+        self, df: pd.DataFrame, columns: Sequence[str] = EXPECTED_COLUMNS
+    ) -> pd.DataFrame:
         """Validate that required columns exist. Returns validated DataFrame."""
-        missing = [c for c in EXPECTED_COLUMNS if c not in df.columns]
+        missing = [c for c in columns if c not in df.columns]
         if missing:
             raise ValueError(
                 f"Schema validation failed. Missing columns: {missing}"
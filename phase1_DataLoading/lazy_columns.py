@@ -0,0 +1,164 @@
+"""
+Phase 1 - Lazy Heavy Columns
+Side stores that keep large text columns (reviews, menus) out of the resident
+DataFrame and fetch them by row id only when a caller needs them.
+"""
+
+import io
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+CSV_CACHED_ROWS = 10_000
+
+
+class HeavyColumnStore(ABC):
+    """
+    Base class: fetches heavy columns for a set of row ids.
+
+    Row ids are 0-based positions in the source dataset (the loader's
+    ROW_ID_COL). fetch() returns a DataFrame indexed by row id, in the order
+    requested.
+    """
+
+    def __init__(self, columns: Sequence[str]):
+        """
+        Args:
+            columns: Heavy column names served by this store.
+        """
+        self.columns = list(columns)
+
+    def fetch(self, row_ids: Sequence[int], columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Return the requested heavy columns for row_ids."""
+        cols = self._resolve_columns(columns)
+        ids = [int(i) for i in row_ids]
+        if not ids:
+            return pd.DataFrame(columns=cols, index=pd.Index([], name="row_id"))
+        df = self._fetch(ids, cols)
+        df.index = pd.Index(ids, name="row_id")
+        return df
+
+    @abstractmethod
+    def _fetch(self, row_ids: list[int], columns: list[str]) -> pd.DataFrame:
+        """Rows row_ids (valid, possibly repeated) of columns, in order."""
+
+    def _resolve_columns(self, columns: Optional[Sequence[str]]) -> list[str]:
+        cols = list(columns) if columns is not None else self.columns
+        unknown = [c for c in cols if c not in self.columns]
+        if unknown:
+            raise KeyError(f"Not heavy columns: {unknown}")
+        return cols
+
+
+class FrameHeavyColumnStore(HeavyColumnStore):
+    """Heavy columns held in a separate in-memory frame (no file to map)."""
+
+    def __init__(self, frame: pd.DataFrame):
+        super().__init__(frame.columns)
+        self._frame = frame.reset_index(drop=True)
+
+    def _fetch(self, row_ids: list[int], columns: list[str]) -> pd.DataFrame:
+        return self._frame[columns].iloc[row_ids].reset_index(drop=True)
+
+
+class ArrowHeavyColumnStore(HeavyColumnStore):
+    """
+    Heavy columns served from a memory-mapped Arrow snapshot.
+
+    Only the pages holding the requested rows are touched, so the columns
+    never become resident as a whole.
+    """
+
+    def __init__(self, path: Path, columns: Sequence[str]):
+        super().__init__(columns)
+        self.path = Path(path)
+        self._table = None
+
+    def _fetch(self, row_ids: list[int], columns: list[str]) -> pd.DataFrame:
+        if self._table is None:
+            from pyarrow import feather
+
+            self._table = feather.read_table(self.path, columns=self.columns, memory_map=True)
+        return self._table.select(columns).take(row_ids).to_pandas()
+
+
+class CsvHeavyColumnStore(HeavyColumnStore):
+    """
+    Heavy columns read back from the source CSV.
+
+    Used when no snapshot is available. The first fetch records the byte
+    offset of every record in one streaming pass; after that a miss seeks
+    straight to its rows. Fetched rows are kept in a bounded LRU memo.
+    """
+
+    def __init__(self, path: Path, columns: Sequence[str], max_cached_rows: int = CSV_CACHED_ROWS):
+        """
+        Args:
+            path: Source CSV.
+            columns: Heavy column names served by this store.
+            max_cached_rows: Rows kept in the memo; least recently used go first.
+        """
+        super().__init__(columns)
+        self.path = Path(path)
+        self.max_cached_rows = max_cached_rows
+        self._lock = threading.Lock()
+        self._rows: OrderedDict[int, dict] = OrderedDict()
+        self._offsets: Optional[np.ndarray] = None  # Start of each record, then end of file
+
+    def _fetch(self, row_ids: list[int], columns: list[str]) -> pd.DataFrame:
+        with self._lock:
+            found = {}
+            for i in row_ids:
+                if i in self._rows:
+                    self._rows.move_to_end(i)
+                    found[i] = self._rows[i]
+            missing = sorted(set(row_ids) - found.keys())
+            if missing:
+                found.update(self._read(missing))
+        return pd.DataFrame([{c: found[i][c] for c in columns} for i in row_ids], columns=columns)
+
+    def _read(self, row_ids: list[int]) -> dict[int, dict]:
+        """Parse the records of sorted row_ids and memoize them."""
+        offsets = self._index()
+        out_of_range = [i for i in row_ids if not 0 <= i < len(offsets) - 1]
+        if out_of_range:
+            raise IndexError(f"Row ids out of range: {out_of_range[:5]}")
+        with open(self.path, "rb") as f:
+            parts = [f.read(int(offsets[0]))]  # Header
+            for i in row_ids:
+                f.seek(int(offsets[i]))
+                record = f.read(int(offsets[i + 1] - offsets[i]))
+                parts.append(record if record.endswith(b"\n") else record + b"\n")
+        frame = pd.read_csv(io.BytesIO(b"".join(parts)), usecols=self.columns, low_memory=False)
+        rows = dict(zip(row_ids, frame.to_dict("records")))
+        for i, row in rows.items():
+            self._rows[i] = row
+        while len(self._rows) > self.max_cached_rows:
+            self._rows.popitem(last=False)
+        return rows
+
+    def _index(self) -> np.ndarray:
+        """
+        Byte offset of every data record (pandas' row ids) plus the end of
+        file. A record ends at a newline outside quotes; blank lines are
+        skipped, as read_csv does.
+        """
+        if self._offsets is None:
+            starts = []
+            start = end = quotes = 0
+            with open(self.path, "rb") as f:
+                for line in f:
+                    end += len(line)
+                    quotes += line.count(b'"')
+                    if quotes % 2:
+                        continue  # Newline inside a quoted field
+                    if end - start > len(line) or line.strip():
+                        starts.append(start)
+                    start, quotes = end, 0
+            self._offsets = np.array(starts[1:] + [end], dtype=np.int64)
+        return self._offsets
@@ -3,6 +3,7 @@ Phase 1 - CLI entry point for data loading.
 Usage:
   python -m phase1.main                    # Load from Hugging Face
   python -m phase1.main --csv path/to.csv  # Load from local CSV
+  python -m phase1.main --csv path/to.csv --cache-dir .zomato_cache  # With snapshot cache
 """
 
 import argparse
@@ -19,6 +20,17 @@ def main() -> None:
         default=None,
         help="Path to local zomato CSV file",
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Directory for columnar dataset snapshots (disabled if not set)",
+    )
+    parser.add_argument(
+        "--lazy-heavy-columns",
+        action="store_true",
+        help="Keep reviews_list/menu_item out of memory; fetch them on demand",
+    )
     parser.add_argument(
         "--prefer-local",
         action="store_true",
@@ -33,10 +45,15 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    loader = ZomatoDataLoader(data_path=args.csv)
+    loader = ZomatoDataLoader(
+        data_path=args.csv,
+        cache_dir=args.cache_dir,
+        lazy_heavy_columns=args.lazy_heavy_columns,
+    )
     df = loader.load(prefer_local=args.prefer_local)
 
-    print(f"Loaded {loader.get_row_count():,} restaurants")
+    source = "snapshot" if loader.loaded_from_snapshot else "source"
+    print(f"Loaded {loader.get_row_count():,} restaurants (from {source})")
     cities = loader.get_unique_cities()
     print(f"Unique cities: {len(cities)}")
     if cities:
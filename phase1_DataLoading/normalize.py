@@ -0,0 +1,88 @@
+"""
+Phase 1 - Dataset Normalization
+Derives typed columns (cost, rating, votes, veg flag, city key) once at load
+time so per-request filtering only needs vectorized comparisons.
+"""
+
+import re
+
+import pandas as pd
+
+CITY_COL = "listed_in(city)"
+PRICE_COL = "approx_cost(for two people)"
+RATE_COL = "rate"
+VOTES_COL = "votes"
+
+# Derived columns added by normalize_dataset()
+COST_COL = "cost_for_two"
+RATING_COL = "rating"
+IS_VEG_COL = "is_veg"
+CITY_KEY_COL = "city_key"
+NORMALIZED_COLUMNS = [COST_COL, RATING_COL, VOTES_COL, IS_VEG_COL, CITY_KEY_COL]
+
+NON_VEG_KEYWORDS = {"chicken", "mutton", "fish", "prawn", "egg", "meat", "lamb", "seafood"}
+NON_VEG_PATTERN = "|".join(sorted(re.escape(kw) for kw in NON_VEG_KEYWORDS))
+VEG_SOURCE_COLUMNS = ["cuisines", "dish_liked"]
+
+
+def parse_cost_series(values: pd.Series) -> pd.Series:
+    """
+    Parse cost strings ('600', '1,000', '300-400', '₹500') to nullable Int64.
+    Takes the first number; unparseable or missing values become <NA>.
+    """
+    text = values.astype(str).str.strip().str.replace(",", "", regex=False)
+    parsed = pd.to_numeric(text.str.extract(r"(\d+)", expand=False), errors="coerce")
+    return parsed.where(values.notna()).astype("Int64")
+
+
+def parse_rating_series(values: pd.Series) -> pd.Series:
+    """Parse ratings like '4.1/5' or '3.9 /5' to float; 'NEW', '-' and missing become NaN."""
+    text = values.astype(str).str.strip()
+    parsed = pd.to_numeric(text.str.extract(r"^(\d+(?:\.\d+)?)", expand=False), errors="coerce")
+    return parsed.where(values.notna()).astype("float64")
+
+
+def parse_votes_series(values: pd.Series) -> pd.Series:
+    """Parse vote counts to int64; unparseable or missing values become 0."""
+    text = values.astype(str).str.replace(",", "", regex=False)
+    return pd.to_numeric(text, errors="coerce").where(values.notna()).fillna(0).astype("int64")
+
+
+def non_veg_mask(df: pd.DataFrame) -> pd.Series:
+    """
+    True where cuisines or dish_liked mention a NON_VEG_KEYWORDS term
+    (case-insensitive substring match). Missing columns count as empty.
+    """
+    mask = pd.Series(False, index=df.index)
+    for col in VEG_SOURCE_COLUMNS:
+        if col not in df.columns:
+            continue
+        values = df[col]
+        hits = values.astype(str).str.lower().str.contains(NON_VEG_PATTERN, regex=True)
+        mask |= hits.fillna(False).astype(bool) & values.notna().to_numpy()
+    return mask
+
+
+def city_key_series(values: pd.Series) -> pd.Series:
+    """Lowercased, stripped city names used as the filter key."""
+    return values.fillna("").astype(str).str.strip().str.lower()
+
+
+def normalize_dataset(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a copy of df with NORMALIZED_COLUMNS added (votes is converted in place).
+
+    Source columns are left untouched otherwise; columns whose source is
+    missing are skipped.
+    """
+    result = df.copy()
+    if PRICE_COL in result.columns:
+        result[COST_COL] = parse_cost_series(result[PRICE_COL])
+    if RATE_COL in result.columns:
+        result[RATING_COL] = parse_rating_series(result[RATE_COL])
+    if VOTES_COL in result.columns:
+        result[VOTES_COL] = parse_votes_series(result[VOTES_COL])
+    result[IS_VEG_COL] = ~non_veg_mask(result)
+    if CITY_COL in result.columns:
+        result[CITY_KEY_COL] = city_key_series(result[CITY_COL])
+    return result
@@ -0,0 +1,210 @@
+"""
+Phase 1 - Dataset Snapshot Cache
+Persists the validated dataset as a columnar snapshot so later process starts
+memory-map it instead of re-parsing the (large) source CSV.
+"""
+
+import hashlib
+import importlib.util
+import os
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+import pandas as pd
+import requests
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+# Bump when the on-disk layout or the loader's post-processing changes.
+SNAPSHOT_FORMAT_VERSION = 2
+# Bytes hashed from the head and the tail of the source file.
+HASH_SAMPLE_BYTES = 1 << 20
+FINGERPRINT_LENGTH = 32
+# Hex digits of the source path hash in local snapshot names.
+PATH_HASH_LENGTH = 8
+# Response headers that change when a remote file's content does.
+VALIDATOR_HEADERS = ("ETag", "X-Linked-Etag", "X-Repo-Commit")
+
+
+def _base_digest(columns: Iterable[str]):
+    digest = hashlib.sha256()
+    digest.update(f"snapshot-v{SNAPSHOT_FORMAT_VERSION}\n".encode())
+    digest.update("\x1f".join(columns).encode())
+    return digest
+
+
+def fingerprint_file(path: Path, columns: Iterable[str]) -> str:
+    """
+    Fingerprint a local source file for snapshot invalidation.
+
+    Combines size, mtime and a SHA-256 over the first and last
+    HASH_SAMPLE_BYTES of the file with the expected column list, so any
+    edit, truncation, replacement or schema change yields a new key without
+    hashing the whole file on every start.
+    """
+    path = Path(path)
+    stat = path.stat()
+    digest = _base_digest(columns)
+    digest.update(f"\n{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    with open(path, "rb") as f:
+        digest.update(f.read(HASH_SAMPLE_BYTES))
+        if stat.st_size > HASH_SAMPLE_BYTES:
+            f.seek(max(stat.st_size - HASH_SAMPLE_BYTES, HASH_SAMPLE_BYTES))
+            digest.update(f.read())
+    return digest.hexdigest()[:FINGERPRINT_LENGTH]
+
+
+def fingerprint_source(source: str, columns: Iterable[str], validator: Optional[str] = None) -> str:
+    """
+    Fingerprint a remote source (e.g. Hugging Face URL) by name, schema and
+    validator (see remote_validator), so a changed upstream file gets a new key.
+    """
+    digest = _base_digest(columns)
+    digest.update(f"\n{source}\n{validator or ''}".encode())
+    return digest.hexdigest()[:FINGERPRINT_LENGTH]
+
+
+def remote_validator(url: str, timeout: float = 5.0) -> Optional[str]:
+    """
+    Cheap content signal of a remote file from one HEAD request (following
+    redirects): its ETag / revision headers and final Content-Length.
+    None if the request fails or returns no such header.
+    """
+    try:
+        response = requests.head(url, allow_redirects=True, timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException:
+        return None
+    values = [
+        f"{name}={r.headers[name]}"
+        for r in (*response.history, response)
+        for name in VALIDATOR_HEADERS
+        if r.headers.get(name)
+    ]
+    if response.headers.get("Content-Length"):
+        values.append(f"Content-Length={response.headers['Content-Length']}")
+    return "\n".join(values) or None
+
+
+def schema_tag(columns: Iterable[str]) -> str:
+    """
+    Short hash of a snapshot schema. Added to a snapshot name, it keeps
+    snapshots of different schemas apart (neither prunes nor stands in for
+    the other).
+    """
+    return _base_digest(columns).hexdigest()[:PATH_HASH_LENGTH]
+
+
+def snapshot_name(path: Path) -> str:
+    """
+    Snapshot name of a local source file: its stem plus a hash of its
+    resolved path, so same-named files in different directories do not
+    share (and prune) each other's snapshots.
+    """
+    path = Path(path)
+    path_hash = hashlib.sha256(str(path.resolve()).encode()).hexdigest()[:PATH_HASH_LENGTH]
+    return f"{path.stem}-{path_hash}"
+
+
+class SnapshotCache:
+    """
+    Directory of dataset snapshots keyed by source name and fingerprint.
+
+    Snapshots are Arrow IPC (Feather v2) files read back with memory mapping
+    when pyarrow is installed, and pickles otherwise.
+    """
+
+    def __init__(self, cache_dir: Path):
+        """
+        Args:
+            cache_dir: Directory to store snapshots in. Created on first save.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.suffix = ".arrow" if HAS_PYARROW else ".pkl"
+
+    def path_for(self, name: str, fingerprint: str) -> Path:
+        """Return the snapshot path for a source name and fingerprint."""
+        return self.cache_dir / f"{name}-{fingerprint}{self.suffix}"
+
+    def sidecar_path(self, name: str, fingerprint: str, kind: str, suffix: str = ".npz") -> Path:
+        """
+        Return the path of an auxiliary file (e.g. an index) stored next to
+        the snapshot for (name, fingerprint). Pruned together with it.
+        """
+        return self.cache_dir / f"{name}-{fingerprint}.{kind}{suffix}"
+
+    def latest(self, name: str) -> Optional[str]:
+        """Fingerprint of the newest snapshot of name, or None if there is none."""
+        snapshots = list(self.cache_dir.glob(f"{name}-{'?' * FINGERPRINT_LENGTH}{self.suffix}"))
+        if not snapshots:
+            return None
+        newest = max(snapshots, key=lambda p: p.stat().st_mtime_ns)
+        return newest.name[len(name) + 1 : len(name) + 1 + FINGERPRINT_LENGTH]
+
+    def load(
+        self, name: str, fingerprint: str, columns: Optional[Sequence[str]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Return the cached DataFrame, or None if missing or unreadable.
+        Unreadable snapshots are deleted; one that lacks some of columns is
+        only skipped.
+
+        Args:
+            columns: Optional projection. Arrow snapshots read only these
+                     columns from the mapped file.
+        """
+        path = self.path_for(name, fingerprint)
+        if not path.exists():
+            return None
+        try:
+            if HAS_PYARROW:
+                from pyarrow import feather
+
+                data = feather.read_table(path, memory_map=True)
+                available = data.column_names
+            else:
+                data = pd.read_pickle(path)
+                available = list(data.columns)
+        except Exception as e:
+            print(f"Ignoring unreadable snapshot {path}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+        if columns is not None:
+            missing = [c for c in columns if c not in available]
+            if missing:
+                print(f"Ignoring snapshot {path} without columns {missing}")
+                return None
+            data = data.select(list(columns)) if HAS_PYARROW else data[list(columns)]
+        return data.to_pandas() if HAS_PYARROW else data
+
+    def save(self, df: pd.DataFrame, name: str, fingerprint: str) -> Optional[Path]:
+        """
+        Write df as the snapshot for (name, fingerprint) and drop older
+        snapshots of the same source. Returns the path, or None on failure.
+        """
+        path = self.path_for(name, fingerprint)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            if HAS_PYARROW:
+                import pyarrow as pa
+                from pyarrow import feather
+
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                feather.write_feather(table, tmp, compression="uncompressed")
+            else:
+                df.to_pickle(tmp)
+            os.replace(tmp, path)
+        except Exception as e:
+            print(f"Could not write snapshot {path}: {e}")
+            tmp.unlink(missing_ok=True)
+            return None
+        self._prune(name, keep=path)
+        return path
+
+    def _prune(self, name: str, keep: Path) -> None:
+        """Remove stale snapshots (and their sidecars) of the same source."""
+        current = keep.name[: -len(self.suffix)]
+        for old in self.cache_dir.glob(f"{name}-{'?' * FINGERPRINT_LENGTH}.*"):
+            if not old.name.startswith(f"{current}."):
+                old.unlink(missing_ok=True)
@@ -0,0 +1,179 @@
+"""Phase 1 - Tests for the categorical bitmap index."""
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from phase1_DataLoading.bitmap_index import (
+    VEG_ATTRIBUTE,
+    BitmapIndex,
+    match_mask,
+    value_key,
+)
+from phase1_DataLoading.data_loader import ZomatoDataLoader
+from phase1_DataLoading.normalize import normalize_dataset
+from phase1_DataLoading.snapshot import snapshot_name
+
+
+@pytest.fixture
+def attrs_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "online_order": ["Yes", "No", " yes", np.nan, "Yes", "No", "Yes", "No", "Yes"],
+            "book_table": ["No", "No", "Yes", "No", "No", "Yes", "No", "No", "Yes"],
+            "rest_type": [
+                "Casual Dining", "Cafe", "Casual Dining, Bar", "Quick Bites", np.nan,
+                "Bar", "Cafe, Dessert Parlor", "Quick Bites", "Bar",
+            ],
+            "listed_in(type)": ["Delivery", "Cafes", "Drinks & nightlife", "Delivery", "Delivery", "Buffet", "Cafes", "Delivery", "Buffet"],
+            "cuisines": ["North Indian", "Cafe", "Continental", "Biryani", "Seafood", "Pizza", "Desserts", "Fast Food", "Kebab"],
+            "dish_liked": ["Paneer", "Coffee", "Lamb Chops", "Chicken Biryani", np.nan, "Pasta", "Brownie", "Fries", "Mutton Seekh"],
+        }
+    )
+
+
+class TestValueKey:
+    """Tests for value_key."""
+
+    def test_canonical_forms(self):
+        assert value_key(" Yes ") == "yes"
+        assert value_key(True) == "yes"
+        assert value_key(False) == "no"
+        assert value_key(np.nan) == ""
+        assert value_key(None) == ""
+
+
+class TestBitmapIndex:
+    """Tests for BitmapIndex build and queries."""
+
+    def test_build_indexes_present_columns_and_veg(self, attrs_df):
+        index = BitmapIndex.build(attrs_df)
+        assert index.columns() == ["online_order", "book_table", "rest_type", "listed_in(type)", VEG_ATTRIBUTE]
+        assert index.values("online_order") == ["no", "yes"]
+        assert index.values("rest_type") == ["bar", "cafe", "casual dining", "dessert parlor", "quick bites"]
+        assert len(index) == 9
+
+    def test_single_value(self, attrs_df):
+        index = BitmapIndex.build(attrs_df)
+        assert index.positions(index.bitmap("online_order", "YES")).tolist() == [0, 2, 4, 6, 8]
+        assert index.positions(index.bitmap("online_order", "maybe")).tolist() == []
+        assert index.positions(index.bitmap(VEG_ATTRIBUTE, True)).tolist() == [0, 1, 5, 6, 7]
+
+    def test_multi_value_column(self, attrs_df):
+        index = BitmapIndex.build(attrs_df)
+        assert index.positions(index.bitmap("rest_type", "bar")).tolist() == [2, 5, 8]
+        assert index.positions(index.bitmap("rest_type", "Cafe")).tolist() == [1, 6]
+
+    def test_select_ands_columns_and_ors_values(self, attrs_df):
+        index = BitmapIndex.build(attrs_df)
+        bits = index.select({"online_order": "Yes", "rest_type": ["Cafe", "Bar"]})
+        assert index.positions(bits).tolist() == [2, 6, 8]
+        assert index.count(bits) == 3
+        assert index.positions(index.select({})).tolist() == list(range(9))
+        assert index.count(index.select({})) == 9
+
+    def test_contains(self, attrs_df):
+        index = BitmapIndex.build(attrs_df)
+        bits = index.bitmap("book_table", "yes")
+        assert index.contains(bits, np.array([0, 2, 5, 7, 8])).tolist() == [False, True, True, False, True]
+
+    def test_unknown_column(self, attrs_df):
+        index = BitmapIndex.build(attrs_df)
+        with pytest.raises(KeyError, match="not in the bitmap index"):
+            index.bitmap("location", "BTM")
+
+    def test_veg_from_normalized_column(self, attrs_df):
+        raw = BitmapIndex.build(attrs_df)
+        normalized = BitmapIndex.build(normalize_dataset(attrs_df))
+        assert np.array_equal(raw.bitmap(VEG_ATTRIBUTE, "yes"), normalized.bitmap(VEG_ATTRIBUTE, "yes"))
+
+    @pytest.mark.parametrize(
+        "predicates",
+        [
+            {"online_order": "yes"},
+            {"book_table": "No", "listed_in(type)": ["Delivery", "Cafes"]},
+            {"rest_type": "Quick Bites", VEG_ATTRIBUTE: "yes"},
+            {"online_order": ["yes", "no"], "rest_type": ["bar", "dessert parlor"]},
+        ],
+    )
+    def test_matches_mask_scan(self, attrs_df, predicates):
+        index = BitmapIndex.build(attrs_df)
+        assert index.positions(index.select(predicates)).tolist() == np.flatnonzero(
+            match_mask(attrs_df, predicates)
+        ).tolist()
+
+
+class TestBitmapIndexPersistence:
+    """Tests for save/load."""
+
+    def test_round_trip(self, attrs_df, tmp_path):
+        index = BitmapIndex.build(attrs_df)
+        path = index.save(tmp_path / "idx.bitmaps.npz")
+        loaded = BitmapIndex.load(path, index.columns())
+        assert loaded.columns() == index.columns()
+        assert len(loaded) == len(index)
+        for column in index.columns():
+            for value in index.values(column):
+                assert np.array_equal(loaded.bitmap(column, value), index.bitmap(column, value))
+
+    def test_load_rejects_other_columns(self, attrs_df, tmp_path):
+        path = BitmapIndex.build(attrs_df).save(tmp_path / "idx.bitmaps.npz")
+        assert BitmapIndex.load(path, ["online_order", VEG_ATTRIBUTE]) is None
+
+    def test_load_unreadable_is_removed(self, tmp_path):
+        path = tmp_path / "idx.bitmaps.npz"
+        path.write_bytes(b"not a zip")
+        assert BitmapIndex.load(path) is None
+        assert not path.exists()
+
+
+class TestLoaderBitmaps:
+    """Bitmap index built by ZomatoDataLoader."""
+
+    @pytest.fixture
+    def csv_copy(self, tmp_path: Path) -> Path:
+        dst = tmp_path / "zomato.csv"
+        shutil.copy(Path(__file__).parent / "fixtures" / "sample_zomato.csv", dst)
+        return dst
+
+    def test_built_at_load(self, csv_copy):
+        loader = ZomatoDataLoader(data_path=csv_copy)
+        loader.load_from_csv()
+        index = loader.bitmap_index
+        assert index.positions(index.bitmap("online_order", "Yes")).tolist() == [0, 2]
+        assert index.values("listed_in(type)") == ["buffet", "cafes", "delivery"]
+
+    def test_disabled(self, csv_copy):
+        loader = ZomatoDataLoader(data_path=csv_copy, build_bitmaps=False)
+        loader.load_from_csv()
+        assert loader.bitmap_index is None
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_stored_with_snapshot(self, csv_copy, tmp_path, lazy):
+        cache_dir = tmp_path / "cache"
+        first = ZomatoDataLoader(data_path=csv_copy, cache_dir=cache_dir, lazy_heavy_columns=lazy)
+        first.load_from_csv()
+        sidecar = cache_dir / f"{snapshot_name(csv_copy)}-{first.fingerprint}.bitmaps.npz"
+        assert sidecar.exists()
+
+        second = ZomatoDataLoader(data_path=csv_copy, cache_dir=cache_dir, lazy_heavy_columns=lazy)
+        second.load_from_csv()
+        assert second.loaded_from_snapshot is True
+        bits = second.bitmap_index.bitmap("book_table", "yes")
+        assert np.array_equal(bits, first.bitmap_index.bitmap("book_table", "yes"))
+
+    def test_missing_sidecar_is_rebuilt(self, csv_copy, tmp_path):
+        cache_dir = tmp_path / "cache"
+        first = ZomatoDataLoader(data_path=csv_copy, cache_dir=cache_dir)
+        first.load_from_csv()
+        sidecar = cache_dir / f"{snapshot_name(csv_copy)}-{first.fingerprint}.bitmaps.npz"
+        sidecar.unlink()
+
+        second = ZomatoDataLoader(data_path=csv_copy, cache_dir=cache_dir)
+        second.load_from_csv()
+        assert second.loaded_from_snapshot is True
+        assert len(second.bitmap_index) == 3
+        assert sidecar.exists()
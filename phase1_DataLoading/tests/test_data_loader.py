@@ -84,6 +84,16 @@ class TestZomatoDataLoaderProperties:
         cities = loader.get_unique_cities()
         assert cities == ["Banashankari", "Indiranagar", "Koramangala"]
 
+    def test_data_version_changes_on_reload(self, loader_with_fixture, sample_csv_path):
+        """data_version is None before loading and differs after every load."""
+        loader = loader_with_fixture
+        assert loader.data_version is None
+        loader.load_from_csv(sample_csv_path)
+        first = loader.data_version
+        loader.load_from_csv(sample_csv_path)
+        assert first.startswith(loader.fingerprint)
+        assert loader.data_version != first
+
     def test_data_property_before_load_raises(self):
         """Accessing .data before load raises RuntimeError."""
         loader = ZomatoDataLoader(data_path=Path("dummy.csv"))
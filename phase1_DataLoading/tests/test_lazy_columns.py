@@ -0,0 +1,169 @@
+"""Phase 1 - Tests for lazy heavy-column loading."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from phase1_DataLoading import lazy_columns, snapshot
+from phase1_DataLoading.data_loader import (
+    EXPECTED_COLUMNS,
+    HEAVY_COLUMNS,
+    HOT_COLUMNS,
+    ROW_ID_COL,
+    ZomatoDataLoader,
+)
+from phase1_DataLoading.lazy_columns import CsvHeavyColumnStore, FrameHeavyColumnStore, HeavyColumnStore
+from phase1_DataLoading.normalize import NORMALIZED_COLUMNS
+
+RESIDENT_COLUMNS = HOT_COLUMNS + [c for c in NORMALIZED_COLUMNS if c not in HOT_COLUMNS] + [ROW_ID_COL]
+
+
+@pytest.fixture
+def heavy_csv(tmp_path: Path) -> Path:
+    """CSV with distinct reviews/menus per row."""
+    rows = []
+    for i in range(7):
+        row = {c: f"{c}-{i}" for c in EXPECTED_COLUMNS}
+        row["votes"] = i
+        row["approx_cost(for two people)"] = 100 * (i + 1)
+        row["reviews_list"] = f"[('Rated 4.0', 'RATED\\n review {i}')]"
+        row["menu_item"] = f"['dish {i}a', 'dish {i}b']"
+        rows.append(row)
+    path = tmp_path / "zomato.csv"
+    pd.DataFrame(rows, columns=EXPECTED_COLUMNS).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture(params=[True, False], ids=["arrow", "pickle"])
+def snapshot_format(request):
+    """Run with and without pyarrow-backed snapshots."""
+    if request.param and not snapshot.HAS_PYARROW:
+        pytest.skip("pyarrow not installed")
+    with patch.object(snapshot, "HAS_PYARROW", request.param):
+        yield request.param
+
+
+def _assert_heavy(df: pd.DataFrame, ids: list[int]) -> None:
+    assert list(df.index) == ids
+    assert list(df["menu_item"]) == [f"['dish {i}a', 'dish {i}b']" for i in ids]
+    assert list(df["reviews_list"]) == [f"[('Rated 4.0', 'RATED\\n review {i}')]" for i in ids]
+
+
+class TestLazyLoadFromCsv:
+    """Lazy mode without a snapshot cache."""
+
+    def test_frame_has_only_hot_columns(self, heavy_csv):
+        loader = ZomatoDataLoader(data_path=heavy_csv, lazy_heavy_columns=True)
+        df = loader.load_from_csv()
+        assert list(df.columns) == RESIDENT_COLUMNS
+        assert list(df[ROW_ID_COL]) == list(range(7))
+        for col in HEAVY_COLUMNS:
+            assert col not in df.columns
+
+    def test_fetch_heavy_columns_in_requested_order(self, heavy_csv):
+        loader = ZomatoDataLoader(data_path=heavy_csv, lazy_heavy_columns=True)
+        loader.load_from_csv()
+        _assert_heavy(loader.fetch_heavy_columns([5, 0, 3]), [5, 0, 3])
+
+    def test_memo_is_bounded(self, heavy_csv):
+        store = CsvHeavyColumnStore(heavy_csv, HEAVY_COLUMNS, max_cached_rows=2)
+        _assert_heavy(store.fetch([6, 1, 3]), [6, 1, 3])
+        assert list(store._rows) == [3, 6]
+        _assert_heavy(store.fetch([3]), [3])
+        _assert_heavy(store.fetch([0]), [0])
+        assert list(store._rows) == [3, 0]
+
+    def test_miss_seeks_to_row(self, heavy_csv):
+        store = CsvHeavyColumnStore(heavy_csv, HEAVY_COLUMNS, max_cached_rows=1)
+        store.fetch([0])
+        offsets = store._offsets
+        with patch.object(lazy_columns.pd, "read_csv", wraps=pd.read_csv) as read_csv:
+            _assert_heavy(store.fetch([5]), [5])
+        assert store._offsets is offsets
+        parsed = read_csv.call_args.args[0].getvalue()
+        assert b"dish 5a" in parsed and b"dish 0a" not in parsed and b"dish 6a" not in parsed
+
+    def test_index_skips_quoted_newlines_and_blank_lines(self, tmp_path):
+        path = tmp_path / "multiline.csv"
+        path.write_bytes(b'name,reviews_list\n"A","first\nline"\n\n"B","x ""quoted""\ny"\nC,plain')
+        store = CsvHeavyColumnStore(path, ["reviews_list"])
+        assert list(store.fetch([2, 0, 1])["reviews_list"]) == ["plain", "first\nline", 'x "quoted"\ny']
+        with pytest.raises(IndexError):
+            store.fetch([3])
+
+    def test_store_is_abstract(self):
+        with pytest.raises(TypeError):
+            HeavyColumnStore(["menu_item"])
+
+    def test_fetch_out_of_range_raises(self, heavy_csv):
+        loader = ZomatoDataLoader(data_path=heavy_csv, lazy_heavy_columns=True)
+        loader.load_from_csv()
+        with pytest.raises(IndexError):
+            loader.fetch_heavy_columns([99])
+
+    def test_without_normalization_keeps_source_columns(self, heavy_csv):
+        loader = ZomatoDataLoader(data_path=heavy_csv, lazy_heavy_columns=True, normalize=False)
+        df = loader.load_from_csv()
+        assert list(df.columns) == HOT_COLUMNS + [ROW_ID_COL]
+
+    def test_missing_columns_still_raise(self, tmp_path):
+        bad_csv = tmp_path / "bad.csv"
+        bad_csv.write_text("url,name\nhttps://x.com,Test")
+        loader = ZomatoDataLoader(data_path=bad_csv, lazy_heavy_columns=True)
+        with pytest.raises(ValueError, match="Missing columns"):
+            loader.load_from_csv()
+
+
+class TestLazyLoadWithSnapshot:
+    """Lazy mode backed by the snapshot cache."""
+
+    def test_cold_and_warm_loads_serve_heavy_columns(self, heavy_csv, tmp_path, snapshot_format):
+        cache_dir = tmp_path / "cache"
+        cold = ZomatoDataLoader(data_path=heavy_csv, cache_dir=cache_dir, lazy_heavy_columns=True)
+        cold_df = cold.load_from_csv()
+        assert list(cold_df.columns) == RESIDENT_COLUMNS
+        _assert_heavy(cold.fetch_heavy_columns([2, 4]), [2, 4])
+
+        warm = ZomatoDataLoader(data_path=heavy_csv, cache_dir=cache_dir, lazy_heavy_columns=True)
+        warm_df = warm.load_from_csv()
+        assert warm.loaded_from_snapshot is True
+        assert list(warm_df.columns) == RESIDENT_COLUMNS
+        _assert_heavy(warm.fetch_heavy_columns([6, 0]), [6, 0])
+
+    def test_eager_loader_reads_snapshot_written_by_lazy_loader(self, heavy_csv, tmp_path, snapshot_format):
+        cache_dir = tmp_path / "cache"
+        ZomatoDataLoader(data_path=heavy_csv, cache_dir=cache_dir, lazy_heavy_columns=True).load_from_csv()
+        eager = ZomatoDataLoader(data_path=heavy_csv, cache_dir=cache_dir)
+        df = eager.load_from_csv()
+        assert eager.loaded_from_snapshot is True
+        for col in EXPECTED_COLUMNS:
+            assert col in df.columns
+
+
+class TestHeavyColumnHelpers:
+    """Tests for fetch_heavy_columns / with_heavy_columns."""
+
+    def test_eager_loader_fetches_from_frame(self, heavy_csv):
+        loader = ZomatoDataLoader(data_path=heavy_csv)
+        loader.load_from_csv()
+        _assert_heavy(loader.fetch_heavy_columns([1, 3]), [1, 3])
+
+    def test_with_heavy_columns_joins_filtered_rows(self, heavy_csv):
+        loader = ZomatoDataLoader(data_path=heavy_csv, lazy_heavy_columns=True)
+        df = loader.load_from_csv()
+        subset = df[df["votes"] % 3 == 0].reset_index(drop=True)
+        enriched = loader.with_heavy_columns(subset)
+        assert list(enriched["name"]) == ["name-0", "name-3", "name-6"]
+        assert list(enriched["menu_item"]) == [f"['dish {i}a', 'dish {i}b']" for i in (0, 3, 6)]
+        assert "menu_item" not in subset.columns
+
+    def test_unknown_column_raises(self):
+        store = FrameHeavyColumnStore(pd.DataFrame({"menu_item": ["a"]}))
+        with pytest.raises(KeyError, match="Not heavy columns"):
+            store.fetch([0], columns=["name"])
+
+    def test_empty_fetch(self):
+        store = FrameHeavyColumnStore(pd.DataFrame({"menu_item": ["a"]}))
+        assert store.fetch([]).empty
@@ -0,0 +1,125 @@
+"""Phase 1 - Tests for dataset normalization."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from phase1_DataLoading.data_loader import ZomatoDataLoader
+from phase1_DataLoading.normalize import (
+    CITY_KEY_COL,
+    COST_COL,
+    IS_VEG_COL,
+    NORMALIZED_COLUMNS,
+    RATING_COL,
+    non_veg_mask,
+    normalize_dataset,
+    parse_cost_series,
+    parse_rating_series,
+    parse_votes_series,
+)
+
+
+class TestParseCostSeries:
+    """Tests for parse_cost_series."""
+
+    def test_formats(self):
+        values = pd.Series(["600", "1,000", "300-400", "₹500", " 750 ", "N/A", "", None])
+        result = parse_cost_series(values)
+        assert str(result.dtype) == "Int64"
+        assert result.tolist()[:5] == [600, 1000, 300, 500, 750]
+        assert result.isna().tolist()[5:] == [True, True, True]
+
+    def test_numeric_input(self):
+        result = parse_cost_series(pd.Series([600.0, np.nan, 400.0]))
+        assert result[0] == 600
+        assert pd.isna(result[1])
+        assert result[2] == 400
+
+
+class TestParseRatingSeries:
+    """Tests for parse_rating_series."""
+
+    def test_formats(self):
+        values = pd.Series(["4.1/5", "3.9 /5", "NEW", "-", None, "4/5"])
+        result = parse_rating_series(values)
+        assert result.dtype == np.float64
+        assert result[0] == pytest.approx(4.1)
+        assert result[1] == pytest.approx(3.9)
+        assert result[2:5].isna().all()
+        assert result[5] == 4.0
+
+
+class TestParseVotesSeries:
+    """Tests for parse_votes_series."""
+
+    def test_formats(self):
+        result = parse_votes_series(pd.Series(["100", 50, "1,200", None, "abc"]))
+        assert result.dtype == np.int64
+        assert result.tolist() == [100, 50, 1200, 0, 0]
+
+
+class TestNonVegMask:
+    """Tests for non_veg_mask."""
+
+    def test_keywords_in_either_column(self):
+        df = pd.DataFrame(
+            {
+                "cuisines": ["North Indian", "Seafood", None, "Cafe"],
+                "dish_liked": ["Paneer", None, "Chicken Biryani", np.nan],
+            }
+        )
+        assert non_veg_mask(df).tolist() == [False, True, True, False]
+
+    def test_missing_columns_are_empty(self):
+        df = pd.DataFrame({"name": ["A"]})
+        assert non_veg_mask(df).tolist() == [False]
+
+
+class TestNormalizeDataset:
+    """Tests for normalize_dataset."""
+
+    def test_adds_typed_columns(self):
+        df = pd.DataFrame(
+            {
+                "listed_in(city)": ["  Banashankari ", None],
+                "approx_cost(for two people)": ["1,200", "abc"],
+                "rate": ["4.1/5", "NEW"],
+                "votes": ["12", None],
+                "cuisines": ["Chinese", "South Indian"],
+                "dish_liked": ["Chicken", "Dosa"],
+            }
+        )
+        result = normalize_dataset(df)
+        for col in NORMALIZED_COLUMNS:
+            assert col in result.columns
+        assert result[CITY_KEY_COL].tolist() == ["banashankari", ""]
+        assert result[COST_COL][0] == 1200 and pd.isna(result[COST_COL][1])
+        assert result[RATING_COL][0] == pytest.approx(4.1) and np.isnan(result[RATING_COL][1])
+        assert result["votes"].tolist() == [12, 0]
+        assert result[IS_VEG_COL].tolist() == [False, True]
+        assert df["votes"][0] == "12"
+
+    def test_skips_missing_sources(self):
+        result = normalize_dataset(pd.DataFrame({"name": ["A"]}))
+        assert result[IS_VEG_COL].tolist() == [True]
+        assert COST_COL not in result.columns
+        assert CITY_KEY_COL not in result.columns
+
+
+class TestLoaderNormalization:
+    """Normalization applied by ZomatoDataLoader."""
+
+    def test_loader_adds_columns_by_default(self):
+        path = Path(__file__).parent / "fixtures" / "sample_zomato.csv"
+        df = ZomatoDataLoader(data_path=path).load_from_csv()
+        assert df[COST_COL].tolist() == [600, 800, 400]
+        assert df[RATING_COL].tolist() == pytest.approx([4.5, 3.8, 4.2])
+        assert df[CITY_KEY_COL].tolist() == ["banashankari", "indiranagar", "koramangala"]
+        assert df[IS_VEG_COL].dtype == bool
+
+    def test_loader_normalize_disabled(self):
+        path = Path(__file__).parent / "fixtures" / "sample_zomato.csv"
+        df = ZomatoDataLoader(data_path=path, normalize=False).load_from_csv()
+        assert COST_COL not in df.columns
@@ -0,0 +1,235 @@
+"""Phase 1 - Tests for the dataset snapshot cache."""
+
+import os
+import shutil
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pandas as pd
+import pytest
+import requests
+
+from phase1_DataLoading import snapshot
+from phase1_DataLoading.data_loader import EXPECTED_COLUMNS, ZomatoDataLoader
+from phase1_DataLoading.snapshot import (
+    SnapshotCache,
+    fingerprint_file,
+    fingerprint_source,
+    remote_validator,
+    snapshot_name,
+)
+
+
+@pytest.fixture
+def csv_copy(tmp_path: Path) -> Path:
+    """Writable copy of the sample CSV fixture."""
+    src = Path(__file__).parent / "fixtures" / "sample_zomato.csv"
+    dst = tmp_path / "zomato.csv"
+    shutil.copy(src, dst)
+    return dst
+
+
+@pytest.fixture(params=[True, False], ids=["arrow", "pickle"])
+def snapshot_format(request):
+    """Run snapshot tests with and without pyarrow."""
+    if request.param and not snapshot.HAS_PYARROW:
+        pytest.skip("pyarrow not installed")
+    with patch.object(snapshot, "HAS_PYARROW", request.param):
+        yield request.param
+
+
+class TestFingerprint:
+    """Tests for fingerprint_file / fingerprint_source."""
+
+    def test_stable_for_unchanged_file(self, csv_copy):
+        assert fingerprint_file(csv_copy, EXPECTED_COLUMNS) == fingerprint_file(
+            csv_copy, EXPECTED_COLUMNS
+        )
+
+    def test_changes_when_file_changes(self, csv_copy):
+        before = fingerprint_file(csv_copy, EXPECTED_COLUMNS)
+        with open(csv_copy, "a") as f:
+            f.write("https://example.com/r4,1 Road,Restaurant D,No,No,3.0/5,5,1,X,Cafe,Tea,Cafe,100,[],[],Cafes,X\n")
+        assert fingerprint_file(csv_copy, EXPECTED_COLUMNS) != before
+
+    def test_changes_when_only_mtime_changes(self, csv_copy):
+        before = fingerprint_file(csv_copy, EXPECTED_COLUMNS)
+        stat = csv_copy.stat()
+        os.utime(csv_copy, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert fingerprint_file(csv_copy, EXPECTED_COLUMNS) != before
+
+    def test_changes_with_expected_columns(self, csv_copy):
+        assert fingerprint_file(csv_copy, EXPECTED_COLUMNS) != fingerprint_file(
+            csv_copy, EXPECTED_COLUMNS[:-1]
+        )
+
+    def test_source_fingerprint_depends_on_source(self):
+        assert fingerprint_source("a", EXPECTED_COLUMNS) != fingerprint_source("b", EXPECTED_COLUMNS)
+
+    def test_source_fingerprint_depends_on_validator(self):
+        assert fingerprint_source("a", EXPECTED_COLUMNS, 'ETag="1"') != fingerprint_source("a", EXPECTED_COLUMNS, 'ETag="2"')
+
+    def test_remote_validator(self):
+        redirect = Mock(headers={"X-Repo-Commit": "abc", "Content-Length": "12"})
+        final = Mock(headers={"ETag": '"e1"', "Content-Length": "574"}, history=[redirect])
+        with patch.object(snapshot.requests, "head", return_value=final) as head:
+            assert remote_validator("https://h/f.csv") == 'X-Repo-Commit=abc\nETag="e1"\nContent-Length=574'
+        head.assert_called_once_with("https://h/f.csv", allow_redirects=True, timeout=5.0)
+        with patch.object(snapshot.requests, "head", side_effect=requests.ConnectionError):
+            assert remote_validator("https://h/f.csv") is None
+
+    def test_snapshot_name_depends_on_directory(self, tmp_path):
+        assert snapshot_name(tmp_path / "a" / "zomato.csv").startswith("zomato-")
+        assert snapshot_name(tmp_path / "a" / "zomato.csv") != snapshot_name(tmp_path / "b" / "zomato.csv")
+
+
+class TestSnapshotCache:
+    """Tests for SnapshotCache."""
+
+    def test_round_trip(self, tmp_path, snapshot_format):
+        df = pd.DataFrame({"name": ["A", "B"], "votes": [1, 2]})
+        cache = SnapshotCache(tmp_path)
+        assert cache.load("zomato", "f" * 32) is None
+        path = cache.save(df, "zomato", "f" * 32)
+        assert path is not None and path.exists()
+        loaded = cache.load("zomato", "f" * 32)
+        assert list(loaded["name"]) == ["A", "B"]
+        assert list(loaded["votes"]) == [1, 2]
+
+    def test_save_prunes_stale_snapshots_of_same_source(self, tmp_path, snapshot_format):
+        df = pd.DataFrame({"name": ["A"]})
+        cache = SnapshotCache(tmp_path)
+        old = cache.save(df, "zomato", "a" * 32)
+        other = cache.save(df, "zomato-v2", "a" * 32)
+        new = cache.save(df, "zomato", "b" * 32)
+        assert not old.exists()
+        assert other.exists()
+        assert new.exists()
+
+    def test_latest(self, tmp_path, snapshot_format):
+        df = pd.DataFrame({"name": ["A"]})
+        cache = SnapshotCache(tmp_path)
+        assert cache.latest("zomato") is None
+        cache.save(df, "zomato", "a" * 32)
+        cache.save(df, "zomato-v2", "b" * 32)
+        assert cache.latest("zomato") == "a" * 32
+
+    def test_unreadable_snapshot_is_discarded(self, tmp_path, snapshot_format):
+        cache = SnapshotCache(tmp_path)
+        path = cache.path_for("zomato", "c" * 32)
+        path.write_bytes(b"not a snapshot")
+        assert cache.load("zomato", "c" * 32) is None
+        assert not path.exists()
+
+    def test_missing_columns_keep_snapshot(self, tmp_path, snapshot_format):
+        cache = SnapshotCache(tmp_path)
+        path = cache.save(pd.DataFrame({"name": ["A"]}), "zomato", "d" * 32)
+        assert cache.load("zomato", "d" * 32, columns=["name", "cost"]) is None
+        assert path.exists()
+        assert list(cache.load("zomato", "d" * 32, columns=["name"])["name"]) == ["A"]
+
+
+class TestLoaderSnapshot:
+    """Tests for ZomatoDataLoader snapshot integration."""
+
+    def test_first_load_writes_snapshot(self, csv_copy, tmp_path, snapshot_format):
+        cache_dir = tmp_path / "cache"
+        loader = ZomatoDataLoader(data_path=csv_copy, cache_dir=cache_dir)
+        df = loader.load_from_csv()
+        assert len(df) == 3
+        assert loader.loaded_from_snapshot is False
+        assert SnapshotCache(cache_dir).path_for(snapshot_name(csv_copy), loader.fingerprint).exists()
+
+    def test_second_load_skips_csv_parse(self, csv_copy, tmp_path, snapshot_format):
+        cache_dir = tmp_path / "cache"
+        expected = ZomatoDataLoader(data_path=csv_copy, cache_dir=cache_dir).load_from_csv()
+
+        loader = ZomatoDataLoader(data_path=csv_copy, cache_dir=cache_dir)
+        with patch("phase1_DataLoading.data_loader.pd.read_csv", side_effect=AssertionError):
+            df = loader.load_from_csv()
+        assert loader.loaded_from_snapshot is True
+        pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+
+    def test_modified_csv_invalidates_snapshot(self, csv_copy, tmp_path, snapshot_format):
+        cache_dir = tmp_path / "cache"
+        ZomatoDataLoader(data_path=csv_copy, cache_dir=cache_dir).load_from_csv()
+        with open(csv_copy, "a") as f:
+            f.write("https://example.com/r4,1 Road,Restaurant D,No,No,3.0/5,5,1,X,Cafe,Tea,Cafe,100,[],[],Cafes,X\n")
+
+        loader = ZomatoDataLoader(data_path=csv_copy, cache_dir=cache_dir)
+        df = loader.load_from_csv()
+        assert loader.loaded_from_snapshot is False
+        assert len(df) == 4
+        # Only the new snapshot and its sidecars are left
+        assert {p.name.split(".")[0] for p in cache_dir.iterdir()} == {f"{snapshot_name(csv_copy)}-{loader.fingerprint}"}
+
+    def test_no_cache_dir_writes_nothing(self, csv_copy, tmp_path):
+        loader = ZomatoDataLoader(data_path=csv_copy)
+        loader.load_from_csv()
+        assert loader.loaded_from_snapshot is False
+        assert loader.fingerprint is not None
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["zomato.csv"]
+
+    def test_same_name_in_other_directory_not_pruned(self, csv_copy, tmp_path):
+        other = tmp_path / "other" / "zomato.csv"
+        other.parent.mkdir()
+        shutil.copy(csv_copy, other)
+        cache_dir = tmp_path / "cache"
+        ZomatoDataLoader(data_path=csv_copy, cache_dir=cache_dir).load_from_csv()
+        ZomatoDataLoader(data_path=other, cache_dir=cache_dir).load_from_csv()
+
+        loader = ZomatoDataLoader(data_path=csv_copy, cache_dir=cache_dir)
+        loader.load_from_csv()
+        assert loader.loaded_from_snapshot is True
+
+    def test_invalid_schema_is_not_cached(self, tmp_path):
+        bad_csv = tmp_path / "bad.csv"
+        bad_csv.write_text("url,name\nhttps://x.com,Test")
+        cache_dir = tmp_path / "cache"
+        loader = ZomatoDataLoader(data_path=bad_csv, cache_dir=cache_dir)
+        with pytest.raises(ValueError, match="Missing columns"):
+            loader.load_from_csv()
+        assert not cache_dir.exists()
+
+
+class TestHuggingFaceSnapshot:
+    """Tests for snapshot invalidation of the remote dataset."""
+
+    def _load(self, cache_dir, validator, csv_copy, **options):
+        loader = ZomatoDataLoader(cache_dir=cache_dir, **options)
+        frame = pd.read_csv(csv_copy)
+        with patch("phase1_DataLoading.data_loader.remote_validator", return_value=validator), \
+                patch("phase1_DataLoading.data_loader.pd.read_csv", return_value=frame) as read_csv:
+            loader.load_from_huggingface()
+        return loader, read_csv.called
+
+    def test_no_head_request_without_cache(self, csv_copy):
+        frame = pd.read_csv(csv_copy)
+        with patch("phase1_DataLoading.data_loader.remote_validator") as validator, \
+                patch("phase1_DataLoading.data_loader.pd.read_csv", return_value=frame):
+            ZomatoDataLoader().load_from_huggingface()
+        validator.assert_not_called()
+
+    def test_new_upstream_version_is_downloaded(self, csv_copy, tmp_path):
+        cache_dir = tmp_path / "cache"
+        first, downloaded = self._load(cache_dir, 'ETag="1"', csv_copy)
+        assert downloaded
+        second, downloaded = self._load(cache_dir, 'ETag="1"', csv_copy)
+        assert not downloaded and second.loaded_from_snapshot
+        third, downloaded = self._load(cache_dir, 'ETag="2"', csv_copy)
+        assert downloaded and third.fingerprint != first.fingerprint
+
+    def test_offline_uses_newest_snapshot(self, csv_copy, tmp_path):
+        cache_dir = tmp_path / "cache"
+        first, _ = self._load(cache_dir, 'ETag="1"', csv_copy)
+        offline, downloaded = self._load(cache_dir, None, csv_copy)
+        assert not downloaded and offline.fingerprint == first.fingerprint
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_offline_ignores_snapshot_of_other_schema(self, csv_copy, tmp_path, lazy):
+        cache_dir = tmp_path / "cache"
+        self._load(cache_dir, 'ETag="1"', csv_copy, normalize=False)
+        snapshots = sorted(cache_dir.iterdir())
+        offline, downloaded = self._load(cache_dir, None, csv_copy, lazy_heavy_columns=lazy)
+        assert downloaded and not offline.loaded_from_snapshot
+        assert set(snapshots) <= set(cache_dir.iterdir())
@@ -3,6 +3,7 @@ Phase 2: User Input
 Collect and validate user preferences: city, price, veg/non-veg.
 """
 
+from .canonical import FragmentationStats, QueryCanonicalizer
 from .user_input import UserInput, UserInputHandler
 
-__all__ = ["UserInput", "UserInputHandler"]
+__all__ = ["UserInput", "UserInputHandler", "QueryCanonicalizer", "FragmentationStats"]
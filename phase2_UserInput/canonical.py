@@ -0,0 +1,173 @@
+"""
+Phase 2 - Query Canonicalization
+Maps equivalent user queries onto one canonical UserInput so downstream
+caches (filter results, LLM responses) see the same key for them: budgets
+snap down to a bucket edge, city names are case-folded and aliased, diet
+and cuisines are normalized.
+"""
+
+import re
+from dataclasses import dataclass, field, replace
+from typing import Iterable, Mapping, Optional
+
+from phase2_UserInput.user_input import DIET_NORMALIZE, UserInput
+
+# Budget bucket edges (Rs. for two). Dataset costs are mostly multiples of 50.
+DEFAULT_BUDGET_BUCKETS = (
+    100, 150, 200, 250, 300, 350, 400, 450, 500, 600, 700, 800, 900,
+    1000, 1200, 1500, 1800, 2000, 2500, 3000, 4000, 5000, 6000,
+)
+
+# Common spellings of listed_in(city) values -> the dataset's (lowercased) name
+DEFAULT_CITY_ALIASES = {
+    "btm layout": "btm",
+    "hsr layout": "hsr",
+    "m g road": "mg road",
+    "m.g. road": "mg road",
+    "mahatma gandhi road": "mg road",
+    "indira nagar": "indiranagar",
+    "j p nagar": "jp nagar",
+    "j.p. nagar": "jp nagar",
+    "jayanagara": "jayanagar",
+    "malleswaram": "malleshwaram",
+    "ecity": "electronic city",
+    "e-city": "electronic city",
+    "white field": "whitefield",
+}
+
+# Distinct raw queries tracked by FragmentationStats before it starts a new window
+DEFAULT_MAX_TRACKED_KEYS = 50_000
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _city_key(city: str) -> str:
+    """Case-folded city name with inner whitespace collapsed."""
+    return _WHITESPACE.sub(" ", city.strip().casefold())
+
+
+@dataclass
+class FragmentationStats:
+    """
+    Distinct query keys seen before and after canonicalization.
+
+    fragmentation_removed is the share of distinct raw queries that
+    canonicalization folded into another one (0 = no effect). To bound
+    memory in long-running servers, distinct keys are counted per window:
+    once max_keys distinct raw keys have been seen, both key sets are
+    cleared and a new window starts (windows counts the completed ones).
+    """
+
+    queries: int = 0
+    window_queries: int = 0  # Queries in the current window
+    windows: int = 0
+    max_keys: int = DEFAULT_MAX_TRACKED_KEYS
+    raw_keys: set = field(default_factory=set, repr=False)
+    canonical_keys: set = field(default_factory=set, repr=False)
+
+    def record(self, raw_key: str, canonical_key: str) -> None:
+        """Count one query with its raw and canonical keys."""
+        if len(self.raw_keys) >= self.max_keys and raw_key not in self.raw_keys:
+            self.raw_keys.clear()
+            self.canonical_keys.clear()
+            self.window_queries = 0
+            self.windows += 1
+        self.queries += 1
+        self.window_queries += 1
+        self.raw_keys.add(raw_key)
+        self.canonical_keys.add(canonical_key)
+
+    @property
+    def distinct_raw(self) -> int:
+        return len(self.raw_keys)
+
+    @property
+    def distinct_canonical(self) -> int:
+        return len(self.canonical_keys)
+
+    @property
+    def fragmentation_removed(self) -> float:
+        if not self.raw_keys:
+            return 0.0
+        return 1 - self.distinct_canonical / self.distinct_raw
+
+    def as_dict(self) -> dict:
+        return {
+            "queries": self.queries,
+            "window_queries": self.window_queries,
+            "windows": self.windows,
+            "distinct_raw": self.distinct_raw,
+            "distinct_canonical": self.distinct_canonical,
+            "fragmentation_removed": round(self.fragmentation_removed, 4),
+        }
+
+
+class QueryCanonicalizer:
+    """
+    Canonicalizes validated UserInput for caching.
+
+    - price: snapped down to the largest bucket edge <= price, so the
+      canonical query never exceeds the user's budget. Prices below the
+      first edge are kept as they are.
+    - city: case-folded, whitespace collapsed, then mapped through aliases.
+    - diet: mapped through DIET_NORMALIZE.
+    - cuisines: case-folded, de-duplicated and sorted.
+    """
+
+    def __init__(
+        self,
+        budget_buckets: Optional[Iterable[int]] = DEFAULT_BUDGET_BUCKETS,
+        city_aliases: Optional[Mapping[str, str]] = None,
+        max_tracked_keys: int = DEFAULT_MAX_TRACKED_KEYS,
+    ):
+        """
+        Args:
+            budget_buckets: Bucket edges in Rs. None or empty keeps exact prices.
+            city_aliases: Alias -> city name, matched case-insensitively.
+                          Defaults to DEFAULT_CITY_ALIASES.
+            max_tracked_keys: Distinct raw queries tracked per stats window.
+        """
+        self.budget_buckets = tuple(sorted(set(budget_buckets or ())))
+        if any(edge < 0 for edge in self.budget_buckets):
+            raise ValueError("Budget buckets must be non-negative")
+        aliases = DEFAULT_CITY_ALIASES if city_aliases is None else city_aliases
+        self.city_aliases = {_city_key(k): _city_key(v) for k, v in aliases.items()}
+        self.stats = FragmentationStats(max_keys=max_tracked_keys)
+
+    def canonical_price(self, price: int) -> int:
+        """Snap price down to its bucket edge."""
+        edge = price
+        for candidate in self.budget_buckets:
+            if candidate > price:
+                break
+            edge = candidate
+        return edge
+
+    def canonical_city(self, city: str) -> str:
+        """Case-folded, de-aliased city name."""
+        key = _city_key(city)
+        return self.city_aliases.get(key, key)
+
+    def canonicalize(self, user_input: UserInput) -> UserInput:
+        """Return the canonical form of user_input and record it in stats."""
+        canonical = replace(
+            user_input,
+            city=self.canonical_city(user_input.city),
+            price=self.canonical_price(user_input.price),
+            diet=DIET_NORMALIZE.get(user_input.diet.strip().lower(), user_input.diet),
+            cuisines=tuple(sorted({c.strip().casefold() for c in user_input.cuisines if c.strip()})),
+        )
+        self.stats.record(self.key(user_input), self.key(canonical))
+        return canonical
+
+    @staticmethod
+    def key(user_input: UserInput) -> str:
+        """Stable string key of user_input (canonicalize first to share keys)."""
+        return "|".join(
+            (
+                f"city={user_input.city}",
+                f"price={user_input.price}",
+                f"diet={user_input.diet}",
+                f"cuisines={','.join(user_input.cuisines)}",
+            )
+        )
@@ -0,0 +1,96 @@
+"""Phase 2 - Tests for QueryCanonicalizer."""
+
+import pytest
+
+from phase2_UserInput.canonical import QueryCanonicalizer
+from phase2_UserInput.user_input import UserInput
+
+
+class TestCanonicalPrice:
+    """Tests for canonical_price()."""
+
+    @pytest.mark.parametrize(
+        "price,expected",
+        [(790, 700), (800, 800), (810, 800), (1199, 1000), (6000, 6000), (9000, 6000)],
+    )
+    def test_snaps_down_to_bucket(self, price: int, expected: int):
+        assert QueryCanonicalizer().canonical_price(price) == expected
+
+    def test_below_first_bucket_unchanged(self):
+        assert QueryCanonicalizer().canonical_price(80) == 80
+
+    def test_custom_buckets(self):
+        canonicalizer = QueryCanonicalizer(budget_buckets=[500, 250, 1000])
+        assert canonicalizer.canonical_price(499) == 250
+        assert canonicalizer.canonical_price(1500) == 1000
+
+    def test_no_buckets_keeps_price(self):
+        assert QueryCanonicalizer(budget_buckets=None).canonical_price(813) == 813
+
+    def test_negative_bucket_raises(self):
+        with pytest.raises(ValueError, match="non-negative"):
+            QueryCanonicalizer(budget_buckets=[-100, 100])
+
+
+class TestCanonicalCity:
+    """Tests for canonical_city()."""
+
+    def test_casefold_and_whitespace(self):
+        assert QueryCanonicalizer().canonical_city("  Koramangala   5th  Block ") == "koramangala 5th block"
+
+    def test_default_aliases(self):
+        canonicalizer = QueryCanonicalizer()
+        assert canonicalizer.canonical_city("BTM Layout") == "btm"
+        assert canonicalizer.canonical_city("Indira Nagar") == "indiranagar"
+
+    def test_custom_aliases(self):
+        canonicalizer = QueryCanonicalizer(city_aliases={"Bengaluru": "Bangalore"})
+        assert canonicalizer.canonical_city("bengaluru") == "bangalore"
+        assert canonicalizer.canonical_city("BTM Layout") == "btm layout"
+
+
+class TestCanonicalize:
+    """Tests for canonicalize() and key()."""
+
+    def test_equivalent_queries_share_key(self):
+        canonicalizer = QueryCanonicalizer()
+        a = canonicalizer.canonicalize(UserInput(city="BTM Layout", price=810, diet="veg", cuisines=("Chinese", "Cafe")))
+        b = canonicalizer.canonicalize(UserInput(city="btm", price=800, diet="veg", cuisines=("cafe", "chinese")))
+        assert a == b
+        assert canonicalizer.key(a) == "city=btm|price=800|diet=veg|cuisines=cafe,chinese"
+
+    def test_diet_kept_apart(self):
+        canonicalizer = QueryCanonicalizer()
+        veg = canonicalizer.canonicalize(UserInput(city="BTM", price=800, diet="veg"))
+        non_veg = canonicalizer.canonicalize(UserInput(city="BTM", price=800, diet="non-veg"))
+        assert canonicalizer.key(veg) != canonicalizer.key(non_veg)
+
+    def test_input_not_modified(self):
+        user_input = UserInput(city="BTM Layout", price=810, diet="veg")
+        QueryCanonicalizer().canonicalize(user_input)
+        assert user_input.city == "BTM Layout"
+        assert user_input.price == 810
+
+    def test_fragmentation_stats(self):
+        canonicalizer = QueryCanonicalizer()
+        for price in (790, 800, 810, 820):
+            canonicalizer.canonicalize(UserInput(city="BTM", price=price, diet="veg"))
+        canonicalizer.canonicalize(UserInput(city="BTM", price=800, diet="veg"))
+        stats = canonicalizer.stats
+        assert stats.queries == 5
+        assert stats.distinct_raw == 4
+        assert stats.distinct_canonical == 2
+        assert stats.as_dict()["fragmentation_removed"] == pytest.approx(0.5)
+
+    def test_empty_stats(self):
+        assert QueryCanonicalizer().stats.fragmentation_removed == 0.0
+
+    def test_tracked_keys_bounded(self):
+        canonicalizer = QueryCanonicalizer(max_tracked_keys=10)
+        for price in range(100, 125):
+            canonicalizer.canonicalize(UserInput(city="BTM", price=price, diet="veg"))
+        stats = canonicalizer.stats
+        assert stats.queries == 25
+        assert stats.windows == 2
+        assert stats.distinct_raw == stats.window_queries == 5
+        assert stats.distinct_canonical == 1
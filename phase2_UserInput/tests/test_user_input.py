@@ -122,6 +122,19 @@ class TestUserInputHandlerParse:
         with pytest.raises(ValueError):
             handler.parse("Banashankari", "600", "vegan")
 
+    def test_parse_cuisines(self):
+        handler = UserInputHandler()
+        assert handler.parse("Banashankari", "600", "veg").cuisines == ()
+        result = handler.parse("Banashankari", "600", "veg", " North Indian, chinese,,north indian ")
+        assert result.cuisines == ("North Indian", "chinese")
+        result = handler.parse("Banashankari", "600", "veg", ["Cafe", " "])
+        assert result.cuisines == ("Cafe",)
+
+    def test_parse_invalid_cuisines_raises(self):
+        handler = UserInputHandler()
+        with pytest.raises(ValueError, match="Cuisine must be a string"):
+            handler.parse("Banashankari", "600", "veg", [1])
+
 
 class TestUserInputDataclass:
     """Tests for UserInput dataclass validation."""
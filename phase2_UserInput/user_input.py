@@ -4,7 +4,7 @@ Collects, validates, and normalizes user preferences: city, price, veg/non-veg.
 """
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, Optional
 
 
 VALID_DIET_VALUES = {"veg", "non-veg", "nonveg", "vegetarian", "non-vegetarian"}
@@ -24,6 +24,7 @@ class UserInput:
     city: str
     price: int  # Approx cost for two people (₹)
     diet: str  # "veg" or "non-veg"
+    cuisines: tuple[str, ...] = ()  # Optional preferred cuisines, used for ranking
 
     def __post_init__(self) -> None:
         if not self.city or not self.city.strip():
@@ -92,15 +93,35 @@ class UserInputHandler:
             )
         return DIET_NORMALIZE[normalized]
 
+    def validate_cuisines(self, cuisines: str | Iterable[str] | None) -> tuple[str, ...]:
+        """
+        Normalize optional cuisine preferences: a comma-separated string or a
+        list of names. Blank and repeated entries are dropped.
+        """
+        if cuisines is None:
+            return ()
+        if isinstance(cuisines, str):
+            cuisines = cuisines.split(",")
+        result = []
+        for cuisine in cuisines:
+            if not isinstance(cuisine, str):
+                raise ValueError(f"Cuisine must be a string, got: {type(cuisine)}")
+            name = cuisine.strip()
+            if name and name.lower() not in (c.lower() for c in result):
+                result.append(name)
+        return tuple(result)
+
     def parse(
         self,
         city: str,
         price: str | int,
         diet: str,
+        cuisines: str | Iterable[str] | None = None,
     ) -> UserInput:
         """Parse and validate all inputs, returning UserInput."""
         return UserInput(
             city=self.validate_city(city),
             price=self.validate_price(price),
             diet=self.validate_diet(diet),
+            cuisines=self.validate_cuisines(cuisines),
         )
@@ -3,6 +3,18 @@ Phase 3: Integration
 Connect user input to data pipeline and prepare context/filters for recommendation.
 """
 
+from .index import RestaurantIndex
 from .integrator import IntegrationContext, Integrator
+from .ranking import CandidateRanker, RankingWeights
+from .result_cache import FilterResultCache
+from .view import FilteredView
 
-__all__ = ["Integrator", "IntegrationContext"]
+__all__ = [
+    "Integrator",
+    "IntegrationContext",
+    "CandidateRanker",
+    "FilteredView",
+    "FilterResultCache",
+    "RankingWeights",
+    "RestaurantIndex",
+]
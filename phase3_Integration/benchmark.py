@@ -0,0 +1,309 @@
+"""
+Phase 3 - Filter benchmark.
+Compares the row-wise reference filter with the vectorized Integrator on raw
+and Phase 1-normalized frames, with and without the per-city index, and
+attribute filters evaluated with DataFrame masks vs the bitmap index, and
+the prompt candidates picked by head(K) vs Top-K ranking, and repeated
+hot queries with and without the filter result cache.
+With --memory it reports peak allocation per request instead.
+
+Usage:
+  python -m phase3_Integration.benchmark                    # synthetic 51,717 rows
+  python -m phase3_Integration.benchmark --rows 200000 --repeat 10
+  python -m phase3_Integration.benchmark --csv path/to/zomato.csv
+  python -m phase3_Integration.benchmark --memory --heavy-chars 2000
+"""
+
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from phase1_DataLoading.bitmap_index import BitmapIndex
+from phase1_DataLoading.normalize import RATING_COL, normalize_dataset
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.integrator import Integrator, _filter_rowwise
+from phase3_Integration.ranking import DEFAULT_TOP_K
+from phase3_Integration.result_cache import FilterResultCache
+
+ZOMATO_ROW_COUNT = 51_717
+
+_CITIES = [
+    "BTM", "Banashankari", "Bannerghatta Road", "Basavanagudi", "Bellandur",
+    "Brigade Road", "Brookefield", "Church Street", "Electronic City", "Frazer Town",
+    "HSR", "Indiranagar", "Jayanagar", "JP Nagar", "Kalyan Nagar", "Kammanahalli",
+    "Koramangala 4th Block", "Koramangala 5th Block", "Koramangala 6th Block",
+    "Koramangala 7th Block", "Lavelle Road", "Malleshwaram", "Marathahalli",
+    "MG Road", "New BEL Road", "Old Airport Road", "Rajajinagar", "Residency Road",
+    "Sarjapur Road", "Whitefield",
+]
+_CUISINES = [
+    "North Indian", "Chinese", "South Indian", "Biryani", "Fast Food", "Cafe",
+    "Desserts", "Continental", "Italian", "Seafood", "Kebab", "Beverages", "Mughlai",
+]
+_DISHES = [
+    "Paneer Tikka", "Masala Dosa", "Chicken Biryani", "Mutton Rogan Josh", "Pasta",
+    "Pizza", "Fish Curry", "Egg Roll", "Gobi Manchurian", "Prawn Fry", "Cold Coffee",
+    "Butter Naan", "Dal Makhani", "Lamb Chops",
+]
+_REST_TYPES = ["Casual Dining", "Quick Bites", "Cafe", "Bar", "Casual Dining, Bar", "Cafe, Dessert Parlor"]
+_LISTED_TYPES = ["Delivery", "Dine-out", "Cafes", "Desserts", "Drinks & nightlife", "Buffet"]
+_COSTS = ["200", "300", "400", "500", "600", "750", "800", "1,000", "1,200", "1,500", "2,500"]
+
+
+def synthetic_restaurants(rows: int = ZOMATO_ROW_COUNT, seed: int = 0) -> pd.DataFrame:
+    """
+    Build a frame shaped like the Zomato dataset's filter columns, including
+    the messy values seen in the real data (padding, case, NaN, 'N/A' costs).
+    """
+    rng = np.random.default_rng(seed)
+
+    def pick(values: list[str], size: int) -> np.ndarray:
+        return np.asarray(values, dtype=object)[rng.integers(0, len(values), size)]
+
+    def join_lists(values: list[str], max_items: int) -> list[str]:
+        counts = rng.integers(1, max_items + 1, rows)
+        return [", ".join(pick(values, n)) for n in counts]
+
+    cities = pick(_CITIES, rows)
+    cities = np.where(rng.random(rows) < 0.05, [f"  {c.upper()} " for c in cities], cities)
+    costs = pick(_COSTS, rows)
+    costs = np.where(rng.random(rows) < 0.01, "N/A", costs)
+    df = pd.DataFrame(
+        {
+            "name": [f"Restaurant {i}" for i in range(rows)],
+            "rate": pick(["4.1/5", "3.8/5", "NEW", "-", "4.5 /5"], rows),
+            "votes": rng.integers(0, 5000, rows),
+            "listed_in(city)": cities,
+            "approx_cost(for two people)": costs,
+            "cuisines": join_lists(_CUISINES, 3),
+            "dish_liked": join_lists(_DISHES, 4),
+            "rest_type": pick(_REST_TYPES, rows),
+            "online_order": pick(["Yes", "No"], rows),
+            "book_table": pick(["Yes", "No", "No", "No"], rows),
+            "listed_in(type)": pick(_LISTED_TYPES, rows),
+        }
+    )
+    for col in ("listed_in(city)", "approx_cost(for two people)", "cuisines", "dish_liked"):
+        df.loc[rng.random(rows) < 0.02, col] = np.nan
+    return df
+
+
+def with_heavy_text(df: pd.DataFrame, chars: int) -> pd.DataFrame:
+    """Add reviews_list / menu_item columns of about chars characters per row."""
+    result = df.copy()
+    result["reviews_list"] = [f"{i}:" + "r" * chars for i in range(len(df))]
+    result["menu_item"] = [f"{i}:" + "m" * chars for i in range(len(df))]
+    return result
+
+
+def _as_object_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store text columns as numpy object arrays. tracemalloc does not see
+    Arrow-backed string buffers, so memory runs use this layout to make every
+    copy visible.
+    """
+    return df.astype({c: object for c in df.columns if df[c].dtype == "str"})
+
+
+def peak_allocation(fn: Callable[[], object]) -> int:
+    """Peak bytes allocated (per tracemalloc) while running fn once, after a warm-up call."""
+    fn()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    """Best-of-repeat wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(df: pd.DataFrame, queries: list[UserInput], repeat: int) -> list[tuple[str, float]]:
+    """Time each filter variant over all queries. Returns (label, ms per query)."""
+    integrator = Integrator()
+    normalized = normalize_dataset(df)
+    indexed = Integrator()
+    indexed.build_index(normalized)
+    variants = [
+        ("row-wise reference", lambda q: _filter_rowwise(df, q)),
+        ("vectorized (raw frame)", lambda q: integrator.filter_by_user_input(df, q)),
+        ("vectorized (normalized)", lambda q: integrator.filter_by_user_input(normalized, q)),
+        ("city index (normalized)", lambda q: indexed.filter_by_user_input(normalized, q)),
+    ]
+    results = []
+    for label, fn in variants:
+        total = _time(lambda: [fn(q) for q in queries], repeat)
+        results.append((label, total / len(queries)))
+    return results
+
+
+def run_attribute_filters(
+    df: pd.DataFrame,
+    queries: list[UserInput],
+    attributes: dict[str, object],
+    repeat: int,
+) -> list[tuple[str, float]]:
+    """Time city index + attribute filters with masks vs bitmaps. Returns (label, ms per query)."""
+    normalized = normalize_dataset(df)
+    masks = Integrator()
+    masks.build_index(normalized)
+    bitmaps = Integrator()
+    bitmaps.build_index(normalized, bitmaps=BitmapIndex.build(normalized))
+    variants = [
+        ("attributes (masks)", lambda q: masks.filter_by_user_input(normalized, q, attributes)),
+        ("attributes (bitmaps)", lambda q: bitmaps.filter_by_user_input(normalized, q, attributes)),
+    ]
+    results = []
+    for label, fn in variants:
+        total = _time(lambda: [fn(q) for q in queries], repeat)
+        results.append((label, total / len(queries)))
+    return results
+
+
+def run_ranking(
+    df: pd.DataFrame, queries: list[UserInput], repeat: int, k: int = DEFAULT_TOP_K
+) -> list[tuple[str, float, float, float]]:
+    """
+    Compare prompt candidates from head(k) and Top-K ranking.
+    Returns (label, ms per query, mean rating, mean votes) of the chosen rows.
+    """
+    normalized = normalize_dataset(df)
+    integrator = Integrator()
+    integrator.build_index(normalized)
+    variants = [
+        (f"head({k})", lambda q: integrator.prepare_context(normalized, q, max_rows=k)),
+        (f"top-{k} ranked", lambda q: integrator.prepare_context(normalized, q, top_k=k)),
+    ]
+    results = []
+    for label, fn in variants:
+        ms = _time(lambda: [fn(q) for q in queries], repeat) / len(queries)
+        chosen = pd.concat([fn(q).filtered_df for q in queries])
+        results.append((label, ms, float(chosen[RATING_COL].mean()), float(chosen["votes"].mean())))
+    return results
+
+
+def hot_queries(df: pd.DataFrame, count: int = 100) -> list[UserInput]:
+    """count distinct (city, budget, diet) queries over the frame's cities."""
+    cities = df["listed_in(city)"].dropna().str.strip().unique()
+    budgets = (300, 400, 500, 600, 800, 1000, 1200, 1500)
+    grid = [
+        UserInput(city=city, price=price, diet=diet)
+        for price in budgets
+        for diet in ("veg", "non-veg")
+        for city in cities
+    ]
+    return grid[:count]
+
+
+def run_result_cache(
+    df: pd.DataFrame, queries: list[UserInput], repeat: int, k: int = DEFAULT_TOP_K
+) -> list[tuple[str, float]]:
+    """Time prepare_context(top_k=k) over already-seen queries, uncached vs cached. Returns (label, ms per query)."""
+    normalized = normalize_dataset(df)
+    uncached = Integrator()
+    uncached.build_index(normalized, version="bench")
+    cached = Integrator(result_cache=FilterResultCache())
+    cached.build_index(normalized, version="bench")
+    for q in queries:
+        cached.select(normalized, q)
+    variants = [
+        ("filter (uncached)", lambda q: uncached.select(normalized, q)),
+        ("filter (cached)", lambda q: cached.select(normalized, q)),
+        (f"top-{k} context (uncached)", lambda q: uncached.prepare_context(normalized, q, top_k=k)),
+        (f"top-{k} context (cached)", lambda q: cached.prepare_context(normalized, q, top_k=k)),
+    ]
+    results = []
+    for label, fn in variants:
+        total = _time(lambda: [fn(q) for q in queries], repeat)
+        results.append((label, total / len(queries)))
+    return results
+
+
+def run_memory(df: pd.DataFrame, queries: list[UserInput], max_rows: int = 50) -> list[tuple[str, int]]:
+    """Worst-case peak allocation per request for each filter path. Returns (label, bytes)."""
+    raw = _as_object_strings(df)
+    normalized = _as_object_strings(normalize_dataset(df))
+    indexed = Integrator()
+    indexed.build_index(normalized)
+    variants = [
+        ("row-wise reference", lambda q: _filter_rowwise(raw, q)),
+        ("filter_by_user_input", lambda q: indexed.filter_by_user_input(normalized, q)),
+        ("select (view)", lambda q: indexed.select(normalized, q)),
+        (f"prepare_context({max_rows} rows)", lambda q: indexed.prepare_context(normalized, q, max_rows=max_rows)),
+    ]
+    return [
+        (label, max(peak_allocation(lambda: fn(q)) for q in queries))
+        for label, fn in variants
+    ]
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Phase 3: Benchmark restaurant filtering")
+    parser.add_argument("--csv", type=Path, default=None, help="Use a real zomato CSV")
+    parser.add_argument("--rows", type=int, default=ZOMATO_ROW_COUNT, help="Synthetic row count")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best is reported)")
+    parser.add_argument("--memory", action="store_true", help="Report peak allocation per request")
+    parser.add_argument("--heavy-chars", type=int, default=0, help="Add heavy text columns of this size (synthetic only)")
+    args = parser.parse_args(argv)
+
+    if args.csv:
+        from phase1_DataLoading.data_loader import ZomatoDataLoader
+
+        df = ZomatoDataLoader(data_path=args.csv, normalize=False).load_from_csv()
+    else:
+        df = synthetic_restaurants(args.rows)
+        if args.heavy_chars:
+            df = with_heavy_text(df, args.heavy_chars)
+
+    cities = df["listed_in(city)"].dropna().str.strip().unique()[:5]
+    queries = [
+        UserInput(city=city, price=price, diet=diet)
+        for city in cities
+        for price in (400, 800)
+        for diet in ("veg", "non-veg")
+    ]
+
+    if args.memory:
+        frame_bytes = _as_object_strings(df).memory_usage(deep=True).sum()
+        print(f"Peak allocation per request over {len(queries)} queries, frame is {frame_bytes / 2**20:,.1f} MiB")
+        for label, peak in run_memory(df, queries):
+            print(f"  {label:<26} {peak / 1024:10.1f} KiB  {peak / frame_bytes:8.2%} of frame")
+        return
+
+    print(f"Filtering {len(df):,} rows, {len(queries)} queries, best of {args.repeat}")
+    results = run(df, queries, args.repeat)
+    baseline = results[0][1]
+    for label, ms in results:
+        print(f"  {label:<26} {ms:9.2f} ms/query  {baseline / ms:7.1f}x")
+
+    print(f"Prompt candidates (k={DEFAULT_TOP_K}):")
+    for label, ms, rating, votes in run_ranking(df, queries, args.repeat):
+        print(f"  {label:<26} {ms:9.2f} ms/query  mean rating {rating:4.2f}  mean votes {votes:7.0f}")
+
+    hot = hot_queries(df)
+    print(f"Repeated hot queries ({len(hot)} distinct, cache warm):")
+    for label, ms in run_result_cache(df, hot, args.repeat):
+        print(f"  {label:<26} {ms:9.3f} ms/query")
+
+    attributes = {"online_order": "Yes", "book_table": "No", "rest_type": ["Cafe", "Bar"]}
+    if all(c in df.columns for c in attributes):
+        print(f"With attribute filters {attributes}:")
+        for label, ms in run_attribute_filters(df, queries, attributes, args.repeat):
+            print(f"  {label:<26} {ms:9.2f} ms/query  {baseline / ms:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
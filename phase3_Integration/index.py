@@ -0,0 +1,178 @@
+"""
+Phase 3 - Restaurant Index
+Per-city partitions over the loaded restaurant frame, built once so
+city-scoped filtering slices straight to the matching rows. Each partition
+also keeps its rows sorted by parsed cost, so budget filters and counts are
+binary searches. An optional Phase 1 BitmapIndex for the same frame rides
+along for attribute filters.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from phase1_DataLoading.bitmap_index import BitmapIndex
+from phase1_DataLoading.normalize import (
+    CITY_KEY_COL,
+    COST_COL,
+    city_key_series,
+    parse_cost_series,
+)
+
+CITY_COL = "listed_in(city)"
+PRICE_COL = "approx_cost(for two people)"
+_EMPTY = np.empty(0, dtype=np.int64)
+_EMPTY_COSTS = np.empty(0, dtype=np.float64)
+
+
+class RestaurantIndex:
+    """
+    Maps normalized city key -> ascending positional indexes into frame.
+
+    If the frame has a cost column, each city also gets a price-sorted view:
+    the positions of rows with a parseable cost ordered by (cost, position)
+    and the matching sorted costs. Rows with unparseable cost are absent
+    from it, as they never pass a budget filter.
+
+    The index keeps a reference to the frame it was built from; Integrator
+    only uses it for that exact frame object.
+    """
+
+    def __init__(
+        self,
+        frame: pd.DataFrame,
+        partitions: dict[str, np.ndarray],
+        version: Optional[str] = None,
+        price_partitions: Optional[dict[str, tuple[np.ndarray, np.ndarray]]] = None,
+        bitmaps: Optional[BitmapIndex] = None,
+    ):
+        """
+        Args:
+            frame: DataFrame the positions refer to.
+            partitions: City key -> int64 positions (ascending).
+            version: Optional dataset version (e.g. ZomatoDataLoader.data_version).
+            price_partitions: Optional city key -> (positions, costs), both
+                              sorted by cost. None if the frame has no costs.
+            bitmaps: Optional BitmapIndex built from the same frame.
+        """
+        self.frame = frame
+        self.partitions = partitions
+        self.version = version
+        self.price_partitions = price_partitions
+        self.bitmaps = bitmaps
+
+    @property
+    def has_prices(self) -> bool:
+        """Whether budget queries can be answered from the index."""
+        return self.price_partitions is not None
+
+    @classmethod
+    def build(
+        cls,
+        df: pd.DataFrame,
+        version: Optional[str] = None,
+        bitmaps: Optional[BitmapIndex] = None,
+    ) -> "RestaurantIndex":
+        """
+        Build the index from a Phase 1 frame (raw or normalized).
+
+        Args:
+            bitmaps: Optional BitmapIndex of df (e.g. ZomatoDataLoader.bitmap_index).
+
+        Raises:
+            ValueError: If the frame has no city column, or bitmaps has a
+                        different row count.
+        """
+        if bitmaps is not None and len(bitmaps) != len(df):
+            raise ValueError(f"Bitmap index covers {len(bitmaps)} rows, frame has {len(df)}")
+        if CITY_KEY_COL in df.columns:
+            keys = df[CITY_KEY_COL]
+        elif CITY_COL in df.columns:
+            keys = city_key_series(df[CITY_COL])
+        else:
+            raise ValueError(f"Cannot index frame without '{CITY_COL}' column")
+
+        codes, uniques = pd.factorize(keys)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        partitions = {
+            str(key): order[bounds[i]:bounds[i + 1]].astype(np.int64)
+            for i, key in enumerate(uniques)
+            if key
+        }
+
+        if COST_COL in df.columns:
+            costs = df[COST_COL].to_numpy(dtype="float64", na_value=np.nan)
+        elif PRICE_COL in df.columns:
+            costs = parse_cost_series(df[PRICE_COL]).to_numpy(dtype="float64", na_value=np.nan)
+        else:
+            costs = None
+        price_partitions = None
+        if costs is not None:
+            price_partitions = {}
+            for key, positions in partitions.items():
+                city_costs = costs[positions]
+                priced = ~np.isnan(city_costs)
+                by_cost = np.argsort(city_costs[priced], kind="stable")
+                price_partitions[key] = (positions[priced][by_cost], city_costs[priced][by_cost])
+        return cls(df, partitions, version=version, price_partitions=price_partitions, bitmaps=bitmaps)
+
+    def positions(self, city: str) -> np.ndarray:
+        """Positions of rows listed in city (case/whitespace-insensitive)."""
+        return self.partitions.get(city.strip().lower(), _EMPTY)
+
+    def positions_within_budget(self, city: str, price: float) -> np.ndarray:
+        """
+        Positions of rows in city with parsed cost <= price, cheapest first.
+        Binary search on the price-sorted partition; returns a view of it
+        (do not modify), with no copy or sort.
+        """
+        positions, costs = self._price_partition(city)
+        end = np.searchsorted(costs, price, side="right")
+        return positions[:end]
+
+    def positions_in_range(self, city: str, low: float, high: float) -> np.ndarray:
+        """Positions of rows in city with low <= parsed cost <= high, cheapest first (a view, as above)."""
+        positions, costs = self._price_partition(city)
+        start = np.searchsorted(costs, low, side="left")
+        end = np.searchsorted(costs, high, side="right")
+        return positions[start:end]
+
+    def count_within_budget(self, city: str, price: float) -> int:
+        """Number of restaurants in city with parsed cost <= price, in O(log n)."""
+        _, costs = self._price_partition(city)
+        return int(np.searchsorted(costs, price, side="right"))
+
+    def budget_histogram(self, city: str, edges: list[float]) -> list[int]:
+        """
+        Restaurant counts per budget bucket for city.
+
+        Args:
+            edges: Ascending bucket edges; bucket i counts costs in
+                   (edges[i], edges[i + 1]], the first bucket also includes
+                   edges[0] itself.
+
+        Returns:
+            len(edges) - 1 counts.
+        """
+        _, costs = self._price_partition(city)
+        cumulative = np.searchsorted(costs, np.asarray(edges, dtype=np.float64), side="right")
+        cumulative[0] = np.searchsorted(costs, edges[0], side="left")
+        return np.diff(cumulative).astype(int).tolist()
+
+    def _price_partition(self, city: str) -> tuple[np.ndarray, np.ndarray]:
+        if self.price_partitions is None:
+            raise ValueError("Index was built from a frame without cost columns")
+        return self.price_partitions.get(city.strip().lower(), (_EMPTY, _EMPTY_COSTS))
+
+    def partition(self, city: str) -> pd.DataFrame:
+        """Rows listed in city, materialized from the positions."""
+        return self.frame.iloc[self.positions(city)]
+
+    def cities(self) -> list[str]:
+        """Normalized city keys in the index, sorted."""
+        return sorted(self.partitions)
+
+    def __len__(self) -> int:
+        return len(self.frame)
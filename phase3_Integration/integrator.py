@@ -4,16 +4,32 @@ Connects user input to data pipeline and prepares filtered context for recommend
 """
 
 import re
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Mapping, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
+from phase1_DataLoading.bitmap_index import VEG_ATTRIBUTE, BitmapIndex, Predicate, match_mask
+from phase1_DataLoading.normalize import (
+    CITY_KEY_COL,
+    COST_COL,
+    IS_VEG_COL,
+    NON_VEG_KEYWORDS,
+    VEG_SOURCE_COLUMNS,
+    city_key_series,
+    non_veg_mask,
+    parse_cost_series,
+)
 from phase2_UserInput.user_input import UserInput
+from phase3_Integration.index import RestaurantIndex
+from phase3_Integration.ranking import CandidateRanker
+from phase3_Integration.result_cache import FilterResultCache, query_key
+from phase3_Integration.view import FilteredView
 
 CITY_COL = "listed_in(city)"
 PRICE_COL = "approx_cost(for two people)"
-NON_VEG_KEYWORDS = {"chicken", "mutton", "fish", "prawn", "egg", "meat", "lamb", "seafood"}
 
 
 def _parse_cost(value: Any) -> int | None:
@@ -35,79 +51,363 @@ def _has_non_veg_content(text: str) -> bool:
     return any(kw in lower for kw in NON_VEG_KEYWORDS)
 
 
+def _filter_rowwise(df: pd.DataFrame, user_input: UserInput) -> pd.DataFrame:
+    """
+    Row-wise reference filter (per-row cost parsing and veg checks).
+
+    Superseded by Integrator.filter_by_user_input; kept as the oracle for the
+    equivalence tests and as the baseline in phase3_Integration.benchmark.
+    """
+    if df.empty:
+        return df.copy()
+
+    result = df.copy()
+
+    if CITY_COL in result.columns:
+        result = result[
+            result[CITY_COL].fillna("").str.strip().str.lower()
+            == user_input.city.strip().lower()
+        ]
+
+    if PRICE_COL in result.columns:
+        result = result.copy()
+        result["_parsed_cost"] = result[PRICE_COL].apply(_parse_cost)
+        result = result[
+            (result["_parsed_cost"].notna())
+            & (result["_parsed_cost"] <= user_input.price)
+        ].drop(columns=["_parsed_cost"], errors="ignore")
+
+    if user_input.diet == "veg":
+        def is_veg(row: pd.Series) -> bool:
+            cuisines = row.get("cuisines", "")
+            dishes = row.get("dish_liked", "")
+            return not (_has_non_veg_content(cuisines) or _has_non_veg_content(dishes))
+
+        result = result[result.apply(is_veg, axis=1)]
+
+    return result.reset_index(drop=True)
+
+
 @dataclass
 class IntegrationContext:
-    """Filtered context ready for Phase 4 recommendation."""
+    """
+    Filtered context ready for Phase 4 recommendation.
+
+    filtered_df holds all matches, or only the first max_rows / best top_k
+    of them when prepare_context was asked for a bounded context; view then
+    covers the full match set without copying it.
+    """
 
     filtered_df: pd.DataFrame
     user_input: UserInput
     total_matches: int
+    view: Optional[FilteredView] = None
 
 
 class Integrator:
     """
     Integrates Phase 1 (data) and Phase 2 (user input).
     Filters restaurants by city, price, and diet; prepares context for Phase 4.
+
+    With a RestaurantIndex (see build_index), filtering the indexed frame
+    starts from that city's partition instead of scanning every row, and
+    diet/attribute predicates are answered from its bitmaps when present.
+
+    With a FilterResultCache, results for the indexed frame are cached as
+    position arrays keyed by the index version and the query; a repeated
+    query skips filtering and Top-K ranking entirely. Frames without a versioned index are
+    never cached.
     """
 
-    def filter_by_user_input(self, df: pd.DataFrame, user_input: UserInput) -> pd.DataFrame:
+    def __init__(
+        self,
+        index: Optional[RestaurantIndex] = None,
+        ranker: Optional[CandidateRanker] = None,
+        result_cache: Optional[FilterResultCache] = None,
+    ):
+        """
+        Args:
+            index: Optional prebuilt index for the frame that will be filtered.
+            ranker: Ranker used by prepare_context(top_k=...). Defaults to
+                    CandidateRanker().
+            result_cache: Optional cache of filter results. Pass canonical
+                          queries (phase2_UserInput.canonical) to share entries.
+        """
+        self.index = index
+        self.ranker = ranker or CandidateRanker()
+        self.result_cache = result_cache
+
+    def build_index(
+        self,
+        df: pd.DataFrame,
+        version: Optional[str] = None,
+        bitmaps: Optional[BitmapIndex] = None,
+    ) -> RestaurantIndex:
+        """
+        Build and attach a RestaurantIndex for df. Returns the index.
+        Cached filter results of the previous frame are dropped.
+        """
+        self.index = RestaurantIndex.build(df, version=version, bitmaps=bitmaps)
+        if self.result_cache is not None:
+            self.result_cache.invalidate()
+        return self.index
+
+    def filter_by_user_input(
+        self,
+        df: pd.DataFrame,
+        user_input: UserInput,
+        attributes: Optional[Mapping[str, Predicate]] = None,
+    ) -> pd.DataFrame:
         """
         Filter dataframe by user preferences.
 
+        Filtering is vectorized: the city match narrows the frame to
+        candidate positions first and the cost/diet checks only look at
+        those. Frames normalized by Phase 1 (phase1_DataLoading.normalize)
+        reuse their precomputed columns; raw frames are parsed on the fly
+        with the same vectorized parsers.
+
         Args:
             df: Restaurant dataframe from Phase 1.
             user_input: User preferences from Phase 2.
+            attributes: Optional categorical filters, column -> value or list
+                        of values, e.g. {"online_order": "Yes",
+                        "rest_type": ["Cafe", "Bar"]} (see
+                        phase1_DataLoading.bitmap_index).
 
         Returns:
             Filtered DataFrame.
         """
+        return self.select(df, user_input, attributes).to_frame()
+
+    def select(
+        self,
+        df: pd.DataFrame,
+        user_input: UserInput,
+        attributes: Optional[Mapping[str, Predicate]] = None,
+    ) -> FilteredView:
+        """
+        Copy-free variant of filter_by_user_input.
+
+        Works on positional indexes only and returns a FilteredView over df;
+        no row data is copied until the caller materializes (part of) it.
+
+        Args:
+            df: Restaurant dataframe from Phase 1.
+            user_input: User preferences from Phase 2.
+            attributes: Optional categorical filters (see filter_by_user_input).
+
+        Returns:
+            FilteredView of the matching rows.
+        """
         if df.empty:
-            return df.copy()
-
-        result = df.copy()
-
-        # Filter by city (case-insensitive)
-        if CITY_COL in result.columns:
-            result = result[
-                result[CITY_COL].fillna("").str.strip().str.lower()
-                == user_input.city.strip().lower()
-            ]
-
-        # Filter by price (cost <= user price)
-        if PRICE_COL in result.columns:
-            result = result.copy()
-            result["_parsed_cost"] = result[PRICE_COL].apply(_parse_cost)
-            result = result[
-                (result["_parsed_cost"].notna())
-                & (result["_parsed_cost"] <= user_input.price)
-            ].drop(columns=["_parsed_cost"], errors="ignore")
-
-        # Filter by diet
+            return FilteredView(df, np.empty(0, dtype=np.int64))
+        version = self._cache_version(df)
+        if version is None:
+            return FilteredView(df, self._select_positions(df, user_input, attributes))
+        key = query_key(user_input, attributes)
+        positions = self.result_cache.get(version, key)
+        if positions is None:
+            positions = self.result_cache.put(
+                version, key, self._select_positions(df, user_input, attributes)
+            )
+        return FilteredView(df, positions)
+
+    def _top_k(
+        self,
+        view: FilteredView,
+        user_input: UserInput,
+        attributes: Optional[Mapping[str, Predicate]],
+        k: int,
+    ) -> FilteredView:
+        """self.ranker.top_k(view), cached like filter results (keyed by k and the ranker weights)."""
+        version = self._cache_version(view.frame)
+        if version is None:
+            return self.ranker.top_k(view, user_input, k)
+        key = f"{query_key(user_input, attributes)}|top_k={k}|{self.ranker.weights!r}"
+        positions = self.result_cache.get(version, key)
+        if positions is None:
+            positions = self.result_cache.put(
+                version, key, self.ranker.top_k(view, user_input, k).positions
+            )
+        return FilteredView(view.frame, positions)
+
+    def _cache_version(self, df: pd.DataFrame) -> Optional[str]:
+        """Version under which results for df may be cached, or None if they may not."""
+        if self.result_cache is None or self.index is None or self.index.frame is not df:
+            return None
+        return self.index.version
+
+    def _select_positions(
+        self,
+        df: pd.DataFrame,
+        user_input: UserInput,
+        attributes: Optional[Mapping[str, Predicate]] = None,
+    ) -> np.ndarray:
+        """Return positional indexes (ascending) of rows matching user_input."""
+        city = user_input.city.strip().lower()
+        indexed = self.index is not None and self.index.frame is df
+        budget_done = indexed and self.index.has_prices
+        if budget_done:
+            # City and budget in one binary search on the price-sorted partition
+            positions = self.index.positions_within_budget(city, user_input.price)
+        else:
+            positions = self._city_positions(df, city)
+            # Filter by price (cost <= user price); unparseable costs never match
+            costs = self._costs(df, positions)
+            if costs is not None:
+                positions = positions[costs <= user_input.price]
+
+        # Filter by diet and attributes: one AND of packed bitmaps if indexed
+        predicates = dict(attributes or {})
         if user_input.diet == "veg":
-            # Exclude rows with non-veg keywords in cuisines or dish_liked
-            def is_veg(row: pd.Series) -> bool:
-                cuisines = row.get("cuisines", "")
-                dishes = row.get("dish_liked", "")
-                return not (_has_non_veg_content(cuisines) or _has_non_veg_content(dishes))
+            predicates[VEG_ATTRIBUTE] = "yes"
+        bitmaps = self.index.bitmaps if indexed else None
+        if predicates and bitmaps is not None and set(predicates) <= set(bitmaps.columns()):
+            positions = positions[bitmaps.contains(bitmaps.select(predicates), positions)]
+        else:
+            if user_input.diet == "veg":
+                positions = positions[self._veg_mask(df, positions)]
+
+            if attributes:
+                missing = [c for c in attributes if c not in df.columns]
+                if missing:
+                    raise ValueError(f"Cannot filter on missing columns: {missing}")
+                positions = positions[match_mask(df[list(attributes)].iloc[positions], attributes)]
 
-            result = result[result.apply(is_veg, axis=1)]
+        # The budget search yields positions cheapest first; views keep dataset
+        # order (head(max_rows) and ranking ties depend on it), so sort the
+        # survivors once here - the result cache then keeps them sorted.
+        return np.sort(positions) if budget_done else positions
 
-        return result.reset_index(drop=True)
+    def _city_positions(self, df: pd.DataFrame, city: str) -> np.ndarray:
+        """Positional indexes (ascending) of the rows of city (normalized key)."""
+        if self.index is not None and self.index.frame is df:
+            return self.index.positions(city)
+        if CITY_KEY_COL in df.columns:
+            return np.flatnonzero((df[CITY_KEY_COL] == city).to_numpy(dtype=bool))
+        if CITY_COL in df.columns:
+            # Normalize the few distinct spellings, not every row
+            codes, uniques = pd.factorize(df[CITY_COL])
+            wanted = np.flatnonzero((city_key_series(pd.Series(uniques)) == city).to_numpy(dtype=bool))
+            return np.flatnonzero(np.isin(codes, wanted))
+        return np.arange(len(df))
+
+    @staticmethod
+    def _costs(df: pd.DataFrame, positions: np.ndarray) -> Optional[np.ndarray]:
+        """Cost for two of the rows at positions (NaN if unparseable), or None without a cost column."""
+        if COST_COL in df.columns:
+            return df[COST_COL].take(positions).to_numpy(dtype="float64", na_value=np.nan)
+        if PRICE_COL in df.columns:
+            return parse_cost_series(df[PRICE_COL].iloc[positions]).to_numpy(dtype="float64", na_value=np.nan)
+        return None
+
+    def _veg_mask(self, df: pd.DataFrame, positions: np.ndarray) -> np.ndarray:
+        """True for the vegetarian rows among positions."""
+        bitmaps = self.index.bitmaps if self.index is not None and self.index.frame is df else None
+        if bitmaps is not None and VEG_ATTRIBUTE in bitmaps.columns():
+            return bitmaps.contains(bitmaps.select({VEG_ATTRIBUTE: "yes"}), positions)
+        if IS_VEG_COL in df.columns:
+            return df[IS_VEG_COL].take(positions).to_numpy(dtype=bool)
+        sources = [c for c in VEG_SOURCE_COLUMNS if c in df.columns]
+        return ~non_veg_mask(df[sources].iloc[positions]).to_numpy(dtype=bool)
+
+    def select_batch(self, df: pd.DataFrame, user_inputs: Sequence[UserInput]) -> list[FilteredView]:
+        """
+        select() for many queries, with one filter pass per city.
+
+        Queries are grouped by city; each city's rows, their costs and (if
+        any query is veg) their veg flags are computed once, and every query
+        of the city then only compares costs against its budget. Results are
+        the same as select()'s, in the order of user_inputs, and are cached
+        like them.
+        """
+        views: list[Optional[FilteredView]] = [None] * len(user_inputs)
+        if df.empty:
+            return [FilteredView(df, np.empty(0, dtype=np.int64)) for _ in user_inputs]
+        version = self._cache_version(df)
+        by_city: dict[str, list[int]] = defaultdict(list)
+        for i, user_input in enumerate(user_inputs):
+            positions = None if version is None else self.result_cache.get(version, query_key(user_input))
+            if positions is not None:
+                views[i] = FilteredView(df, positions)
+            else:
+                by_city[user_input.city.strip().lower()].append(i)
+
+        for city, members in by_city.items():
+            city_positions = self._city_positions(df, city)
+            costs = self._costs(df, city_positions)
+            veg = None
+            if any(user_inputs[i].diet == "veg" for i in members):
+                veg = self._veg_mask(df, city_positions)
+            for i in members:
+                user_input = user_inputs[i]
+                keep = np.ones(len(city_positions), dtype=bool) if costs is None else costs <= user_input.price
+                if user_input.diet == "veg":
+                    keep &= veg
+                positions = city_positions[keep]
+                if version is not None:
+                    positions = self.result_cache.put(version, query_key(user_input), positions)
+                views[i] = FilteredView(df, positions)
+        return views
+
+    def prepare_contexts(
+        self,
+        df: pd.DataFrame,
+        user_inputs: Sequence[UserInput],
+        top_k: Optional[int] = None,
+    ) -> list[IntegrationContext]:
+        """
+        prepare_context() for many queries, filtering through select_batch()
+        (one pass per city). Contexts are returned in the order of user_inputs.
+        """
+        contexts = []
+        for user_input, view in zip(user_inputs, self.select_batch(df, user_inputs)):
+            selected = view if top_k is None else self._top_k(view, user_input, None, top_k)
+            contexts.append(
+                IntegrationContext(
+                    filtered_df=selected.to_frame(),
+                    user_input=user_input,
+                    total_matches=len(view),
+                    view=view,
+                )
+            )
+        return contexts
 
-    def prepare_context(self, df: pd.DataFrame, user_input: UserInput) -> IntegrationContext:
+    def prepare_context(
+        self,
+        df: pd.DataFrame,
+        user_input: UserInput,
+        attributes: Optional[Mapping[str, Predicate]] = None,
+        max_rows: Optional[int] = None,
+        top_k: Optional[int] = None,
+    ) -> IntegrationContext:
         """
         Filter data and build context for Phase 4 recommendation.
 
         Args:
             df: Restaurant dataframe from Phase 1.
             user_input: User preferences from Phase 2.
+            attributes: Optional categorical filters (see filter_by_user_input).
+            max_rows: If set, only materialize the first max_rows matches
+                      (e.g. the rows that fit in the prompt);
+                      total_matches still counts all of them.
+            top_k: If set, rank all matches with self.ranker and materialize
+                   the best top_k, best first (takes precedence over max_rows).
 
         Returns:
             IntegrationContext with filtered DataFrame and metadata.
         """
-        filtered = self.filter_by_user_input(df, user_input)
+        view = self.select(df, user_input, attributes)
+        if top_k is not None:
+            filtered = self._top_k(view, user_input, attributes, top_k).to_frame()
+        elif max_rows is not None:
+            filtered = view.head(max_rows)
+        else:
+            filtered = view.to_frame()
         return IntegrationContext(
             filtered_df=filtered,
             user_input=user_input,
-            total_matches=len(filtered),
+            total_matches=len(view),
+            view=view,
         )
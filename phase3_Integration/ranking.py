@@ -0,0 +1,140 @@
+"""
+Phase 3 - Candidate Ranking
+Scores filtered restaurants with a vectorized formula (rating, log votes,
+budget closeness, cuisine match) and keeps the top K, so the prompt gets the
+best candidates rather than the first rows in file order.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from phase1_DataLoading.normalize import (
+    COST_COL,
+    PRICE_COL,
+    RATE_COL,
+    RATING_COL,
+    VOTES_COL,
+    parse_cost_series,
+    parse_rating_series,
+    parse_votes_series,
+)
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.view import FilteredView
+
+DEFAULT_TOP_K = 50
+MAX_RATING = 5.0
+# Rating assumed for 'NEW' / unrated restaurants.
+UNRATED_RATING = 3.0
+CUISINES_COL = "cuisines"
+
+
+@dataclass
+class RankingWeights:
+    """Weights of the score components (each component is in [0, 1])."""
+
+    rating: float = 1.0
+    votes: float = 0.5
+    budget: float = 0.3
+    cuisine: float = 1.0
+
+
+def _column(view: FilteredView, derived: str, source: str, parse) -> Optional[np.ndarray]:
+    """Float values of a normalized column, or of its parsed source column."""
+    if derived in view.columns:
+        values = view.column(derived)
+        if values.dtype != object and not pd.api.types.is_string_dtype(values):
+            return values.to_numpy(dtype="float64", na_value=np.nan)
+        return parse(values).to_numpy(dtype="float64", na_value=np.nan)
+    if source in view.columns:
+        return parse(view.column(source)).to_numpy(dtype="float64", na_value=np.nan)
+    return None
+
+
+class CandidateRanker:
+    """
+    Ranks filtered restaurants for the prompt.
+
+    score = w.rating  * rating / 5                  (unrated -> UNRATED_RATING)
+          + w.votes   * log1p(votes) / log1p(max votes among candidates)
+          + w.budget  * (1 - |price - cost| / price)  (clipped to [0, 1])
+          + w.cuisine * share of preferred cuisines the restaurant serves
+    """
+
+    def __init__(self, weights: Optional[RankingWeights] = None):
+        """
+        Args:
+            weights: Component weights. Defaults to RankingWeights().
+        """
+        self.weights = weights or RankingWeights()
+
+    def score(self, view: FilteredView, user_input: UserInput) -> np.ndarray:
+        """
+        Score every row of view. Reads only the columns the formula needs.
+
+        Returns:
+            float64 array aligned with view.positions.
+        """
+        n = len(view)
+        w = self.weights
+        scores = np.zeros(n, dtype=np.float64)
+
+        rating = _column(view, RATING_COL, RATE_COL, parse_rating_series)
+        if rating is not None:
+            scores += w.rating * np.nan_to_num(rating, nan=UNRATED_RATING) / MAX_RATING
+
+        votes = _column(view, VOTES_COL, VOTES_COL, parse_votes_series)
+        if votes is not None and n:
+            log_votes = np.log1p(np.clip(np.nan_to_num(votes, nan=0.0), 0, None))
+            top = log_votes.max()
+            if top > 0:
+                scores += w.votes * log_votes / top
+
+        cost = _column(view, COST_COL, PRICE_COL, parse_cost_series)
+        if cost is not None:
+            if user_input.price > 0:
+                closeness = 1 - np.abs(user_input.price - cost) / user_input.price
+            else:
+                closeness = (cost == 0).astype(np.float64)
+            scores += w.budget * np.clip(np.nan_to_num(closeness, nan=0.0), 0, 1)
+
+        if user_input.cuisines and CUISINES_COL in view.columns:
+            served = view.column(CUISINES_COL).fillna("").astype(str).str.lower()
+            matches = np.zeros(n, dtype=np.float64)
+            for cuisine in user_input.cuisines:
+                matches += served.str.contains(cuisine.strip().lower(), regex=False).to_numpy(dtype=bool)
+            scores += w.cuisine * matches / len(user_input.cuisines)
+
+        return scores
+
+    def top_k(self, view: FilteredView, user_input: UserInput, k: int = DEFAULT_TOP_K) -> FilteredView:
+        """
+        Best k rows of view, ordered by descending score (ties keep match order).
+
+        Returns:
+            FilteredView over the same frame with the chosen positions.
+        """
+        order = top_k_order(self.score(view, user_input), k)
+        return FilteredView(view.frame, view.positions[order])
+
+
+def top_k_order(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indexes of the k highest scores, highest first; ties keep index order.
+
+    Same result as np.argsort(-scores, kind="stable")[:k], but selects with
+    np.partition in O(n) and only sorts the k winners.
+    """
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < n:
+        kth = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[: k - len(above)]
+        chosen = np.concatenate([above, ties])
+    else:
+        chosen = np.arange(n)
+    return chosen[np.lexsort((chosen, -scores[chosen]))]
@@ -0,0 +1,134 @@
+"""
+Phase 3 - Filter Result Cache
+LRU of filter results stored as positional index arrays (not DataFrame
+copies), keyed by dataset version and query. Bounded by entry count and
+total array bytes; a new dataset version drops every older entry.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+import numpy as np
+
+from phase1_DataLoading.bitmap_index import Predicate, value_key
+from phase2_UserInput.canonical import QueryCanonicalizer
+from phase2_UserInput.user_input import UserInput
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+def query_key(user_input: UserInput, attributes: Optional[Mapping[str, Predicate]] = None) -> str:
+    """
+    Cache key of a filter query. Pass canonical UserInput (see
+    phase2_UserInput.canonical) so equivalent queries share a key.
+    """
+    key = QueryCanonicalizer.key(user_input)
+    if attributes:
+        parts = []
+        for column in sorted(attributes):
+            value = attributes[column]
+            values = [value] if isinstance(value, (str, bool)) else value
+            parts.append(f"{column}={','.join(sorted({value_key(v) for v in values}))}")
+        key += "|" + "|".join(parts)
+    return key
+
+
+@dataclass
+class FilterCacheStats:
+    """Counters of a FilterResultCache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class FilterResultCache:
+    """
+    LRU of query -> matching positions for one dataset version at a time.
+
+    Stored arrays are made read-only, so views built from a cached result
+    cannot corrupt it. Safe to share between threads.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            max_entries: Maximum number of cached queries.
+            max_bytes: Maximum total size of the cached position arrays.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.version: Optional[str] = None
+        self.nbytes = 0
+        self.stats = FilterCacheStats()
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version: str, key: str) -> Optional[np.ndarray]:
+        """Return the cached positions for key under version, or None."""
+        with self._lock:
+            positions = self._entries.get(key) if version == self.version else None
+            if positions is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return positions
+
+    def put(self, version: str, key: str, positions: np.ndarray) -> np.ndarray:
+        """
+        Store positions for key under version; entries of any other version
+        are dropped first. Returns the (read-only) stored array.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        positions.flags.writeable = False
+        with self._lock:
+            if version != self.version:
+                self._drop_all()
+                self.version = version
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            if positions.nbytes > self.max_bytes:
+                return positions
+            self._entries[key] = positions
+            self.nbytes += positions.nbytes
+            while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+                self.stats.evictions += 1
+            return positions
+
+    def invalidate(self) -> None:
+        """Drop all entries (e.g. after the dataset was reloaded)."""
+        with self._lock:
+            self._drop_all()
+            self.version = None
+
+    def _drop_all(self) -> None:
+        """Clear entries (caller holds the lock)."""
+        if self._entries:
+            self.stats.invalidations += 1
+        self._entries.clear()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
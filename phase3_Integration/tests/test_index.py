@@ -0,0 +1,201 @@
+"""Phase 3 - Tests for RestaurantIndex."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from phase1_DataLoading.bitmap_index import BitmapIndex
+from phase1_DataLoading.normalize import normalize_dataset, parse_cost_series
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.benchmark import synthetic_restaurants
+from phase3_Integration.index import RestaurantIndex
+from phase3_Integration.integrator import Integrator
+
+
+@pytest.fixture
+def sample_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": ["A", "B", "C", "D", "E"],
+            "listed_in(city)": ["Banashankari", " indiranagar", "BANASHANKARI", np.nan, "Indiranagar"],
+            "approx_cost(for two people)": ["600", "800", "400", "300", "1,000"],
+            "cuisines": ["North Indian", "Chinese", "South Indian", "Cafe", "Seafood"],
+            "dish_liked": ["Paneer", "Chicken", "Dosa", "Tea", "Fish"],
+        }
+    )
+
+
+class TestRestaurantIndexBuild:
+    """Tests for RestaurantIndex.build and lookups."""
+
+    @pytest.mark.parametrize("normalized", [False, True])
+    def test_partitions_by_normalized_city(self, sample_df, normalized):
+        df = normalize_dataset(sample_df) if normalized else sample_df
+        index = RestaurantIndex.build(df, version="v1")
+        assert index.cities() == ["banashankari", "indiranagar"]
+        assert index.positions("Banashankari").tolist() == [0, 2]
+        assert index.positions("  INDIRANAGAR ").tolist() == [1, 4]
+        assert index.version == "v1"
+        assert len(index) == 5
+
+    def test_unknown_city_is_empty(self, sample_df):
+        index = RestaurantIndex.build(sample_df)
+        assert index.positions("Nowhere").tolist() == []
+        assert index.partition("Nowhere").empty
+
+    def test_partition_returns_rows(self, sample_df):
+        index = RestaurantIndex.build(sample_df)
+        assert list(index.partition("indiranagar")["name"]) == ["B", "E"]
+
+    def test_requires_city_column(self):
+        with pytest.raises(ValueError, match="listed_in"):
+            RestaurantIndex.build(pd.DataFrame({"name": ["A"]}))
+
+    def test_covers_every_city_row(self):
+        df = synthetic_restaurants(rows=2_000, seed=3)
+        index = RestaurantIndex.build(df)
+        all_positions = np.sort(np.concatenate(list(index.partitions.values())))
+        expected = np.flatnonzero(df["listed_in(city)"].notna().to_numpy())
+        assert all_positions.tolist() == expected.tolist()
+        for positions in index.partitions.values():
+            assert np.all(np.diff(positions) > 0)
+
+
+class TestIntegratorWithIndex:
+    """Integrator uses the index for its frame only."""
+
+    @pytest.mark.parametrize("diet", ["veg", "non-veg"])
+    @pytest.mark.parametrize("city", ["BTM", "whitefield", "Nowhere"])
+    def test_same_results_as_scan(self, city, diet):
+        df = normalize_dataset(synthetic_restaurants(rows=2_000, seed=5))
+        user_input = UserInput(city=city, price=800, diet=diet)
+        expected = Integrator().filter_by_user_input(df, user_input)
+        indexed = Integrator()
+        indexed.build_index(df)
+        pd.testing.assert_frame_equal(indexed.filter_by_user_input(df, user_input), expected)
+
+    def test_index_skips_city_scan(self, sample_df):
+        integrator = Integrator()
+        integrator.build_index(sample_df)
+        with patch("phase3_Integration.integrator.city_key_series", side_effect=AssertionError):
+            result = integrator.filter_by_user_input(
+                sample_df, UserInput(city="Banashankari", price=1000, diet="veg")
+            )
+        assert list(result["name"]) == ["A", "C"]
+
+    def test_index_ignored_for_other_frames(self, sample_df):
+        integrator = Integrator()
+        integrator.build_index(sample_df)
+        other = sample_df.iloc[::-1].reset_index(drop=True)
+        result = integrator.filter_by_user_input(
+            other, UserInput(city="Banashankari", price=1000, diet="non-veg")
+        )
+        assert list(result["name"]) == ["C", "A"]
+
+
+class TestPriceIndex:
+    """Tests for the price-sorted partitions."""
+
+    @pytest.fixture
+    def priced_df(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "name": list("ABCDEFG"),
+                "listed_in(city)": ["BTM", "BTM", "BTM", "BTM", "BTM", "BTM", "HSR"],
+                "approx_cost(for two people)": ["800", "300", "N/A", "1,000", "300", "500", "100"],
+            }
+        )
+
+    @pytest.mark.parametrize("normalized", [False, True])
+    def test_positions_within_budget(self, priced_df, normalized):
+        df = normalize_dataset(priced_df) if normalized else priced_df
+        index = RestaurantIndex.build(df)
+        assert index.has_prices
+        assert index.positions_within_budget("btm", 299).tolist() == []
+        assert sorted(index.positions_within_budget("btm", 300)) == [1, 4]
+        assert sorted(index.positions_within_budget("btm", 800)) == [0, 1, 4, 5]
+        assert sorted(index.positions_within_budget("btm", 10_000)) == [0, 1, 3, 4, 5]
+        assert index.positions_within_budget("nowhere", 10_000).tolist() == []
+        assert index.positions_within_budget("btm", 800).tolist() == [1, 4, 5, 0]  # cheapest first
+
+    def test_count_and_range(self, priced_df):
+        index = RestaurantIndex.build(priced_df)
+        assert index.count_within_budget("BTM", 500) == 3
+        assert index.count_within_budget("BTM", 10_000) == 5
+        assert index.count_within_budget("Nowhere", 500) == 0
+        assert sorted(index.positions_in_range("BTM", 300, 800)) == [0, 1, 4, 5]
+        assert sorted(index.positions_in_range("BTM", 301, 999)) == [0, 5]
+
+    def test_budget_histogram(self, priced_df):
+        index = RestaurantIndex.build(priced_df)
+        assert index.budget_histogram("BTM", [300, 500, 1000]) == [3, 2]
+        assert index.budget_histogram("BTM", [0, 299, 10_000]) == [0, 5]
+        assert sum(index.budget_histogram("BTM", [0, 400, 800, 5000])) == 5
+
+    def test_without_cost_column(self):
+        index = RestaurantIndex.build(pd.DataFrame({"listed_in(city)": ["BTM"]}))
+        assert not index.has_prices
+        with pytest.raises(ValueError, match="cost"):
+            index.count_within_budget("BTM", 500)
+
+    @pytest.mark.parametrize("price", [0, 250, 500, 800, 1200, 2500, 10_000])
+    def test_matches_linear_scan(self, price):
+        df = synthetic_restaurants(rows=3_000, seed=11)
+        index = RestaurantIndex.build(df)
+        costs = parse_cost_series(df["approx_cost(for two people)"])
+        for city in index.cities():
+            expected = [p for p in index.positions(city) if pd.notna(costs[p]) and costs[p] <= price]
+            assert sorted(index.positions_within_budget(city, price)) == expected
+            assert index.count_within_budget(city, price) == len(expected)
+
+
+class TestBitmapFilters:
+    """Diet and attribute filters answered from the bitmap index."""
+
+    ATTRIBUTES = [
+        None,
+        {"online_order": "Yes"},
+        {"book_table": "no", "rest_type": ["Cafe", "Bar"]},
+        {"listed_in(type)": "Delivery", "online_order": ["yes", "no"]},
+    ]
+
+    @pytest.fixture
+    def df(self) -> pd.DataFrame:
+        return normalize_dataset(synthetic_restaurants(rows=2_000, seed=13))
+
+    @pytest.mark.parametrize("attributes", ATTRIBUTES)
+    @pytest.mark.parametrize("diet", ["veg", "non-veg"])
+    def test_same_results_as_masks(self, df, diet, attributes):
+        user_input = UserInput(city="BTM", price=1200, diet=diet)
+        expected = Integrator().filter_by_user_input(df, user_input, attributes)
+        indexed = Integrator()
+        indexed.build_index(df, bitmaps=BitmapIndex.build(df))
+        pd.testing.assert_frame_equal(indexed.filter_by_user_input(df, user_input, attributes), expected)
+
+    def test_masks_match_row_semantics(self, df):
+        result = Integrator().filter_by_user_input(
+            df, UserInput(city="BTM", price=1200, diet="non-veg"), {"online_order": "yes", "rest_type": "bar"}
+        )
+        assert len(result) > 0
+        assert (result["online_order"] == "Yes").all()
+        assert result["rest_type"].str.contains("Bar").all()
+
+    def test_bitmaps_skip_veg_scan(self, df):
+        frame = df.drop(columns=["is_veg"])
+        user_input = UserInput(city="BTM", price=1200, diet="veg")
+        expected = Integrator().filter_by_user_input(frame, user_input)
+        integrator = Integrator()
+        integrator.build_index(frame, bitmaps=BitmapIndex.build(frame))
+        with patch("phase3_Integration.integrator.non_veg_mask", side_effect=AssertionError):
+            result = integrator.filter_by_user_input(frame, user_input)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_unknown_attribute_column(self, df):
+        with pytest.raises(ValueError, match="missing columns"):
+            Integrator().filter_by_user_input(df, UserInput(city="BTM", price=500, diet="veg"), {"wifi": "yes"})
+
+    def test_mismatched_bitmaps_rejected(self, df):
+        with pytest.raises(ValueError, match="rows"):
+            Integrator().build_index(df, bitmaps=BitmapIndex.build(df.head(10)))
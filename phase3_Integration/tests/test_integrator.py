@@ -5,8 +5,11 @@ from pathlib import Path
 import pandas as pd
 import pytest
 
+from phase1_DataLoading.bitmap_index import BitmapIndex
+from phase1_DataLoading.normalize import normalize_dataset
 from phase2_UserInput.user_input import UserInput
 from phase3_Integration.integrator import IntegrationContext, Integrator, _has_non_veg_content, _parse_cost
+from phase3_Integration.result_cache import FilterResultCache
 
 
 @pytest.fixture
@@ -142,3 +145,77 @@ class TestIntegratorPrepareContext:
         context = integrator.prepare_context(sample_df, user_input)
         assert context.total_matches == 1
         assert context.filtered_df.iloc[0]["name"] == "Restaurant D"
+
+
+class TestIntegratorNormalizedFrames:
+    """Frames normalized in Phase 1 give the same results via precomputed columns."""
+
+    @pytest.mark.parametrize(
+        "city,price,diet",
+        [
+            ("Banashankari", 1000, "non-veg"),
+            ("Banashankari", 500, "non-veg"),
+            (" banashankari ", 600, "veg"),
+            ("Indiranagar", 1000, "veg"),
+            ("Indiranagar", 1000, "non-veg"),
+            ("Koramangala", 1500, "non-veg"),
+            ("UnknownCity", 500, "veg"),
+        ],
+    )
+    def test_matches_raw_frame(self, sample_df, city, price, diet):
+        integrator = Integrator()
+        user_input = UserInput(city=city, price=price, diet=diet)
+        raw = integrator.filter_by_user_input(sample_df, user_input)
+        normalized = integrator.filter_by_user_input(normalize_dataset(sample_df), user_input)
+        assert len(normalized) == len(raw)
+        assert list(normalized["name"]) == list(raw.get("name", []))
+
+    def test_unparseable_cost_excluded(self, sample_df):
+        df = sample_df.copy()
+        df.loc[0, "approx_cost(for two people)"] = "N/A"
+        integrator = Integrator()
+        user_input = UserInput(city="Banashankari", price=1000, diet="non-veg")
+        result = integrator.filter_by_user_input(normalize_dataset(df), user_input)
+        assert list(result["name"]) == ["Restaurant C"]
+
+
+class TestIntegratorBatch:
+    """select_batch / prepare_contexts give select / prepare_context results."""
+
+    QUERIES = [
+        UserInput(city="Banashankari", price=1000, diet="non-veg"),
+        UserInput(city="Banashankari", price=500, diet="veg"),
+        UserInput(city=" banashankari ", price=600, diet="veg"),
+        UserInput(city="Indiranagar", price=1000, diet="veg"),
+        UserInput(city="Koramangala", price=1500, diet="non-veg"),
+        UserInput(city="UnknownCity", price=500, diet="veg"),
+    ]
+
+    @pytest.mark.parametrize("normalized", [False, True])
+    @pytest.mark.parametrize("index", [None, "plain", "bitmaps"])
+    def test_matches_select(self, sample_df, normalized, index):
+        df = normalize_dataset(sample_df) if normalized else sample_df
+        integrator = Integrator(result_cache=FilterResultCache())
+        if index is not None:
+            integrator.build_index(df, version="v1", bitmaps=BitmapIndex.build(df) if index == "bitmaps" else None)
+        views = integrator.select_batch(df, self.QUERIES)
+        expected = [Integrator().select(df, q).positions.tolist() for q in self.QUERIES]
+        assert [v.positions.tolist() for v in views] == expected
+
+    def test_results_cached(self, sample_df):
+        cache = FilterResultCache()
+        integrator = Integrator(result_cache=cache)
+        integrator.build_index(sample_df, version="v1")
+        integrator.select_batch(sample_df, self.QUERIES)
+        hits = cache.stats.hits
+        integrator.select(sample_df, self.QUERIES[0])
+        assert cache.stats.hits == hits + 1
+
+    def test_prepare_contexts(self, sample_df):
+        integrator = Integrator()
+        contexts = integrator.prepare_contexts(sample_df, self.QUERIES, top_k=1)
+        for query, context in zip(self.QUERIES, contexts):
+            single = integrator.prepare_context(sample_df, query, top_k=1)
+            assert context.user_input == query
+            assert context.total_matches == single.total_matches
+            assert list(context.filtered_df.get("name", [])) == list(single.filtered_df.get("name", []))
@@ -0,0 +1,108 @@
+"""Phase 3 - Tests for Top-K candidate ranking."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from phase1_DataLoading.normalize import normalize_dataset
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.benchmark import run_ranking, synthetic_restaurants
+from phase3_Integration.integrator import Integrator
+from phase3_Integration.ranking import CandidateRanker, RankingWeights, top_k_order
+from phase3_Integration.view import FilteredView
+
+
+@pytest.fixture
+def candidates() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": ["Low", "Popular", "New", "Pricey", "Cheap", "Chinese"],
+            "rate": ["3.0/5", "4.5/5", "NEW", "4.5/5", "4.5/5", "3.5/5"],
+            "votes": ["10", "5,000", "0", "5,000", "5,000", "100"],
+            "approx_cost(for two people)": ["800", "800", "800", "1,000", "200", "800"],
+            "cuisines": ["North Indian", "North Indian", "Cafe", "North Indian", "North Indian", "Chinese, Momos"],
+        }
+    )
+
+
+def _view(df: pd.DataFrame) -> FilteredView:
+    return FilteredView(df, np.arange(len(df)))
+
+
+class TestTopKOrder:
+    """Tests for top_k_order."""
+
+    @pytest.mark.parametrize("k", [0, 1, 3, 7, 10, 25])
+    def test_matches_stable_argsort(self, k):
+        scores = np.random.default_rng(k).integers(0, 5, 20).astype(float)
+        expected = np.argsort(-scores, kind="stable")[:k]
+        assert top_k_order(scores, k).tolist() == expected.tolist()
+
+    def test_empty(self):
+        assert top_k_order(np.empty(0), 5).tolist() == []
+
+
+class TestCandidateRanker:
+    """Tests for CandidateRanker scoring."""
+
+    def test_rating_and_votes_rank_first(self, candidates):
+        ui = UserInput(city="BTM", price=1000, diet="non-veg")
+        order = CandidateRanker().top_k(_view(candidates), ui, k=6).to_frame()["name"].tolist()
+        assert order[0] == "Pricey"
+        assert order.index("Popular") < order.index("Low")
+        assert order.index("Popular") < order.index("Cheap")
+
+    def test_budget_closeness(self, candidates):
+        ui = UserInput(city="BTM", price=1000, diet="non-veg")
+        ranker = CandidateRanker(RankingWeights(rating=0, votes=0, budget=1, cuisine=0))
+        scores = ranker.score(_view(candidates), ui)
+        assert scores[3] == pytest.approx(1.0)
+        assert scores[1] == pytest.approx(0.8)
+        assert scores[4] == pytest.approx(0.2)
+
+    def test_unrated_uses_default(self, candidates):
+        ui = UserInput(city="BTM", price=1000, diet="non-veg")
+        ranker = CandidateRanker(RankingWeights(rating=1, votes=0, budget=0, cuisine=0))
+        scores = ranker.score(_view(candidates), ui)
+        assert scores[2] == pytest.approx(3.0 / 5)
+
+    def test_cuisine_match(self, candidates):
+        ui = UserInput(city="BTM", price=1000, diet="non-veg", cuisines=("chinese",))
+        top = CandidateRanker(RankingWeights(cuisine=5)).top_k(_view(candidates), ui, k=1)
+        assert top.to_frame()["name"].tolist() == ["Chinese"]
+
+    def test_normalized_and_raw_scores_agree(self, candidates):
+        ui = UserInput(city="BTM", price=900, diet="non-veg", cuisines=("North Indian", "Cafe"))
+        ranker = CandidateRanker()
+        np.testing.assert_allclose(
+            ranker.score(_view(candidates), ui),
+            ranker.score(_view(normalize_dataset(candidates)), ui),
+        )
+
+    def test_missing_columns_score_zero(self):
+        df = pd.DataFrame({"name": ["A", "B"]})
+        scores = CandidateRanker().score(_view(df), UserInput(city="BTM", price=500, diet="veg"))
+        assert scores.tolist() == [0.0, 0.0]
+
+
+class TestPrepareContextTopK:
+    """Integrator.prepare_context(top_k=...)."""
+
+    def test_top_k_context(self):
+        df = normalize_dataset(synthetic_restaurants(rows=3_000, seed=4))
+        integrator = Integrator()
+        integrator.build_index(df)
+        ui = UserInput(city="BTM", price=1500, diet="non-veg")
+        full = integrator.prepare_context(df, ui)
+        ranked = integrator.prepare_context(df, ui, top_k=10)
+        assert len(ranked.filtered_df) == 10
+        assert ranked.total_matches == full.total_matches
+        assert set(ranked.filtered_df["name"]) <= set(full.filtered_df["name"])
+        assert ranked.filtered_df["rating"].mean() >= full.filtered_df["rating"].mean()
+
+    def test_run_ranking_improves_rating(self):
+        df = synthetic_restaurants(rows=3_000, seed=4)
+        queries = [UserInput(city="BTM", price=800, diet="non-veg")]
+        (head_label, _, head_rating, _), (top_label, _, top_rating, _) = run_ranking(df, queries, repeat=1, k=10)
+        assert (head_label, top_label) == ("head(10)", "top-10 ranked")
+        assert top_rating >= head_rating
@@ -0,0 +1,146 @@
+"""Phase 3 - Tests for FilterResultCache and cached Integrator filtering."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from phase1_DataLoading.normalize import normalize_dataset
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.benchmark import synthetic_restaurants
+from phase3_Integration.integrator import Integrator
+from phase3_Integration.result_cache import FilterResultCache, query_key
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    return normalize_dataset(synthetic_restaurants(2_000, seed=3))
+
+
+@pytest.fixture
+def query() -> UserInput:
+    return UserInput(city="btm", price=800, diet="veg")
+
+
+class TestQueryKey:
+    """Tests for query_key."""
+
+    def test_attribute_order_and_case_ignored(self, query):
+        a = query_key(query, {"online_order": "Yes", "rest_type": ["Cafe", "Bar"]})
+        b = query_key(query, {"rest_type": ["bar", "cafe"], "online_order": "yes"})
+        assert a == b
+
+    def test_attributes_change_key(self, query):
+        assert query_key(query) != query_key(query, {"online_order": "Yes"})
+        assert query_key(query, {"online_order": True}) == query_key(query, {"online_order": "Yes"})
+
+
+class TestFilterResultCache:
+    """Tests for FilterResultCache."""
+
+    def test_hit_and_miss(self):
+        cache = FilterResultCache()
+        assert cache.get("v1", "k") is None
+        stored = cache.put("v1", "k", np.array([1, 2, 3]))
+        assert cache.get("v1", "k") is stored
+        assert not stored.flags.writeable
+        assert cache.stats.as_dict() == {
+            "hits": 1, "misses": 1, "evictions": 0, "invalidations": 0, "hit_rate": 0.5,
+        }
+
+    def test_other_version_misses_and_new_version_drops_old(self):
+        cache = FilterResultCache()
+        cache.put("v1", "k", np.array([1]))
+        assert cache.get("v2", "k") is None
+        cache.put("v2", "other", np.array([2]))
+        assert len(cache) == 1
+        assert cache.get("v1", "k") is None
+        assert cache.stats.invalidations == 1
+
+    def test_entry_limit_evicts_lru(self):
+        cache = FilterResultCache(max_entries=2)
+        cache.put("v", "a", np.array([1]))
+        cache.put("v", "b", np.array([2]))
+        cache.get("v", "a")
+        cache.put("v", "c", np.array([3]))
+        assert cache.get("v", "b") is None
+        assert cache.get("v", "a") is not None
+        assert cache.stats.evictions == 1
+
+    def test_byte_limit(self):
+        cache = FilterResultCache(max_bytes=10 * 8)
+        cache.put("v", "a", np.arange(6))
+        cache.put("v", "b", np.arange(6))
+        assert len(cache) == 1
+        assert cache.nbytes == 6 * 8
+        cache.put("v", "huge", np.arange(20))
+        assert cache.get("v", "huge") is None
+        assert cache.get("v", "b") is not None
+
+    def test_replace_keeps_byte_count(self):
+        cache = FilterResultCache()
+        cache.put("v", "a", np.arange(4))
+        cache.put("v", "a", np.arange(2))
+        assert cache.nbytes == 2 * 8
+
+    def test_invalidate(self):
+        cache = FilterResultCache()
+        cache.put("v", "a", np.arange(4))
+        cache.invalidate()
+        assert len(cache) == 0
+        assert cache.nbytes == 0
+        assert cache.get("v", "a") is None
+
+
+class TestIntegratorResultCache:
+    """Integrator with a FilterResultCache."""
+
+    def test_cached_results_match_uncached(self, frame):
+        plain = Integrator()
+        plain.build_index(frame, version="v1")
+        cached = Integrator(result_cache=FilterResultCache())
+        cached.build_index(frame, version="v1")
+        attributes = {"online_order": "Yes"}
+        for city in ("btm", "hsr", "whitefield"):
+            for price in (400, 1000):
+                q = UserInput(city=city, price=price, diet="veg")
+                for _ in range(2):
+                    assert cached.select(frame, q, attributes).positions.tolist() == \
+                        plain.select(frame, q, attributes).positions.tolist()
+                    pd.testing.assert_frame_equal(
+                        cached.prepare_context(frame, q, top_k=10).filtered_df,
+                        plain.prepare_context(frame, q, top_k=10).filtered_df,
+                    )
+        assert cached.result_cache.stats.hits > 0
+
+    def test_repeat_query_skips_filtering_and_ranking(self, frame, query):
+        integrator = Integrator(result_cache=FilterResultCache())
+        integrator.build_index(frame, version="v1")
+        first = integrator.prepare_context(frame, query, top_k=5)
+        with patch.object(integrator, "_select_positions") as select, \
+                patch.object(integrator.ranker, "top_k") as top_k:
+            second = integrator.prepare_context(frame, query, top_k=5)
+        select.assert_not_called()
+        top_k.assert_not_called()
+        pd.testing.assert_frame_equal(first.filtered_df, second.filtered_df)
+        assert second.total_matches == first.total_matches
+
+    def test_rebuilding_index_invalidates(self, frame, query):
+        integrator = Integrator(result_cache=FilterResultCache())
+        integrator.build_index(frame, version="v1")
+        integrator.select(frame, query)
+        reloaded = frame.iloc[::-1].reset_index(drop=True)
+        integrator.build_index(reloaded, version="v2")
+        assert len(integrator.result_cache) == 0
+        expected = Integrator().select(reloaded, query).positions
+        assert integrator.select(reloaded, query).positions.tolist() == expected.tolist()
+
+    def test_unindexed_or_unversioned_frames_not_cached(self, frame, query):
+        integrator = Integrator(result_cache=FilterResultCache())
+        integrator.select(frame, query)
+        integrator.build_index(frame)
+        integrator.select(frame, query)
+        integrator.select(frame.copy(), query)
+        assert len(integrator.result_cache) == 0
+        assert integrator.result_cache.stats.misses == 0
@@ -0,0 +1,93 @@
+"""Phase 3 - Equivalence tests: vectorized filter vs the row-wise reference."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from phase1_DataLoading.normalize import normalize_dataset
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.benchmark import run, synthetic_restaurants
+from phase3_Integration.integrator import Integrator, _filter_rowwise
+
+
+@pytest.fixture(scope="module")
+def synthetic_df() -> pd.DataFrame:
+    return synthetic_restaurants(rows=3_000, seed=7)
+
+
+@pytest.fixture
+def edge_df() -> pd.DataFrame:
+    """Values that exercise every parsing branch."""
+    return pd.DataFrame(
+        {
+            "name": [f"R{i}" for i in range(10)],
+            "listed_in(city)": [
+                "BTM", " btm ", "BTM", np.nan, "BTM", "BTM", "BTM", "BTM", "Other", "BTM",
+            ],
+            "approx_cost(for two people)": [
+                "1,000", "300-400", "₹500", "400", np.nan, "N/A", "", 600, "100", "  700 ",
+            ],
+            "cuisines": [
+                "North Indian", "SEAFOOD", np.nan, "Cafe", "Cafe", "Cafe", "Cafe", "Eggless Cakes", "Cafe", "",
+            ],
+            "dish_liked": [
+                "Paneer", "Dosa", "Chicken Roll", "Tea", np.nan, "Tea", "Tea", "Pastry", "Tea", "Lamb Chops",
+            ],
+        }
+    )
+
+
+def _assert_equivalent(df: pd.DataFrame, user_input: UserInput) -> None:
+    expected = _filter_rowwise(df, user_input)
+    integrator = Integrator()
+    for frame in (df, normalize_dataset(df)):
+        actual = integrator.filter_by_user_input(frame, user_input)
+        assert len(actual) == len(expected)
+        if len(expected):
+            pd.testing.assert_frame_equal(actual[list(df.columns)], expected[list(df.columns)])
+
+
+class TestVectorizedEquivalence:
+    """filter_by_user_input matches _filter_rowwise on raw and normalized frames."""
+
+    @pytest.mark.parametrize("price", [0, 300, 450, 600, 1000, 100_000])
+    @pytest.mark.parametrize("diet", ["veg", "non-veg"])
+    @pytest.mark.parametrize("city", ["BTM", "  btm", "Other", "Nowhere"])
+    def test_edge_values(self, edge_df, city, price, diet):
+        _assert_equivalent(edge_df, UserInput(city=city, price=price, diet=diet))
+
+    @pytest.mark.parametrize("price", [200, 500, 800, 1200, 5000])
+    @pytest.mark.parametrize("diet", ["veg", "non-veg"])
+    @pytest.mark.parametrize("city", ["BTM", "koramangala 5th block", "WHITEFIELD", "MG Road"])
+    def test_synthetic_dataset(self, synthetic_df, city, price, diet):
+        _assert_equivalent(synthetic_df, UserInput(city=city, price=price, diet=diet))
+
+    @pytest.mark.parametrize("drop", ["listed_in(city)", "approx_cost(for two people)", "cuisines", "dish_liked"])
+    def test_missing_filter_columns(self, edge_df, drop):
+        df = edge_df.drop(columns=[drop])
+        _assert_equivalent(df, UserInput(city="BTM", price=600, diet="veg"))
+
+    def test_numeric_cost_column(self, edge_df):
+        df = edge_df.copy()
+        df["approx_cost(for two people)"] = [1000, 300, np.nan, 400, 500, 600, 700, 800, 100, 700]
+        _assert_equivalent(df, UserInput(city="BTM", price=600, diet="non-veg"))
+
+    def test_empty_match_keeps_columns(self, edge_df):
+        result = Integrator().filter_by_user_input(edge_df, UserInput(city="Nowhere", price=500, diet="veg"))
+        assert result.empty
+        assert list(result.columns) == list(edge_df.columns)
+
+
+class TestBenchmark:
+    """Smoke test for the benchmark harness."""
+
+    def test_run_reports_all_variants(self):
+        df = synthetic_restaurants(rows=500, seed=1)
+        results = run(df, [UserInput(city="BTM", price=800, diet="veg")], repeat=1)
+        assert [label for label, _ in results] == [
+            "row-wise reference",
+            "vectorized (raw frame)",
+            "vectorized (normalized)",
+            "city index (normalized)",
+        ]
+        assert all(ms > 0 for _, ms in results)
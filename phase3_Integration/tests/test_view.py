@@ -0,0 +1,112 @@
+"""Phase 3 - Tests for the copy-free filter path (FilteredView, Integrator.select)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from phase1_DataLoading.normalize import normalize_dataset
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.benchmark import (
+    _as_object_strings,
+    peak_allocation,
+    run_memory,
+    synthetic_restaurants,
+    with_heavy_text,
+)
+from phase3_Integration.integrator import Integrator
+from phase3_Integration.view import FilteredView
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    return pd.DataFrame({"name": list("ABCDEF"), "cost": [100, 200, 300, 400, 500, 600]}, index=list("uvwxyz"))
+
+
+class TestFilteredView:
+    """Tests for FilteredView."""
+
+    def test_materializes_selected_rows(self, frame):
+        view = FilteredView(frame, np.array([1, 3, 4]))
+        assert len(view) == 3
+        assert not view.empty
+        assert list(view.to_frame()["name"]) == ["B", "D", "E"]
+        assert list(view.to_frame().index) == [0, 1, 2]
+        assert list(view.head(2)["name"]) == ["B", "D"]
+        assert list(view.head(2, columns=["cost"]).columns) == ["cost"]
+        assert view.column("cost").tolist() == [200, 400, 500]
+
+    def test_empty_keeps_columns(self, frame):
+        view = FilteredView(frame, np.empty(0, dtype=np.int64))
+        assert view.empty
+        assert list(view.to_frame().columns) == ["name", "cost"]
+
+    def test_does_not_copy_frame(self, frame):
+        view = FilteredView(frame, np.array([0]))
+        assert view.frame is frame
+
+
+class TestIntegratorSelect:
+    """Integrator.select and bounded prepare_context."""
+
+    @pytest.fixture
+    def df(self) -> pd.DataFrame:
+        return normalize_dataset(synthetic_restaurants(rows=3_000, seed=21))
+
+    @pytest.mark.parametrize("indexed", [False, True])
+    def test_select_matches_filter(self, df, indexed):
+        integrator = Integrator()
+        if indexed:
+            integrator.build_index(df)
+        user_input = UserInput(city="Indiranagar", price=1000, diet="veg")
+        view = integrator.select(df, user_input)
+        assert view.frame is df
+        pd.testing.assert_frame_equal(view.to_frame(), integrator.filter_by_user_input(df, user_input))
+
+    def test_select_empty_frame(self, df):
+        view = Integrator().select(df.iloc[:0], UserInput(city="BTM", price=500, diet="veg"))
+        assert view.empty
+
+    def test_prepare_context_max_rows(self, df):
+        integrator = Integrator()
+        integrator.build_index(df)
+        user_input = UserInput(city="BTM", price=5000, diet="non-veg")
+        full = integrator.prepare_context(df, user_input)
+        bounded = integrator.prepare_context(df, user_input, max_rows=10)
+        assert full.total_matches > 10
+        assert bounded.total_matches == full.total_matches
+        pd.testing.assert_frame_equal(bounded.filtered_df, full.filtered_df.head(10))
+        assert len(bounded.view) == full.total_matches
+
+
+class TestMemoryBounds:
+    """Peak allocation per request stays proportional to the matches, not the frame."""
+
+    QUERY = UserInput(city="BTM", price=800, diet="veg")
+
+    def _select_peak(self, df: pd.DataFrame) -> int:
+        normalized = _as_object_strings(normalize_dataset(df))
+        integrator = Integrator()
+        integrator.build_index(normalized)
+        return peak_allocation(lambda: integrator.select(normalized, self.QUERY))
+
+    def test_select_independent_of_row_width(self):
+        df = synthetic_restaurants(rows=20_000, seed=2)
+        narrow = self._select_peak(df)
+        wide = self._select_peak(with_heavy_text(df, 500))
+        assert wide <= narrow * 1.25 + 4096
+
+    def test_select_far_below_frame_size(self):
+        df = with_heavy_text(synthetic_restaurants(rows=20_000, seed=2), 200)
+        frame_bytes = _as_object_strings(df).memory_usage(deep=True).sum()
+        assert self._select_peak(df) < frame_bytes * 0.005
+
+    def test_run_memory_reports_all_paths(self):
+        df = synthetic_restaurants(rows=2_000, seed=3)
+        results = dict(run_memory(df, [self.QUERY], max_rows=20))
+        assert list(results) == [
+            "row-wise reference",
+            "filter_by_user_input",
+            "select (view)",
+            "prepare_context(20 rows)",
+        ]
+        assert results["select (view)"] < results["row-wise reference"]
@@ -0,0 +1,60 @@
+"""
+Phase 3 - Filtered View
+A copy-free filter result: the source frame plus the positions of matching
+rows. Rows are only materialized when (and as far as) they are needed.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class FilteredView:
+    """
+    Matching rows of a frame, by position.
+
+    Holds a reference to the source frame and an int64 positions array
+    (ascending, or best-first for ranked views), so creating one costs
+    O(matches) memory regardless of how wide the frame is. head()/to_frame()
+    copy only the rows and columns they return.
+    """
+
+    def __init__(self, frame: pd.DataFrame, positions: np.ndarray):
+        """
+        Args:
+            frame: Source DataFrame (not copied).
+            positions: Positional indexes of the matching rows.
+        """
+        self.frame = frame
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.positions) == 0
+
+    @property
+    def columns(self) -> pd.Index:
+        return self.frame.columns
+
+    def column(self, name: str) -> pd.Series:
+        """Values of one column for the matching rows (0..n-1 index)."""
+        return self.frame[name].take(self.positions).reset_index(drop=True)
+
+    def head(self, n: int = 5, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Materialize the first n matching rows."""
+        return self._materialize(self.positions[:n], columns)
+
+    def to_frame(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Materialize all matching rows (optionally only some columns)."""
+        return self._materialize(self.positions, columns)
+
+    def _materialize(self, positions: np.ndarray, columns: Optional[Sequence[str]]) -> pd.DataFrame:
+        frame = self.frame if columns is None else self.frame[list(columns)]
+        return frame.iloc[positions].reset_index(drop=True)
+
+    def __repr__(self) -> str:
+        return f"FilteredView({len(self)} of {len(self.frame)} rows)"
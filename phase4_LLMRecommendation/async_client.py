@@ -0,0 +1,144 @@
+"""
+Phase 4 - Async LLM HTTP Client
+asyncio counterpart of LLMClient. With aiohttp installed, calls share one
+event loop and a pooled aiohttp.ClientSession, so one process can keep
+hundreds of LLM calls in flight. Without aiohttp it falls back to the
+pooled LLMClient on worker threads, which keeps the same interface but
+bounds concurrency by pool size.
+"""
+
+import asyncio
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Mapping, Optional
+
+from phase4_LLMRecommendation.backends import GOOGLE_STUDIO_URL, GoogleStudioBackend, LLMBackend
+from phase4_LLMRecommendation.client import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    MIN_READ_TIMEOUT,
+    LLMClient,
+)
+
+HAS_AIOHTTP = importlib.util.find_spec("aiohttp") is not None
+DEFAULT_ASYNC_POOL_SIZE = 100
+
+
+class AsyncLLMClient:
+    """
+    Async keep-alive connection pool to one LLM endpoint.
+
+    The underlying aiohttp session (or fallback thread pool) is created on
+    first use, so the object can be built outside a running event loop.
+    Use one instance per event loop.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        pool_size: int = DEFAULT_ASYNC_POOL_SIZE,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        provider: Optional[LLMBackend] = None,
+    ):
+        """
+        Args:
+            url: generateText endpoint (e.g. a local stub server for load
+                 tests); shorthand for provider=GoogleStudioBackend(url).
+            pool_size: Maximum concurrent connections.
+            connect_timeout: Seconds to establish a connection.
+            read_timeout: Seconds to wait for response data.
+            provider: LLM backend (wire format). Defaults to GoogleStudioBackend.
+        """
+        self.provider = provider or GoogleStudioBackend(url or GOOGLE_STUDIO_URL)
+        self.url = self.provider.url
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._session = None
+        self._fallback: Optional[LLMClient] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def backend(self) -> str:
+        """'aiohttp' or 'threads' (fallback without aiohttp)."""
+        return "aiohttp" if HAS_AIOHTTP else "threads"
+
+    async def generate(
+        self,
+        prompt: str,
+        api_key: str,
+        params: Optional[Mapping[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Send prompt and return the generated text. timeout (seconds), if
+        given, caps the read timeout for this call.
+
+        Raises:
+            aiohttp.ClientError / asyncio.TimeoutError / requests.RequestException:
+                On connection errors, timeouts and HTTP errors (per backend).
+            KeyError: If the response has no candidate text.
+        """
+        if not HAS_AIOHTTP:
+            return await self._generate_in_thread(prompt, api_key, params, timeout)
+        session = self._aiohttp_session()
+        options = {}
+        if timeout is not None:
+            import aiohttp
+
+            options["timeout"] = aiohttp.ClientTimeout(
+                sock_connect=self.connect_timeout,
+                sock_read=max(min(self.read_timeout, timeout), MIN_READ_TIMEOUT),
+            )
+        request = self.provider.request(prompt, api_key, params)
+        async with session.post(
+            request.url, params=request.query, headers=request.headers, json=request.body, **options
+        ) as response:
+            response.raise_for_status()
+            return self.provider.response_text(await response.json())
+
+    def _aiohttp_session(self):
+        if self._session is None:
+            import aiohttp
+
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=self.connect_timeout, sock_read=self.read_timeout
+                ),
+            )
+        return self._session
+
+    async def _generate_in_thread(
+        self, prompt: str, api_key: str, params: Optional[Mapping[str, Any]], timeout: Optional[float]
+    ) -> str:
+        if self._fallback is None:
+            self._fallback = LLMClient(
+                pool_size=self.pool_size,
+                connect_timeout=self.connect_timeout,
+                read_timeout=self.read_timeout,
+                provider=self.provider,
+            )
+            self._executor = ThreadPoolExecutor(self.pool_size, thread_name_prefix="llm")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._fallback.generate, prompt, api_key, params, timeout
+        )
+
+    async def aclose(self) -> None:
+        """Close pooled connections (and fallback threads)."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._fallback is not None:
+            self._fallback.close()
+            self._executor.shutdown(wait=False)
+            self._fallback = None
+            self._executor = None
+
+    async def __aenter__(self) -> "AsyncLLMClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
@@ -0,0 +1,233 @@
+"""
+Phase 4 - LLM Backends
+What differs between LLM providers on the wire: endpoint, authentication,
+request body, where the generated text sits in a response or a streamed
+event, and the model name (part of response cache keys). LLMClient and
+AsyncLLMClient handle connections, timeouts and server-sent events and
+delegate these details to a backend:
+
+- GoogleStudioBackend: Google generateText (the default). generateText
+  has no streaming method, so streamed recommendations are answered with
+  one blocking call (see supports_streaming).
+- OpenAICompatibleBackend: any /chat/completions API (OpenAI, vLLM,
+  llama.cpp server, Ollama, ...).
+- FakeBackend: an OpenAI-compatible StubLLMServer started in-process, with
+  configurable latency distribution, error rate and tokens per second, for
+  load tests and benchmarks without network access or API keys.
+
+create_backend picks one by name, defaulting to $LLM_BACKEND.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Mapping, Optional, Protocol, Union
+
+from phase4_LLMRecommendation.stub_server import StubLLMServer, json_answer, lognormal_latency
+
+GOOGLE_STUDIO_URL = "https://generativelanguage.googleapis.com/v1beta/models/text-bison-001:generateText"
+OPENAI_BASE_URL = "https://api.openai.com/v1"
+OPENAI_MODEL = "gpt-4o-mini"
+LLM_BACKEND_ENV = "LLM_BACKEND"
+BACKEND_NAMES = ("google", "openai", "fake")
+STREAM_DONE = "[DONE]"
+
+
+@dataclass
+class BackendRequest:
+    """One HTTP call to an LLM endpoint: POST url?query with headers and a JSON body."""
+
+    url: str
+    body: dict
+    query: dict = field(default_factory=dict)
+    headers: dict = field(default_factory=dict)
+
+
+class LLMBackend(Protocol):
+    """Wire format of one LLM provider (see module docstring)."""
+
+    name: str  # Backend kind: "google", "openai" or "fake"
+    model: str  # Model answering the prompts (part of cache keys)
+    url: str  # Endpoint, for display
+    api_key_env: Optional[str]  # Environment variable holding the API key (None: no key needed)
+    supports_streaming: bool  # Whether request(stream=True) reaches an endpoint that streams
+
+    def request(
+        self, prompt: str, api_key: str, params: Optional[Mapping[str, Any]] = None, stream: bool = False
+    ) -> BackendRequest:
+        """The call generating text for prompt (as server-sent events if stream)."""
+        ...
+
+    def response_text(self, result: Mapping[str, Any]) -> str:
+        """Generated text of a complete JSON response (KeyError if it has none)."""
+        ...
+
+    def event_text(self, data: str) -> Optional[str]:
+        """Text carried by one streamed event's data ("" if none), None at the end of the stream."""
+        ...
+
+
+def extract_text(result: Mapping[str, Any]) -> str:
+    """Text of the first candidate of a generateText (output) or Gemini (content.parts) response."""
+    candidate = result["candidates"][0]
+    if "output" in candidate:
+        return candidate["output"]
+    return "".join(part.get("text", "") for part in candidate["content"]["parts"])
+
+
+def stream_url(url: str) -> str:
+    """Streaming counterpart of a model method URL (...:generateText -> ...:streamGenerateText)."""
+    base, _, method = url.rpartition(":")
+    return f"{base}:stream{method[:1].upper()}{method[1:]}"
+
+
+def model_of(url: str) -> str:
+    """Model name in a model method URL (.../models/text-bison-001:generateText -> text-bison-001)."""
+    path = url.split("?", 1)[0].rpartition(":")[0]
+    return path.rpartition("/models/")[2] or path.rpartition("/")[2]
+
+
+GOOGLE_STUDIO_MODEL = model_of(GOOGLE_STUDIO_URL)
+
+
+def build_payload(prompt: str, params: Optional[Mapping[str, Any]] = None) -> dict:
+    """Request body for a generateText call."""
+    return {"prompt": {"text": prompt}, **dict(params or {})}
+
+
+class GoogleStudioBackend:
+    """Google generateText: key in the query string, text in candidates[0]."""
+
+    name = "google"
+    api_key_env = "GOOGLE_STUDIO_API_KEY"
+
+    def __init__(self, url: str = GOOGLE_STUDIO_URL, model: Optional[str] = None, streaming: bool = False):
+        """
+        Args:
+            url: generateText endpoint (e.g. a local stub server for load tests).
+            model: Model name used in cache keys. Defaults to the one in url.
+            streaming: Whether url's stream counterpart (see stream_url)
+                       exists. The public generateText models have none.
+        """
+        self.url = url
+        self.model = model or model_of(url)
+        self.supports_streaming = streaming
+
+    def request(
+        self, prompt: str, api_key: str, params: Optional[Mapping[str, Any]] = None, stream: bool = False
+    ) -> BackendRequest:
+        if stream:
+            return BackendRequest(stream_url(self.url), build_payload(prompt, params), {"key": api_key, "alt": "sse"})
+        return BackendRequest(self.url, build_payload(prompt, params), {"key": api_key})
+
+    def response_text(self, result: Mapping[str, Any]) -> str:
+        return extract_text(result)
+
+    def event_text(self, data: str) -> Optional[str]:
+        return extract_text(json.loads(data))
+
+
+class OpenAICompatibleBackend:
+    """
+    OpenAI-compatible chat completions: bearer token, the prompt as one user
+    message, text in choices[0].message (or .delta when streaming).
+    GENERATION_PARAMS are translated (maxOutputTokens -> max_tokens).
+    """
+
+    name = "openai"
+    api_key_env = "OPENAI_API_KEY"
+    supports_streaming = True
+
+    def __init__(self, base_url: Optional[str] = None, model: Optional[str] = None):
+        """
+        Args:
+            base_url: API root (".../v1"). Defaults to $OPENAI_BASE_URL or OPENAI_BASE_URL.
+            model: Model name. Defaults to $OPENAI_MODEL or OPENAI_MODEL.
+        """
+        self.base_url = (base_url or os.environ.get("OPENAI_BASE_URL") or OPENAI_BASE_URL).rstrip("/")
+        self.model = model or os.environ.get("OPENAI_MODEL") or OPENAI_MODEL
+        self.url = f"{self.base_url}/chat/completions"
+
+    def request(
+        self, prompt: str, api_key: str, params: Optional[Mapping[str, Any]] = None, stream: bool = False
+    ) -> BackendRequest:
+        body: dict = {"model": self.model, "messages": [{"role": "user", "content": prompt}]}
+        for key, value in (params or {}).items():
+            body["max_tokens" if key == "maxOutputTokens" else key] = value
+        if stream:
+            body["stream"] = True
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        return BackendRequest(self.url, body, headers=headers)
+
+    def response_text(self, result: Mapping[str, Any]) -> str:
+        return result["choices"][0]["message"]["content"] or ""
+
+    def event_text(self, data: str) -> Optional[str]:
+        if data.strip() == STREAM_DONE:
+            return None
+        choices = json.loads(data).get("choices") or [{}]
+        return choices[0].get("delta", {}).get("content") or ""
+
+
+class FakeBackend(OpenAICompatibleBackend):
+    """
+    OpenAI-compatible backend answered by a StubLLMServer it starts on
+    127.0.0.1. By default the server answers JSON prompts validly (see
+    stub_server.json_answer) after a log-normal latency, and streams at
+    tokens_per_second. No API key is needed. close() stops the server.
+    """
+
+    name = "fake"
+    api_key_env = None
+
+    def __init__(
+        self,
+        latency: Union[float, Callable[[], float], None] = None,
+        error_rate: float = 0.0,
+        tokens_per_second: Optional[float] = 100.0,
+        responder: Optional[Callable[[str], str]] = json_answer,
+        capacity: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            latency: Seconds before each answer, or a sampler. Defaults to
+                     log-normal with a 0.4 s median and a 2 s 99th percentile.
+            error_rate: Share of calls failing with HTTP 503.
+            tokens_per_second: Generation speed (a word counts as a token).
+            responder: Answer text from the prompt (None: a fixed text answer).
+            capacity: Calls answered concurrently (None: unlimited).
+            seed: Seed for latencies and errors.
+        """
+        if latency is None:
+            latency = lognormal_latency(0.4, 2.0, seed)
+        self.server = StubLLMServer(
+            latency=latency,
+            responder=responder,
+            error_rate=error_rate,
+            tokens_per_second=tokens_per_second,
+            capacity=capacity,
+            seed=seed,
+        ).start()
+        super().__init__(self.server.openai_url, model="fake")
+
+    def close(self) -> None:
+        self.server.stop()
+
+
+def create_backend(name: Optional[str] = None, **options) -> LLMBackend:
+    """
+    Backend by name ("google", "openai" or "fake"; default $LLM_BACKEND,
+    else "google"), built with options.
+
+    Raises:
+        ValueError: For an unknown name.
+    """
+    name = (name or os.environ.get(LLM_BACKEND_ENV) or "google").strip().lower()
+    if name == "google":
+        return GoogleStudioBackend(**options)
+    if name == "openai":
+        return OpenAICompatibleBackend(**options)
+    if name == "fake":
+        return FakeBackend(**options)
+    raise ValueError(f"Unknown LLM backend {name!r}; expected one of {', '.join(BACKEND_NAMES)}")
@@ -0,0 +1,490 @@
+"""
+Phase 4 - Prompt size and LLM client benchmark.
+Compares the estimated prompt tokens of the original verbose restaurant list
+with the compact, token-budgeted encoding for Top-K ranked contexts.
+With --http it measures LLM call throughput under concurrent load against a
+local stub server (with injected connection setup cost), one requests.post
+per call vs the pooled LLMClient. With --async it compares end-to-end
+Recommender throughput on a fixed number of worker threads (a threaded web
+server) with the asyncio path keeping every request in flight.
+With --stream it measures time to the first recommendation, blocking vs
+streaming, against a stub server that streams its response word by word.
+With --microbatch it compares unbatched Recommender calls with micro-batched
+ones (several queries per upstream call) against a stub that answers JSON
+and batched prompts, with generation time proportional to answer length and
+a limited number of calls answered at once (the provider's quota).
+With --limiter it sends more concurrent recommendations than a stub can
+answer (calls over --capacity get 429 at once) with and without the
+AdaptiveLimiter, comparing the share answered by the LLM rather than the
+fallback, and the limiter's queue wait against upstream time.
+Every benchmark runs offline against the bundled stub server. For the
+Recommender benchmarks, --api picks the wire format (Google generateText or
+OpenAI-compatible chat completions), --latency-p99 draws latencies from a
+log-normal distribution (median --latency) and --error-rate injects 503s.
+
+Usage:
+  python -m phase4_LLMRecommendation.benchmark
+  python -m phase4_LLMRecommendation.benchmark --budget 800 --chain-share 0.4
+  python -m phase4_LLMRecommendation.benchmark --http --concurrency 32 --latency 0.02
+  python -m phase4_LLMRecommendation.benchmark --async --calls 500 --latency 0.5
+  python -m phase4_LLMRecommendation.benchmark --stream --latency 0.3 --chunk-delay 0.02
+  python -m phase4_LLMRecommendation.benchmark --microbatch --calls 400 --latency 0.5 --capacity 8 --max-wait 0.02
+  python -m phase4_LLMRecommendation.benchmark --async --api openai --latency 0.4 --latency-p99 2 --error-rate 0.02
+  python -m phase4_LLMRecommendation.benchmark --limiter --calls 400 --workers 64 --latency 0.2 --capacity 8
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Union
+
+import requests
+
+import numpy as np
+import pandas as pd
+
+from phase1_DataLoading.normalize import normalize_dataset
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.benchmark import ZOMATO_ROW_COUNT, synthetic_restaurants
+from phase3_Integration.integrator import IntegrationContext, Integrator
+from phase4_LLMRecommendation.prompt import (
+    DEFAULT_PROMPT_TOKEN_BUDGET,
+    CompactPromptBuilder,
+    estimate_tokens,
+)
+from phase4_LLMRecommendation.async_client import AsyncLLMClient
+from phase4_LLMRecommendation.backends import GoogleStudioBackend, LLMBackend, OpenAICompatibleBackend
+from phase4_LLMRecommendation.client import LLMClient, build_payload, extract_text
+from phase4_LLMRecommendation.limiter import AdaptiveLimiter
+from phase4_LLMRecommendation.microbatch import BatchPolicy
+from phase4_LLMRecommendation.recommender import (
+    GENERATION_PARAMS,
+    MAX_RESTAURANTS_IN_PROMPT,
+    Recommender,
+    _build_restaurant_summary,
+)
+from phase4_LLMRecommendation.stub_server import StubLLMServer, json_answer, lognormal_latency
+
+STREAM_RESPONSE = """1. Meghana Foods - Generous veg biryani portions well within budget. Standout: paneer biryani.
+2. Vidyarthi Bhavan - Classic crisp benne dosas for two under Rs.300. Standout: masala dosa.
+3. Brahmin's Coffee Bar - Quick idli-vada breakfasts and filter coffee. Standout: chutney.
+4. Corner House - Desserts to finish the meal. Standout: death by chocolate.
+5. Rameshwaram Cafe - Busy but fast South Indian counter. Standout: ghee podi idli."""
+
+Latency = Union[float, Callable[[], float]]
+
+_CHAINS = ["Domino's Pizza", "McDonald's", "Cafe Coffee Day", "Subway", "KFC", "Polar Bear", "Burger King"]
+
+
+def with_chains(df: pd.DataFrame, share: float, seed: int = 0) -> pd.DataFrame:
+    """Rename a share of rows to chain names, as in the real dataset."""
+    rng = np.random.default_rng(seed)
+    result = df.copy()
+    mask = rng.random(len(df)) < share
+    result.loc[mask, "name"] = np.asarray(_CHAINS, dtype=object)[rng.integers(0, len(_CHAINS), mask.sum())]
+    return result
+
+
+def verbose_prompt(context: IntegrationContext) -> str:
+    """The original prompt: labelled pipe-separated lines for up to 50 rows."""
+    ui = context.user_input
+    summary = _build_restaurant_summary(context.filtered_df)
+    return f"""You are a restaurant recommendation assistant. Given the user's preferences and a list of matching restaurants, recommend the top 3-5 best options with a brief reason for each.
+
+User preferences:
+- City/Area: {ui.city}
+- Budget (approx for two): Rs.{ui.price}
+- Diet: {ui.diet}
+
+Matching restaurants:
+{summary}
+
+Provide your recommendations in a clear, concise format. For each recommendation, include: restaurant name, why it's a good match, and a standout dish or feature."""
+
+
+def run(
+    df: pd.DataFrame, queries: list[UserInput], budget: int = DEFAULT_PROMPT_TOKEN_BUDGET
+) -> list[tuple[str, float, float, float]]:
+    """
+    Build both prompts for every query's Top-K context.
+    Returns (label, mean estimated tokens, mean restaurants listed, ms per prompt).
+    """
+    integrator = Integrator()
+    normalized = normalize_dataset(df)
+    integrator.build_index(normalized)
+    contexts = [
+        integrator.prepare_context(normalized, q, top_k=MAX_RESTAURANTS_IN_PROMPT) for q in queries
+    ]
+
+    results = []
+    start = time.perf_counter()
+    verbose = [verbose_prompt(c) for c in contexts]
+    elapsed = (time.perf_counter() - start) * 1000 / len(contexts)
+    results.append((
+        "verbose (original)",
+        float(np.mean([estimate_tokens(p) for p in verbose])),
+        float(np.mean([min(len(c.filtered_df), MAX_RESTAURANTS_IN_PROMPT) for c in contexts])),
+        elapsed,
+    ))
+
+    for label, builder in (
+        (f"compact (budget {budget})", CompactPromptBuilder(budget)),
+        ("compact + JSON ids", CompactPromptBuilder(budget, json_output=True)),
+    ):
+        start = time.perf_counter()
+        compact = [builder.build(c.filtered_df, c.user_input, c.total_matches) for c in contexts]
+        elapsed = (time.perf_counter() - start) * 1000 / len(contexts)
+        results.append((
+            label,
+            float(np.mean([p.estimated_tokens for p in compact])),
+            float(np.mean([p.restaurants_listed for p in compact])),
+            elapsed,
+        ))
+    return results
+
+
+def _provider(server: StubLLMServer, api: str = "google") -> LLMBackend:
+    """Backend speaking api ("google" or "openai") to the stub server."""
+    if api == "openai":
+        return OpenAICompatibleBackend(server.openai_url, model="stub")
+    return GoogleStudioBackend(server.url, streaming=True)  # the stub serves streamGenerateText
+
+
+def _throughput(call: Callable[[str], str], calls: int, concurrency: int) -> float:
+    """Completed calls per second with concurrency threads issuing calls requests."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, [f"prompt {i}" for i in range(calls)]))
+    return calls / (time.perf_counter() - start)
+
+
+def run_http(
+    calls: int = 400, concurrency: int = 16, latency: float = 0.01, connect_latency: float = 0.03
+) -> list[tuple[str, float, int]]:
+    """
+    Throughput of LLM calls against a local stub server whose connections
+    cost connect_latency to open (remote DNS + TCP + TLS).
+    Returns (label, calls per second, connections opened).
+    """
+    results = []
+    with StubLLMServer(latency=latency, connect_latency=connect_latency) as server:
+
+        def unpooled(prompt: str) -> str:
+            response = requests.post(
+                server.url, params={"key": "bench"}, json=build_payload(prompt, GENERATION_PARAMS), timeout=30
+            )
+            response.raise_for_status()
+            return extract_text(response.json())
+
+        rate = _throughput(unpooled, calls, concurrency)
+        results.append(("requests.post per call", rate, server.connections))
+
+        opened = server.connections
+        with LLMClient(url=server.url, pool_size=concurrency) as client:
+            rate = _throughput(lambda p: client.generate(p, "bench", GENERATION_PARAMS), calls, concurrency)
+        results.append((f"LLMClient (pool {concurrency})", rate, server.connections - opened))
+    return results
+
+
+def run_async(
+    contexts: list[IntegrationContext],
+    workers: int = 16,
+    latency: Latency = 0.5,
+    api: str = "google",
+    error_rate: float = 0.0,
+) -> list[tuple[str, float, int]]:
+    """
+    End-to-end Recommender throughput against a stub server with latency
+    (failing error_rate of the calls), speaking api.
+    Returns (label, requests per second, peak upstream calls in flight).
+    """
+    results = []
+    with StubLLMServer(latency=latency, error_rate=error_rate, seed=0) as server:
+        provider = _provider(server, api)
+        recommender = Recommender(api_key="bench", client=LLMClient(pool_size=workers, provider=provider))
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(recommender.get_recommendations, contexts))
+        rate = len(contexts) / (time.perf_counter() - start)
+        results.append((f"sync, {workers} worker threads", rate, server.max_in_flight))
+
+        async def serve_all() -> float:
+            async with AsyncLLMClient(pool_size=len(contexts), provider=provider) as client:
+                recommender = Recommender(api_key="bench", async_client=client)
+                start = time.perf_counter()
+                await asyncio.gather(*(recommender.get_recommendations_async(c) for c in contexts))
+                return len(contexts) / (time.perf_counter() - start)
+
+        server._server.max_in_flight = 0
+        rate = asyncio.run(serve_all())
+        results.append((f"async ({AsyncLLMClient().backend})", rate, server.max_in_flight))
+    return results
+
+
+def run_stream(
+    context: IntegrationContext,
+    latency: Latency = 0.3,
+    chunk_delay: float = 0.02,
+    repeats: int = 5,
+    api: str = "google",
+) -> list[tuple[str, float, float]]:
+    """
+    Blocking vs streaming recommendations against a stub server that waits
+    latency before the first word and chunk_delay between words.
+    Returns (label, ms to first recommendation, ms to last), mean over repeats.
+    """
+    results = []
+    with StubLLMServer(latency=latency, chunk_delay=chunk_delay, response_text=STREAM_RESPONSE) as server:
+        with LLMClient(provider=_provider(server, api)) as client:
+            recommender = Recommender(api_key="bench", client=client)
+            first, last = [], []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                recs = recommender.get_recommendations(context).recommendations
+                elapsed = (time.perf_counter() - start) * 1000
+                first.append(elapsed)
+                last.append(elapsed)
+            results.append((f"blocking ({len(recs)} recs)", float(np.mean(first)), float(np.mean(last))))
+
+            first, last = [], []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                times = [(time.perf_counter() - start) * 1000 for _ in recommender.stream_recommendations(context)]
+                first.append(times[0])
+                last.append(times[-1])
+            results.append((f"streaming ({len(times)} recs)", float(np.mean(first)), float(np.mean(last))))
+    return results
+
+
+def run_microbatch(
+    contexts: list[IntegrationContext],
+    workers: int = 16,
+    latency: Latency = 0.5,
+    chunk_delay: float = 0.002,
+    capacity: Optional[int] = 8,
+    policy: Optional[BatchPolicy] = None,
+    api: str = "google",
+) -> list[tuple[str, float, float, int, float]]:
+    """
+    Recommender throughput with and without micro-batching, on workers
+    threads against a stub server that waits latency per call plus
+    chunk_delay per generated word and answers capacity calls at a time.
+    Returns (label, requests per second, median ms per request, upstream
+    calls, KB of prompts sent).
+    """
+    policy = policy or BatchPolicy()
+    results = []
+    with StubLLMServer(latency=latency, chunk_delay=chunk_delay, responder=json_answer, capacity=capacity) as server:
+        for label, batching in (
+            ("unbatched", None),
+            (f"batched ({policy.max_wait * 1000:.0f} ms / {policy.max_items} items)", policy),
+        ):
+            requests_before, bytes_before = server.requests, server.bytes_received
+            with LLMClient(pool_size=workers, provider=_provider(server, api)) as client:
+                recommender = Recommender(api_key="bench", client=client, batching=batching)
+
+                def timed(context: IntegrationContext) -> float:
+                    start = time.perf_counter()
+                    recommender.get_recommendations(context)
+                    return (time.perf_counter() - start) * 1000
+
+                start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    latencies = list(pool.map(timed, contexts))
+                rate = len(contexts) / (time.perf_counter() - start)
+            results.append((
+                label,
+                rate,
+                float(np.median(latencies)),
+                server.requests - requests_before,
+                (server.bytes_received - bytes_before) / 1024,
+            ))
+    return results
+
+
+def run_limiter(
+    contexts: list[IntegrationContext],
+    workers: int = 64,
+    latency: Latency = 0.2,
+    capacity: int = 8,
+    api: str = "google",
+) -> list[tuple[str, float, float, float, int, int, Optional[dict]]]:
+    """
+    Recommender on workers threads against a stub server answering at most
+    capacity calls at once and refusing the rest with 429, without and with
+    an AdaptiveLimiter. Returns (label, requests per second, share answered
+    by the LLM, median ms per request, upstream calls, 429s, limiter stats).
+    """
+    results = []
+    with StubLLMServer(latency=latency, responder=json_answer, capacity=capacity, overload_status=429) as server:
+        for label, limiter in (("unlimited", None), ("adaptive limiter", AdaptiveLimiter())):
+            requests_before, errors_before = server.requests, server.errors
+            with LLMClient(pool_size=workers, provider=_provider(server, api)) as client:
+                recommender = Recommender(api_key="bench", client=client, limiter=limiter)
+
+                def timed(context: IntegrationContext) -> tuple[float, bool]:
+                    start = time.perf_counter()
+                    result = recommender.get_recommendations(context)
+                    return (time.perf_counter() - start) * 1000, not result.fallback
+
+                start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    outcomes = list(pool.map(timed, contexts))
+                rate = len(contexts) / (time.perf_counter() - start)
+            results.append((
+                label,
+                rate,
+                sum(answered for _, answered in outcomes) / len(outcomes),
+                float(np.median([ms for ms, _ in outcomes])),
+                server.requests - requests_before,
+                server.errors - errors_before,
+                limiter.stats.as_dict() if limiter is not None else None,
+            ))
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Phase 4: Benchmark prompt size")
+    parser.add_argument("--rows", type=int, default=ZOMATO_ROW_COUNT, help="Synthetic row count")
+    parser.add_argument("--budget", type=int, default=DEFAULT_PROMPT_TOKEN_BUDGET, help="Prompt token budget")
+    parser.add_argument("--chain-share", type=float, default=0.25, help="Share of rows renamed to chains")
+    parser.add_argument("--http", action="store_true", help="Benchmark LLM call throughput against a stub server")
+    parser.add_argument("--calls", type=int, default=400, help="LLM calls per --http variant")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent callers for --http")
+    parser.add_argument("--latency", type=float, default=0.01, help="Stub server latency in seconds for --http")
+    parser.add_argument("--connect-latency", type=float, default=0.03, help="Stub connection setup in seconds for --http")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Benchmark sync vs async recommendations against a stub server")
+    parser.add_argument("--workers", type=int, default=16, help="Worker threads of the sync variant for --async")
+    parser.add_argument("--stream", action="store_true", help="Benchmark time to first recommendation, blocking vs streaming")
+    parser.add_argument("--chunk-delay", type=float, default=0.02, help="Stub delay between streamed words for --stream")
+    parser.add_argument("--microbatch", action="store_true", help="Benchmark unbatched vs micro-batched recommendations")
+    parser.add_argument("--max-wait", type=float, default=0.02, help="Micro-batch wait in seconds for --microbatch")
+    parser.add_argument("--max-items", type=int, default=8, help="Micro-batch size for --microbatch")
+    parser.add_argument("--capacity", type=int, default=8, help="Calls the stub answers at once for --microbatch and --limiter (0: unlimited)")
+    parser.add_argument("--limiter", action="store_true", help="Benchmark recommendations against an overloaded stub with and without the adaptive limiter")
+    parser.add_argument("--api", choices=("google", "openai"), default="google", help="Wire format spoken to the stub")
+    parser.add_argument("--latency-p99", type=float, help="Draw stub latencies log-normally with this p99 (median --latency)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of stub calls failing with 503 for --async")
+    args = parser.parse_args(argv)
+    latency: Latency = args.latency
+    spread = ""
+    if args.latency_p99 is not None:
+        latency = lognormal_latency(args.latency, args.latency_p99, seed=0)
+        spread = f" (p99 {args.latency_p99 * 1000:.0f} ms)"
+
+    if args.limiter:
+        df = normalize_dataset(synthetic_restaurants(args.rows))
+        integrator = Integrator()
+        integrator.build_index(df)
+        cities = df["listed_in(city)"].dropna().str.strip().unique()
+        contexts = [
+            integrator.prepare_context(
+                df,
+                UserInput(city=cities[i % len(cities)], price=300 + 100 * (i // len(cities)), diet="veg"),
+                top_k=MAX_RESTAURANTS_IN_PROMPT,
+            )
+            for i in range(args.calls)
+        ]
+        print(
+            f"{args.calls} distinct recommendations on {args.workers} threads, stub latency "
+            f"{args.latency * 1000:.0f} ms{spread}, {args.capacity or 8} calls at once, 429 beyond"
+        )
+        for label, rate, answered, p50, calls, shed, stats in run_limiter(
+            contexts, args.workers, latency, args.capacity or 8, args.api
+        ):
+            print(
+                f"  {label:<18} {rate:7.1f} req/s  {answered:6.1%} from LLM  p50 {p50:7.1f} ms  "
+                f"{calls:5d} upstream calls  {shed:5d} x 429"
+            )
+            if stats is not None:
+                print(
+                    f"  {'':<18} limit {stats['limit']}  queue wait {stats['mean_queue_wait_ms']:.1f} ms mean / "
+                    f"{stats['max_queue_wait_ms']:.1f} max  upstream {stats['mean_upstream_ms']:.1f} ms mean  "
+                    f"{stats['rejected'] + stats['timeouts']} refused"
+                )
+        return
+
+    if args.microbatch:
+        df = normalize_dataset(synthetic_restaurants(args.rows))
+        integrator = Integrator()
+        integrator.build_index(df)
+        cities = df["listed_in(city)"].dropna().str.strip().unique()
+        contexts = [
+            integrator.prepare_context(
+                df,
+                UserInput(city=cities[i % len(cities)], price=300 + 100 * (i // len(cities)), diet="veg"),
+                top_k=MAX_RESTAURANTS_IN_PROMPT,
+            )
+            for i in range(args.calls)
+        ]
+        print(
+            f"{args.calls} distinct recommendations on {args.workers} threads, stub latency "
+            f"{args.latency * 1000:.0f} ms{spread} + 2 ms per generated word, {args.capacity or 'unlimited'} calls at once"
+        )
+        policy = BatchPolicy(max_wait=args.max_wait, max_items=args.max_items)
+        for label, rate, p50, calls, kb in run_microbatch(
+            contexts, args.workers, latency, 0.002, args.capacity or None, policy, args.api
+        ):
+            print(f"  {label:<28} {rate:7.1f} req/s  p50 {p50:7.1f} ms  {calls:5d} upstream calls  {kb:8.1f} KB sent")
+        return
+
+    if args.stream:
+        df = normalize_dataset(synthetic_restaurants(args.rows))
+        integrator = Integrator()
+        integrator.build_index(df)
+        city = df["listed_in(city)"].dropna().str.strip().iloc[0]
+        context = integrator.prepare_context(
+            df, UserInput(city=city, price=800, diet="veg"), top_k=MAX_RESTAURANTS_IN_PROMPT
+        )
+        print(
+            f"stub latency {args.latency * 1000:.0f} ms{spread} to first word, "
+            f"{args.chunk_delay * 1000:.0f} ms per word"
+        )
+        for label, first, last in run_stream(context, latency, args.chunk_delay, api=args.api):
+            print(f"  {label:<22} first {first:8.1f} ms   last {last:8.1f} ms")
+        return
+
+    if args.use_async:
+        df = normalize_dataset(synthetic_restaurants(args.rows))
+        integrator = Integrator()
+        integrator.build_index(df)
+        cities = df["listed_in(city)"].dropna().str.strip().unique()
+        contexts = [
+            integrator.prepare_context(
+                df, UserInput(city=cities[i % len(cities)], price=800, diet="veg"), top_k=MAX_RESTAURANTS_IN_PROMPT
+            )
+            for i in range(args.calls)
+        ]
+        print(
+            f"{args.calls} recommendations over the {args.api} API, stub latency "
+            f"{args.latency * 1000:.0f} ms{spread}, {args.error_rate:.0%} errors"
+        )
+        for label, rate, in_flight in run_async(contexts, args.workers, latency, args.api, args.error_rate):
+            print(f"  {label:<28} {rate:8.1f} req/s  {in_flight:5d} peak in flight")
+        return
+
+    if args.http:
+        print(
+            f"{args.calls} LLM calls, {args.concurrency} concurrent, stub latency {args.latency * 1000:.0f} ms, "
+            f"connection setup {args.connect_latency * 1000:.0f} ms"
+        )
+        for label, rate, connections in run_http(args.calls, args.concurrency, args.latency, args.connect_latency):
+            print(f"  {label:<24} {rate:8.1f} calls/s  {connections:5d} connections")
+        return
+
+    df = with_chains(synthetic_restaurants(args.rows), args.chain_share)
+    cities = df["listed_in(city)"].dropna().str.strip().unique()[:5]
+    queries = [
+        UserInput(city=city, price=price, diet=diet)
+        for city in cities
+        for price in (400, 800, 1500)
+        for diet in ("veg", "non-veg")
+    ]
+    print(f"{len(queries)} Top-{MAX_RESTAURANTS_IN_PROMPT} contexts from {len(df):,} rows")
+    for label, tokens, listed, ms in run(df, queries, args.budget):
+        print(f"  {label:<24} {tokens:7.0f} est. tokens  {listed:5.1f} restaurants  {ms:6.2f} ms/prompt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Phase 4 - LLM Response Cache
+Content-addressed cache for LLM responses: the key is a hash of the final
+prompt, the model and the generation parameters. An in-memory LRU sits in
+front of an optional SQLite file with TTL and size-based eviction.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping, Optional
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_DISK_ENTRIES = 10_000
+DEFAULT_DISK_BYTES = 64 * 1024 * 1024
+
+
+def cache_key(prompt: str, model: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """SHA-256 hex key for (prompt, model, generation params)."""
+    payload = json.dumps(
+        {"prompt": prompt, "model": model, "params": dict(params or {})},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters of a ResponseCache."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class ResponseCache:
+    """
+    Two-level response cache.
+
+    - Memory: LRU of up to max_memory_entries responses.
+    - Disk (if path is set): SQLite table bounded by max_disk_entries and
+      max_disk_bytes; least recently used rows are evicted first.
+
+    Entries older than ttl_seconds are misses on both levels. Safe to share
+    between threads.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        max_disk_entries: int = DEFAULT_DISK_ENTRIES,
+        max_disk_bytes: int = DEFAULT_DISK_BYTES,
+    ):
+        """
+        Args:
+            path: SQLite file for the persistent level. None keeps the cache in memory only.
+            ttl_seconds: Maximum age of a cached response.
+            max_memory_entries: Capacity of the in-memory LRU.
+            max_disk_entries: Maximum rows kept on disk.
+            max_disk_bytes: Maximum total response size kept on disk.
+        """
+        self.path = Path(path) if path else None
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.stats = CacheStats()
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if self.path is not None:
+            self._db = self._open(self.path)
+
+    @staticmethod
+    def _open(path: Path) -> Optional[sqlite3.Connection]:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, "
+                "accessed REAL NOT NULL, size INTEGER NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            return db
+        except (OSError, sqlite3.Error) as e:
+            print(f"LLM cache disabled on disk ({path}): {e}")
+            return None
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created = entry
+                if now - created <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.stats.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT value, created FROM responses WHERE key = ? AND created >= ?",
+                        (key, now - self.ttl_seconds),
+                    ).fetchone()
+                    if row is not None:
+                        self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                        self._remember(key, row[0], row[1])
+                        self.stats.disk_hits += 1
+                        return row[0]
+                except sqlite3.Error as e:
+                    print(f"LLM cache read failed: {e}")
+
+            self.stats.misses += 1
+            return None
+
+    def put(self, key: str, value: str) -> None:
+        """Store a response under key on both levels."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            self.stats.writes += 1
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created, accessed, size) VALUES (?, ?, ?, ?, ?)",
+                    (key, value, now, now, len(value.encode("utf-8"))),
+                )
+                self._evict_disk(now)
+            except sqlite3.Error as e:
+                print(f"LLM cache write failed: {e}")
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+
+    def disk_entries(self) -> int:
+        """Number of rows in the SQLite level (0 without one)."""
+        if self._db is None:
+            return 0
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the SQLite connection; the memory level keeps working."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _remember(self, key: str, value: str, created: float) -> None:
+        """Insert into the memory LRU (caller holds the lock)."""
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _evict_disk(self, now: float) -> None:
+        """Drop expired rows, then least recently used ones over the limits (caller holds the lock)."""
+        expired = self._db.execute(
+            "DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        evicted = 0
+        if count > self.max_disk_entries or total > self.max_disk_bytes:
+            rows = self._db.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+            drop = []
+            for key, size in rows:
+                if count <= self.max_disk_entries and total <= self.max_disk_bytes:
+                    break
+                drop.append((key,))
+                count -= 1
+                total -= size
+            self._db.executemany("DELETE FROM responses WHERE key = ?", drop)
+            evicted = len(drop)
+        self.stats.evictions += max(expired, 0) + evicted
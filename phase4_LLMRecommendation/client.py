@@ -0,0 +1,161 @@
+"""
+Phase 4 - LLM HTTP Client
+Pooled HTTP client for the LLM API. A Recommender owns one client,
+so consecutive and concurrent calls reuse keep-alive connections instead of
+paying DNS + TCP + TLS setup per request, and every call is bounded by
+connect/read timeouts. stream() yields the response text as it is
+generated, over server-sent events. The provider's URL, authentication and
+payload shapes come from its provider, an LLMBackend (see backends; Google
+by default).
+"""
+
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from phase4_LLMRecommendation.backends import (  # noqa: F401 (re-exported)
+    GOOGLE_STUDIO_URL,
+    GoogleStudioBackend,
+    LLMBackend,
+    build_payload,
+    extract_text,
+    stream_url,
+)
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 30.0
+MIN_READ_TIMEOUT = 0.01
+
+
+def iter_sse_data(lines: Iterable[str]) -> Iterator[str]:
+    """Data payloads of the server-sent events in lines (multi-line data joined with newlines)."""
+    data: list[str] = []
+    for line in lines:
+        if not line:
+            if data:
+                yield "\n".join(data)
+                data = []
+        elif line.startswith("data:"):
+            value = line[5:]
+            data.append(value[1:] if value.startswith(" ") else value)
+    if data:
+        yield "\n".join(data)
+
+
+class LLMClient:
+    """
+    Keep-alive connection pool to one LLM endpoint.
+
+    Uses a requests.Session whose adapter keeps up to pool_size idle
+    connections to the host; concurrent callers beyond that still work but
+    their extra connections are not kept. requests speaks HTTP/1.1 only, so
+    reuse comes from keep-alive rather than HTTP/2 multiplexing. Failed
+    calls are not retried here (see resilience.call_with_retries). Safe to
+    share between threads.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        provider: Optional[LLMBackend] = None,
+    ):
+        """
+        Args:
+            url: generateText endpoint (e.g. a local stub server for load
+                 tests); shorthand for provider=GoogleStudioBackend(url).
+            pool_size: Connections kept alive for reuse.
+            connect_timeout: Seconds to establish a connection.
+            read_timeout: Seconds to wait for response data.
+            provider: LLM backend (wire format). Defaults to GoogleStudioBackend.
+        """
+        self.provider = provider or GoogleStudioBackend(url or GOOGLE_STUDIO_URL)
+        self.url = self.provider.url
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def generate(
+        self,
+        prompt: str,
+        api_key: str,
+        params: Optional[Mapping[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Send prompt and return the generated text. timeout (seconds), if
+        given, caps the read timeout for this call.
+
+        Raises:
+            requests.RequestException: On connection errors, timeouts and HTTP errors.
+            KeyError: If the response has no candidate text.
+        """
+        request = self.provider.request(prompt, api_key, params)
+        response = self.session.post(
+            request.url,
+            params=request.query,
+            headers=request.headers,
+            json=request.body,
+            timeout=self._timeout(timeout),
+        )
+        response.raise_for_status()
+        return self.provider.response_text(response.json())
+
+    def stream(
+        self,
+        prompt: str,
+        api_key: str,
+        params: Optional[Mapping[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[str]:
+        """
+        Send prompt to the streaming endpoint and yield text chunks as they
+        arrive. Closing the generator early closes the connection. timeout
+        caps the read timeout as in generate().
+
+        Raises:
+            requests.RequestException: On connection errors, timeouts and HTTP errors.
+            KeyError: If an event has no candidate text.
+        """
+        request = self.provider.request(prompt, api_key, params, stream=True)
+        with self.session.post(
+            request.url,
+            params=request.query,
+            headers=request.headers,
+            json=request.body,
+            timeout=self._timeout(timeout),
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            response.encoding = "utf-8"
+            for data in iter_sse_data(response.iter_lines(decode_unicode=True)):
+                text = self.provider.event_text(data)
+                if text is None:
+                    break
+                if text:
+                    yield text
+
+    def _timeout(self, limit: Optional[float]) -> tuple[float, float]:
+        """(connect, read) timeouts with the read timeout capped at limit."""
+        connect, read = self.timeout
+        if limit is None:
+            return connect, read
+        return connect, max(min(read, limit), MIN_READ_TIMEOUT)
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "LLMClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,101 @@
+"""
+Phase 4 - Fallback Ranker
+Deterministic recommendations computed locally from the filtered candidates,
+served when the LLM cannot answer (retries exhausted or circuit open). Uses
+the Phase 3 ranking score, so the picks are the same restaurants the prompt
+would list first; the reason is templated from rating, votes, cost and
+cuisines instead of written by the model.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from phase1_DataLoading.normalize import parse_cost_series, parse_rating_series, parse_votes_series
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.ranking import CandidateRanker, top_k_order
+from phase3_Integration.view import FilteredView
+from phase4_LLMRecommendation.parser import normalize_name
+
+DEFAULT_FALLBACK_COUNT = 5
+FALLBACK_HEADER = "Our AI recommender is unavailable right now; these are the best matches by rating, popularity and budget:"
+
+
+def _first_item(value: object) -> Optional[str]:
+    """First entry of a comma-separated list cell, or None."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    items = [item.strip() for item in str(value).split(",") if item.strip()]
+    return items[0] if items else None
+
+
+def _reason(row: pd.Series) -> str:
+    parts = []
+    rating = parse_rating_series(pd.Series([row.get("rate")])).iloc[0]
+    if pd.notna(rating):
+        votes = int(parse_votes_series(pd.Series([row.get("votes")])).iloc[0])
+        parts.append(f"Rated {rating:g}/5" + (f" by {votes:,} diners" if votes else ""))
+    cost = parse_cost_series(pd.Series([row.get("approx_cost(for two people)")])).iloc[0]
+    if pd.notna(cost):
+        parts.append(f"about Rs.{int(cost)} for two")
+    cuisines = row.get("cuisines")
+    if isinstance(cuisines, str) and cuisines.strip():
+        parts.append(f"serves {cuisines.strip()}")
+    return (", ".join(parts) or "Matches your filters") + "."
+
+
+class FallbackRanker:
+    """
+    Ranks the candidates of an IntegrationContext without the LLM.
+
+    Rows are scored with CandidateRanker, restaurants sharing a name are
+    listed once, and each pick becomes a record with the same fields as
+    parsed LLM recommendations (see parser), plus row (the filtered_df
+    index label) and fallback=True.
+    """
+
+    def __init__(self, ranker: Optional[CandidateRanker] = None, count: int = DEFAULT_FALLBACK_COUNT):
+        """
+        Args:
+            ranker: Scoring formula. Defaults to CandidateRanker().
+            count: Number of restaurants to recommend.
+        """
+        self.ranker = ranker or CandidateRanker()
+        self.count = count
+
+    def recommend(self, df: pd.DataFrame, user_input: UserInput) -> list[dict]:
+        """Top count distinct restaurants of df as recommendation records, best first."""
+        if df.empty or "name" not in df.columns:
+            return []
+        scores = self.ranker.score(FilteredView(df, np.arange(len(df))), user_input)
+        records: list[dict] = []
+        seen: set[str] = set()
+        for position in top_k_order(scores, len(df)):
+            row = df.iloc[position]
+            name = str(row["name"]).strip()
+            key = normalize_name(name)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            reason = _reason(row)
+            standout = _first_item(row.get("dish_liked"))
+            rank = len(records) + 1
+            records.append({
+                "raw_text": f"{rank}. {name}: {reason}" + (f" Standout: {standout}" if standout else ""),
+                "name_hint": name,
+                "name": name,
+                "reason": reason,
+                "standout": standout,
+                "matched": True,
+                "row": df.index[position],
+                "fallback": True,
+            })
+            if len(records) == self.count:
+                break
+        return records
+
+    @staticmethod
+    def render(records: list[dict]) -> str:
+        """Plain-text answer for records (the raw_response of a fallback result)."""
+        return "\n".join([FALLBACK_HEADER, ""] + [rec["raw_text"] for rec in records])
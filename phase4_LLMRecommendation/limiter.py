@@ -0,0 +1,303 @@
+"""
+Phase 4 - Adaptive Concurrency Limiter
+Bounds the number of LLM calls in flight and adapts the bound to what the
+upstream can take (AIMD): every completed call within the latency norm
+raises the limit by 1/limit (about +1 per round trip while the limit is in
+use); a 429, 5xx or timeout, or a round trip latency_tolerance times slower
+than the long-run average, cuts it by backoff_ratio (at most once per
+round trip, so one burst of failures counts once).
+
+Callers beyond the limit wait in one FIFO queue (threads and coroutines
+alike) of at most max_queue entries, for at most queue_timeout seconds;
+a call that finds the queue full, or waits too long, is refused at once
+with LimiterRejectedError, and the recommender serves its fallback. Stats
+separate time spent queueing from time spent upstream.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+from phase4_LLMRecommendation.resilience import CallRefusedError, is_overload
+
+DEFAULT_INITIAL_LIMIT = 8
+DEFAULT_MAX_LIMIT = 64
+DEFAULT_MAX_QUEUE = 64
+DEFAULT_QUEUE_TIMEOUT = 5.0
+SHORT_RTT_WEIGHT = 0.2  # EWMA weight of a sample in the recent round trip time
+LONG_RTT_WEIGHT = 0.02  # ... and in the long-run average
+
+
+class LimiterRejectedError(CallRefusedError):
+    """Call refused without trying: the limiter's queue is full or the wait timed out."""
+
+
+@dataclass
+class LimiterStats:
+    """Limit, queue and timing counters of an adaptive limiter."""
+
+    limit: int = 0
+    in_flight: int = 0
+    queued: int = 0
+    admitted: int = 0  # Calls let through (at once or after queueing)
+    rejected: int = 0  # Refused because the queue was full
+    timeouts: int = 0  # Gave up waiting in the queue
+    overloads: int = 0  # Calls that ended in 429 / 5xx / timeout
+    decreases: int = 0  # Times the limit was cut
+    completed: int = 0  # Calls that released their slot
+    queue_wait_seconds: float = 0.0  # Total time admitted calls spent queueing
+    max_queue_wait_seconds: float = 0.0
+    upstream_seconds: float = 0.0  # Total time calls held a slot
+    max_upstream_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "overloads": self.overloads,
+            "decreases": self.decreases,
+            "mean_queue_wait_ms": round(1000 * self.queue_wait_seconds / self.admitted, 2) if self.admitted else 0.0,
+            "max_queue_wait_ms": round(1000 * self.max_queue_wait_seconds, 2),
+            "mean_upstream_ms": round(1000 * self.upstream_seconds / self.completed, 2) if self.completed else 0.0,
+            "max_upstream_ms": round(1000 * self.max_upstream_seconds, 2),
+        }
+
+
+class _Waiter:
+    """A queued thread."""
+
+    def __init__(self):
+        self.granted = False
+        self._event = threading.Event()
+
+    def wake(self) -> None:
+        self._event.set()
+
+    def wait(self, timeout: Optional[float]) -> None:
+        self._event.wait(timeout)
+
+
+class _AsyncWaiter:
+    """A queued coroutine (woken thread-safely: slots may be released from any thread)."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.granted = False
+        self._loop = loop
+        self.future = loop.create_future()
+
+    def wake(self) -> None:
+        self._loop.call_soon_threadsafe(self._set)
+
+    def _set(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limiter with a bounded FIFO queue (see module docstring).
+
+    Wrap each upstream call in slot() (threads) or slot_async()
+    (coroutines): the call's exception, if any, is the overload signal.
+    Safe to share between threads and event loops.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = DEFAULT_INITIAL_LIMIT,
+        min_limit: int = 1,
+        max_limit: int = DEFAULT_MAX_LIMIT,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        queue_timeout: float = DEFAULT_QUEUE_TIMEOUT,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            initial_limit: Calls allowed in flight at first.
+            min_limit: Lower bound of the limit.
+            max_limit: Upper bound of the limit.
+            max_queue: Calls allowed to wait for a slot; more are refused.
+            queue_timeout: Longest wait for a slot, in seconds.
+            backoff_ratio: Factor applied to the limit on overload.
+            latency_tolerance: Round trips this many times the long-run
+                               average count as overload.
+            clock: Monotonic time source (injectable for tests).
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._waiters: deque = deque()
+        self._short_rtt: Optional[float] = None
+        self._long_rtt: Optional[float] = None
+        self._last_decrease = float("-inf")
+        self.stats = LimiterStats(limit=int(self._limit))
+
+    @property
+    def limit(self) -> int:
+        with self._lock:
+            return int(self._limit)
+
+    @contextmanager
+    def slot(self, timeout: Optional[float] = None) -> Iterator[None]:
+        """
+        Hold a slot for the duration of the block, waiting for one if
+        needed (at most min(timeout, queue_timeout) seconds).
+
+        Raises:
+            LimiterRejectedError: If the queue is full or the wait times out.
+        """
+        waited = self._acquire(timeout)
+        started = self._clock()
+        self._admitted(waited)
+        error: Optional[BaseException] = None
+        try:
+            yield
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._release(started, error)
+
+    @asynccontextmanager
+    async def slot_async(self, timeout: Optional[float] = None) -> AsyncIterator[None]:
+        """Async slot(): waits in the same queue without blocking the event loop."""
+        waited = await self._acquire_async(timeout)
+        started = self._clock()
+        self._admitted(waited)
+        error: Optional[BaseException] = None
+        try:
+            yield
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._release(started, error)
+
+    def _enqueue(self, waiter) -> bool:
+        """Take a free slot (True) or queue waiter (False). Raises if the queue is full."""
+        with self._lock:
+            if not self._waiters and self._in_flight < int(self._limit):
+                self._in_flight += 1
+                self.stats.in_flight = self._in_flight
+                return True
+            if len(self._waiters) >= self.max_queue:
+                self.stats.rejected += 1
+                raise LimiterRejectedError(f"LLM call queue full ({self.max_queue} waiting)")
+            self._waiters.append(waiter)
+            self.stats.queued = len(self._waiters)
+            return False
+
+    def _give_up(self, waiter) -> bool:
+        """Leave the queue after a timeout or cancellation; False if the slot was granted meanwhile."""
+        with self._lock:
+            if waiter.granted:
+                return False
+            self._waiters.remove(waiter)
+            self.stats.queued = len(self._waiters)
+            return True
+
+    def _wait_limit(self, timeout: Optional[float]) -> float:
+        return self.queue_timeout if timeout is None else max(0.0, min(timeout, self.queue_timeout))
+
+    def _acquire(self, timeout: Optional[float]) -> float:
+        """Take a slot for this thread; returns the seconds spent waiting."""
+        start = self._clock()
+        waiter = _Waiter()
+        if self._enqueue(waiter):
+            return 0.0
+        waiter.wait(self._wait_limit(timeout))
+        if self._give_up(waiter):
+            self._timed_out()
+        return self._clock() - start
+
+    async def _acquire_async(self, timeout: Optional[float]) -> float:
+        """Take a slot for this coroutine; returns the seconds spent waiting."""
+        start = self._clock()
+        waiter = _AsyncWaiter(asyncio.get_running_loop())
+        if self._enqueue(waiter):
+            return 0.0
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self._wait_limit(timeout))
+        except asyncio.TimeoutError:
+            if self._give_up(waiter):
+                self._timed_out()
+        except asyncio.CancelledError:
+            if not self._give_up(waiter):
+                self._release(None, None)  # granted just as we were cancelled: hand the slot on
+            raise
+        return self._clock() - start
+
+    def _timed_out(self) -> None:
+        with self._lock:
+            self.stats.timeouts += 1
+        raise LimiterRejectedError("timed out waiting for an LLM call slot")
+
+    def _admitted(self, waited: float) -> None:
+        with self._lock:
+            self.stats.admitted += 1
+            self.stats.queue_wait_seconds += waited
+            self.stats.max_queue_wait_seconds = max(self.stats.max_queue_wait_seconds, waited)
+
+    def _release(self, started: Optional[float], error: Optional[BaseException]) -> None:
+        """Free a slot, adapt the limit to the call's outcome and admit waiters."""
+        with self._lock:
+            self._in_flight -= 1
+            if started is not None:
+                now = self._clock()
+                rtt = now - started
+                self.stats.completed += 1
+                self.stats.upstream_seconds += rtt
+                self.stats.max_upstream_seconds = max(self.stats.max_upstream_seconds, rtt)
+                if error is None:
+                    self._on_success(rtt, now)
+                elif isinstance(error, Exception) and is_overload(error):
+                    self.stats.overloads += 1
+                    self._decrease(now)
+            self._grant()
+            self.stats.limit = int(self._limit)
+            self.stats.in_flight = self._in_flight
+            self.stats.queued = len(self._waiters)
+
+    def _on_success(self, rtt: float, now: float) -> None:
+        if self._short_rtt is None:
+            self._short_rtt = self._long_rtt = rtt
+        else:
+            self._short_rtt += SHORT_RTT_WEIGHT * (rtt - self._short_rtt)
+            self._long_rtt += LONG_RTT_WEIGHT * (rtt - self._long_rtt)
+        if self._short_rtt > self.latency_tolerance * self._long_rtt:
+            self._decrease(now)
+        elif self._in_flight + 1 >= int(self._limit) // 2:
+            # Only grow while the limit is actually being used
+            self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+
+    def _decrease(self, now: float) -> None:
+        if now - self._last_decrease < (self._short_rtt or 0.0):
+            return  # already cut for this round trip
+        self._last_decrease = now
+        self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+        self.stats.decreases += 1
+
+    def _grant(self) -> None:
+        """Hand free slots to waiters in FIFO order (lock held)."""
+        while self._waiters and self._in_flight < int(self._limit):
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+            self._in_flight += 1
+            waiter.wake()
@@ -0,0 +1,183 @@
+"""
+Phase 4 - Micro-batching
+Distinct queries arriving close together are packed into one upstream call:
+the first query of a batch waits up to max_wait seconds for others to join
+it, the batch is sent as soon as max_items have joined (or the wait is
+over), and each caller gets back its own item's result. max_wait is the
+latency every batched query may pay for fewer, larger calls; max_items
+bounds the size of one combined prompt and answer.
+
+MicroBatcher serves threads (Flask workers, BatchRunner), AsyncMicroBatcher
+coroutines on one event loop. Both are generic: the batch function maps a
+list of items to a list of results in the same order (see
+Recommender._call_batch for the prompt packing).
+"""
+
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Generic, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_MAX_WAIT = 0.02
+DEFAULT_MAX_ITEMS = 8
+
+
+@dataclass
+class BatchPolicy:
+    """When a micro-batch is sent: after max_wait seconds or at max_items, whichever comes first."""
+
+    max_wait: float = DEFAULT_MAX_WAIT
+    max_items: int = DEFAULT_MAX_ITEMS
+
+
+@dataclass
+class MicroBatchStats:
+    """Counters of a micro-batcher."""
+
+    batches: int = 0  # Batch function calls
+    items: int = 0  # Items submitted
+    full: int = 0  # Batches sent because max_items was reached
+    largest: int = 0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "full": self.full,
+            "largest": self.largest,
+            "mean_batch_size": round(self.mean_batch_size, 2),
+        }
+
+
+@dataclass
+class _Batch:
+    """Items collected for one call and its outcome."""
+
+    items: list = field(default_factory=list)
+    full: threading.Event = field(default_factory=threading.Event)
+    done: threading.Event = field(default_factory=threading.Event)
+    results: Optional[Sequence[Any]] = None
+    error: Optional[BaseException] = None
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Thread micro-batcher.
+
+    submit(item) blocks until the batch holding item has been run through
+    fn and returns fn's result for item; if fn raises, every caller in the
+    batch gets the exception. The first caller of a batch (the leader) waits
+    for the batch to fill and runs fn on its own thread, so no background
+    thread is needed.
+    """
+
+    def __init__(self, fn: Callable[[list[T]], Sequence[R]], policy: Optional[BatchPolicy] = None):
+        """
+        Args:
+            fn: Batch function; returns one result per item, in order.
+            policy: Batch size and wait limits. Defaults to BatchPolicy().
+        """
+        self.fn = fn
+        self.policy = policy or BatchPolicy()
+        self._lock = threading.Lock()
+        self._open: Optional[_Batch] = None
+        self.stats = MicroBatchStats()
+
+    def submit(self, item: T) -> R:
+        with self._lock:
+            batch = self._open
+            leader = batch is None
+            if leader:
+                batch = self._open = _Batch()
+            index = len(batch.items)
+            batch.items.append(item)
+            self.stats.items += 1
+            if len(batch.items) >= self.policy.max_items:
+                self._open = None
+                self.stats.full += 1
+                batch.full.set()
+
+        if not leader:
+            batch.done.wait()
+        else:
+            batch.full.wait(self.policy.max_wait)
+            with self._lock:
+                if self._open is batch:
+                    self._open = None
+                self.stats.batches += 1
+                self.stats.largest = max(self.stats.largest, len(batch.items))
+            try:
+                batch.results = self.fn(batch.items)
+            except BaseException as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[index]
+
+
+class AsyncMicroBatcher(Generic[T, R]):
+    """
+    asyncio micro-batcher: submit(item) awaits fn(items) for the batch
+    holding item. Cancelling one caller does not cancel the batch for the
+    others. Use from one event loop.
+    """
+
+    def __init__(self, fn: Callable[[list[T]], Awaitable[Sequence[R]]], policy: Optional[BatchPolicy] = None):
+        """
+        Args:
+            fn: Async batch function; returns one result per item, in order.
+            policy: Batch size and wait limits. Defaults to BatchPolicy().
+        """
+        self.fn = fn
+        self.policy = policy or BatchPolicy()
+        self._open: Optional[tuple[list, asyncio.Future, asyncio.TimerHandle]] = None
+        self._tasks: set[asyncio.Task] = set()
+        self.stats = MicroBatchStats()
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        if self._open is None:
+            items: list = []
+            future = loop.create_future()
+            timer = loop.call_later(self.policy.max_wait, self._send, items, future)
+            self._open = (items, future, timer)
+        items, future, timer = self._open
+        index = len(items)
+        items.append(item)
+        self.stats.items += 1
+        if len(items) >= self.policy.max_items:
+            timer.cancel()
+            self.stats.full += 1
+            self._send(items, future)
+        results = await asyncio.shield(future)
+        return results[index]
+
+    def _send(self, items: list, future: asyncio.Future) -> None:
+        """Close the open batch and run fn on it in a task."""
+        if self._open is not None and self._open[0] is items:
+            self._open = None
+        self.stats.batches += 1
+        self.stats.largest = max(self.stats.largest, len(items))
+
+        async def run() -> None:
+            try:
+                future.set_result(await self.fn(items))
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                future.set_exception(e)
+
+        task = asyncio.ensure_future(run())
+        self._tasks.add(task)  # the loop only keeps weak references to tasks
+        task.add_done_callback(self._tasks.discard)
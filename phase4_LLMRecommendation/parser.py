@@ -0,0 +1,436 @@
+"""
+Phase 4 - Incremental Recommendation Parser
+Turns LLM response text into recommendation records as it streams in. A
+block starts at a line beginning with a number, "-", "•" or "*" and is
+complete once the next block starts (or the response ends), so each
+recommendation can be shown before the rest of the response has arrived.
+
+Each line is read once: the header line gives the name (resolved against
+the candidate restaurants from the prompt) and the start of the reason;
+labelled lines ("Why it's a good match: ...", "Standout dish: ...") fill
+the reason and standout fields.
+
+Prompts built with json_output ask for JSON that refers to candidates by
+id; parse_json_recommendations and JsonRecommendationParser read that and
+validate every object, falling back to the text parser if the model did not
+answer with usable JSON. split_batch_answer cuts the answer to a batched
+prompt (prompt.build_batch_prompt) into one such JSON answer per query.
+"""
+
+import json
+import re
+from typing import Any, Iterable, Optional, Sequence
+
+BLOCK_MARKERS = ("-", "•", "*")
+NO_STRUCTURE_HINT = "See response"
+MIN_CONTAINED_NAME_CHARS = 4  # Shorter candidate names are only matched exactly
+MIN_PREFIX_NAME_CHARS = 8  # Shortest name accepted as a truncated candidate name
+
+_NAME_SEPARATOR = re.compile(r"\s*(?::|\s[-–—]\s)\s*")
+_REASON_LABEL = re.compile(r"^(?:why(?: it[’']?s| it is)?(?: a)?(?: good| great)?(?: match| pick| choice)?|reason)\s*[:\-–—]\s*", re.I)
+_STANDOUT_LABEL = re.compile(
+    r"(?:^|(?<=[\s.;,(]))(?:standout(?: dish(?:es)?)?(?: or feature)?|must[- ]try|signature dish|don[’']?t miss)\s*[:\-–—]\s*",
+    re.I,
+)
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+
+def normalize_name(name: str) -> str:
+    """Case- and punctuation-insensitive form of a restaurant name."""
+    return _NON_ALNUM.sub("", name.casefold())
+
+
+class NameResolver:
+    """
+    Maps restaurant names written by the LLM to candidate names.
+
+    Tried in order: the same name ignoring case and punctuation; the
+    longest candidate name contained in the header line; a candidate whose
+    name starts with the written one (names are truncated in the prompt).
+    """
+
+    def __init__(self, candidates: Iterable[str]):
+        self._by_key: dict[str, str] = {}
+        for name in candidates:
+            key = normalize_name(str(name))
+            if key:
+                self._by_key.setdefault(key, str(name).strip())
+        # Longest first, so "Truffles Koramangala" wins over "Truffles"
+        self._keys = sorted(
+            (k for k in self._by_key if len(k) >= MIN_CONTAINED_NAME_CHARS), key=len, reverse=True
+        )
+
+    def resolve(self, name: str, line: str = "") -> Optional[str]:
+        """Candidate name for name (as written in line), or None."""
+        key = normalize_name(name)
+        if key in self._by_key:
+            return self._by_key[key]
+        line_key = normalize_name(line) if line else key
+        for candidate in self._keys:
+            if candidate in line_key:
+                return self._by_key[candidate]
+        if len(key) >= MIN_PREFIX_NAME_CHARS:
+            for candidate in self._keys:
+                if candidate.startswith(key):
+                    return self._by_key[candidate]
+        return None
+
+
+class RecommendationParser:
+    """
+    Push parser for recommendation text.
+
+    feed() takes response chunks in order and returns the recommendations
+    they completed; close() returns the rest. Splitting the text into chunks
+    anywhere gives the same recommendations as feeding it whole.
+
+    Records have raw_text and name_hint (the header up to the first colon)
+    plus the structured fields name, reason, standout and matched (name is
+    one of candidates). Text without any block becomes a single record
+    with name None.
+    """
+
+    def __init__(self, candidates: Optional[Iterable[str]] = None):
+        """
+        Args:
+            candidates: Restaurant names the LLM chose from (e.g. the prompt
+                        table); recommended names are resolved against them.
+        """
+        self._resolver = NameResolver(candidates) if candidates is not None else None
+        self._partial_line = ""
+        self._current: Optional[dict] = None
+        self._field = "reason"  # Field that unlabelled continuation lines extend
+        self._unstructured: Optional[list[str]] = []  # text seen before any block starts
+
+    def feed(self, chunk: str) -> list[dict]:
+        """Consume a chunk; return the recommendations it completed."""
+        if self._unstructured is not None:
+            self._unstructured.append(chunk)
+        *lines, self._partial_line = (self._partial_line + chunk).split("\n")
+        completed: list[dict] = []
+        for line in lines:
+            self._consume_line(line, completed)
+        # A line starting with a digit always opens a new block, so the current
+        # one can be emitted before the rest of that line arrives. Bullet
+        # lines wait for the whole line: "- Standout: ..." continues a block.
+        if self._current is not None and self._partial_line.lstrip()[:1].isdigit():
+            completed.append(self._current)
+            self._current = None
+        return completed
+
+    def close(self) -> list[dict]:
+        """
+        End of response: return the last recommendation. If no block was
+        found, the whole response becomes one recommendation.
+        """
+        completed: list[dict] = []
+        self._consume_line(self._partial_line, completed)
+        self._partial_line = ""
+        if self._current is not None:
+            completed.append(self._current)
+            self._current = None
+        if self._unstructured is not None:
+            text = "".join(self._unstructured).strip()
+            if text:
+                completed.append({
+                    "raw_text": text,
+                    "name_hint": NO_STRUCTURE_HINT,
+                    "name": None,
+                    "reason": text,
+                    "standout": None,
+                    "matched": False,
+                })
+            self._unstructured = None
+        return completed
+
+    @staticmethod
+    def _starts_block(line: str) -> bool:
+        return bool(line) and (line[0].isdigit() or line.startswith(BLOCK_MARKERS))
+
+    @staticmethod
+    def _is_header(line: str) -> bool:
+        """False for bullet lines that are labelled fields of the current block ("- Standout: ...")."""
+        if line[0].isdigit():
+            return True
+        text = line.lstrip("-•* ").replace("**", "")
+        return not (_REASON_LABEL.match(text) or _STANDOUT_LABEL.match(text))
+
+    def _consume_line(self, line: str, completed: list[dict]) -> None:
+        line = line.strip()
+        if not line:
+            return
+        if self._starts_block(line) and (self._current is None or self._is_header(line)):
+            if self._current is not None:
+                completed.append(self._current)
+            self._current = self._start_block(line)
+            self._unstructured = None
+        elif self._current is not None:
+            self._current["raw_text"] += " " + line
+            self._add_text(line.lstrip("-•* ").replace("**", "").strip())
+
+    def _start_block(self, line: str) -> dict:
+        # Try to extract restaurant name (first meaningful part)
+        rest = line.lstrip("0123456789.-•*) ").strip()
+        text = rest.replace("**", "").strip()
+        parts = _NAME_SEPARATOR.split(text, maxsplit=1)
+        name = parts[0].strip()
+        resolved = self._resolver.resolve(name, text) if self._resolver is not None else None
+        self._current = {
+            "raw_text": line,
+            "name_hint": rest.split(":")[0].strip() if ":" in rest else rest,
+            "name": resolved or name,
+            "reason": "",
+            "standout": None,
+            "matched": resolved is not None,
+        }
+        self._field = "reason"
+        if len(parts) > 1:
+            self._add_text(parts[1])
+        return self._current
+
+    def _add_text(self, text: str) -> None:
+        """Add a line (or the header remainder) to the reason/standout fields."""
+        reason = _REASON_LABEL.match(text)
+        if reason:
+            self._field = "reason"
+            text = text[reason.end():]
+        standout = _STANDOUT_LABEL.search(text)
+        if standout:
+            self._append("reason", text[:standout.start()])
+            self._field = "standout"
+            text = text[standout.end():]
+        self._append(self._field, text)
+
+    def _append(self, field: str, text: str) -> None:
+        text = text.strip()
+        if text:
+            current = self._current[field]
+            self._current[field] = f"{current} {text}" if current else text
+
+
+def validate_record(obj: Any, candidates: Sequence[str], labels: Optional[Sequence] = None) -> Optional[dict]:
+    """
+    Recommendation record for one JSON object, or None if it does not match
+    {"id": <1..len(candidates)>, "reason": str, "standout": str (optional)}.
+    The record has the same fields as text-parsed ones, plus id and (with
+    labels) row: the source DataFrame index label of the candidate.
+    """
+    if not isinstance(obj, dict):
+        return None
+    rid = obj.get("id")
+    if isinstance(rid, str) and rid.strip().isdigit():
+        rid = int(rid)
+    if isinstance(rid, bool) or not isinstance(rid, int) or not 1 <= rid <= len(candidates):
+        return None
+    reason = obj.get("reason")
+    standout = obj.get("standout")
+    if not isinstance(reason, str) or not (standout is None or isinstance(standout, str)):
+        return None
+    name = candidates[rid - 1]
+    reason = reason.strip()
+    standout = (standout or "").strip() or None
+    record = {
+        "raw_text": f"{rid}. {name}: {reason}" + (f" Standout: {standout}" if standout else ""),
+        "name_hint": name,
+        "name": name,
+        "reason": reason,
+        "standout": standout,
+        "matched": True,
+        "id": rid,
+    }
+    if labels is not None:
+        record["row"] = labels[rid - 1]
+    return record
+
+
+def _strip_fence(text: str) -> str:
+    """text without a leading ```json line and a trailing ``` fence."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        if text.rstrip().endswith("```"):
+            text = text.rstrip()[:-3]
+    return text.strip()
+
+
+def _unique_records(objects: Iterable[Any], candidates: Sequence[str], labels: Optional[Sequence]) -> list[dict]:
+    records = []
+    seen = set()
+    for obj in objects:
+        record = validate_record(obj, candidates, labels)
+        if record is not None and record["id"] not in seen:
+            seen.add(record["id"])
+            records.append(record)
+    return records
+
+
+def parse_json_recommendations(
+    raw: str, candidates: Sequence[str], labels: Optional[Sequence] = None
+) -> Optional[list[dict]]:
+    """
+    Records from a complete JSON answer ({"recommendations": [...]}, or a
+    bare list), skipping invalid and repeated objects. None if raw is not
+    such JSON or holds no valid object.
+    """
+    try:
+        data = json.loads(_strip_fence(raw))
+    except ValueError:
+        return None
+    if isinstance(data, dict):
+        data = data.get("recommendations")
+    if not isinstance(data, list):
+        return None
+    return _unique_records(data, candidates, labels) or None
+
+
+def split_batch_answer(raw: str, count: int) -> list[Optional[str]]:
+    """
+    Per-query answers from the answer to a batch of count prompts
+    ({"answers": [{"query": <1..count>, "recommendations": [...]}]}), each
+    re-encoded as a single-prompt JSON answer for parse_json_recommendations.
+    None for queries the answer does not cover (or if raw is not such JSON);
+    the first section given for a query wins.
+    """
+    answers: list[Optional[str]] = [None] * count
+    try:
+        data = json.loads(_strip_fence(raw))
+    except ValueError:
+        return answers
+    sections = data.get("answers") if isinstance(data, dict) else data
+    if not isinstance(sections, list):
+        return answers
+    for section in sections:
+        if not isinstance(section, dict):
+            continue
+        number = section.get("query")
+        if isinstance(number, str) and number.strip().isdigit():
+            number = int(number)
+        if isinstance(number, bool) or not isinstance(number, int) or not 1 <= number <= count:
+            continue
+        recommendations = section.get("recommendations")
+        if isinstance(recommendations, list) and answers[number - 1] is None:
+            answers[number - 1] = json.dumps({"recommendations": recommendations})
+    return answers
+
+
+class JsonRecommendationParser:
+    """
+    Push parser for JSON answers, with the same interface as
+    RecommendationParser.
+
+    Each object of the recommendations array is validated and returned as
+    soon as its closing brace arrives. If the response does not start like
+    JSON, it is handed to RecommendationParser as it streams; if it does but
+    no valid object has been found by close(), the whole text is parsed with
+    RecommendationParser then. structured tells which way it went.
+    """
+
+    def __init__(self, candidates: Sequence[str], labels: Optional[Sequence] = None):
+        """
+        Args:
+            candidates: Names of the prompt table rows; id N is candidates[N - 1].
+            labels: Source DataFrame index labels of the same rows.
+        """
+        self._candidates = list(candidates)
+        self._labels = list(labels) if labels is not None else None
+        self._raw: list[str] = []
+        self._mode: Optional[str] = None  # None until decided, then "json" or "text"
+        self._text_parser: Optional[RecommendationParser] = None
+        self._seen: set[int] = set()
+        # JSON scanner state: unscanned text from the current element on
+        self._json = ""
+        self._pos = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._start: Optional[int] = None  # Start of the array element being read
+        self._start_depth = 0
+
+    @property
+    def structured(self) -> bool:
+        """True once a valid JSON recommendation has been parsed."""
+        return bool(self._seen)
+
+    def feed(self, chunk: str) -> list[dict]:
+        """Consume a chunk; return the recommendations it completed."""
+        self._raw.append(chunk)
+        if self._mode is None:
+            return self._decide()
+        if self._mode == "text":
+            return self._text_parser.feed(chunk)
+        self._json += chunk
+        return self._scan()
+
+    def close(self) -> list[dict]:
+        """End of response: return the remaining recommendations (or the text fallback)."""
+        completed = self._decide() if self._mode is None else []
+        if self._mode == "json":
+            if self._seen:
+                return completed
+            self._text_parser = None  # no usable JSON: parse the whole text instead
+        if self._text_parser is None:
+            self._text_parser = RecommendationParser(self._candidates)
+            completed = self._text_parser.feed("".join(self._raw))
+        self._mode = "text"
+        return completed + self._text_parser.close()
+
+    def _decide(self) -> list[dict]:
+        """Pick JSON or text mode once the first significant character has arrived."""
+        text = "".join(self._raw).lstrip()
+        if text.startswith("`"):
+            if "\n" not in text:
+                return []  # wait for the end of the fence line
+            text = text.split("\n", 1)[1].lstrip()
+        if not text:
+            return []
+        if text[0] in "{[":
+            self._mode = "json"
+            self._json = text
+            return self._scan()
+        self._mode = "text"
+        self._text_parser = RecommendationParser(self._candidates)
+        return self._text_parser.feed("".join(self._raw))
+
+    def _scan(self) -> list[dict]:
+        completed = []
+        text = self._json
+        for i in range(self._pos, len(text)):
+            c = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+            elif c == '"':
+                self._in_string = True
+            elif c in "{[":
+                if c == "{" and self._start is None and self._stack and self._stack[-1] == "[":
+                    self._start = i
+                    self._start_depth = len(self._stack)
+                self._stack.append(c)
+            elif c in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if c == "}" and self._start is not None and len(self._stack) == self._start_depth:
+                    completed.extend(self._element(text[self._start:i + 1]))
+                    self._start = None
+        # Keep only the element being read
+        if self._start is None:
+            self._json, self._pos = "", 0
+        else:
+            self._json = text[self._start:]
+            self._start, self._pos = 0, len(self._json)
+        return completed
+
+    def _element(self, text: str) -> list[dict]:
+        try:
+            obj = json.loads(text)
+        except ValueError:
+            return []
+        record = validate_record(obj, self._candidates, self._labels)
+        if record is None or record["id"] in self._seen:
+            return []
+        self._seen.add(record["id"])
+        return [record]
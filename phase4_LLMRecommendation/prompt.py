@@ -0,0 +1,270 @@
+"""
+Phase 4 - Compact Prompt Builder
+Encodes the candidate restaurants as a compact table (one header row, short
+field values, truncated lists, chains collapsed to one row) and fills the
+prompt up to an explicit token budget. In JSON mode every row gets an id and
+the model is asked to answer with JSON referring to those ids.
+build_batch_prompt packs several JSON prompts into one request that shares
+the instructions and asks for one answer section per query.
+"""
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+import pandas as pd
+
+from phase2_UserInput.user_input import UserInput
+
+# Rough size of a token for English/Latin text; good enough for budgeting.
+CHARS_PER_TOKEN = 4
+DEFAULT_PROMPT_TOKEN_BUDGET = 1200
+DEFAULT_MAX_LIST_ITEMS = 3
+MAX_NAME_CHARS = 40
+NO_MATCHES_TEXT = "No restaurants found matching your criteria."
+JSON_OUTPUT_INSTRUCTIONS = (
+    'Answer with JSON only: {"recommendations":[{"id":<id from the table>,'
+    '"reason":"<why it matches>","standout":"<dish or feature>"}]}'
+)
+BATCH_PREAMBLE = (
+    "You are a restaurant recommendation assistant. For each numbered query below, recommend "
+    "the top 3-5 options from that query's list with a brief reason for each."
+)
+BATCH_JSON_OUTPUT_INSTRUCTIONS = (
+    'Answer with JSON only, one entry per query: {"answers":[{"query":<query number>,'
+    '"recommendations":[{"id":<id from that query\'s table>,"reason":"<why it matches>",'
+    '"standout":"<dish or feature>"}]}]}'
+)
+
+# (source column, header) in output order; missing columns are skipped.
+TABLE_COLUMNS = [
+    ("name", "name"),
+    ("rate", "rating"),
+    ("approx_cost(for two people)", "cost"),
+    ("cuisines", "cuisines"),
+    ("dish_liked", "popular"),
+    ("rest_type", "type"),
+]
+LIST_COLUMNS = {"cuisines", "dish_liked", "rest_type"}
+REST_TYPE_ABBREVIATIONS = {
+    "casual dining": "casual",
+    "quick bites": "quick",
+    "fine dining": "fine",
+    "dessert parlor": "desserts",
+    "beverage shop": "beverages",
+    "food court": "foodcourt",
+    "delivery": "delivery",
+    "microbrewery": "brewery",
+}
+
+_RATING_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimated token count of text (CHARS_PER_TOKEN characters per token)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass
+class CompactPrompt:
+    """A built prompt and what went into it."""
+
+    text: str
+    rows_listed: int  # Table rows (after chain dedupe)
+    restaurants_listed: int  # Source rows covered by those table rows
+    estimated_tokens: int
+    names: list[str] = field(default_factory=list)  # Listed restaurant names (full), in table order
+    row_labels: list = field(default_factory=list)  # Source df index label of each table row
+    json_output: bool = False  # Rows carry ids 1..rows_listed; answer requested as JSON
+    query_text: str = ""  # Preferences and table, without the instructions (see build_batch_prompt)
+
+
+def _clean(value: object) -> str:
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return "-"
+    text = str(value).replace("|", "/").replace("\n", " ").strip()
+    return text or "-"
+
+
+def _format_rating(value: object) -> str:
+    text = _clean(value)
+    match = _RATING_PATTERN.match(text)
+    if match:
+        return match.group(1)
+    return "new" if text.upper() == "NEW" else "-"
+
+
+def _format_cost(value: object) -> str:
+    return _clean(value).replace(",", "").replace("₹", "")
+
+
+def _format_list(value: object, max_items: int, abbreviations: Optional[dict[str, str]] = None) -> str:
+    text = _clean(value)
+    if text == "-":
+        return text
+    items = [item.strip() for item in text.split(",") if item.strip()]
+    if abbreviations:
+        items = [abbreviations.get(item.lower(), item) for item in items]
+    return ",".join(items[:max_items])
+
+
+class CompactPromptBuilder:
+    """
+    Builds the recommendation prompt within a token budget.
+
+    Rows are taken in order (callers pass them best first, see
+    phase3_Integration.ranking) until the next row would exceed the budget;
+    the first row is always listed.
+    Restaurants sharing a name (chains, or one outlet listed under several
+    types) become a single row tagged "xN".
+    With json_output, rows are numbered in an id column and the answer is
+    requested as JSON (see JSON_OUTPUT_INSTRUCTIONS and
+    parser.JsonRecommendationParser), so the model refers to restaurants by
+    id instead of restating names.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET,
+        max_list_items: int = DEFAULT_MAX_LIST_ITEMS,
+        json_output: bool = False,
+    ):
+        """
+        Args:
+            token_budget: Upper bound on the estimated prompt tokens.
+            max_list_items: Items kept from cuisines / dish_liked / rest_type.
+            json_output: Number the rows and request a JSON answer.
+        """
+        self.token_budget = token_budget
+        self.max_list_items = max_list_items
+        self.json_output = json_output
+
+    def build(self, df: pd.DataFrame, user_input: UserInput, total_matches: Optional[int] = None) -> CompactPrompt:
+        """
+        Build the prompt for the candidate rows in df.
+
+        Args:
+            df: Candidate restaurants, best first.
+            user_input: User preferences.
+            total_matches: All matches (df may be a Top-K subset). Defaults to len(df).
+        """
+        total = len(df) if total_matches is None else total_matches
+        columns = [(source, header) for source, header in TABLE_COLUMNS if source in df.columns]
+        rows, counts = self._table_rows(df, columns)
+
+        header = "|".join(h for _, h in columns)
+        if self.json_output:
+            header = f"id|{header}"
+            rows = [f"{i}|{row}" for i, row in enumerate(rows, 1)]
+        # Fixed part: instructions, preferences and the table header.
+        used = estimate_tokens(self._render(user_input, header, [""], total, total))
+        listed: list[str] = []
+        covered = 0
+        for row, count in zip(rows, counts):
+            cost = estimate_tokens(row) + 1
+            if listed and used + cost > self.token_budget:
+                break
+            listed.append(row)
+            covered += count
+            used += cost
+
+        names: list[str] = []
+        labels: list = []
+        if listed and "name" in df.columns:
+            distinct = df["name"].fillna("").astype(str).str.strip()
+            distinct = distinct[~distinct.str.lower().duplicated()].head(len(listed))
+            names = distinct.tolist()
+            labels = distinct.index.tolist()
+        elif listed:
+            labels = df.index[:len(listed)].tolist()
+
+        text = self._render(user_input, header, listed, total, covered)
+        return CompactPrompt(
+            text=text,
+            rows_listed=len(listed),
+            restaurants_listed=covered,
+            estimated_tokens=estimate_tokens(text),
+            names=names,
+            row_labels=labels,
+            json_output=self.json_output,
+            query_text=self._query_text(user_input, header, listed, total, covered),
+        )
+
+    def _table_rows(self, df: pd.DataFrame, columns: list[tuple[str, str]]) -> tuple[list[str], list[int]]:
+        """Encode df as table lines, one per distinct name. Returns (lines, rows per line)."""
+        if df.empty or not columns:
+            return [], []
+        if "name" in df.columns:
+            key = df["name"].fillna("").astype(str).str.strip().str.lower()
+            counts = key.map(key.value_counts()).to_numpy()
+            first = ~key.duplicated().to_numpy()
+        else:
+            counts = [1] * len(df)
+            first = [True] * len(df)
+
+        lines = []
+        line_counts = []
+        records = df[[source for source, _ in columns]].to_dict("records")
+        for record, keep, count in zip(records, first, counts):
+            if not keep:
+                continue
+            fields = []
+            for source, _ in columns:
+                value = record[source]
+                if source == "name":
+                    field = _clean(value)[:MAX_NAME_CHARS]
+                    if count > 1:
+                        field = f"{field} x{count}"
+                elif source == "rate":
+                    field = _format_rating(value)
+                elif source == "approx_cost(for two people)":
+                    field = _format_cost(value)
+                elif source in LIST_COLUMNS:
+                    abbreviations = REST_TYPE_ABBREVIATIONS if source == "rest_type" else None
+                    field = _format_list(value, self.max_list_items, abbreviations)
+                else:
+                    field = _clean(value)
+                fields.append(field)
+            lines.append("|".join(fields))
+            line_counts.append(int(count))
+        return lines, line_counts
+
+    @staticmethod
+    def _query_text(user_input: UserInput, header: str, rows: list[str], total: int, covered: int) -> str:
+        """The user's preferences and the restaurant table."""
+        preferences = f"city={user_input.city}; budget for two=Rs.{user_input.price}; diet={user_input.diet}"
+        if user_input.cuisines:
+            preferences += f"; cuisines={','.join(user_input.cuisines)}"
+        if rows:
+            table = (
+                f"Restaurants ({covered} of {total} matches; rating out of 5, cost for two in Rs., "
+                f'"xN" = N outlets):\n{header}\n' + "\n".join(rows)
+            )
+        else:
+            table = NO_MATCHES_TEXT
+        return f"User: {preferences}\n\n{table}"
+
+    def _render(self, user_input: UserInput, header: str, rows: list[str], total: int, covered: int) -> str:
+        return (
+            "You are a restaurant recommendation assistant. Recommend the top 3-5 options "
+            "from the list with a brief reason for each.\n\n"
+            f"{self._query_text(user_input, header, rows, total, covered)}\n\n"
+            + (
+                JSON_OUTPUT_INSTRUCTIONS
+                if self.json_output and rows
+                else "For each recommendation give the restaurant name, why it matches, and a standout dish or feature."
+            )
+        )
+
+
+def build_batch_prompt(prompts: Sequence[CompactPrompt]) -> str:
+    """
+    One prompt answering several JSON prompts (json_output, at least one row
+    listed): the instructions once, then each prompt's query text under
+    "Query N:" (N = 1..len(prompts)). Answers come back as
+    {"answers": [{"query": N, "recommendations": [...]}]} with ids from
+    query N's table (see parser.split_batch_answer).
+    """
+    sections = "\n\n".join(f"Query {n}:\n{prompt.query_text}" for n, prompt in enumerate(prompts, 1))
+    return f"{BATCH_PREAMBLE}\n\n{sections}\n\n{BATCH_JSON_OUTPUT_INSTRUCTIONS}"
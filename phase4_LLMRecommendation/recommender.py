@@ -1,19 +1,72 @@
 """
 Phase 4 - Recommender (Google Studio AI)
 Builds prompt from IntegrationContext, calls Google Studio API, parses recommendations.
+The provider is pluggable (see backends): Google by default, any
+OpenAI-compatible API, or a local fake server for load tests.
+API calls are retried and guarded by a circuit breaker (see resilience); when
+no answer can be had, recommendations come from the local FallbackRanker.
+With a BatchPolicy, concurrent distinct queries are packed into one API call
+(see microbatch and prompt.build_batch_prompt). With an AdaptiveLimiter,
+calls in flight are bounded by what the upstream currently sustains (see limiter).
 """
 
+import asyncio
 import os
 import json
-import requests
+import threading
+from contextlib import ExitStack, closing
 from dataclasses import dataclass
+from typing import Iterator
 
+import numpy as np
 import pandas as pd
 
 from phase3_Integration.integrator import IntegrationContext
-
-GOOGLE_STUDIO_MODEL = "gemini-1.5-flash"
+from phase3_Integration.ranking import CandidateRanker
+from phase3_Integration.view import FilteredView
+from phase4_LLMRecommendation.async_client import AsyncLLMClient
+from phase4_LLMRecommendation.backends import LLMBackend, create_backend
+from phase4_LLMRecommendation.cache import ResponseCache, cache_key
+from phase4_LLMRecommendation.client import LLMClient
+from phase4_LLMRecommendation.fallback import FallbackRanker
+from phase4_LLMRecommendation.limiter import AdaptiveLimiter
+from phase4_LLMRecommendation.microbatch import AsyncMicroBatcher, BatchPolicy, MicroBatcher
+from phase4_LLMRecommendation.parser import (
+    JsonRecommendationParser,
+    RecommendationParser,
+    parse_json_recommendations,
+    split_batch_answer,
+)
+from phase4_LLMRecommendation.prompt import (
+    DEFAULT_PROMPT_TOKEN_BUDGET,
+    CompactPrompt,
+    CompactPromptBuilder,
+    build_batch_prompt,
+)
+from phase4_LLMRecommendation.resilience import (
+    CircuitBreaker,
+    LLMUnavailableError,
+    RetryPolicy,
+    call_with_retries,
+    call_with_retries_async,
+)
+from phase4_LLMRecommendation.singleflight import AsyncSingleFlight, SingleFlight
+
+GENERATION_PARAMS = {"temperature": 0.7, "maxOutputTokens": 1024}
 MAX_RESTAURANTS_IN_PROMPT = 50
+MAX_BATCH_OUTPUT_TOKENS = 8192
+
+_default_client: LLMClient | None = None
+_default_client_lock = threading.Lock()
+
+
+def default_client() -> LLMClient:
+    """Process-wide LLMClient for callers without their own (created on first use, backend from $LLM_BACKEND)."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = LLMClient(provider=create_backend())
+        return _default_client
 
 
 @dataclass
@@ -21,11 +74,18 @@ class RecommendationResult:
     """Structured output from Google Studio AI recommendation."""
 
     raw_response: str
-    recommendations: list[dict]  # Parsed recommendations with name, rating, etc.
+    recommendations: list[dict]  # Parsed recommendations: name, reason, standout, matched (see parser)
+    prompt_tokens: int = 0  # Estimated prompt size (see prompt.estimate_tokens)
+    cached: bool = False  # Served from the response cache
+    structured: bool = False  # Parsed from a JSON answer (False: heuristic text parsing)
+    fallback: bool = False  # Ranked locally because the LLM was unavailable (never cached)
 
 
 def _build_restaurant_summary(df: pd.DataFrame, max_rows: int = MAX_RESTAURANTS_IN_PROMPT) -> str:
-    """Build a text summary of restaurants for the prompt."""
+    """
+    Build a verbose text summary of restaurants (one labelled line each).
+    Superseded in prompts by CompactPromptBuilder; kept for display/debugging.
+    """
     if df.empty:
         return "No restaurants found matching your criteria."
 
@@ -50,100 +110,172 @@ def _build_restaurant_summary(df: pd.DataFrame, max_rows: int = MAX_RESTAURANTS_
     return "\n".join(lines)
 
 
-def _build_prompt(context: IntegrationContext) -> str:
-    """Build the prompt for Google Studio AI."""
-    ui = context.user_input
-    summary = _build_restaurant_summary(context.filtered_df)
+def _prompt_candidates(context: IntegrationContext, max_rows: int = MAX_RESTAURANTS_IN_PROMPT) -> pd.DataFrame:
+    """
+    Restaurants to list in the prompt. If the context holds more matches than
+    fit (and its view is available), send the Top-K ranked ones rather than
+    the first rows in file order. The rows keep filtered_df's index labels,
+    so structured answers join back to it.
+    """
+    df = context.filtered_df
+    if context.view is not None and len(df) > max_rows:
+        ranked = CandidateRanker().top_k(FilteredView(df, np.arange(len(df))), context.user_input, max_rows)
+        return df.iloc[ranked.positions]
+    return df
 
-    return f"""You are a restaurant recommendation assistant. Given the user's preferences and a list of matching restaurants, recommend the top 3-5 best options with a brief reason for each.
 
-User preferences:
-- City/Area: {ui.city}
-- Budget (approx for two): Rs.{ui.price}
-- Diet: {ui.diet}
+def _build_prompt(context: IntegrationContext, token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET) -> str:
+    """Build the prompt for Google Studio AI within token_budget (estimated)."""
+    return CompactPromptBuilder(token_budget).build(
+        _prompt_candidates(context), context.user_input, context.total_matches
+    ).text
 
-Matching restaurants:
-{summary}
 
-Provide your recommendations in a clear, concise format. For each recommendation, include: restaurant name, why it's a good match, and a standout dish or feature."""
+def _batch_params(count: int) -> dict:
+    """GENERATION_PARAMS with room for count answers (up to MAX_BATCH_OUTPUT_TOKENS)."""
+    tokens = min(GENERATION_PARAMS["maxOutputTokens"] * count, MAX_BATCH_OUTPUT_TOKENS)
+    return {**GENERATION_PARAMS, "maxOutputTokens": tokens}
 
 
-def _call_google_studio_api(prompt: str, api_key: str | None = None) -> str:
+def _resolve_api_key(api_key: str | None, backend: LLMBackend | None = None) -> str:
+    """api_key, else the backend's key variable (GOOGLE_STUDIO_API_KEY by default) from the environment."""
+    env = backend.api_key_env if backend is not None else "GOOGLE_STUDIO_API_KEY"
+    if env is None:
+        return api_key or ""
+    key = api_key or os.environ.get(env)
+    if not key:
+        raise ValueError(f"{env} not set. Set it in environment or pass api_key parameter.")
+    return key
+
+
+def _call_google_studio_api(
+    prompt: str,
+    api_key: str | None = None,
+    client: LLMClient | None = None,
+    policy: RetryPolicy | None = None,
+    breaker: CircuitBreaker | None = None,
+    params: dict | None = None,
+    limiter: AdaptiveLimiter | None = None,
+) -> str:
     """
-    Call Google Studio API for chat completion.
-    Uses GOOGLE_STUDIO_API_KEY from environment if api_key not provided.
+    Call the LLM API (Google Studio unless client has another backend).
+    Uses the backend's API key variable (GOOGLE_STUDIO_API_KEY) from
+    environment if api_key not provided, and the shared default client if
+    client is not provided. Transient failures are retried under policy
+    (default RetryPolicy()), guarded by breaker; each attempt holds a slot
+    of limiter. params defaults to GENERATION_PARAMS.
+
+    Raises:
+        ValueError: If no API key is configured.
+        LLMUnavailableError: If no answer could be obtained.
     """
-    key = api_key or os.environ.get("GOOGLE_STUDIO_API_KEY")
-    if not key:
-        raise ValueError(
-            "GOOGLE_STUDIO_API_KEY not set. Set it in environment or pass api_key parameter."
+    client = client or default_client()
+    key = _resolve_api_key(api_key, client.provider)
+    try:
+        return call_with_retries(
+            lambda time_left: client.generate(prompt, key, params or GENERATION_PARAMS, timeout=time_left),
+            policy or RetryPolicy(),
+            breaker,
+            limiter,
         )
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        raise LLMUnavailableError(str(e)) from e
+
+
+def _stream_google_studio_api(
+    prompt: str,
+    api_key: str | None = None,
+    client: LLMClient | None = None,
+    policy: RetryPolicy | None = None,
+    breaker: CircuitBreaker | None = None,
+    limiter: AdaptiveLimiter | None = None,
+) -> Iterator[str]:
+    """
+    Streaming _call_google_studio_api: yields response text chunks.
+    Opening the stream (up to the first chunk) is retried like a blocking
+    call and raises LLMUnavailableError if it fails; a failure after that
+    propagates as is (the text so far is incomplete, retrying would repeat it).
+    Each attempt takes a slot of limiter once the breaker lets it through;
+    the slot of the attempt that opened the stream is held until the stream
+    ends or the generator is closed, so close it (contextlib.closing) when
+    stopping early.
+    """
+    client = client or default_client()
+    key = _resolve_api_key(api_key, client.provider)
+    policy = policy or RetryPolicy()
+
+    def open_stream(time_left: float) -> tuple[Iterator[str], str | None, ExitStack]:
+        with ExitStack() as stack:
+            if limiter is not None:
+                stack.enter_context(limiter.slot(time_left))
+            chunks = client.stream(prompt, key, GENERATION_PARAMS, timeout=time_left)
+            first = next(chunks, None)
+            return chunks, first, stack.pop_all()  # Keep the slot past this attempt
 
     try:
-        # Use PaLM API format
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/text-bison-001:generateText?key={key}"
-        
-        headers = {
-            "Content-Type": "application/json",
-        }
-        
-        data = {
-            "prompt": {
-                "text": prompt
-            },
-            "temperature": 0.7,
-            "maxOutputTokens": 1024,
-        }
-        
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        
-        result = response.json()
-        return result["candidates"][0]["output"]
+        chunks, first, slot = call_with_retries(open_stream, policy, breaker)
+    except LLMUnavailableError:
+        raise
     except Exception as e:
-        print(f"Google API Error: {e}")
-        # Fallback to mock response for testing
-        return """Based on your preferences for Bangalore with a budget of Rs.800 for vegetarian food, here are my top recommendations:
+        raise LLMUnavailableError(str(e)) from e
+    with slot:
+        try:
+            if first is None:
+                return
+            yield first
+            yield from chunks
+        finally:
+            chunks.close()
+
+
+async def _call_google_studio_api_async(
+    prompt: str,
+    client: AsyncLLMClient,
+    api_key: str | None = None,
+    policy: RetryPolicy | None = None,
+    breaker: CircuitBreaker | None = None,
+    params: dict | None = None,
+    limiter: AdaptiveLimiter | None = None,
+) -> str:
+    """Async _call_google_studio_api over client (same key lookup, retries, limiter and errors)."""
+    key = _resolve_api_key(api_key, client.provider)
+    try:
+        return await call_with_retries_async(
+            lambda time_left: client.generate(prompt, key, params or GENERATION_PARAMS, timeout=time_left),
+            policy or RetryPolicy(),
+            breaker,
+            limiter,
+        )
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        raise LLMUnavailableError(str(e)) from e
 
-1. Saffron Court - Excellent North Indian cuisine with great ambiance. Known for their paneer dishes and dal makhani.
-2. Green Palace - Perfect for South Indian vegetarian options. Their dosa and idli are highly recommended.
-3. Spice Garden - Offers a variety of vegetarian dishes with good service. Try their vegetable biryani.
 
-All these restaurants fit your budget and dietary preferences perfectly!"""
+def _parse_recommendations(raw: str, candidates: list[str] | None = None) -> list[dict]:
+    """
+    Parse LLM raw text into structured recommendations.
+    Extracts restaurant names and content from each recommendation block,
+    resolving names against candidates (the restaurants in the prompt).
+    """
+    parser = RecommendationParser(candidates)
+    return parser.feed(raw) + parser.close()
 
 
-def _parse_recommendations(raw: str) -> list[dict]:
+def _valid_sections(prompts: list[CompactPrompt], sections: list[str | None]) -> list[str | None]:
     """
-    Parse LLM raw text into structured recommendations.
-    Extracts restaurant names and content from each recommendation block.
+    Sections of a batch answer that validate against their prompt; None
+    for the others, so their callers make their own call instead of
+    caching (and serving) a malformed answer.
     """
-    recommendations = []
-    lines = raw.strip().split("\n")
-    current = None
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        # Heuristic: lines starting with number, dash, or "•" often start a new recommendation
-        if line[0].isdigit() or line.startswith("-") or line.startswith("•") or line.startswith("*"):
-            if current:
-                recommendations.append(current)
-            # Try to extract restaurant name (first meaningful part)
-            rest = line.lstrip("0123456789.-•*) ").strip()
-            current = {"raw_text": line, "name_hint": rest.split(":")[0].strip() if ":" in rest else rest}
-        else:
-            if current:
-                current["raw_text"] = current.get("raw_text", "") + " " + line
-
-    if current:
-        recommendations.append(current)
-
-    # Fallback: if no structure found, treat whole response as one recommendation
-    if not recommendations and raw.strip():
-        recommendations = [{"raw_text": raw.strip(), "name_hint": "See response"}]
-
-    return recommendations
+    valid = []
+    for prompt, section in zip(prompts, sections):
+        if section is not None and parse_json_recommendations(section, prompt.names, prompt.row_labels) is None:
+            section = None
+        valid.append(section)
+    return valid
 
 
 class Recommender:
@@ -151,12 +283,84 @@ class Recommender:
     Generates restaurant recommendations using Google Studio AI.
     """
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET,
+        cache: ResponseCache | None = None,
+        client: LLMClient | None = None,
+        async_client: AsyncLLMClient | None = None,
+        coalesce: bool = True,
+        structured_output: bool = True,
+        retry_policy: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        fallback_ranker: FallbackRanker | None = None,
+        batching: BatchPolicy | None = None,
+        backend: LLMBackend | str | None = None,
+        limiter: AdaptiveLimiter | None = None,
+    ):
         """
         Args:
-            api_key: Google Studio API key. If None, uses GOOGLE_STUDIO_API_KEY env var.
+            api_key: API key. If None, uses the backend's variable
+                     (GOOGLE_STUDIO_API_KEY, OPENAI_API_KEY) from the environment.
+            token_budget: Upper bound on the estimated prompt size in tokens.
+            cache: Optional response cache; identical prompts skip the API call.
+            client: HTTP client for the API (pooled, with timeouts). Defaults
+                    to a new LLMClient on backend.
+            async_client: Client used by get_recommendations_async. Defaults
+                          to a new AsyncLLMClient on backend.
+            coalesce: Share one API call between concurrent requests with the
+                      same prompt (see single_flight / async_single_flight).
+            structured_output: Ask for JSON referring to candidates by id and
+                               validate it; text parsing is the fallback.
+            retry_policy: Retries, backoff and deadline of one API call.
+                          Defaults to RetryPolicy().
+            breaker: Circuit breaker shared by all calls of this recommender.
+                     Defaults to CircuitBreaker().
+            fallback_ranker: Local ranking served when the API cannot
+                             answer. Defaults to FallbackRanker().
+            batching: Pack distinct queries arriving within batching.max_wait
+                      seconds (up to batching.max_items) into one API call.
+                      Needs structured_output; off by default. Streams are
+                      never batched.
+            backend: LLM provider, or its name for create_backend ("google",
+                     "openai", "fake"). Defaults to client's (or
+                     async_client's) provider, else $LLM_BACKEND, else
+                     Google. A backend created here is stopped by close().
+            limiter: Adaptive bound on API calls in flight, shared by
+                     blocking, async and streamed calls; calls it refuses
+                     get the fallback. Off by default.
+
+        Raises:
+            ValueError: If client, async_client and backend name different providers.
         """
         self.api_key = api_key
+        self.prompt_builder = CompactPromptBuilder(token_budget, json_output=structured_output)
+        self.cache = cache
+        providers = [c.provider for c in (client, async_client) if c is not None]
+        if isinstance(backend, str):
+            name = backend.strip().lower()
+            backend = next((p for p in providers if p.name == name), backend)
+        self._owned_backend = None
+        if backend is None and providers:
+            backend = providers[0]
+        elif backend is None or isinstance(backend, str):
+            backend = self._owned_backend = create_backend(backend)
+        mismatched = sorted({p.name for p in providers if p.name != backend.name})
+        if mismatched:
+            raise ValueError(f"Client provider(s) {', '.join(mismatched)} do not match backend {backend.name!r}")
+        self._owns_client = client is None
+        self.client = client or LLMClient(provider=backend)
+        self.async_client = async_client or AsyncLLMClient(provider=backend)
+        self.single_flight = SingleFlight() if coalesce else None
+        self.async_single_flight = AsyncSingleFlight() if coalesce else None
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.fallback_ranker = fallback_ranker or FallbackRanker()
+        self.limiter = limiter
+        batching = batching if structured_output else None
+        self.batcher = MicroBatcher(self._call_batch, batching) if batching else None
+        self.async_batcher = AsyncMicroBatcher(self._call_batch_async, batching) if batching else None
 
     def get_recommendations(self, context: IntegrationContext) -> RecommendationResult:
         """
@@ -166,9 +370,201 @@ class Recommender:
             context: IntegrationContext from Phase 3.
 
         Returns:
-            RecommendationResult with raw LLM response and parsed recommendations.
+            RecommendationResult with raw LLM response and parsed
+            recommendations, or with locally ranked ones (fallback=True) if
+            the API could not answer.
+        """
+        prompt, key, raw = self._lookup(context)
+        cached = raw is not None
+        if not cached:
+            def fetch() -> str:
+                fresh = None
+                if self.batcher is not None and prompt.rows_listed:
+                    fresh = self.batcher.submit(prompt)
+                if fresh is None:
+                    fresh = self._call(prompt.text)
+                self._store(key, prompt, fresh)
+                return fresh
+
+            try:
+                raw = fetch() if self.single_flight is None else self.single_flight.do(key, fetch)
+            except LLMUnavailableError as e:
+                print(f"LLM API Error ({self.backend.name}): {e}")
+                return self._fallback_result(context, prompt)
+        return self._result(prompt, raw, cached)
+
+    def stream_recommendations(self, context: IntegrationContext) -> Iterator[dict]:
         """
-        prompt = _build_prompt(context)
-        raw = _call_google_studio_api(prompt, api_key=self.api_key)
-        parsed = _parse_recommendations(raw)
-        return RecommendationResult(raw_response=raw, recommendations=parsed)
+        Streaming get_recommendations: yields each parsed recommendation as
+        soon as the LLM has finished writing it. The complete response is
+        cached once the stream ends. Streams are not coalesced. If the
+        stream cannot be opened, yields the fallback records instead.
+        Backends that cannot stream are answered by get_recommendations.
+        """
+        if not self.backend.supports_streaming:
+            yield from self.get_recommendations(context).recommendations
+            return
+        prompt, key, raw = self._lookup(context)
+        parser = (
+            JsonRecommendationParser(prompt.names, prompt.row_labels)
+            if prompt.json_output
+            else RecommendationParser(prompt.names)
+        )
+        if raw is not None:
+            yield from parser.feed(raw)
+            yield from parser.close()
+            return
+        chunks = []
+        stream = _stream_google_studio_api(
+            prompt.text,
+            api_key=self.api_key,
+            client=self.client,
+            policy=self.retry_policy,
+            breaker=self.breaker,
+            limiter=self.limiter,
+        )
+        try:
+            with closing(stream):
+                for chunk in stream:
+                    chunks.append(chunk)
+                    yield from parser.feed(chunk)
+        except LLMUnavailableError as e:
+            print(f"LLM API Error ({self.backend.name}): {e}")
+            yield from self.fallback_ranker.recommend(context.filtered_df, context.user_input)
+            return
+        yield from parser.close()
+        self._store(key, prompt, "".join(chunks))
+
+    async def get_recommendations_async(self, context: IntegrationContext) -> RecommendationResult:
+        """
+        Async get_recommendations: the API call goes through self.async_client,
+        so many requests can wait on the LLM concurrently in one event loop.
+        Prompt building and cache I/O run on the loop's default executor to
+        keep the loop responsive.
+        """
+        loop = asyncio.get_running_loop()
+        prompt, key, raw = await loop.run_in_executor(None, self._lookup, context)
+        cached = raw is not None
+        if not cached:
+            async def fetch() -> str:
+                fresh = None
+                if self.async_batcher is not None and prompt.rows_listed:
+                    fresh = await self.async_batcher.submit(prompt)
+                if fresh is None:
+                    fresh = await self._call_async(prompt.text)
+                await loop.run_in_executor(None, self._store, key, prompt, fresh)
+                return fresh
+
+            try:
+                if self.async_single_flight is None:
+                    raw = await fetch()
+                else:
+                    raw = await self.async_single_flight.do(key, fetch)
+            except LLMUnavailableError as e:
+                print(f"LLM API Error ({self.backend.name}): {e}")
+                return await loop.run_in_executor(None, self._fallback_result, context, prompt)
+        return self._result(prompt, raw, cached)
+
+    @property
+    def backend(self) -> LLMBackend:
+        """The LLM backend answering get_recommendations (the client's provider)."""
+        return self.client.provider
+
+    def close(self) -> None:
+        """Close the client this recommender created and stop a backend it created (e.g. a fake server)."""
+        if self._owns_client:
+            self.client.close()
+        if self._owned_backend is not None and hasattr(self._owned_backend, "close"):
+            self._owned_backend.close()
+
+    def __enter__(self) -> "Recommender":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _call(self, text: str, params: dict | None = None) -> str:
+        return _call_google_studio_api(
+            text,
+            api_key=self.api_key,
+            client=self.client,
+            policy=self.retry_policy,
+            breaker=self.breaker,
+            params=params,
+            limiter=self.limiter,
+        )
+
+    async def _call_async(self, text: str, params: dict | None = None) -> str:
+        return await _call_google_studio_api_async(
+            text,
+            self.async_client,
+            api_key=self.api_key,
+            policy=self.retry_policy,
+            breaker=self.breaker,
+            params=params,
+            limiter=self.limiter,
+        )
+
+    def _call_batch(self, prompts: list[CompactPrompt]) -> list[str | None]:
+        """
+        Answer prompts with one API call: each prompt's single-prompt JSON
+        answer, or None where the combined answer left it out (its caller
+        then makes its own call). A lone prompt is sent as is.
+        """
+        if len(prompts) == 1:
+            return [self._call(prompts[0].text)]
+        raw = self._call(build_batch_prompt(prompts), _batch_params(len(prompts)))
+        return _valid_sections(prompts, split_batch_answer(raw, len(prompts)))
+
+    async def _call_batch_async(self, prompts: list[CompactPrompt]) -> list[str | None]:
+        """Async _call_batch."""
+        if len(prompts) == 1:
+            return [await self._call_async(prompts[0].text)]
+        raw = await self._call_async(build_batch_prompt(prompts), _batch_params(len(prompts)))
+        return _valid_sections(prompts, split_batch_answer(raw, len(prompts)))
+
+    def _lookup(self, context: IntegrationContext) -> tuple[CompactPrompt, str, str | None]:
+        """Build the prompt; return it with its cache key and the cached response (or None)."""
+        prompt = self.prompt_builder.build(
+            _prompt_candidates(context), context.user_input, context.total_matches
+        )
+        key = cache_key(prompt.text, self.backend.model, GENERATION_PARAMS)
+        return prompt, key, self.cache.get(key) if self.cache is not None else None
+
+    def _store(self, key: str, prompt: CompactPrompt, raw: str) -> None:
+        """
+        Cache a fresh API response if it yields recommendations: valid JSON,
+        or text naming at least one restaurant. Other answers are asked
+        again next time rather than served from the cache.
+        """
+        if self.cache is None:
+            return
+        structured = prompt.json_output and parse_json_recommendations(raw, prompt.names, prompt.row_labels) is not None
+        if structured or any(r.get("name") for r in _parse_recommendations(raw, prompt.names)):
+            self.cache.put(key, raw)
+
+    def _fallback_result(self, context: IntegrationContext, prompt: CompactPrompt) -> RecommendationResult:
+        """Locally ranked recommendations for context (not cached: the next call retries the API)."""
+        records = self.fallback_ranker.recommend(context.filtered_df, context.user_input)
+        return RecommendationResult(
+            raw_response=FallbackRanker.render(records),
+            recommendations=records,
+            prompt_tokens=prompt.estimated_tokens,
+            fallback=True,
+        )
+
+    @staticmethod
+    def _result(prompt: CompactPrompt, raw: str, cached: bool) -> RecommendationResult:
+        recommendations = None
+        if prompt.json_output:
+            recommendations = parse_json_recommendations(raw, prompt.names, prompt.row_labels)
+        structured = recommendations is not None
+        if not structured:
+            recommendations = _parse_recommendations(raw, prompt.names)
+        return RecommendationResult(
+            raw_response=raw,
+            recommendations=recommendations,
+            prompt_tokens=prompt.estimated_tokens,
+            cached=cached,
+            structured=structured,
+        )
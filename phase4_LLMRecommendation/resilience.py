@@ -0,0 +1,287 @@
+"""
+Phase 4 - Call Resilience (retries, deadlines, circuit breaker)
+An LLM call is retried a bounded number of times with jittered exponential
+backoff, all attempts together must finish within a deadline, and a circuit
+breaker stops calling an upstream that keeps failing: while it is open,
+calls fail at once with CircuitOpenError and the caller serves its local
+fallback instead (see fallback.FallbackRanker). An optional adaptive
+limiter (see limiter.AdaptiveLimiter) bounds the attempts in flight.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional, TypeVar
+
+import requests
+
+if TYPE_CHECKING:
+    from phase4_LLMRecommendation.limiter import AdaptiveLimiter
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class LLMUnavailableError(Exception):
+    """The LLM could not produce an answer (after retries, or circuit open)."""
+
+
+class CallRefusedError(LLMUnavailableError):
+    """Call refused without trying (nothing was sent upstream)."""
+
+
+class CircuitOpenError(CallRefusedError):
+    """Call refused without trying: the circuit breaker is open."""
+
+
+def _status_of(error: BaseException) -> Optional[int]:
+    """HTTP status carried by a requests or aiohttp error, if any."""
+    response = getattr(error, "response", None)
+    if response is not None and getattr(response, "status_code", None) is not None:
+        return response.status_code
+    status = getattr(error, "status", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    True for transient failures: connection errors, timeouts, 429 and 5xx.
+    Other HTTP errors and malformed responses fail the same way every time.
+    """
+    if isinstance(error, (requests.ConnectionError, requests.Timeout, asyncio.TimeoutError, TimeoutError)):
+        return True
+    status = _status_of(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    # aiohttp connection errors (aiohttp is optional, so match by name)
+    return any(cls.__name__ == "ClientConnectionError" for cls in type(error).__mro__)
+
+
+def is_overload(error: BaseException) -> bool:
+    """True for signs of an overloaded upstream: timeouts, 429 and 5xx (also as the cause of an LLMUnavailableError)."""
+    if isinstance(error, LLMUnavailableError) and error.__cause__ is not None:
+        return is_overload(error.__cause__)
+    if isinstance(error, (requests.Timeout, asyncio.TimeoutError, TimeoutError)):
+        return True
+    return _status_of(error) in RETRYABLE_STATUS
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Bounded retries with full-jitter exponential backoff.
+
+    Attempt n (from 1) that fails with a retryable error is followed by a
+    random delay in [0, min(max_delay, base_delay * 2**(n-1))]. No attempt
+    starts, and no delay is slept, past deadline seconds from the first one;
+    each attempt's read timeout is capped by the time left.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.25
+    max_delay: float = 2.0
+    deadline: float = 30.0
+
+    def backoff(self, attempt: int) -> float:
+        """Delay after failed attempt number attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+@dataclass
+class CircuitBreakerStats:
+    """State and counters of a circuit breaker."""
+
+    state: str = CLOSED
+    consecutive_failures: int = 0
+    trips: int = 0  # Times the circuit opened
+    rejected: int = 0  # Calls refused while open
+
+    def as_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Closed: calls go through; failure_threshold failures in a row open it.
+    Open: calls are refused for reset_timeout seconds, then one trial call
+    is let through (half-open). Its success closes the circuit, its failure
+    opens it again. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds to stay open before a trial call.
+            clock: Monotonic time source (injectable for tests).
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_started = 0.0
+        self.stats = CircuitBreakerStats()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self.stats.state
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (claims the trial call when half-open)."""
+        with self._lock:
+            now = self._clock()
+            if self.stats.state == OPEN and now - self._opened_at >= self.reset_timeout:
+                self.stats.state = HALF_OPEN
+                self._trial_in_flight = False
+            if self.stats.state == CLOSED:
+                return True
+            if self.stats.state == HALF_OPEN and (
+                not self._trial_in_flight or now - self._trial_started >= self.reset_timeout
+            ):
+                # A trial that never reported back (e.g. cancelled) expires
+                self._trial_in_flight = True
+                self._trial_started = now
+                return True
+            self.stats.rejected += 1
+            return False
+
+    def release(self) -> None:
+        """
+        Give back a call allow() let through that never went upstream (e.g.
+        refused by a limiter): frees the half-open trial for another call.
+        """
+        with self._lock:
+            if self.stats.state == HALF_OPEN:
+                self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.stats.state = CLOSED
+            self.stats.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.stats.consecutive_failures += 1
+            if self.stats.state == HALF_OPEN or (
+                self.stats.state == CLOSED and self.stats.consecutive_failures >= self.failure_threshold
+            ):
+                self.stats.state = OPEN
+                self.stats.trips += 1
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+
+def _next_delay(
+    error: Exception, attempt: int, policy: RetryPolicy, elapsed: float
+) -> Optional[float]:
+    """Backoff before the next attempt, or None if error should be raised."""
+    if attempt >= policy.max_attempts or not is_retryable(error):
+        return None
+    delay = policy.backoff(attempt)
+    return delay if elapsed + delay < policy.deadline else None
+
+
+def call_with_retries(
+    call: Callable[[float], T],
+    policy: RetryPolicy,
+    breaker: Optional[CircuitBreaker] = None,
+    limiter: Optional["AdaptiveLimiter"] = None,
+) -> T:
+    """
+    Run call(time_left) under policy and breaker; time_left is the number
+    of seconds the attempt may take. With a limiter, each attempt the
+    breaker lets through then takes one of its slots (time spent queueing
+    counts against the deadline); a refused attempt never queues, and an
+    attempt the limiter (or call) refuses gives the breaker's trial back.
+
+    Raises:
+        CircuitOpenError: If the breaker refuses an attempt.
+        LimiterRejectedError: If the limiter refuses an attempt.
+        Exception: The last attempt's error once retries are exhausted, the
+                   deadline is reached or the error is not retryable.
+    """
+    start = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError("circuit breaker open")
+        try:
+            with limiter.slot(policy.deadline - (time.monotonic() - start)) if limiter else nullcontext():
+                result = call(policy.deadline - (time.monotonic() - start))
+        except CallRefusedError:
+            if breaker is not None:
+                breaker.release()
+            raise
+        except LLMUnavailableError:
+            raise
+        except Exception as e:
+            if breaker is not None:
+                breaker.record_failure()
+            delay = _next_delay(e, attempt, policy, time.monotonic() - start)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            continue
+        if breaker is not None:
+            breaker.record_success()
+        return result
+
+
+async def call_with_retries_async(
+    call: Callable[[float], Awaitable[T]],
+    policy: RetryPolicy,
+    breaker: Optional[CircuitBreaker] = None,
+    limiter: Optional["AdaptiveLimiter"] = None,
+) -> T:
+    """Async call_with_retries: awaits call(time_left) and sleeps with asyncio."""
+    start = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError("circuit breaker open")
+        try:
+            async with limiter.slot_async(policy.deadline - (time.monotonic() - start)) if limiter else nullcontext():
+                result = await call(policy.deadline - (time.monotonic() - start))
+        except CallRefusedError:
+            if breaker is not None:
+                breaker.release()
+            raise
+        except LLMUnavailableError:
+            raise
+        except Exception as e:
+            if breaker is not None:
+                breaker.record_failure()
+            delay = _next_delay(e, attempt, policy, time.monotonic() - start)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            continue
+        if breaker is not None:
+            breaker.record_success()
+        return result
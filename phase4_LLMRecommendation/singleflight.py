@@ -0,0 +1,113 @@
+"""
+Phase 4 - Request Coalescing (single-flight)
+Concurrent calls for the same key share one execution: the first caller
+(the leader) runs the function, callers arriving while it is in flight wait
+for and receive its result. Nothing is kept once the call finishes; durable
+reuse is the response cache's job.
+
+SingleFlight serves threads (Flask workers), AsyncSingleFlight coroutines
+on one event loop.
+"""
+
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    """Leader/follower counters of a single-flight group."""
+
+    calls: int = 0  # Executions (one per leader)
+    coalesced: int = 0  # Callers that shared a leader's execution
+
+    def as_dict(self) -> dict:
+        return {"calls": self.calls, "coalesced": self.coalesced}
+
+
+class _Call:
+    """An in-flight execution and its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Thread single-flight group.
+
+    do(key, fn) runs fn once per key at a time; concurrent callers with the
+    same key block until it finishes and get the same return value (or the
+    same exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self.stats = SingleFlightStats()
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats.calls += 1
+            else:
+                self.stats.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        """Number of keys currently executing."""
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    asyncio single-flight group.
+
+    do(key, factory) awaits factory() once per key at a time; concurrent
+    callers with the same key await the same task. Cancelling one caller
+    does not cancel the shared call for the others. Use from one event loop.
+    """
+
+    def __init__(self):
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.stats = SingleFlightStats()
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _, key=key: self._tasks.pop(key, None))
+            self.stats.calls += 1
+        else:
+            self.stats.coalesced += 1
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """Number of keys currently executing."""
+        return len(self._tasks)
@@ -0,0 +1,319 @@
+"""
+Phase 4 - Local stub LLM server
+An HTTP server on 127.0.0.1 speaking both the Google generateText API and
+the OpenAI-compatible chat completions API, with injected latency (fixed or
+drawn from a distribution), errors and streaming speed, for load tests and
+benchmarks that must not hit a real provider (see backends.FakeBackend).
+
+Usage:
+  with StubLLMServer(latency=0.05) as server:
+      client = LLMClient(url=server.url)
+  with StubLLMServer(responder=json_answer) as server:  # answers JSON and batched prompts
+      ...
+  with StubLLMServer(latency=lognormal_latency(0.4, 2.0), error_rate=0.02, tokens_per_second=50) as server:
+      client = LLMClient(provider=OpenAICompatibleBackend(server.openai_url))
+"""
+
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional, Union
+
+DEFAULT_STUB_RESPONSE = """1. Stub Dosa House - Crisp dosas well within budget.
+2. Stub Thali Point - Unlimited veg thali."""
+
+
+_QUERY_HEADING = re.compile(r"^Query (\d+):$", re.M)
+
+
+def json_answer(prompt: str) -> str:
+    """
+    A valid JSON answer to a json_output prompt, recommending id 1 (or to a
+    batched prompt, id 1 of every query), for use as a StubLLMServer responder.
+    """
+    recommendations = [{"id": 1, "reason": "Stub pick within budget.", "standout": "Stub special"}]
+    queries = [int(n) for n in _QUERY_HEADING.findall(prompt)]
+    if not queries:
+        return json.dumps({"recommendations": recommendations})
+    return json.dumps({"answers": [{"query": n, "recommendations": recommendations} for n in queries]})
+
+
+def lognormal_latency(median: float, p99: float, seed: Optional[int] = None) -> Callable[[], float]:
+    """Latency sampler: log-normal with the given median and 99th percentile (seconds)."""
+    sigma = math.log(max(p99, median) / median) / 2.326 if median > 0 else 0.0
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def sample() -> float:
+        with lock:
+            return median * math.exp(rng.gauss(0.0, sigma)) if median > 0 else 0.0
+
+    return sample
+
+
+def _prompt_of(request: dict, openai: bool) -> str:
+    """Prompt text of a generateText or chat completions request body."""
+    if openai:
+        return request["messages"][-1]["content"]
+    return request["prompt"]["text"]
+
+
+def _words(text: str) -> list[str]:
+    """text split into words, each with its surrounding whitespace."""
+    return re.findall(r"\s*\S+\s*", text)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512  # listen backlog for bursts of new connections
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body are separate writes; don't hold the body back
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.stats_lock:
+            self.server.connections += 1
+        if self.server.connect_latency:
+            time.sleep(self.server.connect_latency)  # stands in for the TLS handshake
+
+    def do_POST(self) -> None:
+        path = self.path.split("?", 1)[0]
+        openai = path.endswith("/chat/completions")
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        request = json.loads(body) if body else {}
+        streaming = bool(request.get("stream")) if openai else ":stream" in path
+        with self.server.stats_lock:
+            self.server.requests += 1
+            self.server.bytes_received += length
+            self.server.last_body = body
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+        slots = self.server.slots
+        if slots is not None and self.server.overload_status is not None:
+            if not slots.acquire(blocking=False):
+                # Over capacity: shed the call at once
+                with self.server.stats_lock:
+                    self.server.in_flight -= 1
+                    self.server.errors += 1
+                status = self.server.overload_status
+                self._send_json(status, {"error": {"code": status, "message": "stub overloaded"}})
+                return
+        elif slots is not None:
+            slots.acquire()
+        try:
+            latency = self.server.latency
+            latency = latency() if callable(latency) else latency
+            try:
+                if latency:
+                    time.sleep(latency)
+            finally:
+                with self.server.stats_lock:
+                    self.server.in_flight -= 1
+            status = self.server.status
+            if status == 200 and self.server.error_rate:
+                with self.server.stats_lock:
+                    if self.server.rng.random() < self.server.error_rate:
+                        status = self.server.error_status
+                        self.server.errors += 1
+            text = self.server.response_text
+            if status == 200 and self.server.responder is not None:
+                text = self.server.responder(_prompt_of(request, openai))
+            if status == 200 and self.server.chunk_delay and not streaming:
+                # Same generation time as streaming, delivered at once
+                time.sleep(self.server.chunk_delay * (len(_words(text)) - 1))
+        finally:
+            if slots is not None:
+                slots.release()
+        if status == 200 and streaming:
+            self._stream(text, openai)
+            return
+        if status == 200 and openai:
+            self._send_json(200, {
+                "object": "chat.completion",
+                "model": request.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            })
+        elif status == 200:
+            self._send_json(200, {"candidates": [{"output": text}]})
+        else:
+            self._send_json(status, {"error": {"code": status, "message": "stub error"}})
+
+    def _send_json(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream(self, text: str, openai: bool = False) -> None:
+        """Answer with one server-sent event per word, chunk_delay apart (chunked encoding)."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, piece in enumerate(_words(text)):
+            if i and self.server.chunk_delay:
+                time.sleep(self.server.chunk_delay)
+            if openai:
+                event = {"object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {"content": piece}}]}
+            else:
+                event = {"candidates": [{"content": {"parts": [{"text": piece}]}}]}
+            self._send_event(json.dumps(event))
+        if openai:
+            self._send_event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _send_event(self, data: str) -> None:
+        event = f"data: {data}\r\n\r\n".encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(event), event))
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class StubLLMServer:
+    """
+    Threaded stub of the generateText and chat completions endpoints.
+
+    Every POST sleeps latency seconds (a number, or a sampler called per
+    request such as lognormal_latency) and answers with response_text in the
+    shape of the API called: generateText at url, chat completions under
+    openai_url (max_in_flight records the peak number of requests
+    being answered at once); every new connection first sleeps connect_latency
+    seconds, standing in for DNS + TCP + TLS setup to a remote host. Set
+    status to answer with that HTTP error instead; with error_rate, that
+    share of requests (at random) fails with error_status. Streaming calls
+    (...:streamGenerateText, or "stream": true) answer with server-sent
+    events, one word each, chunk_delay seconds apart (1 / tokens_per_second,
+    counting a word as a token) after the initial latency; other calls wait for
+    the same generation time and answer at once. With a responder, the
+    answer is responder(prompt text) instead of response_text. With a
+    capacity, at most that many calls are answered at once and the rest
+    queue, like a provider's concurrency quota (or, with overload_status,
+    are refused at once with that status, like a rate limit). Counts
+    requests, request bytes and accepted connections, so tests can assert
+    upstream call counts and connection reuse.
+    """
+
+    def __init__(
+        self,
+        latency: Union[float, Callable[[], float]] = 0.0,
+        response_text: str = DEFAULT_STUB_RESPONSE,
+        connect_latency: float = 0.0,
+        chunk_delay: float = 0.0,
+        responder: Optional[Callable[[str], str]] = None,
+        capacity: Optional[int] = None,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        tokens_per_second: Optional[float] = None,
+        seed: Optional[int] = None,
+        overload_status: Optional[int] = None,
+    ):
+        """
+        Args:
+            latency: Seconds to wait before answering each request, or a
+                     function returning them (sampled per request).
+            response_text: Generated text returned for every prompt.
+            connect_latency: Seconds added to every new connection.
+            chunk_delay: Seconds between streamed words.
+            responder: Builds the generated text from the prompt (e.g. json_answer).
+            capacity: Calls answered concurrently (None: unlimited).
+            error_rate: Share of requests answered with error_status.
+            error_status: HTTP status of injected errors.
+            tokens_per_second: Generation speed; overrides chunk_delay.
+            seed: Seed for the injected errors.
+            overload_status: HTTP status answered at once to calls over
+                             capacity (None: they queue).
+        """
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.latency = latency
+        self._server.connect_latency = connect_latency
+        self._server.chunk_delay = 1.0 / tokens_per_second if tokens_per_second else chunk_delay
+        self._server.status = 200
+        self._server.response_text = response_text
+        self._server.responder = responder
+        self._server.slots = threading.Semaphore(capacity) if capacity else None
+        self._server.error_rate = error_rate
+        self._server.error_status = error_status
+        self._server.overload_status = overload_status
+        self._server.rng = random.Random(seed)
+        self._server.errors = 0
+        self._server.stats_lock = threading.Lock()
+        self._server.requests = 0
+        self._server.bytes_received = 0
+        self._server.connections = 0
+        self._server.in_flight = 0
+        self._server.max_in_flight = 0
+        self._server.last_body: Optional[bytes] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1beta/models/stub:generateText"
+
+    @property
+    def openai_url(self) -> str:
+        """Base URL of the OpenAI-compatible API (POST {openai_url}/chat/completions)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def status(self) -> int:
+        return self._server.status
+
+    @status.setter
+    def status(self, value: int) -> None:
+        self._server.status = value
+
+    @property
+    def requests(self) -> int:
+        return self._server.requests
+
+    @property
+    def errors(self) -> int:
+        """Requests failed by error_rate or shed over capacity."""
+        return self._server.errors
+
+    @property
+    def bytes_received(self) -> int:
+        return self._server.bytes_received
+
+    @property
+    def connections(self) -> int:
+        return self._server.connections
+
+    @property
+    def max_in_flight(self) -> int:
+        return self._server.max_in_flight
+
+    @property
+    def last_request(self) -> Optional[dict]:
+        body = self._server.last_body
+        return json.loads(body) if body else None
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,121 @@
+"""Phase 4 - Tests for AsyncLLMClient and the async recommendation path."""
+
+import asyncio
+
+import pandas as pd
+import pytest
+import requests
+
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.integrator import IntegrationContext
+from phase4_LLMRecommendation import async_client
+from phase4_LLMRecommendation.async_client import AsyncLLMClient
+from phase4_LLMRecommendation.cache import ResponseCache
+from phase4_LLMRecommendation.recommender import GENERATION_PARAMS, Recommender
+from phase4_LLMRecommendation.resilience import RetryPolicy
+from phase4_LLMRecommendation.stub_server import DEFAULT_STUB_RESPONSE, StubLLMServer
+
+
+@pytest.fixture
+def server():
+    with StubLLMServer() as stub:
+        yield stub
+
+
+@pytest.fixture(params=["aiohttp", "threads"])
+def backend(request, monkeypatch):
+    if request.param == "aiohttp" and not async_client.HAS_AIOHTTP:
+        pytest.skip("aiohttp not installed")
+    monkeypatch.setattr(async_client, "HAS_AIOHTTP", request.param == "aiohttp")
+    return request.param
+
+
+def _context() -> IntegrationContext:
+    df = pd.DataFrame([
+        {"name": "Dosa Corner", "rate": "4.1/5", "approx_cost(for two people)": 300, "cuisines": "South Indian"},
+    ])
+    return IntegrationContext(filtered_df=df, user_input=UserInput(city="Bangalore", price=500, diet="veg"), total_matches=1)
+
+
+async def _generate_all(url: str, n: int) -> list[str]:
+    async with AsyncLLMClient(url=url) as client:
+        return await asyncio.gather(*(client.generate(f"prompt {i}", "key") for i in range(n)))
+
+
+class TestAsyncLLMClient:
+    """Tests for AsyncLLMClient on both backends."""
+
+    def test_backend_name(self, backend):
+        assert AsyncLLMClient().backend == backend
+
+    def test_generate_sends_prompt_and_params(self, server, backend):
+        async def run():
+            async with AsyncLLMClient(url=server.url) as client:
+                return await client.generate("hello", "key", GENERATION_PARAMS)
+
+        assert asyncio.run(run()) == DEFAULT_STUB_RESPONSE
+        assert server.last_request == {"prompt": {"text": "hello"}, **GENERATION_PARAMS}
+
+    def test_concurrent_calls_overlap(self, backend):
+        with StubLLMServer(latency=0.2) as slow:
+            texts = asyncio.run(_generate_all(slow.url, 10))
+        assert texts == [DEFAULT_STUB_RESPONSE] * 10
+        assert slow.requests == 10
+        assert slow.max_in_flight > 1
+
+    def test_http_error_raises(self, server, backend):
+        server.status = 503
+
+        async def run():
+            async with AsyncLLMClient(url=server.url) as client:
+                await client.generate("hello", "key")
+
+        if backend == "aiohttp":
+            import aiohttp
+
+            expected = aiohttp.ClientResponseError
+        else:
+            expected = requests.HTTPError
+        with pytest.raises(expected):
+            asyncio.run(run())
+
+
+class TestRecommenderAsync:
+    """Tests for Recommender.get_recommendations_async."""
+
+    def test_returns_parsed_recommendations(self, server):
+        recommender = Recommender(api_key="key", async_client=AsyncLLMClient(url=server.url))
+        result = asyncio.run(recommender.get_recommendations_async(_context()))
+        assert result.raw_response == DEFAULT_STUB_RESPONSE
+        assert len(result.recommendations) == 2
+        assert not result.cached
+
+    def test_second_call_served_from_cache(self, server, tmp_path):
+        recommender = Recommender(
+            api_key="key",
+            cache=ResponseCache(tmp_path / "llm.sqlite"),
+            async_client=AsyncLLMClient(url=server.url),
+        )
+
+        async def run():
+            first = await recommender.get_recommendations_async(_context())
+            second = await recommender.get_recommendations_async(_context())
+            await recommender.async_client.aclose()
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert not first.cached and second.cached
+        assert second.raw_response == first.raw_response
+        assert server.requests == 1
+
+    def test_api_error_falls_back_to_local_ranking(self, server):
+        server.status = 500
+        recommender = Recommender(
+            api_key="key",
+            async_client=AsyncLLMClient(url=server.url),
+            retry_policy=RetryPolicy(max_attempts=2, base_delay=0),
+        )
+        result = asyncio.run(recommender.get_recommendations_async(_context()))
+        assert result.fallback
+        assert [r["name"] for r in result.recommendations] == ["Dosa Corner"]
+        assert server.requests == 2
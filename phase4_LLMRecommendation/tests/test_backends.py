@@ -0,0 +1,211 @@
+"""Phase 4 - Tests for pluggable LLM backends and the stub server's fault injection."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.integrator import IntegrationContext
+from phase4_LLMRecommendation.async_client import AsyncLLMClient
+from phase4_LLMRecommendation.backends import (
+    FakeBackend,
+    GoogleStudioBackend,
+    OpenAICompatibleBackend,
+    create_backend,
+)
+from phase4_LLMRecommendation.cache import ResponseCache
+from phase4_LLMRecommendation.client import LLMClient
+from phase4_LLMRecommendation.recommender import Recommender
+from phase4_LLMRecommendation.resilience import RetryPolicy
+from phase4_LLMRecommendation.stub_server import DEFAULT_STUB_RESPONSE, StubLLMServer, json_answer, lognormal_latency
+
+
+def _status(client: LLMClient) -> int:
+    """HTTP status of one generate call through client."""
+    try:
+        client.generate("prompt", "key")
+    except requests.HTTPError as e:
+        return e.response.status_code
+    return 200
+
+
+@pytest.fixture
+def server():
+    with StubLLMServer(chunk_delay=0.001) as stub:
+        yield stub
+
+
+@pytest.fixture
+def context():
+    df = pd.DataFrame([
+        {"name": "Dosa Corner", "rate": "4.1/5", "approx_cost(for two people)": 300, "cuisines": "South Indian"},
+        {"name": "Thali Point", "rate": "3.9/5", "approx_cost(for two people)": 400, "cuisines": "North Indian"},
+    ])
+    return IntegrationContext(filtered_df=df, user_input=UserInput(city="BTM", price=500, diet="veg"), total_matches=2)
+
+
+class TestOpenAICompatibleBackend:
+    """Tests for the chat completions wire format."""
+
+    def test_request(self):
+        backend = OpenAICompatibleBackend("http://host/v1/", model="m")
+        request = backend.request("hi", "secret", {"temperature": 0.7, "maxOutputTokens": 64}, stream=True)
+        assert request.url == "http://host/v1/chat/completions"
+        assert request.headers == {"Authorization": "Bearer secret"}
+        assert request.body == {
+            "model": "m",
+            "messages": [{"role": "user", "content": "hi"}],
+            "temperature": 0.7,
+            "max_tokens": 64,
+            "stream": True,
+        }
+
+    def test_events(self):
+        backend = OpenAICompatibleBackend("http://host/v1")
+        assert backend.event_text('{"choices": [{"delta": {"content": "a"}}]}') == "a"
+        assert backend.event_text('{"choices": [{"delta": {"role": "assistant"}}]}') == ""
+        assert backend.event_text("[DONE]") is None
+
+    def test_client_generate_and_stream(self, server):
+        with LLMClient(provider=OpenAICompatibleBackend(server.openai_url, model="m")) as client:
+            assert client.generate("prompt", "key", {"maxOutputTokens": 10}) == DEFAULT_STUB_RESPONSE
+            assert server.last_request["max_tokens"] == 10
+            assert "".join(client.stream("prompt", "key")) == DEFAULT_STUB_RESPONSE
+
+    def test_async_client(self, server):
+        async def run():
+            async with AsyncLLMClient(provider=OpenAICompatibleBackend(server.openai_url)) as client:
+                return await client.generate("prompt", "key")
+
+        assert asyncio.run(run()) == DEFAULT_STUB_RESPONSE
+
+
+class TestBackendSelection:
+    """Recommender and create_backend choosing a backend."""
+
+    def test_default_is_google(self):
+        with patch.dict("os.environ", {"LLM_BACKEND": ""}):
+            assert isinstance(Recommender(api_key="k").backend, GoogleStudioBackend)
+
+    def test_by_name_and_environment(self):
+        assert isinstance(Recommender(api_key="k", backend="openai").backend, OpenAICompatibleBackend)
+        with patch.dict("os.environ", {"LLM_BACKEND": "openai", "OPENAI_MODEL": "local-llama"}):
+            backend = create_backend()
+        assert backend.model == "local-llama"
+        with pytest.raises(ValueError, match="Unknown LLM backend"):
+            create_backend("bard")
+
+    def test_google_model_from_url(self):
+        assert GoogleStudioBackend().model == "text-bison-001"
+        assert GoogleStudioBackend("http://h/v1beta/models/stub:generateText").model == "stub"
+        assert GoogleStudioBackend(model="m").model == "m"
+
+    def test_google_streams_through_blocking_call(self, server, context):
+        recommender = Recommender(api_key="k", client=LLMClient(url=server.url), cache=ResponseCache())
+        assert not recommender.backend.supports_streaming
+        with patch.object(recommender.client, "stream", side_effect=AssertionError("generateText cannot stream")):
+            streamed = list(recommender.stream_recommendations(context))
+        assert streamed == recommender.get_recommendations(context).recommendations
+        assert server.requests == 1
+
+    def test_openai_key_required(self, server, context):
+        recommender = Recommender(backend=OpenAICompatibleBackend(server.openai_url))
+        with patch.dict("os.environ", {"OPENAI_API_KEY": ""}):
+            with pytest.raises(ValueError, match="OPENAI_API_KEY"):
+                recommender.get_recommendations(context)
+
+    def test_clients_share_one_backend(self, server):
+        client = LLMClient(provider=OpenAICompatibleBackend(server.openai_url))
+        with patch("phase4_LLMRecommendation.recommender.create_backend") as create:
+            recommender = Recommender(api_key="k", client=client, backend="openai")
+            assert Recommender(api_key="k", async_client=AsyncLLMClient(provider=client.provider)).backend.name == "openai"
+        create.assert_not_called()
+        assert recommender.async_client.provider is client.provider
+
+    def test_mismatched_client_and_backend_rejected(self, server):
+        with pytest.raises(ValueError, match="do not match backend 'openai'"):
+            Recommender(api_key="k", client=LLMClient(url=server.url), backend="openai")
+        with pytest.raises(ValueError, match="google"):
+            Recommender(api_key="k", client=LLMClient(url=server.url),
+                        async_client=AsyncLLMClient(provider=OpenAICompatibleBackend(server.openai_url)))
+
+    def test_cache_keys_depend_on_model(self, context):
+        cache = ResponseCache()
+        google = Recommender(api_key="k", cache=cache)
+        openai = Recommender(api_key="k", cache=cache, backend=OpenAICompatibleBackend("http://host/v1"))
+        assert google._lookup(context)[1] != openai._lookup(context)[1]
+
+
+class TestFakeBackend:
+    """Recommender against the bundled fake server."""
+
+    def test_recommends_without_key(self, context):
+        backend = FakeBackend(latency=0.01, tokens_per_second=None)
+        try:
+            recommender = Recommender(backend=backend)
+            with patch.dict("os.environ", {"GOOGLE_STUDIO_API_KEY": "", "OPENAI_API_KEY": ""}):
+                result = recommender.get_recommendations(context)
+                streamed = list(recommender.stream_recommendations(context))
+            assert result.structured and result.recommendations[0]["name"] == "Dosa Corner"
+            assert streamed[0]["name"] == "Dosa Corner"
+            assert backend.server.requests == 2
+        finally:
+            backend.close()
+
+    def test_created_backend_stopped_on_close(self, context):
+        with Recommender(backend="fake") as recommender:
+            server = recommender.backend.server
+            assert server.requests == 0
+        with pytest.raises(requests.ConnectionError):
+            requests.get(server.openai_url, timeout=1)
+
+    def test_given_backend_left_running(self, context):
+        backend = FakeBackend(latency=0.0, tokens_per_second=None)
+        try:
+            Recommender(backend=backend).close()
+            assert not Recommender(backend=backend).get_recommendations(context).fallback
+        finally:
+            backend.close()
+
+    def test_injected_errors_serve_fallback(self, context):
+        backend = FakeBackend(latency=0.0, error_rate=1.0)
+        try:
+            recommender = Recommender(backend=backend, retry_policy=RetryPolicy(max_attempts=2, base_delay=0))
+            assert recommender.get_recommendations(context).fallback
+            assert backend.server.errors == 2
+        finally:
+            backend.close()
+
+
+class TestStubFaults:
+    """Latency distribution and error injection of StubLLMServer."""
+
+    def test_lognormal_latency(self):
+        sample = lognormal_latency(0.1, 0.5, seed=1)
+        values = np.array([sample() for _ in range(20000)])
+        assert np.median(values) == pytest.approx(0.1, rel=0.05)
+        assert np.percentile(values, 99) == pytest.approx(0.5, rel=0.1)
+
+    def test_error_rate(self):
+        with StubLLMServer(error_rate=0.3, seed=3, responder=json_answer) as stub:
+            with LLMClient(url=stub.url) as client:
+                failures = 0
+                for _ in range(200):
+                    try:
+                        client.generate("prompt", "key")
+                    except Exception:
+                        failures += 1
+        assert failures == stub.errors
+        assert 30 < failures < 90
+
+    def test_overload_status_sheds_over_capacity(self):
+        with StubLLMServer(latency=0.1, capacity=2, overload_status=429) as stub:
+            with LLMClient(url=stub.url, pool_size=4) as client, ThreadPoolExecutor(4) as pool:
+                outcomes = list(pool.map(lambda _: _status(client), range(4)))
+        assert sorted(outcomes) == [200, 200, 429, 429]
+        assert stub.errors == 2
@@ -0,0 +1,169 @@
+"""Phase 4 - Tests for the LLM response cache."""
+
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.integrator import IntegrationContext
+from phase4_LLMRecommendation.cache import ResponseCache, cache_key
+from phase4_LLMRecommendation.recommender import Recommender
+from phase4_LLMRecommendation.resilience import LLMUnavailableError
+
+
+@pytest.fixture
+def context() -> IntegrationContext:
+    df = pd.DataFrame(
+        {
+            "name": ["Udupi Grand", "Truffles"],
+            "rate": ["4.1/5", "4.5/5"],
+            "approx_cost(for two people)": ["400", "600"],
+            "cuisines": ["South Indian", "Burger"],
+        }
+    )
+    return IntegrationContext(
+        user_input=UserInput(city="Banashankari", price=600, diet="veg"),
+        filtered_df=df,
+        total_matches=len(df),
+    )
+
+
+class TestCacheKey:
+    """Tests for cache_key."""
+
+    def test_stable_and_order_independent(self):
+        a = cache_key("prompt", "model", {"temperature": 0.7, "maxOutputTokens": 1024})
+        b = cache_key("prompt", "model", {"maxOutputTokens": 1024, "temperature": 0.7})
+        assert a == b
+        assert len(a) == 64
+
+    def test_changes_with_inputs(self):
+        base = cache_key("prompt", "model", {"temperature": 0.7})
+        assert cache_key("prompt!", "model", {"temperature": 0.7}) != base
+        assert cache_key("prompt", "other", {"temperature": 0.7}) != base
+        assert cache_key("prompt", "model", {"temperature": 0.2}) != base
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    def test_memory_hit_and_miss(self):
+        cache = ResponseCache()
+        assert cache.get("k") is None
+        cache.put("k", "v")
+        assert cache.get("k") == "v"
+        assert cache.stats.as_dict()["hits"] == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.hit_rate == pytest.approx(0.5)
+
+    def test_memory_lru_eviction(self):
+        cache = ResponseCache(max_memory_entries=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert len(cache) == 2
+        assert cache.stats.evictions == 1
+
+    def test_ttl_expiry(self):
+        cache = ResponseCache(ttl_seconds=10)
+        with patch("phase4_LLMRecommendation.cache.time.time", return_value=1_000.0):
+            cache.put("k", "v")
+        with patch("phase4_LLMRecommendation.cache.time.time", return_value=1_005.0):
+            assert cache.get("k") == "v"
+        with patch("phase4_LLMRecommendation.cache.time.time", return_value=1_011.0):
+            assert cache.get("k") is None
+
+    def test_disk_persists_across_instances(self, tmp_path):
+        path = tmp_path / "llm.sqlite"
+        first = ResponseCache(path)
+        first.put("k", "v")
+        first.close()
+
+        second = ResponseCache(path)
+        assert second.get("k") == "v"
+        assert second.stats.disk_hits == 1
+        assert second.get("k") == "v"
+        assert second.stats.memory_hits == 1
+
+    def test_disk_ttl_expiry(self, tmp_path):
+        path = tmp_path / "llm.sqlite"
+        with patch("phase4_LLMRecommendation.cache.time.time", return_value=1_000.0):
+            ResponseCache(path, ttl_seconds=10).put("k", "v")
+        with patch("phase4_LLMRecommendation.cache.time.time", return_value=1_011.0):
+            assert ResponseCache(path, ttl_seconds=10).get("k") is None
+
+    def test_disk_entry_limit(self, tmp_path):
+        cache = ResponseCache(tmp_path / "llm.sqlite", max_disk_entries=3)
+        for i in range(5):
+            with patch("phase4_LLMRecommendation.cache.time.time", return_value=1_000.0 + i):
+                cache.put(f"k{i}", "v")
+        assert cache.disk_entries() == 3
+        with patch("phase4_LLMRecommendation.cache.time.time", return_value=1_010.0):
+            fresh = ResponseCache(tmp_path / "llm.sqlite")
+            assert fresh.get("k0") is None
+            assert fresh.get("k4") == "v"
+
+    def test_disk_byte_limit(self, tmp_path):
+        cache = ResponseCache(tmp_path / "llm.sqlite", max_disk_bytes=250)
+        for i in range(5):
+            with patch("phase4_LLMRecommendation.cache.time.time", return_value=1_000.0 + i):
+                cache.put(f"k{i}", "x" * 100)
+        assert cache.disk_entries() == 2
+
+    def test_clear(self, tmp_path):
+        cache = ResponseCache(tmp_path / "llm.sqlite")
+        cache.put("k", "v")
+        cache.clear()
+        assert cache.get("k") is None
+        assert cache.disk_entries() == 0
+
+    def test_unwritable_path_falls_back_to_memory(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        cache = ResponseCache(blocker / "llm.sqlite")
+        cache.put("k", "v")
+        assert cache.get("k") == "v"
+        assert cache.disk_entries() == 0
+
+
+class TestRecommenderCache:
+    """Recommender with a ResponseCache."""
+
+    def test_repeat_prompt_skips_api(self, context):
+        recommender = Recommender(api_key="k", cache=ResponseCache())
+        with patch("phase4_LLMRecommendation.recommender._call_google_studio_api") as mock_api:
+            mock_api.return_value = "1. Truffles - great burgers"
+            first = recommender.get_recommendations(context)
+            second = recommender.get_recommendations(context)
+        assert mock_api.call_count == 1
+        assert not first.cached
+        assert second.cached
+        assert second.raw_response == first.raw_response
+        assert second.recommendations == first.recommendations
+
+    def test_different_prompt_misses(self, context):
+        recommender = Recommender(api_key="k", cache=ResponseCache())
+        other = IntegrationContext(
+            user_input=UserInput(city="Banashankari", price=800, diet="veg"),
+            filtered_df=context.filtered_df,
+            total_matches=context.total_matches,
+        )
+        with patch("phase4_LLMRecommendation.recommender._call_google_studio_api") as mock_api:
+            mock_api.return_value = "1. Truffles"
+            recommender.get_recommendations(context)
+            recommender.get_recommendations(other)
+        assert mock_api.call_count == 2
+
+    def test_fallback_not_cached(self, context):
+        cache = ResponseCache()
+        recommender = Recommender(api_key="k", cache=cache)
+        with patch("phase4_LLMRecommendation.recommender._call_google_studio_api") as mock_api:
+            mock_api.side_effect = LLMUnavailableError("down")
+            assert recommender.get_recommendations(context).fallback
+            assert recommender.get_recommendations(context).fallback
+        assert mock_api.call_count == 2
+        assert cache.stats.writes == 0
@@ -0,0 +1,217 @@
+"""Phase 4 - Tests for LLMClient against the local stub server."""
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.integrator import IntegrationContext
+from phase3_Integration.view import FilteredView
+from phase4_LLMRecommendation.cache import ResponseCache
+from phase4_LLMRecommendation.client import LLMClient, extract_text, iter_sse_data, stream_url
+from phase4_LLMRecommendation.recommender import GENERATION_PARAMS, MAX_RESTAURANTS_IN_PROMPT, Recommender
+from phase4_LLMRecommendation.resilience import RetryPolicy
+from phase4_LLMRecommendation.stub_server import DEFAULT_STUB_RESPONSE, StubLLMServer
+
+
+@pytest.fixture
+def server():
+    with StubLLMServer() as stub:
+        yield stub
+
+
+class TestExtractText:
+    """Tests for extract_text."""
+
+    def test_generate_text_shape(self):
+        assert extract_text({"candidates": [{"output": "hi"}]}) == "hi"
+
+    def test_gemini_shape(self):
+        result = {"candidates": [{"content": {"parts": [{"text": "a"}, {"text": "b"}]}}]}
+        assert extract_text(result) == "ab"
+
+    def test_missing_candidates_raises(self):
+        with pytest.raises(KeyError):
+            extract_text({})
+
+
+class TestLLMClient:
+    """Tests for LLMClient."""
+
+    def test_generate_sends_prompt_and_params(self, server):
+        with LLMClient(url=server.url) as client:
+            text = client.generate("hello", "key", GENERATION_PARAMS)
+        assert text == DEFAULT_STUB_RESPONSE
+        assert server.last_request == {"prompt": {"text": "hello"}, **GENERATION_PARAMS}
+
+    def test_reuses_connection(self, server):
+        with LLMClient(url=server.url) as client:
+            for i in range(5):
+                client.generate(f"prompt {i}", "key")
+        assert server.requests == 5
+        assert server.connections == 1
+
+    def test_read_timeout_raises(self):
+        with StubLLMServer(latency=0.5) as slow:
+            with LLMClient(url=slow.url, read_timeout=0.05) as client:
+                with pytest.raises(requests.Timeout):
+                    client.generate("hello", "key")
+
+    def test_http_error_raises(self, server):
+        server.status = 503
+        with LLMClient(url=server.url) as client:
+            with pytest.raises(requests.HTTPError):
+                client.generate("hello", "key")
+
+
+class TestRecommenderClient:
+    """Recommender calls the API through its own client."""
+
+    def test_end_to_end_with_stub(self, server):
+        context = IntegrationContext(
+            filtered_df=pd.DataFrame({"name": ["Stub Dosa House"], "rate": ["4.1/5"]}),
+            user_input=UserInput(city="BTM", price=500, diet="veg"),
+            total_matches=1,
+        )
+        recommender = Recommender(api_key="key", client=LLMClient(url=server.url))
+        result = recommender.get_recommendations(context)
+        assert result.raw_response == DEFAULT_STUB_RESPONSE
+        assert len(result.recommendations) == 2
+        assert "BTM" in server.last_request["prompt"]["text"]
+        first, second = result.recommendations
+        assert (first["name"], first["matched"]) == ("Stub Dosa House", True)
+        assert first["reason"] == "Crisp dosas well within budget."
+        assert (second["name"], second["matched"]) == ("Stub Thali Point", False)
+
+    def test_unreachable_endpoint_falls_back(self, server):
+        url = server.url
+        server.stop()
+        recommender = Recommender(
+            api_key="key",
+            client=LLMClient(url=url, connect_timeout=0.2),
+            retry_policy=RetryPolicy(base_delay=0),
+        )
+        context = IntegrationContext(
+            filtered_df=pd.DataFrame({"name": ["A"]}),
+            user_input=UserInput(city="BTM", price=500, diet="veg"),
+            total_matches=1,
+        )
+        result = recommender.get_recommendations(context)
+        assert result.fallback
+        assert [r["name"] for r in result.recommendations] == ["A"]
+
+
+class TestStreaming:
+    """Tests for LLMClient.stream and Recommender.stream_recommendations."""
+
+    def test_stream_url(self):
+        assert stream_url("https://h/v1beta/models/m:generateText") == "https://h/v1beta/models/m:streamGenerateText"
+
+    def test_iter_sse_data(self):
+        lines = ["event: x", "data: {\"a\": 1}", "", ": comment", "data:one", "data: two", ""]
+        assert list(iter_sse_data(lines)) == ['{"a": 1}', "one\ntwo"]
+
+    def test_stream_yields_chunks(self, server):
+        with LLMClient(url=server.url) as client:
+            chunks = list(client.stream("hello", "key", GENERATION_PARAMS))
+        assert len(chunks) > 1
+        assert "".join(chunks) == DEFAULT_STUB_RESPONSE
+        assert server.last_request == {"prompt": {"text": "hello"}, **GENERATION_PARAMS}
+
+    def test_stream_http_error_raises(self, server):
+        server.status = 503
+        with LLMClient(url=server.url) as client:
+            with pytest.raises(requests.HTTPError):
+                list(client.stream("hello", "key"))
+
+    def test_recommendations_stream_then_cache(self, server, tmp_path):
+        context = IntegrationContext(
+            filtered_df=pd.DataFrame({"name": ["Stub Dosa House"], "rate": ["4.1/5"]}),
+            user_input=UserInput(city="BTM", price=500, diet="veg"),
+            total_matches=1,
+        )
+        recommender = Recommender(
+            api_key="key", client=LLMClient(url=server.url), cache=ResponseCache(tmp_path / "llm.sqlite")
+        )
+        streamed = list(recommender.stream_recommendations(context))
+        assert streamed == recommender.get_recommendations(context).recommendations
+        assert server.requests == 1  # second call served from the cache filled by the stream
+        assert list(recommender.stream_recommendations(context)) == streamed
+        assert server.requests == 1
+
+    def test_stream_failure_falls_back(self, server):
+        server.status = 500
+        context = IntegrationContext(
+            filtered_df=pd.DataFrame({"name": ["A"]}),
+            user_input=UserInput(city="BTM", price=500, diet="veg"),
+            total_matches=1,
+        )
+        recommender = Recommender(
+            api_key="key", client=LLMClient(url=server.url), retry_policy=RetryPolicy(base_delay=0)
+        )
+        streamed = list(recommender.stream_recommendations(context))
+        assert [(r["name"], r["fallback"]) for r in streamed] == [("A", True)]
+        assert server.requests == 3
+
+
+class TestStructuredOutput:
+    """JSON answers referring to candidates by id."""
+
+    def test_json_answer_joins_back_to_rows(self):
+        df = pd.DataFrame({"name": ["Stub Dosa House", "Stub Thali Point"], "rate": ["4.1/5", "3.9/5"]}, index=[7, 9])
+        context = IntegrationContext(filtered_df=df, user_input=UserInput(city="BTM", price=500, diet="veg"), total_matches=2)
+        answer = '{"recommendations": [{"id": 2, "reason": "Unlimited thali.", "standout": "thali"}]}'
+        with StubLLMServer(response_text=answer) as server:
+            recommender = Recommender(api_key="key", client=LLMClient(url=server.url))
+            result = recommender.get_recommendations(context)
+            streamed = list(recommender.stream_recommendations(context))
+            prompt = server.last_request["prompt"]["text"]
+        assert "id|name|rating" in prompt
+        assert '"recommendations"' in prompt
+        assert result.structured
+        assert streamed == result.recommendations
+        (rec,) = result.recommendations
+        assert (rec["name"], rec["standout"], rec["row"]) == ("Stub Thali Point", "thali", 9)
+        assert df.loc[rec["row"], "rate"] == "3.9/5"
+
+    def test_json_answer_joins_back_to_ranked_rows(self):
+        rows = [
+            {"name": f"Stub {i}", "rate": f"{3 + (i % 20) / 10:.1f}/5", "votes": i, "approx_cost(for two people)": 300}
+            for i in range(MAX_RESTAURANTS_IN_PROMPT + 30)
+        ]
+        frame = pd.DataFrame(rows)
+        view = FilteredView(frame, np.arange(len(frame)))
+        context = IntegrationContext(
+            filtered_df=view.to_frame(),
+            user_input=UserInput(city="BTM", price=500, diet="veg"),
+            total_matches=len(frame),
+            view=view,
+        )
+        answer = '{"recommendations": [{"id": 1, "reason": "Top rated."}, {"id": 3, "reason": "Popular."}]}'
+        with StubLLMServer(response_text=answer) as server:
+            result = Recommender(api_key="key", client=LLMClient(url=server.url)).get_recommendations(context)
+        assert result.structured and len(result.recommendations) == 2
+        for rec in result.recommendations:
+            assert context.filtered_df.loc[rec["row"], "name"] == rec["name"]
+        assert result.recommendations[0]["row"] != 0  # the best-ranked row, not the first one
+
+    def test_text_answer_falls_back(self, server):
+        context = IntegrationContext(
+            filtered_df=pd.DataFrame({"name": ["Stub Dosa House"]}),
+            user_input=UserInput(city="BTM", price=500, diet="veg"),
+            total_matches=1,
+        )
+        result = Recommender(api_key="key", client=LLMClient(url=server.url)).get_recommendations(context)
+        assert not result.structured
+        assert [r["name"] for r in result.recommendations] == ["Stub Dosa House", "Stub Thali Point"]
+
+    def test_text_mode(self, server):
+        context = IntegrationContext(
+            filtered_df=pd.DataFrame({"name": ["Stub Dosa House"]}),
+            user_input=UserInput(city="BTM", price=500, diet="veg"),
+            total_matches=1,
+        )
+        recommender = Recommender(api_key="key", client=LLMClient(url=server.url), structured_output=False)
+        recommender.get_recommendations(context)
+        assert "JSON" not in server.last_request["prompt"]["text"]
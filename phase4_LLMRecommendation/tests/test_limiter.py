@@ -0,0 +1,279 @@
+"""Phase 4 - Tests for the adaptive concurrency limiter."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+import requests
+
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.integrator import IntegrationContext
+from phase4_LLMRecommendation.client import LLMClient
+from phase4_LLMRecommendation.limiter import AdaptiveLimiter, LimiterRejectedError
+from phase4_LLMRecommendation.recommender import Recommender, _stream_google_studio_api
+from phase4_LLMRecommendation.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    call_with_retries,
+    call_with_retries_async,
+    is_overload,
+)
+from phase4_LLMRecommendation.stub_server import StubLLMServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+def _run(limiter: AdaptiveLimiter, clock: FakeClock, seconds: float, error: Exception | None = None) -> None:
+    """One call through limiter taking seconds on clock (and failing with error, if given)."""
+    try:
+        with limiter.slot():
+            clock.now += seconds
+            if error is not None:
+                raise error
+    except Exception as e:
+        assert e is error
+
+
+async def _async_ok(time_left):
+    return "ok"
+
+
+@pytest.fixture
+def context():
+    df = pd.DataFrame([
+        {"name": "Dosa Corner", "rate": "4.1/5", "approx_cost(for two people)": 300, "cuisines": "South Indian"},
+    ])
+    return IntegrationContext(filtered_df=df, user_input=UserInput(city="BTM", price=500, diet="veg"), total_matches=1)
+
+
+class TestAIMD:
+    """Limit adaptation."""
+
+    def test_grows_while_used(self):
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial_limit=2, clock=clock)
+        for _ in range(20):
+            _run(limiter, clock, 0.1)
+        assert limiter.limit > 2
+
+    def test_overload_halves_once_per_round_trip(self):
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial_limit=16, clock=clock)
+        _run(limiter, clock, 0.1)
+        for _ in range(3):
+            _run(limiter, clock, 0.01, _http_error(429))
+        assert limiter.limit == 8
+        assert (limiter.stats.overloads, limiter.stats.decreases) == (3, 1)
+        clock.now += 1
+        _run(limiter, clock, 0.01, _http_error(503))
+        assert limiter.limit == 4
+
+    def test_other_errors_leave_limit(self):
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial_limit=4, clock=clock)
+        _run(limiter, clock, 0.1, _http_error(400))
+        _run(limiter, clock, 0.1, ValueError("bad answer"))
+        assert limiter.limit == 4 and limiter.stats.overloads == 0
+
+    def test_latency_inflation_decreases(self):
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial_limit=8, clock=clock, latency_tolerance=2.0)
+        for _ in range(10):
+            _run(limiter, clock, 0.1)
+        limit = limiter.limit
+        for _ in range(10):
+            _run(limiter, clock, 1.0)
+        assert limiter.limit < limit
+
+    def test_bounds(self):
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial_limit=2, min_limit=2, max_limit=3, clock=clock)
+        for _ in range(5):
+            clock.now += 1
+            _run(limiter, clock, 0.01, requests.Timeout())
+        assert limiter.limit == 2
+        for _ in range(50):
+            _run(limiter, clock, 0.01)
+        assert limiter.limit == 3
+
+    def test_is_overload(self):
+        assert is_overload(_http_error(429)) and is_overload(_http_error(502)) and is_overload(TimeoutError())
+        assert not is_overload(_http_error(404)) and not is_overload(requests.ConnectionError())
+
+
+class TestQueue:
+    """Queueing and fast rejection."""
+
+    def test_full_queue_rejects_at_once(self):
+        limiter = AdaptiveLimiter(initial_limit=1, max_queue=1, queue_timeout=5)
+        release = threading.Event()
+        entered = threading.Event()
+
+        def hold():
+            with limiter.slot():
+                entered.set()
+                release.wait()
+
+        def wait_turn():
+            with limiter.slot():
+                pass
+
+        with ThreadPoolExecutor(2) as pool:
+            holder = pool.submit(hold)
+            entered.wait()
+            waiter = pool.submit(wait_turn)
+            while limiter.stats.queued < 1:
+                threading.Event().wait(0.001)
+            with pytest.raises(LimiterRejectedError, match="queue full"):
+                with limiter.slot():
+                    pass
+            release.set()
+            holder.result()
+            waiter.result()
+        assert limiter.stats.rejected == 1
+        assert limiter.stats.admitted == 2
+        assert limiter.stats.max_queue_wait_seconds > 0
+
+    def test_wait_times_out(self):
+        limiter = AdaptiveLimiter(initial_limit=1, queue_timeout=0.05)
+        with limiter.slot():
+            with pytest.raises(LimiterRejectedError, match="timed out"):
+                with limiter.slot():
+                    pass
+        assert limiter.stats.timeouts == 1
+        assert limiter.stats.in_flight == 0 and limiter.stats.queued == 0
+
+    def test_bounds_concurrency(self):
+        limiter = AdaptiveLimiter(initial_limit=3, max_limit=3)
+        lock = threading.Lock()
+        active, peak = [0], [0]
+
+        def work(_):
+            with limiter.slot():
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                threading.Event().wait(0.01)
+                with lock:
+                    active[0] -= 1
+
+        with ThreadPoolExecutor(12) as pool:
+            list(pool.map(work, range(36)))
+        assert peak[0] == 3
+        assert limiter.stats.completed == 36 and limiter.stats.in_flight == 0
+
+    def test_async_waiters_share_queue(self):
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=2)
+        active, peak = [0], [0]
+
+        async def work():
+            async with limiter.slot_async():
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+                await asyncio.sleep(0.01)
+                active[0] -= 1
+
+        async def run():
+            await asyncio.gather(*(work() for _ in range(10)))
+
+        asyncio.run(run())
+        assert peak[0] == 2
+        assert limiter.stats.completed == 10
+        assert limiter.stats.as_dict()["mean_queue_wait_ms"] > 0
+
+
+class TestIntegration:
+    """Limiter inside call_with_retries and the Recommender."""
+
+    def test_each_attempt_takes_a_slot(self):
+        limiter = AdaptiveLimiter(initial_limit=4)
+        attempts = []
+
+        def call(time_left):
+            attempts.append(limiter.stats.in_flight)
+            if len(attempts) < 3:
+                raise _http_error(503)
+            return "ok"
+
+        assert call_with_retries(call, RetryPolicy(max_attempts=3, base_delay=0), limiter=limiter) == "ok"
+        assert attempts == [1, 1, 1]
+        assert limiter.stats.overloads == 2 and limiter.stats.in_flight == 0
+
+    def test_open_breaker_does_not_queue(self):
+        limiter = AdaptiveLimiter(initial_limit=1, max_queue=0)
+        breaker = CircuitBreaker(failure_threshold=1)
+        breaker.record_failure()
+        with limiter.slot():
+            with pytest.raises(CircuitOpenError):
+                call_with_retries(lambda time_left: "ok", RetryPolicy(), breaker, limiter)
+
+            async def run():
+                await call_with_retries_async(_async_ok, RetryPolicy(), breaker, limiter)
+
+            with pytest.raises(CircuitOpenError):
+                asyncio.run(run())
+        assert limiter.stats.rejected == 0 and limiter.stats.admitted == 1
+
+    def test_rejected_trial_released(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now += 10
+        limiter = AdaptiveLimiter(initial_limit=1, max_queue=0)
+        with StubLLMServer() as server, LLMClient(url=server.url) as client:
+            with limiter.slot():
+                with pytest.raises(LimiterRejectedError):
+                    call_with_retries(lambda time_left: "ok", RetryPolicy(), breaker, limiter)
+                with pytest.raises(LimiterRejectedError):
+                    list(_stream_google_studio_api("p", api_key="key", client=client, breaker=breaker, limiter=limiter))
+
+                async def run():
+                    await call_with_retries_async(_async_ok, RetryPolicy(), breaker, limiter)
+
+                with pytest.raises(LimiterRejectedError):
+                    asyncio.run(run())
+            assert breaker.state == "half_open" and breaker.stats.rejected == 0
+            assert call_with_retries(lambda time_left: "ok", RetryPolicy(), breaker, limiter) == "ok"
+        assert breaker.state == "closed"
+
+    def test_rejected_call_serves_fallback(self, context):
+        limiter = AdaptiveLimiter(initial_limit=1, max_queue=0)
+        with StubLLMServer() as server:
+            recommender = Recommender(api_key="key", client=LLMClient(url=server.url), limiter=limiter)
+            with limiter.slot():
+                result = recommender.get_recommendations(context)
+            assert result.fallback and server.requests == 0
+            assert not recommender.get_recommendations(context).fallback
+        assert limiter.stats.rejected == 1
+
+    def test_stream_holds_slot_until_done(self):
+        limiter = AdaptiveLimiter(initial_limit=2)
+        with StubLLMServer(chunk_delay=0.001) as server, LLMClient(url=server.url) as client:
+            chunks = _stream_google_studio_api("prompt", api_key="key", client=client, limiter=limiter)
+            next(chunks)
+            assert limiter.stats.in_flight == 1
+            list(chunks)
+        assert limiter.stats.in_flight == 0 and limiter.stats.completed == 1
+
+    def test_closing_stream_releases_slot(self):
+        limiter = AdaptiveLimiter(initial_limit=2)
+        with StubLLMServer(chunk_delay=0.001) as server, LLMClient(url=server.url) as client:
+            chunks = _stream_google_studio_api("prompt", api_key="key", client=client, limiter=limiter)
+            next(chunks)
+            chunks.close()
+            assert limiter.stats.in_flight == 0 and limiter.stats.overloads == 0
@@ -0,0 +1,210 @@
+"""Phase 4 - Tests for micro-batching of LLM calls."""
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.integrator import IntegrationContext
+from phase4_LLMRecommendation.async_client import AsyncLLMClient
+from phase4_LLMRecommendation.cache import ResponseCache
+from phase4_LLMRecommendation.client import LLMClient
+from phase4_LLMRecommendation.microbatch import AsyncMicroBatcher, BatchPolicy, MicroBatcher
+from phase4_LLMRecommendation.parser import parse_json_recommendations, split_batch_answer
+from phase4_LLMRecommendation.prompt import BATCH_PREAMBLE, CompactPromptBuilder, build_batch_prompt
+from phase4_LLMRecommendation.recommender import Recommender
+from phase4_LLMRecommendation.resilience import RetryPolicy
+from phase4_LLMRecommendation.stub_server import StubLLMServer, json_answer
+
+
+def _context(i: int) -> IntegrationContext:
+    df = pd.DataFrame([
+        {"name": f"Dosa Corner {i}", "rate": "4.1/5", "approx_cost(for two people)": 300, "cuisines": "South Indian"},
+        {"name": f"Thali Point {i}", "rate": "3.9/5", "approx_cost(for two people)": 400, "cuisines": "North Indian"},
+    ])
+    return IntegrationContext(filtered_df=df, user_input=UserInput(city="BTM", price=500 + i, diet="veg"), total_matches=2)
+
+
+@pytest.fixture
+def server():
+    with StubLLMServer(latency=0.05, responder=json_answer) as stub:
+        yield stub
+
+
+def _recommender(server, **kwargs) -> Recommender:
+    return Recommender(
+        api_key="key",
+        client=LLMClient(url=server.url),
+        retry_policy=RetryPolicy(max_attempts=1),
+        **kwargs,
+    )
+
+
+class TestMicroBatcher:
+    """Tests for MicroBatcher (threads)."""
+
+    def test_full_batches_sent_at_once(self):
+        calls = []
+        batcher = MicroBatcher(lambda items: calls.append(list(items)) or [x * 10 for x in items], BatchPolicy(5, 4))
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(batcher.submit, range(8)))
+        assert results == [x * 10 for x in range(8)]
+        assert sorted(len(c) for c in calls) == [4, 4]
+        assert batcher.stats.as_dict() == {"batches": 2, "items": 8, "full": 2, "largest": 4, "mean_batch_size": 4.0}
+
+    def test_partial_batch_sent_after_max_wait(self):
+        batcher = MicroBatcher(lambda items: items, BatchPolicy(max_wait=0.05, max_items=10))
+        with ThreadPoolExecutor(3) as pool:
+            assert list(pool.map(batcher.submit, "abc")) == ["a", "b", "c"]
+        assert batcher.stats.full == 0
+        assert batcher.stats.batches >= 1
+
+    def test_error_reaches_every_caller(self):
+        release = threading.Event()
+
+        def fail(items):
+            release.wait()
+            raise RuntimeError("boom")
+
+        batcher = MicroBatcher(fail, BatchPolicy(max_wait=1, max_items=3))
+        with ThreadPoolExecutor(3) as pool:
+            futures = [pool.submit(batcher.submit, i) for i in range(3)]
+            release.set()
+            for future in futures:
+                with pytest.raises(RuntimeError, match="boom"):
+                    future.result()
+
+
+class TestAsyncMicroBatcher:
+    """Tests for AsyncMicroBatcher."""
+
+    def test_batches_and_demultiplexes(self):
+        calls = []
+
+        async def fn(items):
+            calls.append(list(items))
+            await asyncio.sleep(0.01)
+            return [x * 10 for x in items]
+
+        async def run():
+            batcher = AsyncMicroBatcher(fn, BatchPolicy(max_wait=0.05, max_items=4))
+            return await asyncio.gather(*(batcher.submit(i) for i in range(6))), batcher
+
+        results, batcher = asyncio.run(run())
+        assert results == [x * 10 for x in range(6)]
+        assert calls == [[0, 1, 2, 3], [4, 5]]
+        assert (batcher.stats.batches, batcher.stats.full) == (2, 1)
+
+
+class TestBatchPrompt:
+    """Tests for build_batch_prompt and split_batch_answer."""
+
+    def test_round_trip(self):
+        builder = CompactPromptBuilder(json_output=True)
+        prompts = [builder.build(c.filtered_df, c.user_input, c.total_matches) for c in map(_context, range(3))]
+        text = build_batch_prompt(prompts)
+        assert text.count(BATCH_PREAMBLE) == 1
+        assert "Query 3:\nUser: city=BTM; budget for two=Rs.502" in text
+        assert len(text) < sum(len(p.text) for p in prompts)  # instructions sent once
+
+        answers = split_batch_answer(json_answer(text), 3)
+        for prompt, answer in zip(prompts, answers):
+            records = parse_json_recommendations(answer, prompt.names, prompt.row_labels)
+            assert records[0]["name"] == prompt.names[0]
+
+    def test_missing_and_invalid_sections(self):
+        raw = json.dumps({"answers": [
+            {"query": "2", "recommendations": [{"id": 1, "reason": "r"}]},
+            {"query": 2, "recommendations": []},
+            {"query": 9, "recommendations": []},
+            {"recommendations": []},
+        ]})
+        assert split_batch_answer(raw, 3) == [None, '{"recommendations": [{"id": 1, "reason": "r"}]}', None]
+        assert split_batch_answer("Sorry, I cannot help.", 2) == [None, None]
+
+
+class TestRecommenderBatching:
+    """Recommender with batching against the stub server."""
+
+    def test_concurrent_queries_share_calls(self, server):
+        cache = ResponseCache()
+        recommender = _recommender(server, cache=cache, batching=BatchPolicy(max_wait=0.2, max_items=8))
+        contexts = [_context(i) for i in range(8)]
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(recommender.get_recommendations, contexts))
+        assert server.requests == 1
+        assert [r.recommendations[0]["name"] for r in results] == [f"Dosa Corner {i}" for i in range(8)]
+        assert all(r.structured and not r.fallback for r in results)
+        assert cache.stats.writes == 8
+
+        assert recommender.get_recommendations(contexts[3]).cached  # cached per query
+        assert server.requests == 1
+
+    def test_uncovered_query_gets_its_own_call(self, server):
+        def forget_second(prompt):
+            answer = json.loads(json_answer(prompt))
+            if "answers" in answer:
+                answer["answers"] = [a for a in answer["answers"] if a["query"] != 2]
+            return json.dumps(answer)
+
+        server._server.responder = forget_second
+        recommender = _recommender(server, batching=BatchPolicy(max_wait=0.2, max_items=2))
+        with ThreadPoolExecutor(2) as pool:
+            results = list(pool.map(recommender.get_recommendations, [_context(0), _context(1)]))
+        assert all(r.structured for r in results)
+        assert server.requests == 2
+
+    def test_invalid_section_not_cached(self, server):
+        def garble_second(prompt):
+            answer = json.loads(json_answer(prompt))
+            for section in answer.get("answers", []):
+                if section["query"] == 2:
+                    section["recommendations"] = [{"id": 99, "reason": "Not a candidate."}]
+            return json.dumps(answer)
+
+        server._server.responder = garble_second
+        cache = ResponseCache()
+        recommender = _recommender(server, cache=cache, batching=BatchPolicy(max_wait=0.2, max_items=2))
+        with ThreadPoolExecutor(2) as pool:
+            results = list(pool.map(recommender.get_recommendations, [_context(0), _context(1)]))
+        assert all(r.structured for r in results)
+        assert [r.recommendations[0]["name"] for r in results] == ["Dosa Corner 0", "Dosa Corner 1"]
+        assert server.requests == 2  # the garbled query got its own call
+        assert cache.stats.writes == 2
+
+    def test_unparseable_answer_not_cached(self, server):
+        server._server.responder = lambda prompt: "Sorry, I cannot help with that."
+        cache = ResponseCache()
+        recommender = _recommender(server, cache=cache)
+        assert not recommender.get_recommendations(_context(0)).structured
+        assert cache.stats.writes == 0
+        recommender.get_recommendations(_context(0))
+        assert server.requests == 2
+
+    def test_failed_batch_falls_back(self, server):
+        server.status = 503
+        recommender = _recommender(server, batching=BatchPolicy(max_wait=0.2, max_items=4))
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(recommender.get_recommendations, [_context(i) for i in range(4)]))
+        assert all(r.fallback for r in results)
+        assert server.requests == 1
+
+    def test_async_queries_share_calls(self, server):
+        async def run():
+            async with AsyncLLMClient(url=server.url) as client:
+                recommender = _recommender(
+                    server, async_client=client, batching=BatchPolicy(max_wait=0.2, max_items=8)
+                )
+                return await asyncio.gather(*(recommender.get_recommendations_async(_context(i)) for i in range(5)))
+
+        results = asyncio.run(run())
+        assert server.requests == 1
+        assert [r.recommendations[0]["name"] for r in results] == [f"Dosa Corner {i}" for i in range(5)]
+
+    def test_off_without_structured_output(self, server):
+        recommender = _recommender(server, structured_output=False, batching=BatchPolicy())
+        assert recommender.batcher is None and recommender.async_batcher is None
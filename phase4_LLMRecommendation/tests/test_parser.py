@@ -0,0 +1,211 @@
+"""Phase 4 - Tests for the incremental recommendation parser."""
+
+import pytest
+
+from phase4_LLMRecommendation.parser import (
+    NO_STRUCTURE_HINT,
+    JsonRecommendationParser,
+    NameResolver,
+    RecommendationParser,
+    normalize_name,
+    parse_json_recommendations,
+    validate_record,
+)
+from phase4_LLMRecommendation.recommender import _parse_recommendations
+
+RESPONSE = """Here are my picks:
+
+1. Meghana Foods: Generous biryani portions.
+   Standout: paneer biryani.
+2. Vidyarthi Bhavan - Crisp dosas.
+- Corner House: Desserts
+  that are worth the wait.
+"""
+
+
+MARKDOWN_RESPONSE = """1. **Meghana Foods**
+   - Why it's a good match: Generous portions
+     that fit the budget.
+   - Standout dish: Paneer biryani
+2. **Vidyarthi Bhavan (Basavanagudi)** - Crisp dosas. Must-try: benne masala dosa.
+3. Unknown Diner: Good coffee.
+"""
+
+CANDIDATES = ["Meghana Foods", "Vidyarthi Bhavan", "Brahmin's Coffee Bar"]
+
+
+def _feed_all(chunks: list[str], candidates=None) -> list[dict]:
+    parser = RecommendationParser(candidates)
+    result = []
+    for chunk in chunks:
+        result.extend(parser.feed(chunk))
+    return result + parser.close()
+
+
+class TestRecommendationParser:
+    """Tests for RecommendationParser."""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 16, 1000])
+    @pytest.mark.parametrize("text", [RESPONSE, MARKDOWN_RESPONSE])
+    def test_any_chunking_matches_whole_text(self, text, size):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        assert _feed_all(chunks, CANDIDATES) == _feed_all([text], CANDIDATES)
+
+    def test_blocks(self):
+        result = _feed_all([RESPONSE])
+        assert [r["name_hint"] for r in result] == ["Meghana Foods", "Vidyarthi Bhavan - Crisp dosas.", "Corner House"]
+        assert result[0]["raw_text"] == "1. Meghana Foods: Generous biryani portions. Standout: paneer biryani."
+        assert result[2]["raw_text"].endswith("that are worth the wait.")
+
+    def test_block_emitted_when_next_block_starts(self):
+        parser = RecommendationParser()
+        assert parser.feed("1. Meghana Foods: biryani\n") == []
+        assert parser.feed("   Standout: paneer\n") == []
+        completed = parser.feed("2")
+        assert [r["name_hint"] for r in completed] == ["Meghana Foods"]
+        assert parser.feed(". Corner House\n") == []
+        assert [r["name_hint"] for r in parser.close()] == ["Corner House"]
+
+    def test_unstructured_text_becomes_one_recommendation(self):
+        result = _feed_all(["Nothing ", "matches\nyour query."])
+        assert result[0]["raw_text"] == "Nothing matches\nyour query."
+        assert result[0]["name_hint"] == NO_STRUCTURE_HINT
+        assert result[0]["name"] is None
+
+    def test_empty(self):
+        assert _feed_all(["", "  \n"]) == []
+
+    def test_parse_recommendations_uses_parser(self):
+        assert _parse_recommendations(MARKDOWN_RESPONSE) == _feed_all(list(MARKDOWN_RESPONSE))
+
+    def test_structured_fields(self):
+        result = _feed_all([MARKDOWN_RESPONSE], CANDIDATES)
+        assert len(result) == 3
+        assert result[0]["name"] == "Meghana Foods"
+        assert result[0]["reason"] == "Generous portions that fit the budget."
+        assert result[0]["standout"] == "Paneer biryani"
+        assert result[1]["name"] == "Vidyarthi Bhavan"
+        assert result[1]["reason"] == "Crisp dosas."
+        assert result[1]["standout"] == "benne masala dosa."
+        assert [r["matched"] for r in result] == [True, True, False]
+        assert result[2]["name"] == "Unknown Diner"
+        assert result[2]["reason"] == "Good coffee."
+
+    def test_labelled_bullets_continue_the_block(self):
+        result = _feed_all([MARKDOWN_RESPONSE])
+        assert [r["name"] for r in result] == ["Meghana Foods", "Vidyarthi Bhavan (Basavanagudi)", "Unknown Diner"]
+        assert not any(r["matched"] for r in result)
+
+
+class TestNameResolver:
+    """Tests for NameResolver."""
+
+    def test_ignores_case_and_punctuation(self):
+        resolver = NameResolver(["Domino's Pizza"])
+        assert resolver.resolve("DOMINOS PIZZA") == "Domino's Pizza"
+
+    def test_longest_contained_candidate(self):
+        resolver = NameResolver(["Truffles", "Truffles Koramangala"])
+        assert resolver.resolve("Truffles Koramangala (5th Block)") == "Truffles Koramangala"
+
+    def test_truncated_name(self):
+        resolver = NameResolver(["The Black Pearl Microbrewery And Kitchen"])
+        assert resolver.resolve("The Black Pearl Micro") == "The Black Pearl Microbrewery And Kitchen"
+
+    def test_no_match(self):
+        assert NameResolver(["Meghana Foods"]).resolve("Empire") is None
+
+    def test_normalize_name(self):
+        assert normalize_name("Brahmin's Coffee-Bar") == "brahminscoffeebar"
+
+
+JSON_RESPONSE = """```json
+{"recommendations": [
+  {"id": 2, "reason": "Crisp dosas {and} \\"filter\\" coffee.", "standout": "benne dosa"},
+  {"id": 1, "reason": "Big biryani portions.", "standout": "paneer biryani", "extra": [{"x": 1}]},
+  {"id": 9, "reason": "Not a candidate."},
+  {"id": 1, "reason": "Repeated."}
+]}
+```"""
+LABELS = [101, 205, 307]
+
+
+def _feed_json(chunks: list[str]) -> tuple[list[dict], JsonRecommendationParser]:
+    parser = JsonRecommendationParser(CANDIDATES, LABELS)
+    result = []
+    for chunk in chunks:
+        result.extend(parser.feed(chunk))
+    return result + parser.close(), parser
+
+
+class TestValidateRecord:
+    """Tests for validate_record."""
+
+    def test_valid(self):
+        record = validate_record({"id": 3, "reason": " Coffee ", "standout": ""}, CANDIDATES, LABELS)
+        assert record["name"] == "Brahmin's Coffee Bar"
+        assert record["reason"] == "Coffee"
+        assert record["standout"] is None
+        assert record["row"] == 307
+        assert record["matched"]
+
+    def test_numeric_string_id(self):
+        assert validate_record({"id": "1", "reason": "x"}, CANDIDATES)["name"] == "Meghana Foods"
+
+    @pytest.mark.parametrize("obj", [
+        [], {"reason": "x"}, {"id": 0, "reason": "x"}, {"id": 4, "reason": "x"},
+        {"id": True, "reason": "x"}, {"id": 1}, {"id": 1, "reason": "x", "standout": 5},
+    ])
+    def test_invalid(self, obj):
+        assert validate_record(obj, CANDIDATES) is None
+
+
+class TestParseJsonRecommendations:
+    """Tests for parse_json_recommendations."""
+
+    def test_fenced_object(self):
+        result = parse_json_recommendations(JSON_RESPONSE, CANDIDATES, LABELS)
+        assert [(r["id"], r["name"], r["row"]) for r in result] == [
+            (2, "Vidyarthi Bhavan", 205), (1, "Meghana Foods", 101)
+        ]
+        assert result[0]["reason"] == 'Crisp dosas {and} "filter" coffee.'
+
+    def test_bare_list(self):
+        result = parse_json_recommendations('[{"id": 3, "reason": "Coffee"}]', CANDIDATES)
+        assert [r["name"] for r in result] == ["Brahmin's Coffee Bar"]
+
+    @pytest.mark.parametrize("raw", [RESPONSE, "{}", '{"recommendations": [{"id": 7, "reason": "x"}]}', "[1, 2"])
+    def test_unusable(self, raw):
+        assert parse_json_recommendations(raw, CANDIDATES) is None
+
+
+class TestJsonRecommendationParser:
+    """Tests for JsonRecommendationParser."""
+
+    @pytest.mark.parametrize("size", [1, 2, 5, 13, 10000])
+    def test_any_chunking_matches_whole_parse(self, size):
+        chunks = [JSON_RESPONSE[i:i + size] for i in range(0, len(JSON_RESPONSE), size)]
+        result, parser = _feed_json(chunks)
+        assert result == parse_json_recommendations(JSON_RESPONSE, CANDIDATES, LABELS)
+        assert parser.structured
+
+    def test_object_emitted_when_closed(self):
+        parser = JsonRecommendationParser(CANDIDATES)
+        assert parser.feed('{"recommendations": [{"id": 1, "reason": "Biryani"') == []
+        assert [r["name"] for r in parser.feed('}, {"id": ')] == ["Meghana Foods"]
+
+    @pytest.mark.parametrize("size", [1, 7, 10000])
+    def test_text_answer_falls_back_while_streaming(self, size):
+        chunks = [MARKDOWN_RESPONSE[i:i + size] for i in range(0, len(MARKDOWN_RESPONSE), size)]
+        result, parser = _feed_json(chunks)
+        assert result == _feed_all([MARKDOWN_RESPONSE], CANDIDATES)
+        assert not parser.structured
+
+    def test_invalid_json_falls_back_at_close(self):
+        raw = '{"recommendations": [{"id": 42, "reason": "hallucinated"}]}'
+        result, parser = _feed_json([raw])
+        assert not parser.structured
+        assert result[0]["name_hint"] == NO_STRUCTURE_HINT
+
+    def test_empty(self):
+        assert _feed_json(["", " "])[0] == []
@@ -0,0 +1,132 @@
+"""Phase 4 - Tests for the compact, token-budgeted prompt builder."""
+
+import pandas as pd
+import pytest
+
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.benchmark import synthetic_restaurants
+from phase4_LLMRecommendation.benchmark import run, with_chains
+from phase4_LLMRecommendation.prompt import (
+    JSON_OUTPUT_INSTRUCTIONS,
+    NO_MATCHES_TEXT,
+    CompactPromptBuilder,
+    estimate_tokens,
+)
+
+
+@pytest.fixture
+def user_input() -> UserInput:
+    return UserInput(city="Banashankari", price=800, diet="veg")
+
+
+@pytest.fixture
+def candidates() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": ["Udupi Grand", "Cafe Coffee Day", "Truffles", "cafe coffee day ", "Pizza | Co"],
+            "rate": ["4.1/5", "3.6 /5", "NEW", "3.9/5", None],
+            "approx_cost(for two people)": ["1,000", "400", "600", "400", "300"],
+            "cuisines": ["South Indian, North Indian, Chinese, Juices", "Cafe", "Burger, American", "Cafe", "Pizza"],
+            "dish_liked": ["Masala Dosa, Filter Coffee, Idli, Vada", None, "Burgers", "Coffee", "Pizza"],
+            "rest_type": ["Casual Dining", "Beverage Shop", "Casual Dining, Cafe", "Beverage Shop", "Quick Bites"],
+        }
+    )
+
+
+class TestEstimateTokens:
+    """Tests for estimate_tokens."""
+
+    def test_rounds_up(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd") == 1
+        assert estimate_tokens("abcde") == 2
+
+
+class TestCompactPromptBuilder:
+    """Tests for CompactPromptBuilder."""
+
+    def test_header_and_compact_fields(self, candidates, user_input):
+        prompt = CompactPromptBuilder().build(candidates, user_input)
+        lines = prompt.text.splitlines()
+        assert "name|rating|cost|cuisines|popular|type" in lines
+        assert "Udupi Grand|4.1|1000|South Indian,North Indian,Chinese|Masala Dosa,Filter Coffee,Idli|casual" in lines
+        assert "Truffles|new|600|Burger,American|Burgers|casual,Cafe" in lines
+        assert "Pizza / Co|-|300|Pizza|Pizza|quick" in lines
+        assert "Rating:" not in prompt.text
+
+    def test_user_preferences(self, candidates):
+        ui = UserInput(city="Banashankari", price=600, diet="veg", cuisines=("Cafe",))
+        text = CompactPromptBuilder().build(candidates, ui).text
+        assert "city=Banashankari" in text
+        assert "Rs.600" in text
+        assert "diet=veg" in text
+        assert "cuisines=Cafe" in text
+
+    def test_dedupes_chains(self, candidates, user_input):
+        prompt = CompactPromptBuilder().build(candidates, user_input)
+        assert "Cafe Coffee Day x2|3.6|400|Cafe|-|beverages" in prompt.text.splitlines()
+        assert "cafe coffee day" not in prompt.text
+        assert prompt.rows_listed == 4
+        assert prompt.restaurants_listed == 5
+        assert prompt.names == ["Udupi Grand", "Cafe Coffee Day", "Truffles", "Pizza | Co"]
+
+    def test_truncates_lists(self, candidates, user_input):
+        text = CompactPromptBuilder(max_list_items=1).build(candidates, user_input).text
+        assert "Udupi Grand|4.1|1000|South Indian|Masala Dosa|casual" in text
+
+    def test_respects_token_budget(self, user_input):
+        df = synthetic_restaurants(rows=500, seed=1)
+        for budget in (300, 600, 1200):
+            prompt = CompactPromptBuilder(budget).build(df, user_input)
+            assert prompt.estimated_tokens <= budget
+            assert estimate_tokens(prompt.text) == prompt.estimated_tokens
+            assert 0 < prompt.rows_listed < len(df)
+        small = CompactPromptBuilder(300).build(df, user_input)
+        large = CompactPromptBuilder(1200).build(df, user_input)
+        assert small.rows_listed < large.rows_listed
+        assert f"({large.restaurants_listed} of 500 matches" in large.text
+
+    def test_keeps_row_order(self, user_input):
+        df = pd.DataFrame({"name": [f"R{i}" for i in range(100)]})
+        prompt = CompactPromptBuilder(200).build(df, user_input)
+        rows = prompt.text.split("name\n", 1)[1].split("\n\n")[0].splitlines()
+        assert rows == [f"R{i}" for i in range(prompt.rows_listed)]
+        assert prompt.names == rows
+
+    def test_first_row_always_listed(self, candidates, user_input):
+        prompt = CompactPromptBuilder(token_budget=1).build(candidates, user_input)
+        assert prompt.rows_listed == 1
+        assert "Udupi Grand" in prompt.text
+
+    def test_json_output_numbers_rows(self, candidates, user_input):
+        prompt = CompactPromptBuilder(json_output=True).build(candidates, user_input)
+        assert prompt.json_output
+        assert "id|name|rating|cost|cuisines|popular|type" in prompt.text
+        assert "2|Cafe Coffee Day x2|3.6|400|Cafe|-|beverages" in prompt.text.splitlines()
+        assert JSON_OUTPUT_INSTRUCTIONS in prompt.text
+        assert prompt.row_labels == [0, 1, 2, 4]
+
+    def test_json_output_respects_token_budget(self, user_input):
+        df = synthetic_restaurants(rows=500, seed=1)
+        prompt = CompactPromptBuilder(600, json_output=True).build(df, user_input)
+        assert prompt.estimated_tokens <= 600
+
+    def test_empty(self, user_input):
+        prompt = CompactPromptBuilder().build(pd.DataFrame(), user_input)
+        assert NO_MATCHES_TEXT in prompt.text
+        assert prompt.rows_listed == 0
+
+
+class TestPromptBenchmark:
+    """Smoke test for the prompt benchmark."""
+
+    def test_compact_is_smaller(self):
+        df = with_chains(synthetic_restaurants(rows=3_000, seed=2), 0.3)
+        queries = [UserInput(city="BTM", price=800, diet="non-veg")]
+        verbose, compact, json_ids = run(df, queries)
+        (verbose_label, verbose_tokens, _, _), (compact_label, compact_tokens, listed, _) = verbose, compact
+        assert verbose_label == "verbose (original)"
+        assert compact_label.startswith("compact")
+        assert compact_tokens < verbose_tokens
+        assert json_ids[1] < verbose_tokens
+        assert listed > 0
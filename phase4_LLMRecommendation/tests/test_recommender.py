@@ -5,6 +5,7 @@ import os
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pandas as pd
 import pytest
 from dotenv import load_dotenv
@@ -20,6 +21,7 @@ except Exception:
 
 from phase2_UserInput.user_input import UserInput
 from phase3_Integration.integrator import IntegrationContext
+from phase3_Integration.view import FilteredView
 from phase4_LLMRecommendation.recommender import (
     MAX_RESTAURANTS_IN_PROMPT,
     RecommendationResult,
@@ -96,6 +98,25 @@ class TestBuildPrompt:
         assert "No restaurants found" in prompt or "No restaurants" in prompt
         assert "X" in prompt
 
+    def test_prompt_lists_top_ranked_matches(self):
+        n = MAX_RESTAURANTS_IN_PROMPT + 10
+        df = pd.DataFrame(
+            {
+                "name": [f"R{i}" for i in range(n)],
+                "rate": ["3.0/5"] * (n - 1) + ["4.9/5"],
+                "votes": ["10"] * (n - 1) + ["900"],
+                "approx_cost(for two people)": ["500"] * n,
+            }
+        )
+        user_input = UserInput(city="X", price=500, diet="non-veg")
+        context = IntegrationContext(
+            filtered_df=df, user_input=user_input, total_matches=n, view=FilteredView(df, np.arange(n))
+        )
+        prompt = _build_prompt(context, token_budget=10_000)
+        lines = [line for line in prompt.splitlines() if line.startswith("R") and "|" in line]
+        assert len(lines) == MAX_RESTAURANTS_IN_PROMPT
+        assert lines[0].startswith(f"R{n - 1}|")
+
 
 class TestParseRecommendations:
     """Tests for _parse_recommendations."""
@@ -138,7 +159,7 @@ class TestCallGoogleStudioApi:
                 _call_google_studio_api("test prompt", api_key="")
 
     @pytest.mark.skipif(not HAS_REQUESTS, reason="requests package not installed")
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_calls_google_studio_with_valid_key(self, mock_post):
         mock_response = MagicMock()
         mock_response.json.return_value = {
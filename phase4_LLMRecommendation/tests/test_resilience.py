@@ -0,0 +1,225 @@
+"""Phase 4 - Tests for retries, the circuit breaker and the fallback ranker."""
+
+import time
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+import requests
+
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.integrator import IntegrationContext
+from phase4_LLMRecommendation.cache import ResponseCache
+from phase4_LLMRecommendation.client import LLMClient
+from phase4_LLMRecommendation.fallback import FALLBACK_HEADER, FallbackRanker
+from phase4_LLMRecommendation.recommender import Recommender
+from phase4_LLMRecommendation.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    call_with_retries,
+    is_retryable,
+)
+from phase4_LLMRecommendation.stub_server import StubLLMServer
+
+
+def _http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status}", response=response)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def server():
+    with StubLLMServer() as stub:
+        yield stub
+
+
+@pytest.fixture
+def context():
+    df = pd.DataFrame(
+        {
+            "name": ["Plain Cafe", "Dosa Corner", "Dosa Corner", "Thali Point"],
+            "rate": ["3.2/5", "4.5/5", "4.4/5", "4.1/5"],
+            "votes": [10, 900, 50, 300],
+            "approx_cost(for two people)": ["400", "300", "300", "1,000"],
+            "cuisines": ["Cafe", "South Indian", "South Indian", "North Indian, Thali"],
+            "dish_liked": [None, "Masala Dosa, Filter Coffee", None, "Thali"],
+        },
+        index=[10, 11, 12, 13],
+    )
+    return IntegrationContext(
+        filtered_df=df, user_input=UserInput(city="BTM", price=500, diet="veg"), total_matches=len(df)
+    )
+
+
+class TestRetries:
+    """Tests for is_retryable and call_with_retries."""
+
+    @pytest.mark.parametrize(
+        "error, expected",
+        [
+            (requests.ConnectionError(), True),
+            (requests.Timeout(), True),
+            (_http_error(429), True),
+            (_http_error(503), True),
+            (_http_error(400), False),
+            (KeyError("candidates"), False),
+        ],
+    )
+    def test_is_retryable(self, error, expected):
+        assert is_retryable(error) is expected
+
+    def test_backoff_is_bounded(self):
+        policy = RetryPolicy(base_delay=0.1, max_delay=0.3)
+        assert all(0 <= policy.backoff(1) <= 0.1 for _ in range(50))
+        assert all(0 <= policy.backoff(5) <= 0.3 for _ in range(50))
+
+    def test_retries_transient_errors(self):
+        call = MagicMock(side_effect=[requests.ConnectionError(), _http_error(503), "ok"])
+        assert call_with_retries(call, RetryPolicy(max_attempts=3, base_delay=0)) == "ok"
+        assert call.call_count == 3
+
+    def test_gives_up_after_max_attempts(self):
+        call = MagicMock(side_effect=requests.Timeout())
+        with pytest.raises(requests.Timeout):
+            call_with_retries(call, RetryPolicy(max_attempts=2, base_delay=0))
+        assert call.call_count == 2
+
+    def test_does_not_retry_client_errors(self):
+        call = MagicMock(side_effect=_http_error(400))
+        with pytest.raises(requests.HTTPError):
+            call_with_retries(call, RetryPolicy(base_delay=0))
+        assert call.call_count == 1
+
+    def test_attempts_get_time_left(self):
+        call = MagicMock(side_effect=[requests.Timeout(), "ok"])
+        call_with_retries(call, RetryPolicy(base_delay=0, deadline=5.0))
+        first, second = (c.args[0] for c in call.call_args_list)
+        assert 0 < second <= first <= 5.0
+
+    def test_no_sleep_past_deadline(self):
+        call = MagicMock(side_effect=requests.Timeout())
+        started = time.monotonic()
+        with pytest.raises(requests.Timeout):
+            call_with_retries(call, RetryPolicy(max_attempts=10, base_delay=5, max_delay=5, deadline=0.05))
+        assert time.monotonic() - started < 1
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker state transitions."""
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=3)
+        for _ in range(2):
+            breaker.record_failure()
+        breaker.record_success()
+        for _ in range(3):
+            assert breaker.allow()
+            breaker.record_failure()
+        assert breaker.state == "open"
+        assert not breaker.allow()
+        assert breaker.stats.as_dict() == {"state": "open", "consecutive_failures": 3, "trips": 1, "rejected": 1}
+
+    def test_half_open_trial(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now = 9.9
+        assert not breaker.allow()
+        clock.now = 10
+        assert breaker.allow()  # the trial call
+        assert breaker.state == "half_open"
+        assert not breaker.allow()  # only one at a time
+        breaker.record_failure()
+        assert breaker.state == "open" and breaker.stats.trips == 2
+        clock.now = 20
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == "closed" and breaker.allow()
+
+    def test_open_circuit_refuses_call(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+        breaker.record_failure()
+        call = MagicMock()
+        with pytest.raises(CircuitOpenError):
+            call_with_retries(call, RetryPolicy(), breaker)
+        call.assert_not_called()
+
+
+class TestFallbackRanker:
+    """Tests for FallbackRanker."""
+
+    def test_ranks_dedupes_and_describes(self, context):
+        records = FallbackRanker().recommend(context.filtered_df, context.user_input)
+        assert [(r["name"], r["row"]) for r in records] == [
+            ("Dosa Corner", 11),
+            ("Thali Point", 13),
+            ("Plain Cafe", 10),
+        ]
+        top = records[0]
+        assert top["reason"] == "Rated 4.5/5 by 900 diners, about Rs.300 for two, serves South Indian."
+        assert top["standout"] == "Masala Dosa"
+        assert top["matched"] and top["fallback"]
+        assert records[2]["standout"] is None
+
+    def test_count_and_render(self, context):
+        records = FallbackRanker(count=1).recommend(context.filtered_df, context.user_input)
+        assert len(records) == 1
+        assert FallbackRanker.render(records).splitlines() == [FALLBACK_HEADER, "", records[0]["raw_text"]]
+
+    def test_empty_frame(self, context):
+        assert FallbackRanker().recommend(pd.DataFrame(), context.user_input) == []
+
+
+class TestRecommenderResilience:
+    """Recommender against a failing stub upstream."""
+
+    def test_recovers_from_transient_failure(self, server, context):
+        recommender = Recommender(
+            api_key="key", client=LLMClient(url=server.url), retry_policy=RetryPolicy(base_delay=0)
+        )
+        server.status = 503
+        assert recommender.get_recommendations(context).fallback
+        server.status = 200
+        result = recommender.get_recommendations(context)
+        assert not result.fallback
+        assert recommender.breaker.state == "closed"
+
+    def test_open_circuit_serves_fallback_without_upstream_calls(self, server, context):
+        clock = FakeClock()
+        cache = ResponseCache()
+        recommender = Recommender(
+            api_key="key",
+            client=LLMClient(url=server.url),
+            cache=cache,
+            retry_policy=RetryPolicy(max_attempts=2, base_delay=0),
+            breaker=CircuitBreaker(failure_threshold=4, reset_timeout=30, clock=clock),
+        )
+        server.status = 503
+        for _ in range(2):
+            assert recommender.get_recommendations(context).fallback
+        assert server.requests == 4
+        assert recommender.breaker.state == "open"
+
+        started = time.monotonic()
+        result = recommender.get_recommendations(context)
+        assert time.monotonic() - started < 0.5
+        assert result.fallback and result.recommendations[0]["name"] == "Dosa Corner"
+        assert list(recommender.stream_recommendations(context)) == result.recommendations
+        assert server.requests == 4
+        assert cache.stats.writes == 0
+
+        server.status = 200
+        clock.now = 30
+        assert not recommender.get_recommendations(context).fallback
+        assert recommender.breaker.state == "closed"
+        assert server.requests == 5
@@ -0,0 +1,163 @@
+"""Phase 4 - Tests for single-flight request coalescing."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.integrator import IntegrationContext
+from phase4_LLMRecommendation.async_client import AsyncLLMClient
+from phase4_LLMRecommendation.client import LLMClient
+from phase4_LLMRecommendation.recommender import Recommender
+from phase4_LLMRecommendation.singleflight import AsyncSingleFlight, SingleFlight
+from phase4_LLMRecommendation.stub_server import DEFAULT_STUB_RESPONSE, StubLLMServer
+
+N = 20
+
+
+def _context(city: str = "Bangalore") -> IntegrationContext:
+    df = pd.DataFrame([
+        {"name": "Dosa Corner", "rate": "4.1/5", "approx_cost(for two people)": 300, "cuisines": "South Indian"},
+    ])
+    return IntegrationContext(filtered_df=df, user_input=UserInput(city=city, price=800, diet="veg"), total_matches=1)
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight (threads)."""
+
+    def test_concurrent_callers_share_one_call(self):
+        group = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            release.wait()
+            return "value"
+
+        with ThreadPoolExecutor(N) as pool:
+            futures = [pool.submit(group.do, "k", fn) for _ in range(N)]
+            while group.stats.calls + group.stats.coalesced < N:
+                threading.Event().wait(0.01)
+            release.set()
+            results = [f.result() for f in futures]
+
+        assert results == ["value"] * N
+        assert len(calls) == 1
+        assert group.stats.as_dict() == {"calls": 1, "coalesced": N - 1}
+        assert group.in_flight() == 0
+
+    def test_error_propagates_to_all_callers(self):
+        group = SingleFlight()
+        release = threading.Event()
+
+        def fn():
+            release.wait()
+            raise RuntimeError("boom")
+
+        with ThreadPoolExecutor(4) as pool:
+            futures = [pool.submit(group.do, "k", fn) for _ in range(4)]
+            while group.stats.calls + group.stats.coalesced < 4:
+                threading.Event().wait(0.01)
+            release.set()
+            for f in futures:
+                with pytest.raises(RuntimeError):
+                    f.result()
+
+    def test_sequential_calls_are_not_shared(self):
+        group = SingleFlight()
+        assert group.do("k", lambda: 1) == 1
+        assert group.do("k", lambda: 2) == 2
+        assert group.stats.calls == 2
+
+
+class TestAsyncSingleFlight:
+    """Tests for AsyncSingleFlight."""
+
+    def test_concurrent_callers_share_one_call(self):
+        group = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "value"
+
+        async def run():
+            return await asyncio.gather(*(group.do("k", fetch) for _ in range(N)))
+
+        assert asyncio.run(run()) == ["value"] * N
+        assert len(calls) == 1
+        assert group.stats.coalesced == N - 1
+        assert group.in_flight() == 0
+
+    def test_cancelled_caller_does_not_cancel_others(self):
+        group = AsyncSingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "value"
+
+        async def run():
+            first = asyncio.ensure_future(group.do("k", fetch))
+            second = asyncio.ensure_future(group.do("k", fetch))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(run()) == "value"
+
+
+class TestRecommenderCoalescing:
+    """N concurrent identical recommendation requests make one upstream call."""
+
+    def test_threads(self):
+        with StubLLMServer(latency=0.3) as server:
+            recommender = Recommender(api_key="key", client=LLMClient(url=server.url, pool_size=N))
+            barrier = threading.Barrier(N)
+
+            def request():
+                barrier.wait()
+                return recommender.get_recommendations(_context())
+
+            with ThreadPoolExecutor(N) as pool:
+                results = list(pool.map(lambda _: request(), range(N)))
+
+        assert server.requests == 1
+        assert all(r.raw_response == DEFAULT_STUB_RESPONSE for r in results)
+        assert recommender.single_flight.stats.coalesced == N - 1
+
+    def test_asyncio(self):
+        with StubLLMServer(latency=0.3) as server:
+            recommender = Recommender(api_key="key", async_client=AsyncLLMClient(url=server.url))
+
+            async def run():
+                try:
+                    return await asyncio.gather(
+                        *(recommender.get_recommendations_async(_context()) for _ in range(N))
+                    )
+                finally:
+                    await recommender.async_client.aclose()
+
+            results = asyncio.run(run())
+
+        assert server.requests == 1
+        assert all(r.raw_response == DEFAULT_STUB_RESPONSE for r in results)
+        assert recommender.async_single_flight.stats.coalesced == N - 1
+
+    def test_different_queries_are_not_coalesced(self):
+        with StubLLMServer(latency=0.1) as server:
+            recommender = Recommender(api_key="key", client=LLMClient(url=server.url))
+            with ThreadPoolExecutor(2) as pool:
+                list(pool.map(recommender.get_recommendations, [_context("Bangalore"), _context("Delhi")]))
+        assert server.requests == 2
+
+    def test_coalescing_can_be_disabled(self):
+        with StubLLMServer(latency=0.1) as server:
+            recommender = Recommender(api_key="key", client=LLMClient(url=server.url), coalesce=False)
+            with ThreadPoolExecutor(4) as pool:
+                list(pool.map(lambda _: recommender.get_recommendations(_context()), range(4)))
+        assert server.requests == 4
@@ -0,0 +1,237 @@
+"""
+Phase 5 - Batch Recommendations
+Runs many recommendation queries in one go (e.g. the nightly grid of
+city x budget x diet). Queries are parsed and canonicalized up front,
+filtered with one pass per city (Integrator.prepare_contexts), and their
+LLM calls run concurrently on a bounded thread pool. Results are yielded
+as JSON-ready records as soon as each query completes.
+
+Usage:
+  python -m phase5_DisplayCLI.batch queries.jsonl -o results.jsonl --workers 8
+  python -m phase5_DisplayCLI.batch queries.csv > results.jsonl
+
+Query files are JSON lines or CSV (chosen by suffix) with the fields city,
+price, diet and optionally cuisines (comma-separated); other fields are
+copied to the output unchanged.
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional
+
+from phase2_UserInput.user_input import UserInput
+from phase3_Integration.integrator import IntegrationContext
+from phase4_LLMRecommendation.recommender import MAX_RESTAURANTS_IN_PROMPT, RecommendationResult
+
+DEFAULT_BATCH_WORKERS = 8
+
+
+def read_queries(path: Path) -> list[dict]:
+    """Queries from a JSON lines file (one object per line) or a CSV file with a header row."""
+    path = Path(path)
+    with path.open(newline="", encoding="utf-8") as f:
+        if path.suffix.lower() == ".csv":
+            return [dict(row) for row in csv.DictReader(f)]
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@dataclass
+class BatchStats:
+    """Progress and throughput of a batch run."""
+
+    total: int = 0
+    completed: int = 0  # Queries finished, successfully or not
+    failed: int = 0
+    cached: int = 0  # Answered from the LLM response cache
+    fallback: int = 0  # Answered by the local fallback ranker
+    filter_seconds: float = 0.0  # Parsing, filtering and ranking of all queries
+    elapsed_seconds: float = 0.0
+
+    @property
+    def queries_per_second(self) -> float:
+        return self.completed / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cached": self.cached,
+            "fallback": self.fallback,
+            "filter_seconds": round(self.filter_seconds, 3),
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "queries_per_second": round(self.queries_per_second, 2),
+        }
+
+
+@dataclass
+class BatchItem:
+    """Outcome of one batch query."""
+
+    index: int  # Position in the batch
+    query: dict
+    user_input: Optional[UserInput] = None  # Canonical query (None if invalid)
+    context: Optional[IntegrationContext] = None
+    result: Optional[RecommendationResult] = None
+    error: Optional[str] = None
+
+
+def _result_record(result: RecommendationResult) -> dict:
+    """JSON-ready fields of a recommendation result."""
+    return {
+        "cached": result.cached,
+        "fallback": result.fallback,
+        "recommendations": [
+            {
+                "name": rec.get("name") or rec.get("name_hint"),
+                "reason": rec.get("reason") or rec.get("raw_text"),
+                "standout": rec.get("standout"),
+            }
+            for rec in result.recommendations
+        ],
+    }
+
+
+class BatchRunner:
+    """
+    Runs recommendation queries for a ZomatoRecommendationApp in bulk.
+
+    At most workers LLM calls are in flight at once; identical queries
+    share one call through the recommender's coalescing and cache. Invalid
+    queries produce error records instead of stopping the batch.
+    """
+
+    def __init__(self, app, workers: int = DEFAULT_BATCH_WORKERS):
+        """
+        Args:
+            app: ZomatoRecommendationApp whose data, integrator and recommender are used.
+            workers: Maximum concurrent LLM calls.
+        """
+        self.app = app
+        self.workers = workers
+        self.stats = BatchStats()
+
+    def run(
+        self,
+        queries: Iterable[Mapping[str, Any]],
+        progress: Optional[Callable[[BatchStats], None]] = None,
+    ) -> Iterator[dict]:
+        """
+        Run queries and yield one record per query in completion order:
+        {"index", "query", "ok", "total_matches", "cached", "fallback",
+        "recommendations"} or {"index", "query", "ok": False, "error"}.
+        index is the query's position in queries. progress, if given, is
+        called with self.stats after every completed query.
+        """
+        for item in self.results(queries, progress):
+            record = {"index": item.index, "query": item.query, "ok": item.error is None}
+            if item.error is not None:
+                record["error"] = item.error
+            else:
+                record.update(total_matches=item.context.total_matches, **_result_record(item.result))
+            yield record
+
+    def results(
+        self,
+        queries: Iterable[Mapping[str, Any]],
+        progress: Optional[Callable[[BatchStats], None]] = None,
+    ) -> Iterator[BatchItem]:
+        """run() with the full outcome of each query (context and RecommendationResult)."""
+        queries = [dict(q) for q in queries]
+        stats = self.stats = BatchStats(total=len(queries))
+        start = time.perf_counter()
+
+        def finish(item: BatchItem) -> BatchItem:
+            stats.completed += 1
+            if item.error is not None:
+                stats.failed += 1
+            else:
+                stats.cached += item.result.cached
+                stats.fallback += item.result.fallback
+            stats.elapsed_seconds = time.perf_counter() - start
+            if progress is not None:
+                progress(stats)
+            return item
+
+        indexes, user_inputs = [], []
+        for i, query in enumerate(queries):
+            try:
+                user_input = self.app.user_input_handler.parse(
+                    query.get("city"), query.get("price"), query.get("diet"), query.get("cuisines") or None
+                )
+            except (ValueError, TypeError) as e:
+                yield finish(BatchItem(i, query, error=str(e)))
+                continue
+            indexes.append(i)
+            user_inputs.append(self.app.canonicalizer.canonicalize(user_input))
+        contexts = self.app.integrator.prepare_contexts(
+            self.app.data, user_inputs, top_k=MAX_RESTAURANTS_IN_PROMPT
+        )
+        stats.filter_seconds = time.perf_counter() - start
+
+        pool = ThreadPoolExecutor(max(1, self.workers), thread_name_prefix="batch")
+        try:
+            futures = {
+                pool.submit(self.app.recommender.get_recommendations, context): (i, user_input, context)
+                for i, user_input, context in zip(indexes, user_inputs, contexts)
+            }
+            for future in as_completed(futures):
+                i, user_input, context = futures[future]
+                item = BatchItem(i, queries[i], user_input, context)
+                try:
+                    item.result = future.result()
+                except Exception as e:
+                    item.error = str(e)
+                yield finish(item)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def print_progress(stats: BatchStats) -> None:
+    """Progress callback for the batch CLIs: one line on stderr, rewritten in place."""
+    print(
+        f"\r{stats.completed}/{stats.total} done, {stats.failed} failed, "
+        f"{stats.queries_per_second:.1f} queries/s",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Phase 5: Recommendations for every query in a JSONL or CSV file"
+    )
+    parser.add_argument("queries", type=Path, help="Query file (.jsonl or .csv)")
+    parser.add_argument("-o", "--output", type=Path, help="Result file (JSON lines). Default: stdout")
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_BATCH_WORKERS, help="Concurrent LLM calls"
+    )
+    args = parser.parse_args()
+
+    from phase5_DisplayCLI.main import ZomatoRecommendationApp
+
+    queries = read_queries(args.queries)
+    app = ZomatoRecommendationApp()
+    runner = BatchRunner(app, workers=args.workers)
+
+    out = args.output.open("w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for record in runner.run(queries, progress=print_progress):
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+    finally:
+        if args.output:
+            out.close()
+    print(file=sys.stderr)
+    print(json.dumps(runner.stats.as_dict()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
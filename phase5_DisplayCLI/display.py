@@ -3,12 +3,14 @@ Phase 5 - Display Layer
 Formats and displays restaurant recommendations to the user.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 import pandas as pd
 
 from phase2_UserInput.user_input import UserInput
 from phase4_LLMRecommendation.recommender import RecommendationResult
 
+FALLBACK_NOTICE = "Note: AI recommendations are unavailable right now; showing top-rated matches instead."
+
 
 class RecommendationDisplay:
     """Handles formatting and display of restaurant recommendations."""
@@ -36,12 +38,33 @@ class RecommendationDisplay:
         if not result.recommendations:
             return self._format_no_recommendations(user_input)
         
-        header = self._build_header(user_input, len(result.recommendations))
+        header = self._build_header(user_input, len(result.recommendations), result.fallback)
         recommendations = self._format_recommendation_list(result.recommendations[:self.max_recommendations])
         footer = self._build_footer(user_input)
         
         return f"{header}\n\n{recommendations}\n\n{footer}"
 
+    def stream_recommendations(self, recommendations: Iterable[Dict[str, Any]], user_input: UserInput) -> Iterator[str]:
+        """
+        Format recommendations as they arrive.
+
+        Yields the header together with the first recommendation, then one
+        block per recommendation (up to max_recommendations), then the
+        footer. recommendations is always consumed to the end.
+        
+        Args:
+            recommendations: Parsed recommendations, e.g. Recommender.stream_recommendations
+            user_input: User preferences from Phase 2
+        """
+        count = 0
+        for rec in recommendations:
+            count += 1
+            if count == 1:
+                yield self._build_header(user_input, fallback=rec.get('fallback', False))
+            if count <= self.max_recommendations:
+                yield self._format_recommendation(count, rec)
+        yield self._build_footer(user_input) if count else self._format_no_recommendations(user_input)
+
     def _format_no_recommendations(self, user_input: UserInput) -> str:
         """Format message when no recommendations are available."""
         return f"""
@@ -64,8 +87,11 @@ Suggestions:
 Please adjust your filters and try again!
 """
 
-    def _build_header(self, user_input: UserInput, count: int) -> str:
-        """Build the header section of the display."""
+    def _build_header(self, user_input: UserInput, count: Optional[int] = None, fallback: bool = False) -> str:
+        """Build the header section of the display (count unknown while streaming)."""
+        found = f"\nFound {count} recommendation(s) for you!\n" if count is not None else ""
+        if fallback:
+            found += f"\n{FALLBACK_NOTICE}\n"
         return f"""
 ╔══════════════════════════════════════════════════════════════╗
 ║              ZOMATO AI RESTAURANT RECOMMENDATIONS           ║
@@ -75,31 +101,41 @@ Your Preferences:
    Location: {user_input.city}
    Budget: Rs.{user_input.price} for two people  
    Diet: {user_input.diet}
-
-Found {count} recommendation(s) for you!
-"""
+{found}"""
 
     def _format_recommendation_list(self, recommendations: List[Dict[str, Any]]) -> str:
         """Format the list of recommendations."""
-        formatted_items = []
-        
-        for i, rec in enumerate(recommendations, 1):
+        return "\n".join(self._format_recommendation(i, rec) for i, rec in enumerate(recommendations, 1))
+
+    def _format_recommendation(self, index: int, rec: Dict[str, Any]) -> str:
+        """Format one recommendation block."""
+        if rec.get('name'):
+            # Structured record from the Phase 4 parser: no re-parsing needed
+            name = rec['name']
+            content = self._structured_content(rec)
+        else:
             # Extract restaurant name from the recommendation
             name = self._extract_restaurant_name(rec)
             content = rec.get('raw_text', '').strip()
             
             # Clean up the content
             content = self._clean_content(content, name)
-            
-            formatted_item = f"""
+        
+        return f"""
 ┌─────────────────────────────────────────────────────────────┐
-│ RECOMMENDATION {i}: {name.upper()}
+│ RECOMMENDATION {index}: {name.upper()}
 ├─────────────────────────────────────────────────────────────┤
 │ {content}
 └─────────────────────────────────────────────────────────────┘"""
-            formatted_items.append(formatted_item)
-        
-        return "\n".join(formatted_items)
+
+    def _structured_content(self, rec: Dict[str, Any]) -> str:
+        """Reason and standout dish of a structured recommendation."""
+        lines = []
+        if rec.get('reason'):
+            lines.append(rec['reason'].replace('*', ''))
+        if rec.get('standout'):
+            lines.append(f"   Standout: {rec['standout'].replace('*', '')}")
+        return '\n'.join(lines)
 
     def _extract_restaurant_name(self, recommendation: Dict[str, Any]) -> str:
         """Extract restaurant name from recommendation data."""
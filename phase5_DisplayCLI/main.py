@@ -3,9 +3,12 @@ Phase 5 - Main Application
 Integrates all phases to provide complete restaurant recommendation functionality.
 """
 
+import asyncio
+import os
 import sys
+from dataclasses import replace
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
@@ -22,28 +25,110 @@ except Exception:
 
 import pandas as pd
 from phase1_DataLoading.data_loader import ZomatoDataLoader
+from phase2_UserInput.canonical import QueryCanonicalizer
 from phase2_UserInput.user_input import UserInput, UserInputHandler
-from phase3_Integration.integrator import Integrator
-from phase4_LLMRecommendation.recommender import Recommender
+from phase3_Integration.integrator import IntegrationContext, Integrator
+from phase3_Integration.result_cache import FilterResultCache
+from phase4_LLMRecommendation.cache import ResponseCache
+from phase4_LLMRecommendation.limiter import AdaptiveLimiter
+from phase4_LLMRecommendation.microbatch import BatchPolicy, MicroBatchStats
+from phase4_LLMRecommendation.recommender import (
+    MAX_RESTAURANTS_IN_PROMPT,
+    RecommendationResult,
+    Recommender,
+)
 from phase5_DisplayCLI.display import RecommendationDisplay
+from phase5_DisplayCLI.materialize import (
+    MATERIALIZED_FILENAME,
+    MaterializedStore,
+    Materializer,
+    StalenessPolicy,
+)
+
+DEFAULT_CACHE_DIR = project_root / ".zomato_cache"
+DEFAULT_BUDGET_EDGES = [0, 300, 500, 800, 1200, 2000, 6000]
+LLM_CACHE_FILENAME = "llm_responses.sqlite"
+
+
+def _format_error(e: Exception) -> str:
+    """User-facing error block for a failed recommendation request."""
+    return f"""
+╔══════════════════════════════════════════════════════════════╗
+║                       ERROR OCCURRED                        ║
+╚══════════════════════════════════════════════════════════════╝
+
+Sorry, we encountered an error while processing your request:
+
+Error: {str(e)}
+
+Suggestions:
+• Check if all input values are correct
+• Ensure the city name is spelled correctly
+• Verify your budget is a reasonable number
+• Make sure dietary preference is 'veg' or 'non-veg'
+
+Please try again with different inputs!
+"""
 
 
 class ZomatoRecommendationApp:
     """Main application integrating all phases of the recommendation system."""
     
-    def __init__(self, data_path: Optional[Path] = None):
+    def __init__(
+        self,
+        data_path: Optional[Path] = None,
+        cache_dir: Optional[Path] = None,
+        lazy_heavy_columns: bool = True,
+        canonicalizer: Optional[QueryCanonicalizer] = None,
+        staleness: Optional[StalenessPolicy] = None,
+        batching: Optional[BatchPolicy] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+    ):
         """
         Initialize the complete recommendation system.
         
         Args:
             data_path: Optional path to local CSV data file
+            cache_dir: Optional directory for dataset snapshots and the
+                       persistent LLM response cache and materialized
+                       results. Defaults to $ZOMATO_CACHE_DIR. Without
+                       either, snapshots go to .zomato_cache in the project
+                       root and LLM responses and materialized results are
+                       kept in memory only.
+            lazy_heavy_columns: Keep reviews/menu text out of memory and
+                                fetch it on demand (see ZomatoDataLoader).
+            canonicalizer: Maps queries to their canonical form before filtering
+                           and prompting, so near-identical queries share cache
+                           entries. Defaults to QueryCanonicalizer().
+            staleness: How long materialized results (see
+                       phase5_DisplayCLI.materialize) are served.
+            batching: Pack concurrent distinct queries into shared LLM calls
+                      (see phase4_LLMRecommendation.microbatch). Off by default.
+            limiter: Adaptive bound on LLM calls in flight (see
+                     phase4_LLMRecommendation.limiter). Defaults to AdaptiveLimiter().
         """
+        if cache_dir is None and os.environ.get("ZOMATO_CACHE_DIR"):
+            cache_dir = Path(os.environ["ZOMATO_CACHE_DIR"])
+        state_dir = Path(cache_dir) if cache_dir is not None else None  # None: nothing persisted across runs
+
         # Initialize all phases
-        self.data_loader = ZomatoDataLoader(data_path=data_path)
+        self.data_loader = ZomatoDataLoader(
+            data_path=data_path,
+            cache_dir=state_dir or DEFAULT_CACHE_DIR,
+            lazy_heavy_columns=lazy_heavy_columns,
+        )
         self.user_input_handler = UserInputHandler()
-        self.integrator = Integrator()
-        self.recommender = Recommender()
+        self.canonicalizer = canonicalizer or QueryCanonicalizer()
+        self.integrator = Integrator(result_cache=FilterResultCache())
+        self.recommender = Recommender(
+            cache=ResponseCache(state_dir / LLM_CACHE_FILENAME if state_dir else None),
+            batching=batching,
+            limiter=limiter or AdaptiveLimiter(),
+        )
         self.display = RecommendationDisplay()
+        self.materializer = Materializer(
+            self, MaterializedStore(state_dir / MATERIALIZED_FILENAME if state_dir else None), staleness
+        )
         
         # Load data
         self._load_data()
@@ -62,8 +147,20 @@ class ZomatoRecommendationApp:
             except Exception as e2:
                 print(f"Failed to load data from all sources: {e2}")
                 raise
+        self._build_index()
+
+    def _build_index(self):
+        """Index self.data for the integrator, reusing the loader's bitmaps if they cover it."""
+        bitmaps = self.data_loader.bitmap_index
+        if bitmaps is not None and len(bitmaps) != len(self.data):
+            bitmaps = None
+        return self.integrator.build_index(
+            self.data, version=self.data_loader.data_version, bitmaps=bitmaps
+        )
     
-    def get_recommendations(self, city: str, price: int, diet: str) -> str:
+    def get_recommendations(
+        self, city: str, price: int, diet: str, cuisines: Optional[list[str]] = None
+    ) -> str:
         """
         Get complete restaurant recommendations.
         
@@ -71,55 +168,170 @@ class ZomatoRecommendationApp:
             city: City/area name
             price: Budget for two people
             diet: Dietary preference ('veg' or 'non-veg')
+            cuisines: Optional preferred cuisines (boost matching restaurants)
             
         Returns:
             Formatted recommendation string
         """
         try:
             # Phase 2: Process user input
-            user_input = self.user_input_handler.parse(city, price, diet)
+            user_input = self.user_input_handler.parse(city, price, diet, cuisines)
+            query = self.canonicalizer.canonicalize(user_input)
+            
+            # Precomputed for the hot query grid: no filtering or LLM call
+            materialized = self.materializer.lookup(query)
+            if materialized is not None:
+                result, total_matches = materialized
+                return self._render(self._shown_input(user_input, query), total_matches, result)
             
-            # Phase 3: Filter restaurants based on user preferences
-            context = self.integrator.prepare_context(self.data, user_input)
+            # Phase 3: Filter restaurants based on the canonical query
+            # (only the best-ranked rows that fit in the prompt are materialized)
+            context = self._prepare_context(query)
             
             # Phase 4: Get AI recommendations
             result = self.recommender.get_recommendations(context)
             
             # Phase 5: Format and display recommendations
-            formatted_output = self.display.format_recommendations(result, user_input)
+            return self._render(self._shown_input(user_input, query), context.total_matches, result)
             
-            # Add statistics
-            stats = self.display.display_summary_stats(
+        except Exception as e:
+            return _format_error(e)
+
+    def stream_recommendations(
+        self, city: str, price: int, diet: str, cuisines: Optional[list[str]] = None
+    ) -> Iterator[str]:
+        """
+        Streaming get_recommendations: yields the formatted output piece by
+        piece (header with the first recommendation, each further
+        recommendation as soon as the LLM has finished it, then footer and
+        statistics), so the first recommendation shows before the whole
+        response has arrived.
+        """
+        try:
+            user_input = self.user_input_handler.parse(city, price, diet, cuisines)
+            query = self.canonicalizer.canonicalize(user_input)
+            materialized = self.materializer.lookup(query)
+            if materialized is not None:
+                result, total_matches = materialized
+                source = iter(result.recommendations)
+            else:
+                context = self._prepare_context(query)
+                total_matches = context.total_matches
+                source = self.recommender.stream_recommendations(context)
+
+            received = []
+
+            def recommendations():
+                for rec in source:
+                    received.append(rec)
+                    yield rec
+
+            yield from self.display.stream_recommendations(recommendations(), self._shown_input(user_input, query))
+            yield self.display.display_summary_stats(
                 total_restaurants=len(self.data),
-                filtered_restaurants=context.total_matches,
-                recommendations_count=len(result.recommendations)
+                filtered_restaurants=total_matches,
+                recommendations_count=len(received)
             )
-            
-            return f"{formatted_output}\n{stats}"
-            
         except Exception as e:
-            return f"""
-╔══════════════════════════════════════════════════════════════╗
-║                       ERROR OCCURRED                        ║
-╚══════════════════════════════════════════════════════════════╝
+            yield _format_error(e)
 
-Sorry, we encountered an error while processing your request:
+    async def get_recommendations_async(
+        self, city: str, price: int, diet: str, cuisines: Optional[list[str]] = None
+    ) -> str:
+        """
+        Async get_recommendations for event-loop servers (see
+        phase6_Backend_Frontend.asgi). Filtering and ranking run on the
+        loop's default executor; the LLM call is awaited on the recommender's
+        async client, so the loop keeps serving other requests meanwhile.
+        """
+        try:
+            user_input = self.user_input_handler.parse(city, price, diet, cuisines)
+            query = self.canonicalizer.canonicalize(user_input)
+            loop = asyncio.get_running_loop()
+            materialized = await loop.run_in_executor(None, self.materializer.lookup, query)
+            if materialized is not None:
+                result, total_matches = materialized
+                return self._render(self._shown_input(user_input, query), total_matches, result)
+            context = await loop.run_in_executor(None, self._prepare_context, query)
+            result = await self.recommender.get_recommendations_async(context)
+            return self._render(self._shown_input(user_input, query), context.total_matches, result)
+        except Exception as e:
+            return _format_error(e)
 
-Error: {str(e)}
+    def _prepare_context(self, query: UserInput) -> IntegrationContext:
+        """Phase 3 context for a canonical query: the Top-K rows that fit in the prompt."""
+        return self.integrator.prepare_context(self.data, query, top_k=MAX_RESTAURANTS_IN_PROMPT)
 
-Suggestions:
-• Check if all input values are correct
-• Ensure the city name is spelled correctly
-• Verify your budget is a reasonable number
-• Make sure dietary preference is 'veg' or 'non-veg'
+    @staticmethod
+    def _shown_input(user_input: UserInput, query: UserInput) -> UserInput:
+        """
+        user_input as displayed: with the budget the results were filtered
+        by (the canonical one, snapped down to its bucket edge), so the
+        output never shows a budget some of whose restaurants were left out.
+        """
+        return replace(user_input, price=query.price)
 
-Please try again with different inputs!
-"""
+    def _render(self, user_input: UserInput, total_matches: int, result: RecommendationResult) -> str:
+        """Formatted recommendations plus summary statistics."""
+        formatted_output = self.display.format_recommendations(result, user_input)
+        stats = self.display.display_summary_stats(
+            total_restaurants=len(self.data),
+            filtered_restaurants=total_matches,
+            recommendations_count=len(result.recommendations)
+        )
+        return f"{formatted_output}\n{stats}"
     
     def get_available_cities(self) -> list[str]:
         """Get list of available cities from the dataset."""
         return self.data_loader.get_unique_cities()
     
+    def get_budget_histogram(self, city: str, edges: Optional[list[int]] = None) -> dict:
+        """
+        Count restaurants per budget bucket in a city using the price index.
+
+        Args:
+            city: City/area name
+            edges: Ascending bucket edges in Rs. (defaults to DEFAULT_BUDGET_EDGES)
+
+        Returns:
+            Dict with the edges, per-bucket counts and the total under the last edge
+        """
+        edges = list(edges) if edges else DEFAULT_BUDGET_EDGES
+        index = self.integrator.index
+        if index is None or index.frame is not self.data:
+            index = self._build_index()
+        return {
+            "city": city,
+            "edges": edges,
+            "counts": index.budget_histogram(city, edges),
+            "total": index.count_within_budget(city, edges[-1]),
+        }
+
+    def get_cache_stats(self) -> dict:
+        """Query canonicalization, materialized results, filter result cache, LLM response cache, coalescing, micro-batching, concurrency limiter and circuit breaker counters."""
+        cache = self.recommender.cache
+        filter_cache = self.integrator.result_cache
+        flights = [self.recommender.single_flight, self.recommender.async_single_flight]
+        batchers = [b for b in (self.recommender.batcher, self.recommender.async_batcher) if b is not None]
+        return {
+            "queries": self.canonicalizer.stats.as_dict(),
+            "materialized": self.materializer.stats.as_dict(),
+            "filter_cache": filter_cache.stats.as_dict() if filter_cache is not None else None,
+            "llm_cache": cache.stats.as_dict() if cache is not None else None,
+            "llm_coalescing": {
+                "calls": sum(f.stats.calls for f in flights if f is not None),
+                "coalesced": sum(f.stats.coalesced for f in flights if f is not None),
+            },
+            "llm_batching": MicroBatchStats(
+                batches=sum(b.stats.batches for b in batchers),
+                items=sum(b.stats.items for b in batchers),
+                full=sum(b.stats.full for b in batchers),
+                largest=max(b.stats.largest for b in batchers),
+            ).as_dict() if batchers else None,
+            "llm_limiter": self.recommender.limiter.stats.as_dict() if self.recommender.limiter is not None else None,
+            "llm_circuit": self.recommender.breaker.stats.as_dict(),
+        }
+
     def get_dataset_info(self) -> dict:
         """Get information about the loaded dataset."""
         return {
@@ -168,12 +380,11 @@ def main():
             print("Diet must be 'veg' or 'non-veg'!")
             return
         
-        print("\nProcessing your request...")
-        
-        # Get recommendations
-        recommendations = app.get_recommendations(city, price, diet)
+        print("\nProcessing your request...\n")
         
-        print("\n" + recommendations)
+        # Get recommendations, printing each one as soon as it arrives
+        for piece in app.stream_recommendations(city, price, diet):
+            print(piece, flush=True)
         
     except KeyboardInterrupt:
         print("\nGoodbye!")
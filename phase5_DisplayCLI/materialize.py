@@ -0,0 +1,363 @@
+"""
+Phase 5 - Materialized Recommendations
+Precomputes recommendations for the hot query grid (busiest cities x
+budget tiers x diets) by running the full Phase 3 -> 4 pipeline offline
+(see batch.BatchRunner), and stores the structured results in a small
+SQLite file keyed by dataset version and canonical query. Front ends look
+a canonical query up before filtering; a hit is served without touching
+the data or the LLM.
+
+Entries younger than StalenessPolicy.fresh_seconds are served as is;
+older ones, up to max_stale_seconds, are still served but queued for a
+background refresh; anything older, or made for another dataset version,
+is ignored.
+
+The store lives in the app's cache directory, so it persists only when
+one is configured (cache_dir or $ZOMATO_CACHE_DIR); otherwise it is kept
+in memory for the life of the app.
+
+Usage:
+  ZOMATO_CACHE_DIR=.zomato_cache python -m phase5_DisplayCLI.materialize --top-cities 30 --budgets 300,500,800,1200,2000
+"""
+
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from phase2_UserInput.canonical import QueryCanonicalizer
+from phase2_UserInput.user_input import UserInput
+from phase4_LLMRecommendation.recommender import RecommendationResult
+from phase5_DisplayCLI.batch import DEFAULT_BATCH_WORKERS, BatchRunner, BatchStats, print_progress
+
+MATERIALIZED_FILENAME = "materialized.sqlite"
+DEFAULT_MATERIALIZED_BUDGETS = (300, 500, 800, 1200, 2000)
+DEFAULT_TOP_CITIES = 30
+DIETS = ("veg", "non-veg")
+CITY_COL = "listed_in(city)"
+
+
+def hot_grid(
+    cities: Iterable[str],
+    budgets: Iterable[int] = DEFAULT_MATERIALIZED_BUDGETS,
+    diets: Iterable[str] = DIETS,
+) -> list[dict]:
+    """Every (city, budget, diet) combination as batch queries."""
+    budgets, diets = list(budgets), list(diets)
+    return [{"city": c, "price": b, "diet": d} for c in cities for b in budgets for d in diets]
+
+
+def top_cities(data, n: int = DEFAULT_TOP_CITIES) -> list[str]:
+    """The n cities with the most restaurants in data."""
+    if CITY_COL not in data.columns:
+        return []
+    return [str(city) for city in data[CITY_COL].dropna().value_counts().head(n).index]
+
+
+def _json_scalar(value):
+    """JSON form of numpy scalars (e.g. DataFrame index labels in records)."""
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_result(result: RecommendationResult, total_matches: int) -> dict:
+    """JSON-ready payload of a result (see decode_result)."""
+    return {"result": asdict(result), "total_matches": total_matches}
+
+
+def decode_result(payload: dict) -> tuple[RecommendationResult, int]:
+    """RecommendationResult (marked cached) and total matches of a stored payload."""
+    result = RecommendationResult(**payload["result"])
+    result.cached = True
+    return result, payload["total_matches"]
+
+
+@dataclass
+class StalenessPolicy:
+    """How long materialized entries are served."""
+
+    fresh_seconds: float = 24 * 60 * 60  # Served without refreshing
+    max_stale_seconds: float = 7 * 24 * 60 * 60  # Served while a refresh runs; older entries are misses
+
+
+@dataclass
+class MaterializedStats:
+    """Lookup and refresh counters of a Materializer."""
+
+    hits: int = 0  # Fresh entries served
+    stale_hits: int = 0  # Stale entries served (refresh queued)
+    misses: int = 0
+    writes: int = 0
+    refreshes: int = 0  # Background refreshes completed
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "refreshes": self.refreshes,
+        }
+
+
+class MaterializedStore:
+    """
+    SQLite table of (dataset version, query key) -> zlib-compressed JSON
+    payload and creation time. Safe to share between threads.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: SQLite file. None keeps the store in memory (for tests).
+        """
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._db = self._open(self.path)
+
+    @staticmethod
+    def _open(path: Optional[Path]) -> Optional[sqlite3.Connection]:
+        try:
+            if path is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path) if path else ":memory:", check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS materialized ("
+                "version TEXT NOT NULL, query_key TEXT NOT NULL, created REAL NOT NULL, "
+                "payload BLOB NOT NULL, PRIMARY KEY (version, query_key))"
+            )
+            return db
+        except (OSError, sqlite3.Error) as e:
+            print(f"Materialized recommendations disabled ({path}): {e}")
+            return None
+
+    def get(self, version: str, key: str) -> Optional[tuple[dict, float]]:
+        """(payload, created) stored for key under version, or None."""
+        if self._db is None:
+            return None
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    "SELECT payload, created FROM materialized WHERE version = ? AND query_key = ?",
+                    (version, key),
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"Materialized lookup failed: {e}")
+                return None
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0])), row[1]
+
+    def put(self, version: str, key: str, payload: dict, created: Optional[float] = None) -> None:
+        """Store payload for key under version (replacing an older entry)."""
+        if self._db is None:
+            return
+        text = json.dumps(payload, separators=(",", ":"), default=_json_scalar)
+        blob = zlib.compress(text.encode("utf-8"))
+        with self._lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO materialized (version, query_key, created, payload) VALUES (?, ?, ?, ?)",
+                    (version, key, time.time() if created is None else created, blob),
+                )
+            except sqlite3.Error as e:
+                print(f"Materialized write failed: {e}")
+
+    def purge(self, keep_version: str) -> int:
+        """Delete entries of every other version. Returns the number deleted."""
+        if self._db is None:
+            return 0
+        with self._lock:
+            return self._db.execute("DELETE FROM materialized WHERE version != ?", (keep_version,)).rowcount
+
+    def count(self, version: Optional[str] = None) -> int:
+        """Number of entries (of version, if given)."""
+        if self._db is None:
+            return 0
+        with self._lock:
+            if version is None:
+                return self._db.execute("SELECT COUNT(*) FROM materialized").fetchone()[0]
+            return self._db.execute(
+                "SELECT COUNT(*) FROM materialized WHERE version = ?", (version,)
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class Materializer:
+    """
+    Fills, serves and refreshes materialized results for a ZomatoRecommendationApp.
+
+    Entries are stored under the dataset fingerprint of the app's loader
+    (plus the LLM model), so a new dataset never serves old results; with
+    no fingerprint (e.g. sample data) nothing is materialized or served.
+    Fallback results are never stored. Refreshes run one at a time on a
+    daemon thread; a query already queued is not queued again.
+    """
+
+    def __init__(self, app, store: MaterializedStore, policy: Optional[StalenessPolicy] = None):
+        """
+        Args:
+            app: ZomatoRecommendationApp providing data, integrator and recommender.
+            store: Where results are kept.
+            policy: Staleness policy. Defaults to StalenessPolicy().
+        """
+        self.app = app
+        self.store = store
+        self.policy = policy or StalenessPolicy()
+        self.stats = MaterializedStats()
+        self._queue: "queue.Queue[UserInput]" = queue.Queue()
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    @property
+    def version(self) -> Optional[str]:
+        """Store version of the loaded dataset, or None if it has no fingerprint."""
+        fingerprint = self.app.data_loader.fingerprint
+        return f"{fingerprint}|{self.app.recommender.backend.model}" if fingerprint else None
+
+    def lookup(self, query: UserInput) -> Optional[tuple[RecommendationResult, int]]:
+        """
+        Materialized (result, total_matches) for a canonical query, or None.
+        A stale hit queues a background refresh.
+        """
+        version = self.version
+        if version is None:
+            return None
+        entry = self.store.get(version, QueryCanonicalizer.key(query))
+        age = None if entry is None else time.time() - entry[1]
+        if age is None or age > self.policy.max_stale_seconds:
+            with self._lock:
+                self.stats.misses += 1
+            return None
+        stale = age > self.policy.fresh_seconds
+        with self._lock:
+            if stale:
+                self.stats.stale_hits += 1
+            else:
+                self.stats.hits += 1
+        if stale:
+            self.refresh_in_background(query)
+        return decode_result(entry[0])
+
+    def materialize(
+        self,
+        queries: Iterable[dict],
+        workers: int = DEFAULT_BATCH_WORKERS,
+        progress: Optional[Callable[[BatchStats], None]] = None,
+    ) -> BatchStats:
+        """
+        Run queries through the pipeline (see BatchRunner) and store every
+        LLM answer, then drop entries of older dataset versions.
+        """
+        version = self.version
+        runner = BatchRunner(self.app, workers)
+        if version is None:
+            print("Dataset has no fingerprint; nothing materialized.")
+            return runner.stats
+        for item in runner.results(queries, progress):
+            if item.result is not None:
+                self._store(version, item.user_input, item.result, item.context.total_matches)
+        self.store.purge(version)
+        return runner.stats
+
+    def refresh_in_background(self, query: UserInput) -> None:
+        """Queue a canonical query for recomputation (no-op if already queued)."""
+        key = QueryCanonicalizer.key(query)
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._refresh_loop, name="materialize-refresh", daemon=True)
+                self._worker.start()
+        self._queue.put(query)
+
+    def wait_for_refreshes(self) -> None:
+        """Block until every queued refresh has finished."""
+        self._queue.join()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            query = self._queue.get()
+            try:
+                self.refresh(query)
+            except Exception as e:
+                print(f"Materialized refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(QueryCanonicalizer.key(query))
+                self._queue.task_done()
+
+    def refresh(self, query: UserInput) -> None:
+        """Recompute and store one canonical query now."""
+        version = self.version
+        if version is None:
+            return
+        context = self.app._prepare_context(query)
+        result = self.app.recommender.get_recommendations(context)
+        if self._store(version, query, result, context.total_matches):
+            with self._lock:
+                self.stats.refreshes += 1
+
+    def _store(self, version: str, query: UserInput, result: RecommendationResult, total_matches: int) -> bool:
+        """Store result for query unless it is a fallback. Returns whether it was stored."""
+        if result.fallback:
+            return False
+        stored = RecommendationResult(**{**asdict(result), "cached": False})
+        self.store.put(version, QueryCanonicalizer.key(query), encode_result(stored, total_matches))
+        with self._lock:
+            self.stats.writes += 1
+        return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Phase 5: Precompute recommendations for the hot query grid"
+    )
+    parser.add_argument("--cities", help="Comma-separated cities. Default: the --top-cities busiest")
+    parser.add_argument("--top-cities", type=int, default=DEFAULT_TOP_CITIES, help="Busiest cities to cover")
+    parser.add_argument(
+        "--budgets",
+        default=",".join(str(b) for b in DEFAULT_MATERIALIZED_BUDGETS),
+        help="Comma-separated budget tiers in Rs.",
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_BATCH_WORKERS, help="Concurrent LLM calls")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=os.environ.get("ZOMATO_CACHE_DIR") or None,
+        help="Directory of the store served by the app. Default: $ZOMATO_CACHE_DIR",
+    )
+    args = parser.parse_args()
+    if args.cache_dir is None:
+        parser.error("set --cache-dir or $ZOMATO_CACHE_DIR (the app serves materialized results only from there)")
+
+    from phase5_DisplayCLI.main import ZomatoRecommendationApp
+
+    app = ZomatoRecommendationApp(cache_dir=args.cache_dir)
+    cities = [c.strip() for c in args.cities.split(",") if c.strip()] if args.cities else top_cities(app.data, args.top_cities)
+    queries = hot_grid(cities, [int(b) for b in args.budgets.split(",")])
+
+    stats = app.materializer.materialize(queries, workers=args.workers, progress=print_progress)
+    print(file=sys.stderr)
+    print(json.dumps({**stats.as_dict(), "stored": app.materializer.store.count(app.materializer.version)}))
+
+
+if __name__ == "__main__":
+    main()
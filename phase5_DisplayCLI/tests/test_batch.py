@@ -0,0 +1,88 @@
+"""Phase 5 - Tests for batch recommendations."""
+
+import json
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from phase4_LLMRecommendation.client import LLMClient
+from phase4_LLMRecommendation.recommender import Recommender
+from phase4_LLMRecommendation.stub_server import StubLLMServer
+from phase5_DisplayCLI.batch import BatchRunner, read_queries
+from phase5_DisplayCLI.main import ZomatoRecommendationApp
+
+
+@pytest.fixture
+def server():
+    with StubLLMServer(latency=0.05) as stub:
+        yield stub
+
+
+@pytest.fixture
+def app(server, tmp_path):
+    data = pd.DataFrame({
+        "name": [f"Place {i}" for i in range(8)],
+        "rate": ["4.1/5", "3.9/5", "4.5/5", "3.5/5", "4.0/5", "4.2/5", "3.8/5", "4.4/5"],
+        "approx_cost(for two people)": ["200", "300", "400", "500", "600", "700", "800", "900"],
+        "cuisines": ["South Indian", "Chinese", "Cafe", "North Indian", "Chicken Biryani", "Thai", "Cafe", "Italian"],
+        "dish_liked": [None] * 8,
+        "listed_in(city)": ["BTM"] * 4 + ["Indiranagar"] * 4,
+        "votes": [10, 20, 30, 40, 50, 60, 70, 80],
+    })
+    with patch("phase5_DisplayCLI.main.ZomatoRecommendationApp._load_data"):
+        app = ZomatoRecommendationApp(cache_dir=tmp_path)
+    app.data = data
+    app.recommender = Recommender(api_key="key", client=LLMClient(url=server.url))
+    return app
+
+
+QUERIES = [
+    {"city": "BTM", "price": price, "diet": diet}
+    for price in (250, 350, 450, 600)
+    for diet in ("veg", "non-veg")
+] + [{"city": "Indiranagar", "price": 900, "diet": "veg", "id": "x"}]
+
+
+class TestBatchRunner:
+    """Tests for BatchRunner."""
+
+    def test_every_query_answered(self, app, server):
+        runner = BatchRunner(app, workers=3)
+        records = list(runner.run(QUERIES + [{"city": "BTM", "price": "cheap", "diet": "veg"}]))
+        assert sorted(r["index"] for r in records) == list(range(len(QUERIES) + 1))
+        by_index = {r["index"]: r for r in records}
+        assert not by_index[len(QUERIES)]["ok"]
+        assert "Price must be a number" in by_index[len(QUERIES)]["error"]
+        assert all(by_index[i]["ok"] for i in range(len(QUERIES)))
+        assert by_index[8]["query"]["id"] == "x"
+        assert by_index[8]["total_matches"] == 3  # the Biryani place is not veg
+        assert json.loads(json.dumps(records)) == records
+        assert 1 < server.max_in_flight <= 3
+        stats = runner.stats.as_dict()
+        assert (stats["total"], stats["completed"], stats["failed"]) == (10, 10, 1)
+        assert stats["queries_per_second"] > 0
+
+    def test_one_filter_pass_per_city(self, app):
+        with patch.object(app.integrator, "_city_positions", wraps=app.integrator._city_positions) as city_pass:
+            list(BatchRunner(app).run(QUERIES))
+        assert sorted(c.args[1] for c in city_pass.call_args_list) == ["btm", "indiranagar"]
+
+    def test_progress_reported(self, app):
+        seen = []
+        list(BatchRunner(app).run(QUERIES[:3], progress=lambda stats: seen.append(stats.completed)))
+        assert seen == [1, 2, 3]
+
+
+class TestReadQueries:
+    """Tests for read_queries."""
+
+    def test_jsonl(self, tmp_path):
+        path = tmp_path / "q.jsonl"
+        path.write_text('{"city": "BTM", "price": 300, "diet": "veg"}\n\n{"city": "HSR", "price": 500, "diet": "non-veg"}\n')
+        assert [q["city"] for q in read_queries(path)] == ["BTM", "HSR"]
+
+    def test_csv(self, tmp_path):
+        path = tmp_path / "q.csv"
+        path.write_text('city,price,diet,cuisines\nBTM,300,veg,"Chinese, Thai"\n')
+        assert read_queries(path) == [{"city": "BTM", "price": "300", "diet": "veg", "cuisines": "Chinese, Thai"}]
@@ -9,7 +9,9 @@ import pandas as pd
 from phase1_DataLoading.data_loader import ZomatoDataLoader
 from phase2_UserInput.user_input import UserInput, UserInputHandler
 from phase3_Integration.integrator import Integrator
+from phase4_LLMRecommendation.client import LLMClient
 from phase4_LLMRecommendation.recommender import Recommender
+from phase4_LLMRecommendation.stub_server import StubLLMServer
 from phase5_DisplayCLI.display import RecommendationDisplay
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
@@ -24,7 +26,7 @@ from phase5_DisplayCLI.main import ZomatoRecommendationApp
 
 
 @pytest.fixture
-def sample_app():
+def sample_app(tmp_path):
     """Create app instance with sample data for testing."""
     # Create sample data
     sample_data = pd.DataFrame({
@@ -49,7 +51,7 @@ def sample_app():
     
     # Create app with mocked data loading
     with patch('phase5_DisplayCLI.main.ZomatoRecommendationApp._load_data'):
-        app = ZomatoRecommendationApp()
+        app = ZomatoRecommendationApp(cache_dir=tmp_path)
         app.data = sample_data
         # Also set the data in the data_loader to avoid the RuntimeError
         app.data_loader._df = sample_data
@@ -127,6 +129,12 @@ class TestCompleteIntegration:
         assert isinstance(cities, list)
         assert "Bangalore" in cities
 
+    def test_budget_histogram(self, sample_app):
+        """Test budget histogram from the price index."""
+        histogram = sample_app.get_budget_histogram("bangalore", [0, 500, 1000, 1500])
+        assert histogram["counts"] == [2, 2, 1]
+        assert histogram["total"] == 5
+
     def test_recommendation_formatting_quality(self, sample_app):
         """Test that recommendations are properly formatted and readable."""
         result = sample_app.get_recommendations("Bangalore", 800, "non-veg")
@@ -150,13 +158,33 @@ class TestCompleteIntegration:
             assert "ERROR OCCURRED" in result
             assert "API Error" in result
 
+    def test_stream_recommendations(self, sample_app):
+        """Test streaming yields the header with the first recommendation, then one piece per recommendation."""
+        with StubLLMServer() as server:
+            sample_app.recommender = Recommender(api_key="key", client=LLMClient(url=server.url))
+            pieces = list(sample_app.stream_recommendations("Bangalore", 700, "veg"))
+        
+        assert "ZOMATO AI RESTAURANT RECOMMENDATIONS" in pieces[0]
+        assert "RECOMMENDATION 1: STUB DOSA HOUSE" in pieces[1]
+        assert "│ Crisp dosas well within budget." in pieces[1]
+        assert "RECOMMENDATION 2: STUB THALI POINT" in pieces[2]
+        assert "TIPS & NOTES" in pieces[3]
+        assert "AI recommendations generated: 2" in pieces[4]
+
+    def test_stream_recommendations_error(self, sample_app):
+        """Test streaming reports errors as a formatted error block."""
+        pieces = list(sample_app.stream_recommendations("Bangalore", -5, "veg"))
+        assert len(pieces) == 1
+        assert "ERROR OCCURRED" in pieces[0]
+
 
 class TestRealAPIIntegration:
     """Integration tests with real API calls (limited to avoid rate limits)."""
 
     @pytest.fixture
-    def real_app(self):
+    def real_app(self, monkeypatch):
         """Create app with real data loading."""
+        monkeypatch.delenv("ZOMATO_CACHE_DIR", raising=False)  # LLM answers cached in memory only
         try:
             app = ZomatoRecommendationApp()
             return app
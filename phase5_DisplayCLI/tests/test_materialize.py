@@ -0,0 +1,160 @@
+"""Phase 5 - Tests for materialized recommendations."""
+
+import time
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from phase2_UserInput.canonical import QueryCanonicalizer
+from phase2_UserInput.user_input import UserInput
+from phase4_LLMRecommendation.client import LLMClient
+from phase4_LLMRecommendation.recommender import Recommender
+from phase4_LLMRecommendation.resilience import RetryPolicy
+from phase4_LLMRecommendation.stub_server import StubLLMServer
+from phase5_DisplayCLI.main import ZomatoRecommendationApp
+from phase5_DisplayCLI.materialize import (
+    MaterializedStore,
+    Materializer,
+    StalenessPolicy,
+    hot_grid,
+    top_cities,
+)
+
+
+@pytest.fixture
+def server():
+    with StubLLMServer(latency=0.01) as stub:
+        yield stub
+
+
+@pytest.fixture
+def app(server, tmp_path):
+    data = pd.DataFrame({
+        "name": [f"Place {i}" for i in range(6)],
+        "rate": ["4.1/5", "3.9/5", "4.5/5", "3.5/5", "4.0/5", "4.2/5"],
+        "approx_cost(for two people)": ["200", "450", "700", "250", "600", "1,100"],
+        "cuisines": ["South Indian", "Chinese", "Cafe", "North Indian", "Chicken Biryani", "Thai"],
+        "dish_liked": [None] * 6,
+        "listed_in(city)": ["BTM", "BTM", "BTM", "Indiranagar", "Indiranagar", "BTM"],
+        "votes": [10, 20, 30, 40, 50, 60],
+    })
+    with patch("phase5_DisplayCLI.main.ZomatoRecommendationApp._load_data"):
+        app = ZomatoRecommendationApp(cache_dir=tmp_path)
+    app.data = data
+    app.data_loader.fingerprint = "fp1"
+    app.recommender = Recommender(
+        api_key="key", client=LLMClient(url=server.url), retry_policy=RetryPolicy(max_attempts=1)
+    )
+    return app
+
+
+GRID = hot_grid(["BTM", "Indiranagar"], budgets=[300, 800])
+
+
+class TestGrid:
+    """Tests for hot_grid and top_cities."""
+
+    def test_hot_grid(self):
+        assert len(GRID) == 8
+        assert GRID[0] == {"city": "BTM", "price": 300, "diet": "veg"}
+
+    def test_top_cities(self, app):
+        assert top_cities(app.data, 1) == ["BTM"]
+
+
+class TestMaterializer:
+    """Serving and refreshing materialized results."""
+
+    def test_grid_queries_served_without_llm(self, app, server):
+        stats = app.materializer.materialize(GRID, workers=4)
+        assert (stats.completed, stats.failed) == (8, 0)
+        assert app.materializer.store.count(app.materializer.version) == 8
+        requests_after_job = server.requests
+
+        text = app.get_recommendations("btm", 850, "vegetarian")  # canonicalizes to BTM / 800 / veg
+        assert "RECOMMENDATION 1: STUB DOSA HOUSE" in text
+        streamed = "".join(app.stream_recommendations("BTM", 800, "veg"))
+        assert "STUB DOSA HOUSE" in streamed
+        assert server.requests == requests_after_job
+        assert app.materializer.stats.hits == 2
+
+        app.get_recommendations("BTM", 500, "veg")  # not in the grid
+        assert server.requests == requests_after_job + 1
+        assert app.get_cache_stats()["materialized"]["misses"] == 1
+
+    def test_new_dataset_version_not_served(self, app, server):
+        app.materializer.materialize(GRID)
+        app.data_loader.fingerprint = "fp2"
+        assert app.materializer.lookup(_query(app, "BTM", 800, "veg")) is None
+        app.materializer.materialize(GRID[:1])
+        assert app.materializer.store.count() == 1  # fp1 entries purged
+
+    def test_stale_entry_served_and_refreshed(self, app, server):
+        app.materializer = Materializer(
+            app, MaterializedStore(), StalenessPolicy(fresh_seconds=60, max_stale_seconds=3600)
+        )
+        app.materializer.materialize(GRID[:1])
+        query = _query(app, "BTM", 300, "veg")
+        version = app.materializer.version
+        payload, _ = app.materializer.store.get(version, _key(query))
+        app.materializer.store.put(version, _key(query), payload, created=time.time() - 120)
+
+        assert app.materializer.lookup(query) is not None
+        app.materializer.wait_for_refreshes()
+        assert app.materializer.stats.stale_hits == 1
+        assert app.materializer.stats.refreshes == 1
+        assert time.time() - app.materializer.store.get(version, _key(query))[1] < 60
+
+    def test_expired_entry_is_a_miss(self, app):
+        app.materializer = Materializer(app, MaterializedStore(), StalenessPolicy(max_stale_seconds=0))
+        app.materializer.materialize(GRID[:1])
+        assert app.materializer.lookup(_query(app, "BTM", 300, "veg")) is None
+
+    def test_fallback_not_materialized(self, app, server):
+        server.status = 503
+        stats = app.materializer.materialize(GRID)
+        assert stats.fallback == 8
+        assert app.materializer.store.count() == 0
+
+    def test_no_fingerprint_disables(self, app):
+        app.data_loader.fingerprint = None
+        app.materializer.materialize(GRID)
+        assert app.materializer.store.count() == 0
+        assert app.materializer.lookup(_query(app, "BTM", 300, "veg")) is None
+
+
+def _query(app, city, price, diet) -> UserInput:
+    return app.canonicalizer.canonicalize(UserInput(city=city, price=price, diet=diet))
+
+
+def _key(query: UserInput) -> str:
+    return QueryCanonicalizer.key(query)
+
+
+class TestPersistence:
+    """Where the app keeps materialized results."""
+
+    def test_in_memory_without_cache_dir(self, monkeypatch):
+        monkeypatch.delenv("ZOMATO_CACHE_DIR", raising=False)
+        with patch("phase5_DisplayCLI.main.ZomatoRecommendationApp._load_data"):
+            app = ZomatoRecommendationApp()
+        assert app.materializer.store.path is None
+        assert app.recommender.cache.path is None
+
+    def test_on_disk_with_cache_dir(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("ZOMATO_CACHE_DIR", str(tmp_path))
+        with patch("phase5_DisplayCLI.main.ZomatoRecommendationApp._load_data"):
+            app = ZomatoRecommendationApp()
+        assert app.materializer.store.path.parent == tmp_path
+        assert app.recommender.cache.path.parent == tmp_path
+
+
+class TestCanonicalBudget:
+    """The output shows the budget the results were filtered by."""
+
+    def test_budget_snapped_to_bucket_edge(self, app, server):
+        text = app.get_recommendations("BTM", 740, "non-veg")
+        assert "Budget: Rs.700 for two people" in text and "Rs.740" not in text
+        streamed = "".join(app.stream_recommendations("BTM", 740, "non-veg"))
+        assert "Budget: Rs.700 for two people" in streamed
@@ -0,0 +1,110 @@
+"""
+Phase 6 - Async Web Entry Point
+Minimal ASGI application serving the recommendation API on an event loop.
+Unlike the Flask app, a request waiting on the LLM does not hold a worker:
+one process can keep hundreds of recommendation requests in flight.
+
+Run with any ASGI server, e.g.:
+  uvicorn phase6_Backend_Frontend.asgi:app --port 5001
+
+Endpoints:
+  GET  /health
+  POST /api/recommendations   (same body and responses as the Flask API)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from phase6_Backend_Frontend.app import parse_recommendation_request
+from phase5_DisplayCLI.main import ZomatoRecommendationApp
+
+recommendation_app = None
+
+
+def initialize_app():
+    """Initialize the recommendation system."""
+    global recommendation_app
+    try:
+        recommendation_app = ZomatoRecommendationApp()
+        return True, "System initialized successfully"
+    except Exception as e:
+        return False, f"Failed to initialize: {str(e)}"
+
+
+async def _send_json(send, status, payload):
+    body = json.dumps(payload).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            if recommendation_app is None:
+                success, text = initialize_app()
+                if not success:
+                    await send({"type": "lifespan.startup.failed", "message": text})
+                    return
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            if recommendation_app is not None:
+                await recommendation_app.recommender.async_client.aclose()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI entry point."""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    path, method = scope["path"], scope["method"]
+    if path == "/health" and method == "GET":
+        if recommendation_app is None:
+            await _send_json(send, 503, {"status": "error", "message": "System not initialized"})
+        else:
+            await _send_json(send, 200, {"status": "healthy", "message": "System ready"})
+        return
+
+    if path == "/api/recommendations" and method == "POST":
+        try:
+            args, error = parse_recommendation_request(json.loads(await _read_body(receive) or b"{}"))
+        except ValueError:
+            args, error = None, "Invalid JSON body"
+        if error:
+            await _send_json(send, 400, {"error": error})
+            return
+        if recommendation_app is None:
+            await _send_json(send, 503, {"error": "System not initialized"})
+            return
+        try:
+            recommendations = await recommendation_app.get_recommendations_async(**args)
+        except Exception as e:
+            await _send_json(send, 500, {"error": f"System error: {str(e)}"})
+            return
+        await _send_json(send, 200, {"success": True, "recommendations": recommendations})
+        return
+
+    await _send_json(send, 404, {"error": "Not found"})
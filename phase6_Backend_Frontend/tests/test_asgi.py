@@ -0,0 +1,82 @@
+"""Test the Phase 6 async (ASGI) entry point."""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from phase6_Backend_Frontend import asgi
+
+
+def _call(method, path, body=b""):
+    """Run one HTTP request through asgi.app; return (status, json body)."""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path}
+    asyncio.run(asgi.app(scope, receive, send))
+    status = sent[0]["status"]
+    return status, json.loads(sent[1]["body"])
+
+
+class StubApp:
+    """Stands in for ZomatoRecommendationApp."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def get_recommendations_async(self, **kwargs):
+        self.calls.append(kwargs)
+        return "recommended"
+
+
+@pytest.fixture
+def stub_app(monkeypatch):
+    stub = StubApp()
+    monkeypatch.setattr(asgi, "recommendation_app", stub)
+    return stub
+
+
+class TestAsgiApp:
+    """Test the ASGI application."""
+
+    def test_health(self, stub_app):
+        assert _call("GET", "/health") == (200, {"status": "healthy", "message": "System ready"})
+
+    def test_health_before_startup(self, monkeypatch):
+        monkeypatch.setattr(asgi, "recommendation_app", None)
+        status, _ = _call("GET", "/health")
+        assert status == 503
+
+    def test_recommendations(self, stub_app):
+        body = json.dumps({"city": "Bangalore", "price": 800, "diet": "veg"}).encode()
+        status, data = _call("POST", "/api/recommendations", body)
+        assert status == 200
+        assert data == {"success": True, "recommendations": "recommended"}
+        assert stub_app.calls[0]["city"] == "Bangalore"
+
+    def test_invalid_json(self, stub_app):
+        status, data = _call("POST", "/api/recommendations", b"{not json")
+        assert status == 400
+        assert stub_app.calls == []
+
+    def test_missing_fields(self, stub_app):
+        status, data = _call("POST", "/api/recommendations", b'{"city": "Bangalore"}')
+        assert status == 400
+        assert "error" in data
+
+    def test_unknown_path(self, stub_app):
+        status, _ = _call("GET", "/nope")
+        assert status == 404
@@ -1,5 +1,6 @@
 """Test the Phase 6 web frontend."""
 
+import json
 import pytest
 import sys
 from pathlib import Path
@@ -12,8 +13,9 @@ from phase6_Backend_Frontend.app import app, initialize_app
 
 
 @pytest.fixture
-def client():
+def client(monkeypatch):
     """Create test client for Flask app."""
+    monkeypatch.delenv("ZOMATO_CACHE_DIR", raising=False)  # LLM answers cached in memory only
     with app.test_client() as client:
         with app.app_context():
             # Initialize the recommendation system for testing
@@ -75,6 +77,75 @@ class TestWebFrontend:
         assert 'recommendations' in data
         assert len(data['recommendations']) > 0
 
+    def test_recommendations_endpoint_event_stream(self, client):
+        """Test recommendations are streamed as server-sent events on request."""
+        response = client.post('/api/recommendations',
+                           json={
+                               'city': 'Bangalore',
+                               'price': 800,
+                               'diet': 'veg'
+                           },
+                           headers={'Accept': 'text/event-stream'})
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        events = [e for e in response.get_data(as_text=True).split('\n\n') if e]
+        assert events[0].startswith('event: chunk\ndata: ')
+        assert events[-1] == 'event: done\ndata: {}'
+
+    def test_recommendations_endpoint_event_stream_invalid_input(self, client):
+        """Test invalid streaming requests still get a JSON error."""
+        response = client.post('/api/recommendations',
+                           json={'price': 800, 'diet': 'veg'},
+                           headers={'Accept': 'text/event-stream'})
+        assert response.status_code == 400
+        assert 'City is required' in response.get_json()['error']
+
+    def test_batch_endpoint(self, client):
+        """Test batch results come back as JSON lines with a final stats line."""
+        response = client.post('/api/recommendations/batch', json={
+            'queries': [
+                {'city': 'Bangalore', 'price': 800, 'diet': 'veg'},
+                {'city': 'Bangalore', 'price': 'cheap', 'diet': 'veg'},
+            ],
+            'workers': 2,
+        })
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert sorted(line['index'] for line in lines[:-1]) == [0, 1]
+        assert not next(line for line in lines if line.get('index') == 1)['ok']
+        assert lines[-1]['stats']['completed'] == 2
+
+    @pytest.mark.parametrize('body', [
+        {},
+        {'queries': []},
+        {'queries': ['Bangalore']},
+        {'queries': [{'city': 'Bangalore'}], 'workers': 0},
+    ])
+    def test_batch_endpoint_invalid_body(self, client, body):
+        """Test malformed batch requests are rejected."""
+        response = client.post('/api/recommendations/batch', json=body)
+        assert response.status_code == 400
+        assert 'error' in response.get_json()
+
+    def test_batch_endpoint_before_initialization(self, monkeypatch):
+        """Test the batch endpoint answers 503 (not a truncated 200) without a system."""
+        monkeypatch.setattr(sys.modules['phase6_Backend_Frontend.app'], 'recommendation_app', None)
+        with app.test_client() as client:
+            response = client.post('/api/recommendations/batch', json={'queries': [{'city': 'Bangalore'}]})
+        assert response.status_code == 503
+        assert response.get_json() == {'status': 'error', 'message': 'System not initialized'}
+
+    @pytest.mark.parametrize('accept', ['text/event-stream', 'application/json'])
+    def test_recommendations_endpoint_before_initialization(self, monkeypatch, accept):
+        """Test the recommendations endpoint answers 503 (not a truncated stream) without a system."""
+        monkeypatch.setattr(sys.modules['phase6_Backend_Frontend.app'], 'recommendation_app', None)
+        with app.test_client() as client:
+            response = client.post('/api/recommendations', json={'city': 'Bangalore', 'price': 800, 'diet': 'veg'},
+                                   headers={'Accept': accept})
+        assert response.status_code == 503
+        assert response.get_json() == {'status': 'error', 'message': 'System not initialized'}
+
     def test_recommendations_endpoint_missing_city(self, client):
         """Test recommendations endpoint with missing city."""
         response = client.post('/api/recommendations', 
@@ -139,3 +210,42 @@ class TestWebFrontend:
         data = response.get_json()
         assert data['success'] is True
         assert 'recommendations' in data
+
+    def test_budget_histogram_endpoint(self, client):
+        """Test the budget histogram endpoint."""
+        response = client.get('/api/budget-histogram?city=Bangalore&edges=0,500,1000')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['edges'] == [0, 500, 1000]
+        assert len(data['counts']) == 2
+        assert data['total'] == sum(data['counts'])
+
+    def test_budget_histogram_endpoint_invalid_edges(self, client):
+        """Test the budget histogram endpoint rejects bad edges."""
+        response = client.get('/api/budget-histogram?city=Bangalore&edges=500,100')
+        assert response.status_code == 400
+        response = client.get('/api/budget-histogram?edges=0,100')
+        assert response.status_code == 400
+
+    def test_cache_stats_endpoint(self, client):
+        """Test the cache stats endpoint counts canonical queries."""
+        for price in (790, 810):
+            client.post('/api/recommendations', json={
+                'city': 'Bangalore', 'price': price, 'diet': 'veg'
+            })
+        response = client.get('/api/cache-stats')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['queries']['queries'] >= 2
+        assert 'fragmentation_removed' in data['queries']
+        assert 'hit_rate' in data['llm_cache']
+        assert 'hit_rate' in data['filter_cache']
+        assert 'coalesced' in data['llm_coalescing']
+        assert 'trips' in data['llm_circuit']
+
+    def test_recommendations_endpoint_invalid_cuisines(self, client):
+        """Test cuisines must be a list or string."""
+        response = client.post('/api/recommendations', json={
+            'city': 'Bangalore', 'price': 800, 'diet': 'veg', 'cuisines': 5
+        })
+        assert response.status_code == 400